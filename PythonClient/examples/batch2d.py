@@ -0,0 +1,44 @@
+""" ==================== examples/batch2d.py ========================
+This example file shows how to run many 2d analyses in a single call
+
+Prerequisites: analysis2d.py
+Features: 
+    Build a list of polars for a Reynolds sweep
+    Run all of them on a thread pool in the server
+    Get custom results for every polar
+
+================================================================= """
+
+from xflrpy import xflrClient, enumApp, Polar, enumPolarType, AnalysisSettings2D, enumSequenceType, enumPolarResult
+
+# Change these values accordingly
+# Using a valid path is your responsibility
+project_name = "test1.xfl"
+project_path = "/home/nikhil/Softwares/xflrpy/projects/"
+
+xp = xflrClient(connect_timeout=100)
+
+# Load multiple airfoils; return the design application
+xp.loadProject(project_path+project_name, save_current=False)
+
+# get some apps
+xdirect = xp.getApp(enumApp.XFOILANALYSIS) # Get the xdirect application
+
+# one polar per (foil, Reynolds) pair
+polars = []
+for foil_name in xdirect.foil_mgr.foilDict():
+    for reynolds in (100000.0, 200000.0, 500000.0):
+        polar = Polar(name="batch_Re%d" % reynolds, foil_name=foil_name)
+        polar.spec.polar_type = enumPolarType.FIXEDSPEEDPOLAR
+        polar.spec.reynolds = reynolds
+        polars.append(polar)
+
+# all polars share the same settings
+settings = AnalysisSettings2D(is_sequence=True, sequence_type=enumSequenceType.ALPHA, sequence=(0.0, 10.0, 0.5))
+
+# run with 4 threads; use n_threads=0 to use all the cores of the server
+results = xdirect.analyze_batch(polars, settings, result_list=[enumPolarResult.ALPHA, enumPolarResult.CL, enumPolarResult.CD], n_threads=4)
+
+for polar, result in zip(polars, results):
+    polar.result = result
+    print(polar.foil_name, polar.spec.reynolds, max(result.Cl, default=None))
@@ -47,7 +47,7 @@ print(new_foil)
 afoil.foil_mgr.exportFoil(foil.name, "/home/nikhil/foil.dat")
 
 foil.delete()   # delete the original foil
-coord_arr = np.array(foil.coords) 
+coord_arr = new_foil.coords_array  # (n,2) numpy array sent as one binary buffer. np.array(foil.coords) also works but is slower
 print(coord_arr)
 
 # Display the current airfoil
@@ -0,0 +1,36 @@
+""" ==================== examples/geometry_screen.py ======================
+This example file shows how to pre-screen many candidate shapes locally
+before sending any of them to the server
+
+Prerequisites: foil_geom.py
+Features:
+    Generate a batch of NACA 4-digit candidates with numpy
+    Repanel, measure thickness and camber for the whole batch at once
+    Upload only the feasible candidates
+
+================================================================= """
+
+import numpy as np
+
+from xflrpy import xflrClient, enumApp, geometry
+
+# every 4-digit foil with 1-6% camber at 20-60% chord and 8-20% thickness
+m, p, t = np.meshgrid(np.arange(1, 7), np.arange(2, 7), np.arange(8, 21), indexing='ij')
+digits = (1000*m + 100*p + t).ravel()
+
+candidates = geometry.repanel(geometry.naca4(digits, nside=120), nside=100)   # (batch, 199, 2)
+thickness, x_thickness, camber, x_camber = geometry.thickness_camber(candidates)
+
+# structural and manufacturing constraints
+feasible = (thickness >= 0.11) & (thickness <= 0.14) & (camber/thickness < 0.3)
+print("%d feasible candidates out of %d" % (feasible.sum(), len(digits)))
+
+xp = xflrClient(connect_timeout=100)
+xp.setApp(enumApp.DIRECTDESIGN)
+afoil = xp.getApp()
+
+for d, xy in zip(digits[feasible], candidates[feasible]):
+    # the server generates the foil, then receives the repaneled coordinates in a single binary call
+    afoil.createNACAFoil(int(d))
+    foil = afoil.foil_mgr.getFoil("NACA" + str(d))
+    foil.coords_array = xy
@@ -0,0 +1,66 @@
+""" ==================== examples/lookup_bench.py ========================
+This example file measures how the latency of name lookups grows with the size of the project
+
+Prerequisites: batch2d.py
+Features:
+    Grow the project by batches of stored operating points
+    Time getOpPoint and setCurPolar after each batch
+    Print the median latency against the number of stored polars and operating points
+
+================================================================= """
+
+import random
+import statistics
+import time
+
+from xflrpy import xflrClient, enumApp, Polar, enumPolarType, AnalysisSettings2D, enumSequenceType
+
+# Change these values accordingly
+# Using a valid path is your responsibility
+project_name = "test1.xfl"
+project_path = "/home/nikhil/Softwares/xflrpy/projects/"
+
+n_steps = 6         # number of growth steps
+n_reynolds = 20     # polars added per foil at each step
+n_calls = 200       # lookups timed at each step
+
+xp = xflrClient(connect_timeout=100)
+xp.loadProject(project_path+project_name, save_current=False)
+xp.setDisplay(False) # no view updates while the project grows
+
+xdirect = xp.getApp(enumApp.XFOILANALYSIS)
+foil_names = list(xdirect.foil_mgr.foilDict())
+
+# 81 stored operating points per polar
+settings = AnalysisSettings2D(is_sequence=True, sequence_type=enumSequenceType.ALPHA, sequence=(-10.0, 10.0, 0.25), store_opp=True)
+alphas = [-10.0 + 0.25*i for i in range(81)]
+
+def median_us(call, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        call(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)*1e6
+
+stored = []
+print("%8s %10s %16s %16s" % ("polars", "opps", "getOpPoint (us)", "setCurPolar (us)"))
+for step in range(n_steps):
+    polars = []
+    for foil_name in foil_names:
+        for i in range(n_reynolds):
+            reynolds = 50000.0*(1 + step*n_reynolds + i)
+            polar = Polar(name="bench_Re%d" % reynolds, foil_name=foil_name)
+            polar.spec.polar_type = enumPolarType.FIXEDSPEEDPOLAR
+            polar.spec.reynolds = reynolds
+            polars.append(polar)
+    xdirect.analyze_batch(polars, settings, n_threads=0)
+    stored += polars
+
+    # look up objects spread over the whole project, not only the latest ones
+    samples = [random.choice(stored) for _ in range(n_calls)]
+    t_opp = median_us(xdirect.opp_mgr.getOpPoint, [(random.choice(alphas), p.name, p.foil_name) for p in samples])
+    t_polar = median_us(xdirect.polar_mgr.setCurPolar, [(p.name, p.foil_name) for p in samples])
+    print("%8d %10d %16.1f %16.1f" % (len(stored), len(stored)*len(alphas), t_opp, t_polar))
+
+xp.setDisplay(True)
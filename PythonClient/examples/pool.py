@@ -0,0 +1,34 @@
+""" ==================== examples/pool.py ========================
+This example file shows how to spread analyses over several xflr5 servers
+
+Prerequisites: batch2d.py
+Features: 
+    Launch N servers on consecutive ports
+    Submit jobs to a shared work queue
+    Collect the results in order
+
+================================================================= """
+
+from xflrpy import XflrPool, enumApp, Polar, AnalysisSettings2D, enumPolarResult
+
+# Change these values accordingly
+# Using a valid path is your responsibility
+project_name = "test1.xfl"
+project_path = "/home/nikhil/Softwares/xflrpy/projects/"
+xflr5_path = "/usr/local/bin/xflrpy"
+
+def polar_job(xp, reynolds):
+    # every job gets the client of the server it runs on
+    xp.loadProject(project_path+project_name, save_current=False)
+    xdirect = xp.getApp(enumApp.XFOILANALYSIS)
+    polar = Polar(name="pool_Re%d" % reynolds, foil_name="MH 60  10.08%")
+    polar.spec.reynolds = reynolds
+    xdirect.define_analysis(polar)
+    settings = AnalysisSettings2D(is_sequence=True, sequence=(0.0, 10.0, 0.5))
+    return xdirect.analyze(settings, result_list=[enumPolarResult.ALPHA, enumPolarResult.CL])
+
+# servers on ports 8080, 8081, 8082 and 8083. Leave executable out to attach to running servers
+with XflrPool(n_workers=4, base_port=8080, executable=xflr5_path) as pool:
+    results = pool.map(polar_job, [1e5, 2e5, 3e5, 4e5, 5e5, 6e5, 7e5, 8e5])
+
+print(results)
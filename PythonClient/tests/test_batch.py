@@ -0,0 +1,33 @@
+# ======================= tests/test_batch.py =================== #
+# xflrClient.batch against the in-process fake server
+
+import msgpackrpc as rpc
+import pytest
+
+from xflrpy import xflrClient
+from xflrpy.bench.fake import FakeServer
+
+@pytest.fixture
+def xp():
+    with FakeServer() as server:
+        yield xflrClient(port=server.port, cache_age=None)
+
+def test_batch(xp):
+    with xp.batch() as batch:
+        xp._client.call("setProjectPath", "/tmp/project.xfl")
+        xp._client.call("saveProject")
+    assert [result.result() for result in batch.results] == [None, None]
+    assert xp.state.projectPath == "/tmp/project.xfl"
+
+def test_failed_batch(xp):
+    with pytest.raises(rpc.error.RPCError, match=r"Call 1 of the batch \(saveProject\) failed: the project has no file name"):
+        with xp.batch() as batch:
+            xp._client.call("setDisplay", False)
+            xp._client.call("saveProject")
+            xp._client.call("setProjectPath", "/tmp/project.xfl")
+    # the calls before the failed one keep their results, the ones after it are not run
+    assert batch.results[0].result() is None
+    for result in batch.results[1:]:
+        with pytest.raises(RuntimeError):
+            result.result()
+    assert xp.state.projectPath == ""
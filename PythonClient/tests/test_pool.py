@@ -0,0 +1,79 @@
+# ======================= tests/test_pool.py =================== #
+# XflrPool against in-process fake servers on consecutive ports
+
+import socket
+import threading
+import time
+
+import msgpackrpc as rpc
+import pytest
+
+from xflrpy import XflrPool
+from xflrpy.bench.fake import FakeServer
+
+def _free_ports(n):
+    """First of n consecutive free ports"""
+    for _ in range(100):
+        base = FakeServer._free_port()
+        try:
+            for port in range(base, base + n):
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.bind(("127.0.0.1", port))
+            return base
+        except OSError:
+            continue
+    raise RuntimeError("No consecutive free ports")
+
+@pytest.fixture
+def servers():
+    base = _free_ports(2)
+    started = [FakeServer(base), FakeServer(base + 1)]
+    for server in started:
+        server.start()
+    yield base
+    for server in started:
+        server.stop()
+
+def _server_of(client, delay = 0.0):
+    """The port of the server running the job, from the name of the pool thread"""
+    time.sleep(delay)
+    assert client.ping()
+    return int(threading.current_thread().name.split("-")[-1])
+
+class _FailOnce:
+    """Job which loses its connection on the first attempt"""
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    def __call__(self, client, value):
+        self.attempts += 1
+        if self.attempts == 1:
+            raise rpc.error.TransportError("connection lost")
+        return value
+
+def test_jobs_spread_over_servers(servers):
+    with XflrPool(n_workers=2, base_port=servers, connect_timeout=5) as pool:
+        ports = pool.map(lambda client, _: _server_of(client, 0.2), range(6))
+    assert set(ports) == {servers, servers + 1}
+
+def test_retry_after_transport_error(servers):
+    job = _FailOnce()
+    with XflrPool(n_workers=2, base_port=servers, connect_timeout=5) as pool:
+        assert pool.submit(job, 42).result(timeout=10) == 42
+    assert job.attempts == 2
+
+def test_retries_exhausted(servers):
+    job = _FailOnce()
+    with XflrPool(n_workers=2, base_port=servers, connect_timeout=5, max_retries=0) as pool:
+        future = pool.submit(job, 42)
+        with pytest.raises(rpc.error.TransportError):
+            future.result(timeout=10)
+
+def test_close_with_pending_jobs(servers):
+    pool = XflrPool(n_workers=2, base_port=servers, connect_timeout=5)
+    futures = [pool.submit(lambda client, _: _server_of(client, 0.1), i) for i in range(4)]
+    # retried while the pool is closing
+    futures.append(pool.submit(_FailOnce(), 7))
+    pool.close()
+    assert all(future.done() for future in futures)
+    assert futures[-1].result(timeout=0) == 7
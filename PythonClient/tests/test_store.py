@@ -0,0 +1,47 @@
+# ======================= tests/test_store.py =================== #
+# PolarStore round trip in an in-memory database
+
+import numpy as np
+import pytest
+
+from xflrpy import PolarStore, Polar, PolarResult
+
+def _polar(foil_name, reynolds, cl_slope):
+    polar = Polar("T1_Re%g" % reynolds, foil_name)
+    polar.spec.reynolds = reynolds
+    polar.result = PolarResult()
+    polar.result.alpha = [0.0, 2.0, 4.0]
+    polar.result.Cl = [cl_slope*a for a in polar.result.alpha]
+    return polar
+
+@pytest.fixture
+def store():
+    with PolarStore(":memory:") as store:
+        store.add(_polar("NACA 0012", 2.0e5, 0.10))
+        store.add(_polar("NACA 0012", 4.0e5, 0.12))
+        store.add(_polar("NACA 2412", 3.0e5, 0.11))
+        yield store
+
+def test_query(store):
+    polars = store.query("NACA 0012")
+    assert [p.spec.reynolds for p in polars] == [2.0e5, 4.0e5]
+    assert polars[0].name == "T1_Re200000"
+    np.testing.assert_allclose(polars[1].result.Cl, [0.0, 0.24, 0.48])
+    assert len(polars[0].result.Cd) == 0
+    assert [p.foil_name for p in store.query(re_min=2.5e5, re_max=3.5e5)] == ["NACA 2412"]
+    assert store.foils() == ["NACA 0012", "NACA 2412"]
+
+def test_interpolate(store):
+    # halfway in Reynolds number and in alpha
+    assert store.interpolate("NACA 0012", 3.0e5, 1.0) == pytest.approx(0.11)
+    # outside the stored range, the closest polar
+    np.testing.assert_allclose(store.interpolate("NACA 0012", 1.0e6, [2.0, 5.0]), [0.24, np.nan])
+    with pytest.raises(KeyError):
+        store.interpolate("NACA 4412", 3.0e5, 1.0)
+
+def test_delete(store):
+    store.delete("NACA 0012", re_max=3.0e5)
+    assert len(store) == 2
+    assert [p.spec.reynolds for p in store.query("NACA 0012")] == [4.0e5]
+    store.delete()
+    assert len(store) == 0
@@ -0,0 +1,76 @@
+# ======================= tests/test_types.py =================== #
+# The hand-written decoders of the message types against the field names of the server adapters
+
+import os
+import re
+
+import pytest
+
+from xflrpy.types import (MsgpackMixin, Foil, SpanStats, MethodStats, OpPoint, PolarSpec, PolarResult, Polar, State,
+                          Wing, Plane, WPolarResult, PolarIndexEntry)
+
+_ADAPTERS = os.path.join(os.path.dirname(__file__), "..", "..", "xflr5v6", "xflserver", "RpcLibAdapters.h")
+
+# python class: server adapter
+_DECODED = {
+    Foil: "FoilAdapter",
+    SpanStats: "SpanStats",
+    MethodStats: "MethodStats",
+    OpPoint: "OpPointAdapter",
+    PolarSpec: "PolarSpecAdapter",
+    PolarResult: "PolarResultAdapter",
+    Polar: "PolarAdapter",
+    State: "StateAdapter",
+    Wing: "WingAdapter",
+    Plane: "PlaneAdapter",
+    WPolarResult: "WPolarResult",
+    PolarIndexEntry: "PolarIndexEntry",
+}
+
+def _server_fields():
+    """The MSGPACK_DEFINE_MAP field names of each struct of the adapters"""
+    if not os.path.exists(_ADAPTERS):
+        pytest.skip("the server sources are not available")
+    with open(_ADAPTERS) as f:
+        source = f.read()
+    fields = {}
+    for match in re.finditer(r"struct\s+(\w+)\s*\{(.*?)MSGPACK_DEFINE_MAP\(([^)]*)\)", source, re.S):
+        fields[match.group(1)] = [name.strip() for name in match.group(3).split(",")]
+    return fields
+
+def _plain(value):
+    """Comparable form of a field: nested messages as dicts, empty columns as ()"""
+    if isinstance(value, MsgpackMixin):
+        return {name: _plain(getattr(value, name)) for name in value._fields}
+    if isinstance(value, (list, tuple)) and not value:
+        return ()
+    return value
+
+@pytest.mark.parametrize("cls", list(_DECODED), ids=lambda cls: cls.__name__)
+def test_every_server_field_is_decoded(cls):
+    server_fields = _server_fields()[_DECODED[cls]]
+    nested = {name for name, default in cls._defaults.items() if isinstance(default, MsgpackMixin)}
+    # a distinct value per field, found back under the name of the python field
+    encoded = {name: ({} if name in nested else "value of " + name) for name in server_fields}
+    obj = cls.from_msgpack(encoded)
+    values = {getattr(obj, name) for name in cls._fields if name not in nested}
+    for name in server_fields:
+        if name in nested:
+            assert isinstance(getattr(obj, name), MsgpackMixin)
+        else:
+            assert "value of " + name in values, "%s drops the server field %s" % (cls.__name__, name)
+
+@pytest.mark.parametrize("cls", list(_DECODED), ids=lambda cls: cls.__name__)
+def test_missing_fields_get_the_class_defaults(cls):
+    assert _plain(cls.from_msgpack({})) == _plain(cls.__new__(cls))
+
+def test_slots():
+    polar = Polar()
+    with pytest.raises(AttributeError):
+        polar.store_id = 1
+    # a subclass which declares no field keeps a __dict__
+    class TaggedPolar(Polar):
+        pass
+    tagged = TaggedPolar.from_msgpack({"name": "T1"})
+    tagged.store_id = 1
+    assert tagged.name == "T1" and tagged.store_id == 1
@@ -1,3 +1,6 @@
 from .client import *
 from .types import *
-from .utils import *
\ No newline at end of file
+from .utils import *
+from .pool import *
+from .store import *
+from . import geometry
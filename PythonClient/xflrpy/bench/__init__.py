@@ -0,0 +1,13 @@
+# ======================= bench =================== #
+# Repeatable benchmarks of the client and of the server
+# Usage:
+#   python -m xflrpy.bench --out new.json                         # against an in-process fake server, no gui needed
+#   python -m xflrpy.bench --port 8080 --out new.json             # against a running XFLR5
+#   python -m xflrpy.bench --out new.json --compare old.json      # exits with 1 if a benchmark got slower than the tolerance
+# Notes:
+# - suites: ping latency, foil coordinates round trip, PolarResult decoding, 2D batch throughput per thread count, 3D sweep per panel count
+# - the fake server only stands in for the transport and for the size of the problems; compare reports made against the same kind of server
+
+from .fake import FakeServer
+from .suites import SUITES
+from .report import run, save, load, compare, format_report, format_comparison
@@ -0,0 +1,29 @@
+import argparse
+import sys
+
+from ..client import xflrClient
+from .suites import SUITES
+from .report import run, save, load, compare, format_report, format_comparison
+
+parser = argparse.ArgumentParser(prog="python -m xflrpy.bench", description="Benchmarks of xflrpy and of the XFLR5 server")
+parser.add_argument("--ip", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=None, help="port of a running XFLR5 server. Without it, the benchmarks run against an in-process fake server")
+parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=None)
+parser.add_argument("--repeat", type=int, default=5)
+parser.add_argument("--out", default=None, help="json file which receives the report")
+parser.add_argument("--compare", default=None, help="json report of a previous run")
+parser.add_argument("--tolerance", type=float, default=0.10, help="relative slowdown above which a benchmark is a regression")
+args = parser.parse_args()
+
+xp = None if args.port is None else xflrClient(ip=args.ip, port=args.port)
+report = run(xp, args.suites, args.repeat)
+print(format_report(report))
+if args.out:
+    save(report, args.out)
+
+if args.compare:
+    rows = compare(load(args.compare), report, args.tolerance)
+    print()
+    print(format_comparison(rows))
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
@@ -0,0 +1,194 @@
+# ======================= bench/fake.py =================== #
+# In-process stand-in for the XFLR5 server, so that the benchmarks run without the gui
+# Notes:
+# - only the bindings used by the benchmarks and the tests are implemented, with the same names, arguments and reply layouts as the server
+# - the analyses do not compute aerodynamics: their cost is a dense solve sized like the real one, so timings scale with the problem size
+
+import asyncio
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import msgpack
+import msgpackrpc as rpc
+import numpy as np
+from tornado import ioloop
+
+from .. import geometry
+
+class _Bindings:
+    def __init__(self) -> None:
+        self._generation = 0
+        self.project_path = ""
+        self.foils = {}         # name: (n, 2) coordinates
+        self.planes = {}        # name: number of panels
+        self.wpolars = {}       # name: plane name
+
+    def _modified(self):
+        self._generation += 1
+
+    # ---- mainframe ---- #
+    def ping(self):
+        return True
+
+    def generation(self):
+        return self._generation
+
+    def getState(self):
+        return {"projectPath": self.project_path, "projectName": "bench", "app": 1, "saved": True, "display": False, "generation": self._generation}
+
+    def setDisplay(self, flag):
+        self._modified()
+
+    def setProjectPath(self, path):
+        self.project_path = path
+        self._modified()
+
+    def saveProject(self):
+        self._modified()
+        if not self.project_path:
+            raise RuntimeError("the project has no file name, set its path before saving it")
+
+    def multicall(self, methods, args_list):
+        """Runs the calls in order and stops at the first one which fails, as the server does"""
+        multi = {"results": [], "failed": -1, "error": ""}
+        for i, method in enumerate(methods):
+            try:
+                # multicalls cannot be nested
+                if method.startswith("_") or method == "multicall" or not hasattr(self, method):
+                    raise AttributeError("unknown method " + method)
+                result = getattr(self, method)(*(args_list[i] if i < len(args_list) else []))
+            except Exception as e:
+                multi["failed"], multi["error"] = i, str(e)
+                break
+            multi["results"].append(msgpack.packb(result, use_bin_type=True))
+        return multi
+
+    # ---- foils ---- #
+    def createNACAFoil(self, digits, name):
+        self.foils[name] = geometry.naca(digits)
+        self._modified()
+
+    def foilExists(self, name):
+        return name in self.foils
+
+    def foilList(self):
+        return [{"name": name, "n": len(xy)} for name, xy in self.foils.items()]
+
+    def getFoilCoords(self, name):
+        return self.foils[name].tolist()
+
+    def setFoilCoords(self, name, xy):
+        self.foils[name] = np.asarray(xy, dtype=float)
+        self._modified()
+
+    def getFoilCoordsBin(self, name):
+        return np.ascontiguousarray(self.foils[name], dtype='<f8').tobytes()
+
+    def setFoilCoordsBin(self, name, data):
+        self.foils[name] = np.frombuffer(data, dtype='<f8').reshape(-1, 2)
+        self._modified()
+
+    def updateFoilCoordsBin(self, name, indices, data):
+        xy = self.foils[name].copy()
+        xy[indices] = np.frombuffer(data, dtype='<f8').reshape(-1, 2)
+        self.foils[name] = xy
+        self._modified()
+        return True
+
+    # ---- 2D analyses ---- #
+    def _polar(self, foil_name, sequence):
+        start, end, step = sequence
+        alpha = np.arange(start, end + 0.5*step, step) if step else np.array([start])
+        n = len(self.foils[foil_name])
+        a = np.random.rand(n, n) + n*np.eye(n)
+        for _ in alpha:
+            # one Newton iteration of the viscous solution per point, on a system of the paneling size
+            np.linalg.solve(a, np.ones(n))
+        cl = 0.11*alpha
+        return {"alpha": alpha.tolist(), "Cl": cl.tolist(), "Cd": (0.01 + 0.01*cl*cl).tolist(), "Cm": (-0.05 + 0*alpha).tolist()}
+
+    def analyzeBatch2D(self, polars, analysis_settings, result_list, n_threads):
+        self._modified()
+        with ThreadPoolExecutor(max_workers=n_threads or None) as pool:
+            return list(pool.map(lambda polar: self._polar(polar["foil_name"], analysis_settings["sequence"]), polars))
+
+    # ---- planes and 3D analyses ---- #
+    def addPlane(self, plane):
+        # panels of both sides of the main wing; the panel numbers of the last section are not used
+        sections = plane["wing"]["sections"]
+        self.planes[plane["name"]] = 2*sum(sec["n_x_panels"]*sec["n_y_panels"] for sec in sections[:-1])
+        self._modified()
+
+    def getPlaneData(self, name):
+        return {"n_panels": self.planes[name]}
+
+    def defineAnalysis3D(self, wpolar):
+        self.wpolars[wpolar["name"]] = wpolar["plane_name"]
+        self._modified()
+
+    def analyzeWPolarBin(self, polar_name, plane_name, analysis_settings, result_list):
+        self._modified()
+        n = self.planes[plane_name]
+        start, end, step = analysis_settings["sequence"]
+        alpha = np.arange(start, end + 0.5*step, step) if step else np.array([start])
+        # influence matrix factorized once, then one back substitution per angle of attack, as in the VLM solver
+        q, r = np.linalg.qr(np.random.rand(n, n) + n*np.eye(n))
+        for a in alpha:
+            np.linalg.solve(r, q.T @ np.full(n, np.sin(np.radians(a))))
+        cl = 0.08*alpha
+        return {"alpha": alpha.astype('<f8').tobytes(), "Cl": cl.astype('<f8').tobytes(), "ICd": (0.04*cl*cl).astype('<f8').tobytes()}
+
+class FakeServer:
+    """
+    msgpack-rpc server running the subset of bindings used by xflrpy.bench in a background thread.
+
+    Usage:
+        with FakeServer() as server:
+            xp = xflrClient(port=server.port)
+    """
+    def __init__(self, port = 0) -> None:
+        """
+        Args:
+            port: (int, optional) 0 picks a free port
+        """
+        self.port = port or self._free_port()
+        self._thread = None
+        self._ioloop = None
+        self._server = None
+
+    @staticmethod
+    def _free_port():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        ready = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(asyncio.new_event_loop())
+            self._ioloop = ioloop.IOLoop.current()
+            self._server = rpc.Server(_Bindings(), unpack_encoding='utf-8')
+            self._server.listen(rpc.Address("127.0.0.1", self.port))
+            ready.set()
+            self._server.start()
+            self._server.close()
+
+        self._thread = threading.Thread(target=serve, name="xflrpy-fake-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._ioloop.add_callback(self._ioloop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
@@ -0,0 +1,102 @@
+# ======================= bench/report.py =================== #
+# Runs the suites and compares the reports of two runs
+# Notes:
+# - a report is a json-compatible dict {"meta": {...}, "results": [records]}
+# - records of two reports are matched by benchmark name and parameters
+
+import datetime
+import json
+import platform
+
+import numpy as np
+
+from ..client import xflrClient
+from .fake import FakeServer
+from .suites import SUITES
+
+def _version():
+    try:
+        from importlib.metadata import version
+        return version("xflrpy")
+    except Exception:
+        return "unknown"
+
+def run(xp:xflrClient = None, suites = None, repeat = 5) -> dict:
+    """
+    Runs benchmark suites.
+
+    Args:
+        xp: (xflrClient, optional) client of a running server. None runs against a FakeServer started for the occasion
+        suites: (list of str, optional) names in SUITES. Defaults to all of them
+        repeat: (int, optional) number of timed runs of each benchmark
+
+    Returns:
+        report dict, see save
+    """
+    if xp is None:
+        with FakeServer() as server:
+            report = _run(xflrClient(port=server.port), suites, repeat)
+        report["meta"]["server"] = "fake"
+        return report
+    report = _run(xp, suites, repeat)
+    report["meta"]["server"] = "xflr5"
+    return report
+
+def _run(xp, suites, repeat):
+    meta = {"xflrpy": _version(), "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"), "repeat": repeat}
+    results = []
+    display = xp.state.display
+    xp.setDisplay(False)
+    try:
+        for name in (suites or SUITES):
+            results += SUITES[name](xp, repeat)
+    finally:
+        xp.setDisplay(display)
+    return {"meta": meta, "results": results}
+
+def save(report:dict, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def _key(record):
+    return record["bench"], json.dumps(record["params"], sort_keys=True)
+
+def compare(baseline:dict, current:dict, tolerance = 0.10) -> list:
+    """
+    Matches the records of two reports and flags the benchmarks which got slower.
+
+    Args:
+        baseline, current: (dict) reports, as returned by run or load
+        tolerance: (float, optional) relative increase of the median time above which a benchmark is a regression
+
+    Returns:
+        list of {"bench", "params", "baseline_s", "current_s", "ratio", "regression"}, for the benchmarks present in both reports
+    """
+    previous = {_key(record): record for record in baseline["results"]}
+    rows = []
+    for record in current["results"]:
+        old = previous.get(_key(record))
+        if old is None:
+            continue
+        ratio = record["median_s"]/old["median_s"]
+        rows.append({"bench": record["bench"], "params": record["params"], "baseline_s": old["median_s"], "current_s": record["median_s"],
+                     "ratio": ratio, "regression": ratio > 1.0 + tolerance})
+    return rows
+
+def format_report(report:dict) -> str:
+    lines = ["%-16s %-36s %12s %12s" % ("bench", "params", "median (ms)", "min (ms)")]
+    for record in report["results"]:
+        lines.append("%-16s %-36s %12.4f %12.4f" % (record["bench"], json.dumps(record["params"]), 1e3*record["median_s"], 1e3*record["min_s"]))
+    return "\n".join(lines)
+
+def format_comparison(rows:list) -> str:
+    lines = ["%-16s %-36s %14s %14s %7s" % ("bench", "params", "baseline (ms)", "current (ms)", "ratio")]
+    for row in rows:
+        lines.append("%-16s %-36s %14.4f %14.4f %7.2f%s" % (row["bench"], json.dumps(row["params"]), 1e3*row["baseline_s"], 1e3*row["current_s"],
+                                                           row["ratio"], "  REGRESSION" if row["regression"] else ""))
+    return "\n".join(lines)
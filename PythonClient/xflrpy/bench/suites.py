@@ -0,0 +1,131 @@
+# ======================= bench/suites.py =================== #
+# The benchmarks. Each suite takes a connected xflrClient and the number of repeats, and returns a list of records
+# Notes:
+# - a record is {"bench", "params", "median_s", "min_s", "repeat", "number"}, times are in seconds per call
+# - suites create the objects they need (foil, planes, polars) under names starting with "xflrpy bench"
+
+import statistics
+import time
+from collections import OrderedDict
+
+import msgpack
+import numpy as np
+
+from .. import geometry
+from ..types import (Afoil, Foil, FoilManager, Polar, PolarResult, XDirect, AnalysisSettings2D, enumPolarType, enumSequenceType,
+                     Miarex, Plane, WingSection, WPolar, AnalysisSettings3D, enumAnalysisMethod)
+
+BENCH_FOIL = "xflrpy bench NACA 2412"
+
+def _timed(fn, repeat, number = 1):
+    """Median and minimum over repeat runs of the time per call of fn, after a warm up call"""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start)/number)
+    return {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat, "number": number}
+
+def _record(bench, params, fn, repeat, number = 1):
+    record = {"bench": bench, "params": params}
+    record.update(_timed(fn, repeat, number))
+    return record
+
+def _bench_foil(xp):
+    if not FoilManager(xp.client).foilExists(BENCH_FOIL):
+        Afoil(xp.client).createNACAFoil(2412, BENCH_FOIL)
+    foil = Foil(xp.client)
+    foil.name = BENCH_FOIL
+    return foil
+
+def ping(xp, repeat):
+    """Latency of the smallest call"""
+    return [_record("ping", {}, xp.ping, repeat, number=200)]
+
+def coords(xp, repeat, sizes = (101, 201, 401, 801, 1601, 3201)):
+    """Round trip of foil coordinates against their number, as lists and as binary buffers, and update of 4 nodes"""
+    foil = _bench_foil(xp)
+    records = []
+    for n in sizes:
+        xy = geometry.naca4(2412, (n + 1)//2)
+        xy_list = xy.tolist()
+        params = {"n_points": len(xy)}
+
+        def round_trip_list():
+            foil.coords = xy_list
+            return foil.coords
+
+        def round_trip_bin():
+            foil.coords_array = xy
+            return foil.coords_array
+
+        records.append(_record("coords_list", params, round_trip_list, repeat, number=10))
+        records.append(_record("coords_bin", params, round_trip_bin, repeat, number=10))
+
+        foil.coords_array = xy
+        nodes = np.arange(len(xy)//4, len(xy)//4 + 4)
+        records.append(_record("coords_update", params, lambda: foil.update_coords(nodes, xy[nodes]), repeat, number=10))
+    foil.coords_array = geometry.naca4(2412)
+    return records
+
+def decode(xp, repeat, sizes = (10, 100, 1000, 10000)):
+    """Client side cost of turning a received polar message into a PolarResult, against the number of points, and of decoding polars and planes. Does not use the server"""
+    records = []
+    for n in sizes:
+        columns = {name: np.linspace(0.0, 1.0, n) for name in PolarResult._fields}
+        message = msgpack.packb({name: values.tolist() for name, values in columns.items()})
+        message_bin = msgpack.packb({name: values.astype('<f8').tobytes() for name, values in columns.items()})
+        records.append(_record("decode_msgpack", {"n_points": n}, lambda: PolarResult.from_msgpack(msgpack.unpackb(message)), repeat, number=20))
+        records.append(_record("decode_bin", {"n_points": n}, lambda: PolarResult.from_bin(msgpack.unpackb(message_bin)), repeat, number=20))
+
+    # objects of a polar list and of a plane, already unpacked: the cost of the types alone
+    polars = [Polar(name="xflrpy bench Re%d" % (100000*(i + 1)), foil_name=BENCH_FOIL).to_msgpack() for i in range(100)]
+    polars = msgpack.unpackb(msgpack.packb(polars, default=lambda obj: obj.to_msgpack()))
+    records.append(_record("decode_polars", {"n_polars": len(polars)}, lambda: [Polar.from_msgpack(polar) for polar in polars], repeat, number=20))
+    plane = Plane(name="xflrpy bench plane")
+    for wing in (plane.wing, plane.elevator, plane.fin):
+        wing.sections = [WingSection(y_position=0.1*i) for i in range(5)]
+    plane = msgpack.unpackb(msgpack.packb(plane, default=lambda obj: obj.to_msgpack()))
+    records.append(_record("decode_plane", {"n_sections": 15}, lambda: Plane.from_msgpack(plane), repeat, number=200))
+    return records
+
+def polar2d(xp, repeat, threads = (1, 2, 4, 8), n_polars = 16):
+    """Time of a batch of 2D polars against the number of server threads"""
+    _bench_foil(xp)
+    xdirect = XDirect(xp.client)
+    settings = AnalysisSettings2D(is_sequence=True, sequence_type=enumSequenceType.ALPHA, sequence=(-4.0, 8.0, 1.0), store_opp=False)
+    records = []
+    for n_threads in threads:
+        polars = []
+        for i in range(n_polars):
+            polar = Polar(name="xflrpy bench T%d Re%d" % (n_threads, 100000*(i + 1)), foil_name=BENCH_FOIL)
+            polar.spec.polar_type = enumPolarType.FIXEDSPEEDPOLAR
+            polar.spec.reynolds = 100000.0*(i + 1)
+            polars.append(polar)
+        record = _record("polar2d", {"n_threads": n_threads, "n_polars": n_polars}, lambda: xdirect.analyze_batch(polars, settings, n_threads=n_threads), repeat)
+        record["polars_per_s"] = n_polars/record["median_s"]
+        records.append(record)
+    return records
+
+def sweep3d(xp, repeat, meshes = ((4, 8), (8, 16), (12, 24), (16, 32))):
+    """Time of a VLM alpha sweep against the number of panels of the wing"""
+    _bench_foil(xp)
+    miarex = Miarex(xp.client)
+    settings = AnalysisSettings3D(is_sequence=True, sequence=(0.0, 8.0, 1.0), store_opp=False)
+    records = []
+    for nx, ny in meshes:
+        plane = Plane(name="xflrpy bench %dx%d" % (nx, ny))
+        plane.wing.sections.append(WingSection(chord=0.25, right_foil_name=BENCH_FOIL, left_foil_name=BENCH_FOIL, n_x_panels=nx, n_y_panels=ny))
+        plane.wing.sections.append(WingSection(y_position=1.0, chord=0.15, offset=0.05, right_foil_name=BENCH_FOIL, left_foil_name=BENCH_FOIL, n_x_panels=nx, n_y_panels=ny))
+        miarex.plane_mgr.addPlane(plane)
+        wpolar = WPolar(name="xflrpy bench VLM", plane_name=plane.name)
+        wpolar.spec.polar_type = enumPolarType.FIXEDSPEEDPOLAR
+        wpolar.spec.analysis_method = enumAnalysisMethod.VLMMETHOD
+        wpolar.spec.is_viscous = False
+        miarex.define_analysis(wpolar)
+        records.append(_record("sweep3d", {"n_panels": 2*nx*ny}, lambda: miarex.analyze(wpolar.name, plane.name, settings, as_numpy=True), repeat))
+    return records
+
+SUITES = OrderedDict([("ping", ping), ("coords", coords), ("decode", decode), ("polar2d", polar2d), ("sweep3d", sweep3d)])
@@ -4,24 +4,27 @@ from .types import *
 from .utils import *
 
 class xflrClient:
-    def __init__(self, ip = '127.0.0.1', port = 8080, connect_timeout = 100):
-        self._client = rpc.Client(rpc.Address(ip, port), timeout=connect_timeout, pack_encoding='utf-8', unpack_encoding='utf-8')
+    def __init__(self, ip = '127.0.0.1', port = 8080, connect_timeout = 100, n_workers = 1, cache_age = 1.0):
+        # n_workers: number of background connections used by the *_async methods
+        # cache_age: seconds during which the cached state, foil and polar lists are used without checking the server generation. None disables the cache
+        self._client = XflrRpcClient(rpc.Address(ip, port), n_workers=n_workers, cache_age=cache_age, timeout=connect_timeout, pack_encoding='utf-8', unpack_encoding='utf-8')
         self.poll_timeout = 5 # seconds
         try:
             if self.ping():
                 print(f"Xflr client connected at port: {port}")
         except rpc.error.TransportError:
-            print("Could not connect to the XFLR5 server. Is the application gui running?\n")
+            print("Could not connect to the XFLR5 server. Is the application gui or xflrpy-server running?\n")
 
     @property
     def state(self):
         """
-        Returns a State object for the mainframe
+        Returns a State object for the mainframe.
+        It is cached until the server reports a modification, see cache_age
 
         Returns:
             State()
         """
-        state_raw = self._client.call("getState")
+        state_raw = self._client.call_cached("getState")
         state_raw['app'] = enumApp(state_raw['app'])
         return State.from_msgpack(state_raw)
     
@@ -29,13 +32,65 @@ class xflrClient:
     def client(self):
         return self._client
 
+    def call_async(self, method, *args):
+        """
+        Sends any rpc call in the background.
+
+        Returns:
+            RpcFuture with the raw reply. Call result() or await it.
+        """
+        return self._client.call_future(method, *args)
+
+    def batch(self):
+        """
+        Sends the calls made in a with block as a single message, saving one round trip per call.
+        Only the calls which do not use their reply can be batched, e.g. setters and analysis definitions.
+        The calls after a failed one are not run, and the failure is raised when the block exits.
+
+        Usage:
+            with xp.batch():
+                xdirect.polar_mgr.setCurPolar(...)
+                xdirect.define_analysis(...)
+        """
+        return self._client.batch()
+
+    @property
+    def stats(self) -> CallStats:
+        """Wall time and payload size of the calls made by this client, see enableStats"""
+        return self._client.stats
+
+    def enableStats(self, flag = True, server = True):
+        """
+        Starts or stops recording the calls made by this client, and the timings of the server bindings.
+
+        Args:
+            flag: (bool) False stops recording. The figures recorded so far are kept
+            server: (bool, optional) also switch the timings of the server
+        """
+        self._client.stats.enabled = flag
+        if server:
+            self._client.call("setStatsEnabled", flag)
+
+    def getServerStats(self) -> list:
+        """
+        Timings of the server bindings recorded since they were enabled.
+
+        Returns:
+            list of MethodStats
+        """
+        return [MethodStats.from_msgpack(raw) for raw in self._client.call("getStats")]
+
+    def clearStats(self):
+        self._client.stats.clear()
+        self._client.call("clearStats")
+
     def ping(self):
         """
         Returns true is the server is connected to the client and data can be exchanged.
         """
         return self._client.call("ping")
 
-    def loadProject(self, files, save_current = True):
+    def loadProject(self, files, save_current = True, include = PROJECT_RECORDS, foils = None, opps = True):
         """
         Returns pointer to application.
 
@@ -44,6 +99,13 @@ class xflrClient:
         Args:
             files: (str) Absolute project path to .xfl file / (list) List of .dat airfoil files to open 
             save_current (bool, optional): Flag to save the current project
+            include (list, optional): The records of a .xfl file to load, among "foils", "polars" and "planes".
+                                      The polars and operating points are only loaded for the foils which are loaded.
+                                      A project loaded partially cannot be saved back to its .xfl file
+            foils (list, optional): Names of the foils to load, all of them if None
+            opps (bool, optional): If False, the foil and plane operating points stay in the file. The server reads those of a polar
+                                   the first time they are accessed (getOpPoint, getOpPoints, planeOppList, getPlaneOppArrays),
+                                   and all of them before the project is saved
 
         Returns:
             Currently open pointer to an application object.
@@ -55,9 +117,19 @@ class xflrClient:
         if files is None:
             print("{1}: Please provide valid file(s). Accepted file formats: .xfl, .dat, .wpa,  ".format(files))
         else:
-            self._client.call('loadProject', files)
+            options = ProjectLoadOptions(include, foils or (), opps)
+            if options.include == list(PROJECT_RECORDS) and not options.foils and options.opps:
+                self._client.call('loadProject', files)
+            else:
+                self._client.call('loadProjectPartial', files, options.to_msgpack())
             return self.getApp()
 
+    def deferredOppCount(self) -> int:
+        """
+        Returns the number of foil and plane operating points which a partial load has left in the project file, see loadProject
+        """
+        return self._client.call("deferredOppCount")
+
     def newProject(self, projectPath = "", save_current = True):
         """
         Args:
@@ -83,6 +155,9 @@ class xflrClient:
         Args:
             projectPath: (str, optional) Absolute project path to .xfl file
                          if empty, the current project will be saved
+                         The server raises an error if the project was loaded partially from this file,
+                         since the records which were skipped would be lost
+                         or if the project file could not be written
         Returns:
             None
         """
@@ -131,6 +206,20 @@ class xflrClient:
             None
         """
         self._client.call("setApp", int(app))
+
+    def setDisplay(self, flag:bool)->None:
+        """
+        Switch the gui updates on or off. The current value is given by state.display.
+        With the display off, analyses run without their dialogs and the views are not redrawn.
+        The views are refreshed once the display is switched back on.
+
+        Args:
+            flag: (bool) False for headless runs
+
+        Returns:
+            None
+        """
+        self._client.call("setDisplay", flag)
             
     def close(self):
         """
@@ -0,0 +1,188 @@
+# ======================= geometry.py =================== #
+# Foil geometry computed locally with numpy, without calling the server
+# Notes:
+# - coordinates are (n, 2) arrays or batches of candidates as (batch, n, 2) arrays; results keep the same rank
+# - points run from the trailing edge over the upper surface to the leading edge, and back along the lower surface, as in XFoil
+# - the NACA generators and the leading and trailing edge definitions follow the server (XFoil naca4/naca5, Foil::initFoil)
+
+import numpy as np
+
+_NACA5_MEANLINES = {210: (0.0580, 361.4), 220: (0.1260, 51.64), 230: (0.2025, 15.957), 240: (0.2900, 6.643), 250: (0.3910, 3.230)}
+
+def _as_batch(xy):
+    xy = np.asarray(xy, dtype=float)
+    if xy.ndim == 2:
+        return xy[None], True
+    return xy, False
+
+def _unbatch(a, single):
+    return a[0] if single else a
+
+def _te_bunched_x(nside):
+    """Chordwise stations of the NACA generators, bunched at the trailing edge"""
+    an = 1.5
+    frac = np.arange(nside)/(nside - 1.0)
+    return 1.0 - (an + 1.0)*frac*(1.0 - frac)**an - (1.0 - frac)**(an + 1.0)
+
+def _wrap(xx, yc, yt):
+    """Assembles the upper surface from the trailing edge and the lower surface back to the trailing edge"""
+    x = np.concatenate([np.broadcast_to(xx[::-1], yc.shape[:-1] + xx.shape), np.broadcast_to(xx[1:], yc.shape[:-1] + (xx.size - 1,))], axis=-1)
+    y = np.concatenate([(yc + yt)[..., ::-1], (yc - yt)[..., 1:]], axis=-1)
+    return np.stack([x, y], axis=-1)
+
+def naca4(digits, nside = 100):
+    """
+    4-digit NACA foils.
+
+    Args:
+        digits: (int or array of int) e.g. 2412
+        nside: (int) number of points on each surface
+
+    Returns:
+        (2*nside-1, 2) array, or (batch, 2*nside-1, 2) if digits is an array
+    """
+    digits = np.asarray(digits)
+    m = (digits//1000)/100.0
+    p = (digits//100 % 10)/10.0
+    t = (digits % 100)/100.0
+    xx = _te_bunched_x(nside)
+    m, p, t = m[..., None], p[..., None], t[..., None]
+    yt = (1.4845*np.sqrt(xx) - 0.6300*xx - 1.7580*xx**2 + 1.4215*xx**3 - 0.5075*xx**4)*t
+    with np.errstate(divide='ignore', invalid='ignore'):
+        yc = np.where(xx < p, m/p/p*(2.0*p*xx - xx**2), m/(1.0 - p)/(1.0 - p)*(1.0 - 2.0*p + 2.0*p*xx - xx**2))
+    return _wrap(xx, yc, yt)
+
+def naca5(digits, nside = 100):
+    """
+    5-digit NACA foils. The first three digits must be 210, 220, 230, 240 or 250.
+
+    Args:
+        digits: (int or array of int) e.g. 23012
+        nside: (int) number of points on each surface
+
+    Returns:
+        (2*nside-1, 2) array, or (batch, 2*nside-1, 2) if digits is an array
+    """
+    digits = np.asarray(digits)
+    meanline = digits//100
+    if not np.isin(meanline, list(_NACA5_MEANLINES)).all():
+        raise ValueError("Illegal 5-digit designation: the first three digits must be 210, 220, ... 250")
+    m = np.vectorize(lambda k: _NACA5_MEANLINES[k][0], otypes=[float])(meanline)[..., None]
+    c = np.vectorize(lambda k: _NACA5_MEANLINES[k][1], otypes=[float])(meanline)[..., None]
+    t = (digits % 100)[..., None]/100.0
+    xx = _te_bunched_x(nside)
+    yt = (0.29690*np.sqrt(xx) - 0.12600*xx - 0.35160*xx**2 + 0.28430*xx**3 - 0.10150*xx**4)*t/0.20
+    yc = np.where(xx < m, (c/6.0)*(xx**3 - 3.0*m*xx**2 + m*m*(3.0 - m)*xx), (c/6.0)*m**3*(1.0 - xx))
+    return _wrap(xx, yc, yt)
+
+def naca(digits, nside = 100):
+    """4 or 5-digit NACA foil, chosen like the server does: 4 digits up to 9999, 5 digits up to 25099"""
+    if np.all(np.asarray(digits) <= 9999):
+        return naca4(digits, nside)
+    if np.all(np.asarray(digits) <= 25099):
+        return naca5(digits, nside)
+    raise ValueError("Illegal NACA number")
+
+def normalize(xy):
+    """
+    Scales the chord to 1, with the leading edge at x=0 and the first point at y=0, like Foil.normalize.
+
+    Returns:
+        (normalized coordinates, former chord lengths)
+    """
+    xy, single = _as_batch(xy)
+    xmin = xy[..., 0].min(axis=1)
+    length = xy[..., 0].max(axis=1) - xmin
+    out = np.empty_like(xy)
+    out[..., 0] = (xy[..., 0] - xmin[:, None])/length[:, None]
+    out[..., 1] = xy[..., 1]/length[:, None]
+    out[..., 1] -= out[:, :1, 1]
+    return _unbatch(out, single), _unbatch(length, single)
+
+def leading_edge_index(xy):
+    """Index of the leading edge, where the x coordinate stops decreasing"""
+    xy, single = _as_batch(xy)
+    rising = np.diff(xy[..., 0], axis=1) >= 0.0
+    ile = np.where(rising.any(axis=1), rising.argmax(axis=1), xy.shape[1] - 1)
+    return _unbatch(ile, single)
+
+def derotate(xy):
+    """
+    Moves the leading edge to the origin and aligns the chord with the x axis, like Foil.derotate.
+
+    Returns:
+        (derotated coordinates, angle of the former chord line in degrees)
+    """
+    xy, single = _as_batch(xy)
+    batch = np.arange(len(xy))
+    le = xy[batch, leading_edge_index(xy)]
+    te = 0.5*(xy[:, 0] + xy[:, -1])
+    angle = np.arctan2(te[:, 1] - le[:, 1], te[:, 0] - le[:, 0])
+    cosa, sina = np.cos(-angle)[:, None], np.sin(-angle)[:, None]
+    x, y = xy[..., 0] - le[:, :1], xy[..., 1] - le[:, 1:]
+    out = np.stack([x*cosa - y*sina, x*sina + y*cosa], axis=-1)
+    return _unbatch(out, single), _unbatch(np.degrees(angle), single)
+
+def _interp_rows(xp, fp, x):
+    """
+    Row by row linear interpolation, clamped at the ends like np.interp.
+    xp (batch, n) must be non-decreasing along each row. The rows are shifted apart so that a single searchsorted does the whole batch
+    """
+    batch, n = xp.shape
+    lo = min(xp.min(), x.min())
+    width = max(xp.max(), x.max()) - lo + 1.0
+    shift = (np.arange(batch)*width)[:, None]
+    flat_xp = (xp - lo + shift).ravel()
+    flat_fp = fp.ravel()
+    qx = x - lo + shift
+    row_start = (np.arange(batch)*n)[:, None]
+    j = np.clip(np.searchsorted(flat_xp, qx, side='right') - 1, row_start, row_start + n - 2)
+    x0, x1 = flat_xp[j], flat_xp[j + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(np.where(x1 > x0, (qx - x0)/(x1 - x0), 0.0), 0.0, 1.0)
+    return flat_fp[j] + t*(flat_fp[j + 1] - flat_fp[j])
+
+def _surfaces(xy):
+    """Upper and lower surfaces as (batch, n, 2) arrays running from the leading edge to the trailing edge, padded with their last point"""
+    n = xy.shape[1]
+    ile = leading_edge_index(xy)[:, None]
+    k = np.arange(n)[None]
+    upper = np.take_along_axis(xy, np.maximum(ile - k, 0)[..., None], axis=1)
+    lower = np.take_along_axis(xy, np.minimum(ile + k, n - 1)[..., None], axis=1)
+    return upper, lower
+
+def thickness_camber(xy, n_stations = 1000):
+    """
+    Maximum thickness and camber, and their chordwise positions, computed on the mid line like the server.
+
+    Returns:
+        (thickness, x_thickness, camber, x_camber); floats, or arrays of length batch
+    """
+    xy, single = _as_batch(xy)
+    upper, lower = _surfaces(xy)
+    xu, xl = np.maximum.accumulate(upper[..., 0], axis=1), np.maximum.accumulate(lower[..., 0], axis=1)
+    x = upper[:, :1, 0] + (upper[:, -1:, 0] - upper[:, :1, 0])*np.linspace(0.0, 1.0, n_stations)[None]
+    yu = _interp_rows(xu, upper[..., 1], x)
+    yl = _interp_rows(xl, lower[..., 1], x)
+    batch = np.arange(len(xy))
+    it = np.abs(yu - yl).argmax(axis=1)
+    mid = 0.5*(yu + yl)
+    ic = np.abs(mid).argmax(axis=1)
+    result = (np.abs(yu - yl)[batch, it], x[batch, it], mid[batch, ic], x[batch, ic])
+    return tuple(_unbatch(r, single) for r in result)
+
+def repanel(xy, nside = 100):
+    """
+    Redistributes the points along the contour with a cosine spacing on each surface, refined at both edges.
+    This is a geometric repaneling; the server's XFoil paneling also refines with the curvature.
+
+    Returns:
+        (2*nside-1, 2) array, or (batch, 2*nside-1, 2)
+    """
+    xy, single = _as_batch(xy)
+    s = np.concatenate([np.zeros((len(xy), 1)), np.cumsum(np.hypot(*np.diff(xy, axis=1).transpose(2, 0, 1)), axis=1)], axis=1)
+    s_le = np.take_along_axis(s, leading_edge_index(xy)[:, None], axis=1)
+    spacing = 0.5*(1.0 - np.cos(np.pi*np.arange(nside)/(nside - 1.0)))[None]
+    s_new = np.concatenate([s_le*spacing, s_le + (s[:, -1:] - s_le)*spacing[:, 1:]], axis=1)
+    out = np.stack([_interp_rows(s, xy[..., 0], s_new), _interp_rows(s, xy[..., 1], s_new)], axis=-1)
+    return _unbatch(out, single)
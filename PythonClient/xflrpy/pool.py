@@ -0,0 +1,152 @@
+# ======================= pool.py =================== #
+# Distributes jobs over several xflr5 servers running on consecutive ports
+# Notes:
+# - a job is any callable taking an xflrClient as its first argument
+# - servers are either launched by the pool (executable given) or already running
+
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+
+import msgpackrpc as rpc
+
+from .client import xflrClient
+
+class XflrPool:
+    """
+    Pool of xflr5 servers fed from a single work queue.
+    Each server is driven by its own thread, so jobs run in parallel across servers.
+    If a server dies while running a job, it is restarted (when the pool launched it) and the job is retried.
+    """
+    def __init__(self, n_workers = 2, base_port = 8080, ip = '127.0.0.1', executable = None, args = [],
+                 connect_timeout = 100, start_timeout = 30, max_retries = 1) -> None:
+        """
+        Args:
+            n_workers: (int) number of servers. They use ports base_port ... base_port + n_workers - 1
+            base_port: (int) port of the first server
+            ip: (str) address of the servers
+            executable: (str, optional) path to the xflr5 binary. If None, attaches to running servers
+            args: (list, optional) extra command line arguments for launched servers
+            connect_timeout: (int) timeout of each rpc call in seconds
+            start_timeout: (float) seconds to wait for a (re)started server to answer a ping
+            max_retries: (int) number of times a job is retried after its server died
+        """
+        self.ip = ip
+        self.ports = [base_port + i for i in range(n_workers)]
+        self.executable = executable
+        self.args = list(args)
+        self.connect_timeout = connect_timeout
+        self.start_timeout = start_timeout
+        self.max_retries = max_retries
+
+        self._queue = queue.Queue()
+        self._processes = [None]*n_workers
+        self._threads = []
+        for i in range(n_workers):
+            thread = threading.Thread(target=self._work, args=(i,), name=f"xflrpool-{self.ports[i]}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, job, *args, **kwargs) -> Future:
+        """
+        Queues job(client, *args, **kwargs) for the next free server.
+
+        Returns:
+            concurrent.futures.Future with the return value of the job
+        """
+        future = Future()
+        self._queue.put((future, job, args, kwargs, 0))
+        return future
+
+    def map(self, job, iterable) -> list:
+        """Runs job(client, item) for every item and returns the results in order"""
+        futures = [self.submit(job, item) for item in iterable]
+        return [future.result() for future in futures]
+
+    def close(self, terminate = True):
+        """Waits for the queued jobs, stops the worker threads and terminates launched servers"""
+        # the jobs retried after a server failure are queued again, so wait for every job before queuing the sentinels
+        self._queue.join()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if terminate:
+            for i in range(len(self._processes)):
+                self._stop(i)
+
+    def _launch(self, i):
+        if self.executable is None:
+            return
+        self._stop(i)
+        self._processes[i] = subprocess.Popen([self.executable, "--port", str(self.ports[i])] + self.args)
+
+    def _stop(self, i):
+        process = self._processes[i]
+        if process is not None and process.poll() is None:
+            process.terminate()
+            process.wait()
+        self._processes[i] = None
+
+    def _connect(self, i) -> xflrClient:
+        """Returns a client once the server answers, launching it if needed"""
+        if self.executable is not None and (self._processes[i] is None or self._processes[i].poll() is not None):
+            self._launch(i)
+        deadline = time.time() + self.start_timeout
+        while True:
+            client = xflrClient(self.ip, self.ports[i], self.connect_timeout)
+            try:
+                if client.ping():
+                    return client
+            except rpc.error.RPCError:
+                pass
+            client.client.close()
+            if time.time() > deadline:
+                raise RuntimeError(f"The XFLR5 server at port {self.ports[i]} did not start")
+            time.sleep(0.5)
+
+    def _work(self, i):
+        client = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            try:
+                client = self._run(i, client, *item)
+            finally:
+                # a retried job is queued again before this one is marked done, see close()
+                self._queue.task_done()
+        if client is not None:
+            client.client.close()
+
+    def _run(self, i, client, future, job, args, kwargs, retries):
+        """Runs a job on the server i, and returns the client to use for the next one"""
+        if retries == 0 and not future.set_running_or_notify_cancel():
+            return client
+        try:
+            if client is None:
+                client = self._connect(i)
+            future.set_result(job(client, *args, **kwargs))
+        except (rpc.error.TransportError, rpc.error.TimeoutError) as e:
+            # the server is dead or unreachable: restart it and give the job to any free server
+            if client is not None:
+                client.client.close()
+            client = None
+            self._stop(i)
+            if retries < self.max_retries:
+                self._queue.put((future, job, args, kwargs, retries + 1))
+            else:
+                future.set_exception(e)
+        except Exception as e:
+            future.set_exception(e)
+        return client
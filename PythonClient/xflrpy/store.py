@@ -0,0 +1,161 @@
+# ======================= store.py =================== #
+# Persistent on-disk database of 2D polars
+# Notes:
+# - one sqlite file holds the polar specifications (indexed by foil, Re and Mach) and the result columns as float64 blobs
+# - attach a store to XDirect (XDirect.setStore) to save every analysis automatically
+
+import sqlite3
+import time
+
+import numpy as np
+
+from .types import Polar, PolarSpec, PolarResult
+
+class PolarStore:
+    """
+    On-disk polar database.
+    Polars are looked up by foil name and by ranges of Reynolds and Mach numbers, without a running server.
+    """
+    _SPEC_FIELDS = ("polar_type", "Re_type", "ma_type", "aoa", "mach", "ncrit", "xtop", "xbot", "reynolds")
+
+    def __init__(self, path = "polars.db") -> None:
+        """
+        Args:
+            path: (str) path of the sqlite file. It is created if needed. ":memory:" keeps the store in memory
+        """
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS polars(
+                id INTEGER PRIMARY KEY,
+                name TEXT, foil_name TEXT,
+                polar_type INTEGER, Re_type INTEGER, ma_type INTEGER,
+                aoa REAL, mach REAL, ncrit REAL, xtop REAL, xbot REAL, reynolds REAL,
+                created REAL);
+            CREATE INDEX IF NOT EXISTS polars_foil_re_mach ON polars(foil_name, reynolds, mach);
+            CREATE TABLE IF NOT EXISTS columns(
+                polar_id INTEGER REFERENCES polars(id) ON DELETE CASCADE,
+                name TEXT,
+                data BLOB,
+                PRIMARY KEY(polar_id, name));
+            PRAGMA foreign_keys = ON;
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM polars").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def add(self, polar:Polar, result:PolarResult = None) -> int:
+        """
+        Saves a polar and its non-empty result columns.
+
+        Args:
+            polar: (Polar) name, foil name and specification of the analysis
+            result: (PolarResult, optional) results to save. Defaults to polar.result
+
+        Returns:
+            id of the stored polar
+        """
+        result = polar.result if result is None else result
+        spec = [float(getattr(polar.spec, field)) for field in self._SPEC_FIELDS]
+        with self._db:
+            cursor = self._db.execute("INSERT INTO polars(name, foil_name, " + ", ".join(self._SPEC_FIELDS) + ", created) VALUES (?, ?, " + "?, "*len(spec) + "?)",
+                                      [polar.name, polar.foil_name] + spec + [time.time()])
+            polar_id = cursor.lastrowid
+            self._db.executemany("INSERT INTO columns VALUES (?, ?, ?)",
+                                 [(polar_id, name, np.ascontiguousarray(values, dtype='<f8').tobytes()) for name, values in result.to_msgpack().items() if len(values)])
+        return polar_id
+
+    def query(self, foil_name = None, re_min = None, re_max = None, mach = None, ncrit = None, polar_type = None) -> list:
+        """
+        Returns the stored polars matching every given criterion, sorted by foil name and Reynolds number.
+
+        Args:
+            foil_name: (str, optional) exact foil name
+            re_min, re_max: (float, optional) inclusive bounds of the Reynolds number
+            mach: (float, optional) Mach number
+            ncrit: (float, optional) transition criterion
+            polar_type: (enumPolarType, optional)
+
+        Returns:
+            list of Polar. Result columns are numpy arrays
+        """
+        where, params = self._where(foil_name, re_min, re_max, mach, ncrit, polar_type)
+        rows = self._db.execute("SELECT id, name, foil_name, " + ", ".join(self._SPEC_FIELDS) + " FROM polars" + where + " ORDER BY foil_name, reynolds, id", params).fetchall()
+        return [self._load(row) for row in rows]
+
+    def foils(self) -> list:
+        """Names of all the foils which have stored polars"""
+        return [row[0] for row in self._db.execute("SELECT DISTINCT foil_name FROM polars ORDER BY foil_name")]
+
+    def delete(self, foil_name = None, re_min = None, re_max = None):
+        """Deletes the polars matching the criteria (see query)"""
+        where, params = self._where(foil_name, re_min, re_max)
+        ids = [row[0] for row in self._db.execute("SELECT id FROM polars" + where, params)]
+        with self._db:
+            self._db.executemany("DELETE FROM columns WHERE polar_id = ?", [(i,) for i in ids])
+            self._db.executemany("DELETE FROM polars WHERE id = ?", [(i,) for i in ids])
+
+    def interpolate(self, foil_name, reynolds, alpha, column = "Cl", mach = None, ncrit = None):
+        """
+        Interpolates a result column at the given angles of attack, linearly in alpha and then in Reynolds number.
+        The two stored polars which bracket reynolds are used. Outside the stored range, the closest polar is used.
+
+        Args:
+            foil_name: (str)
+            reynolds: (float)
+            alpha: (float or array) angles of attack in degrees
+            column: (str, optional) name of the PolarResult column, e.g. "Cl", "Cd", "Cm"
+            mach, ncrit: (float, optional) restrict the polars used
+
+        Returns:
+            float or numpy array, nan outside the alpha range of the polars
+        """
+        polars = [p for p in self.query(foil_name, mach=mach, ncrit=ncrit) if len(getattr(p.result, column, [])) and len(getattr(p.result, "alpha", []))]
+        if not polars:
+            raise KeyError(f"No stored polar of {foil_name} with alpha and {column} columns")
+
+        def at_alpha(polar):
+            order = np.argsort(polar.result.alpha)
+            return np.interp(alpha, polar.result.alpha[order], getattr(polar.result, column)[order], left=np.nan, right=np.nan)
+
+        re = np.array([p.spec.reynolds for p in polars])
+        upper = int(np.searchsorted(re, reynolds))
+        if upper == 0:
+            return at_alpha(polars[0])
+        if upper == len(polars):
+            return at_alpha(polars[-1])
+        lower = upper - 1
+        if re[upper] == re[lower]:
+            return at_alpha(polars[upper])
+        t = (reynolds - re[lower])/(re[upper] - re[lower])
+        return (1.0 - t)*at_alpha(polars[lower]) + t*at_alpha(polars[upper])
+
+    @staticmethod
+    def _where(foil_name = None, re_min = None, re_max = None, mach = None, ncrit = None, polar_type = None):
+        """WHERE clause and parameters of the criteria of query"""
+        clauses, params = [], []
+        for clause, value in (("foil_name = ?", foil_name), ("reynolds >= ?", re_min), ("reynolds <= ?", re_max),
+                              ("ABS(mach - ?) < 1e-9", mach), ("ABS(ncrit - ?) < 1e-9", ncrit), ("polar_type = ?", polar_type)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return ((" WHERE " + " AND ".join(clauses)) if clauses else ""), params
+
+    def _load(self, row) -> Polar:
+        polar_id, name, foil_name = row[:3]
+        polar = Polar(name, foil_name)
+        polar.spec = PolarSpec()
+        for field, value in zip(self._SPEC_FIELDS, row[3:]):
+            setattr(polar.spec, field, value)
+        columns = self._db.execute("SELECT name, data FROM columns WHERE polar_id = ?", (polar_id,))
+        polar.result = PolarResult.from_bin({column: data for column, data in columns})
+        return polar
@@ -2,26 +2,109 @@
 # All data structures required to work with xflr5
 # Notes:
 # - if a class has an __init__ method you can create your own at runtime or get an existing one as well. Otherwise it's just a getter.
+# - the message classes use __slots__: their instances only take the declared fields. Subclass one without declaring fields to attach your own attributes
+# - the messages which the server sends often have their own from_msgpack, tests/test_types.py checks them against the server adapters
 
 import enum
+import time
 
-class MsgpackMixin:
+import numpy as np
+
+from .utils import LRUCache
+
+_MISSING = object()
+_new = object.__new__
+
+_EMPTY = np.empty(0)
+_EMPTY.flags.writeable = False
+
+def _clone(value):
+    """Copy of a default value which an instance can modify without changing the class defaults"""
+    if isinstance(value, MsgpackMixin):
+        obj = _new(type(value))
+        for name in value._fields:
+            setattr(obj, name, _clone(getattr(value, name)))
+        return obj
+    if isinstance(value, (list, dict)):
+        return value.copy()
+    return value
+
+def _is_method(value):
+    return isinstance(value, (classmethod, staticmethod, property)) or (callable(value) and not isinstance(value, type))
+
+class _MessageType(type):
+    """
+    Metaclass of the messages. The public class attributes of a message class are its fields:
+    they are turned into __slots__ and their values are kept in _defaults.
+    A class which declares no field, e.g. XDirect, keeps its __dict__.
+    """
+    def __new__(mcs, name, bases, namespace):
+        inherited = {}
+        for base in reversed(bases):
+            inherited.update(getattr(base, "_defaults", {}))
+        defaults = {k: v for k, v in namespace.items() if not k.startswith("_") and not _is_method(v)}
+        if defaults:
+            for k in defaults:
+                del namespace[k]
+            namespace["__slots__"] = tuple(k for k in defaults if k not in inherited)
+        namespace["_defaults"] = dict(inherited, **defaults)
+        namespace["_fields"] = tuple(namespace["_defaults"])
+        return super().__new__(mcs, name, bases, namespace)
+
+class MsgpackMixin(metaclass=_MessageType):
+    __slots__ = ("_client",)
+
+    def __new__(cls, *args, **kwargs):
+        # the instances start with the class defaults, which __init__ may then change
+        obj = _new(cls)
+        for name, default in cls._defaults.items():
+            setattr(obj, name, _clone(default))
+        return obj
     def __repr__(self):
-        from pprint import pformat
-        return "<" + type(self).__name__ + "> " + pformat(vars(self), indent=4, width=1)
+        return "<" + type(self).__name__ + "> " + repr(self.to_msgpack())
     def to_msgpack(self, *args, **kwargs):
-        return self.__dict__
+        return {name: getattr(self, name) for name in self._fields}
     @classmethod
     def from_msgpack(cls, encoded, client = None):
+        """
+        Builds an instance from a decoded message, without calling __init__. Only the fields of the class are read,
+        the missing ones get the class defaults. Nested messages are decoded by the class of the default value of their field.
+        The messages which the server sends often have their own decoding function.
+        """
+        obj = _new(cls)
+        get = encoded.get
+        for name, default in cls._defaults.items():
+            value = get(name, _MISSING)
+            if value is _MISSING:
+                value = _clone(default)
+            elif value.__class__ is dict and isinstance(default, MsgpackMixin):
+                value = default.from_msgpack(value)
+            setattr(obj, name, value)
         if client is not None:
-            obj = cls(client)
-        else:
-            obj=cls()
-        # obj.__dict__ = {k.decode('utf-8'): (v.__class__.from_msgpack(v.__class__, v) if hasattr(v, "__dict__") else v) for k, v in encoded.items()}
-        obj.__dict__.update({ k : (v if not isinstance(v, dict) else getattr(getattr(obj, k).__class__, "from_msgpack")(v)) for k, v in encoded.items()})
-        #return cls(**msgpack.unpack(encoded))
+            obj._client = client
+        return obj
+
+class ColumnsMixin:
+    """For results which the server can send as columns of packed float64 (little endian)"""
+    __slots__ = ()
+    _SERVER_NAMES = {} # columns which the server names differently
+
+    @classmethod
+    def from_bin(cls, encoded):
+        """Wraps every blob in a read-only numpy array without copying. The columns missing from the message are empty"""
+        obj = _new(cls)
+        get = encoded.get
+        names = cls._SERVER_NAMES
+        for name in cls._fields:
+            data = get(names.get(name, name))
+            setattr(obj, name, _EMPTY if data is None else np.frombuffer(data, dtype='<f8'))
         return obj
 
+    def to_records(self):
+        """Returns the columns which hold data as a numpy structured (record) array"""
+        columns = {k : np.asarray(v, dtype='<f8') for k, v in self.to_msgpack().items() if len(v)}
+        return np.rec.fromarrays(list(columns.values()), names=list(columns.keys()))
+
 # ============= Miscellaneous =============== # 
 class QColor(MsgpackMixin):
 # will be a list not dict  
@@ -85,6 +168,19 @@ class Foil(MsgpackMixin):
     def __init__(self, client) -> None:
         self._client=client
 
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.name = get("name", "")
+        obj.camber = get("camber", 0.0)
+        obj.camber_x = get("camber_x", 0.0)
+        obj.thickness = get("thickness", 0.0)
+        obj.thickness_x = get("thickness_x", 0.0)
+        obj.n = get("n", 0)
+        obj._client = client
+        return obj
+
     @property
     def coords(self) -> list:
         return self._client.call("getFoilCoords", self.name)
@@ -93,6 +189,25 @@ class Foil(MsgpackMixin):
     def coords(self, xy:list):
         self._client.call("setFoilCoords", self.name, xy)
 
+    @property
+    def coords_array(self) -> np.ndarray:
+        """Coordinates as a read-only (n,2) float64 array. Sent as a single binary buffer"""
+        return np.frombuffer(self._client.call("getFoilCoordsBin", self.name), dtype='<f8').reshape(-1, 2)
+
+    @coords_array.setter
+    def coords_array(self, xy:np.ndarray):
+        self._client.call("setFoilCoordsBin", self.name, np.ascontiguousarray(xy, dtype='<f8').tobytes())
+
+    def update_coords(self, indices, xy) -> bool:
+        """Moves the nodes at indices to the (len(indices),2) positions xy. Only these nodes are sent, and the mid line, thickness
+        and camber are updated around them. Returns False if the server had to rebuild the whole geometry, e.g. when the leading
+        or trailing edge moved. The view refresh does not wait and is merged with the following ones"""
+        indices = [int(i) for i in np.ravel(indices)]
+        xy = np.ascontiguousarray(xy, dtype='<f8').reshape(-1, 2)
+        if len(xy) != len(indices):
+            raise ValueError("update_coords needs one (x,y) position per index, got %d indices and %d positions" % (len(indices), len(xy)))
+        return self._client.call("updateFoilCoordsBin", self.name, indices, xy.tobytes())
+
     def setGeom(self, camber = 0., camber_x = 0., thickness=0., thickness_x=0.):
         # set on python side
         if camber != 0.:
@@ -148,7 +263,7 @@ class FoilManager:
         return self._client.call("foilExists", name)
     
     def foilDict(self) -> dict:
-        foil_list_raw = self._client.call("foilList") 
+        foil_list_raw = self._client.call_cached("foilList")
         return {item["name"]:Foil.from_msgpack(item, self._client) for item in foil_list_raw}
     
     def loadFoils(self, paths):
@@ -242,8 +357,9 @@ class AnalysisSettings2D(MsgpackMixin):
     store_opp = True
     viscous = True
     keep_open_on_error = False     
+    warm_start = False # start each polar of a foil from the converged boundary layer of a previous one. See XDirect.analyze_batch
 
-    def __init__(self, sequence_type = enumSequenceType.ALPHA, sequence = (0,0,0), is_sequence = False, init_BL = True, store_opp = True, viscous = True, keep_open_on_error = False) -> None:
+    def __init__(self, sequence_type = enumSequenceType.ALPHA, sequence = (0,0,0), is_sequence = False, init_BL = True, store_opp = True, viscous = True, keep_open_on_error = False, warm_start = False) -> None:
         self.sequence_type = sequence_type
         self.sequence = sequence
         self.is_sequence = is_sequence
@@ -251,6 +367,112 @@ class AnalysisSettings2D(MsgpackMixin):
         self.store_opp = store_opp
         self.viscous = viscous
         self.keep_open_on_error = keep_open_on_error
+        self.warm_start = warm_start
+
+class OptimObjective(MsgpackMixin):
+    """Target value of a coefficient of the optimized foil. name is one of OPTIM_OBJECTIVES"""
+    name = "Cl"
+    target = 0.0
+    max_error = 0.0 # the optimization ends when every objective is within max_error of its target
+
+    def __init__(self, name = "Cl", target = 0.0, max_error = 0.0) -> None:
+        self.name = name
+        self.target = target
+        self.max_error = max_error
+
+OPTIM_OBJECTIVES = ("Cl", "Cd", "Cm", "Cl/Cd")
+
+class OptimSettings2D(MsgpackMixin):
+    """Algorithm and analysis conditions of a foil optimization. Each particle is analyzed at a single aoa, see XDirect.optimize"""
+    algorithm = "mopso" # or "ga", which takes a single objective
+    population = 31
+    max_iter = 100
+    n_threads = 0
+    alpha = 0.0
+    reynolds = 1.0e6
+    mach = 0.0
+    ncrit = 9.0
+    xtr_top = 1.0
+    xtr_bot = 1.0
+    hh_t2 = 1.0 # width parameter of the Hicks-Henne bumps
+
+    def __init__(self, algorithm = "mopso", population = 31, max_iter = 100, n_threads = 0, alpha = 0.0, reynolds = 1.0e6, mach = 0.0, ncrit = 9.0,
+                 xtr_top = 1.0, xtr_bot = 1.0, hh_t2 = 1.0) -> None:
+        self.algorithm = algorithm
+        self.population = population
+        self.max_iter = max_iter
+        self.n_threads = n_threads
+        self.alpha = alpha
+        self.reynolds = reynolds
+        self.mach = mach
+        self.ncrit = ncrit
+        self.xtr_top = xtr_top
+        self.xtr_bot = xtr_bot
+        self.hh_t2 = hh_t2
+
+class OptimFront(MsgpackMixin):
+    """
+    The best particles of a generation: the Pareto archive for MOPSO, the best particle for GA. One row per particle:
+    position holds the bump amplitudes, fitness the value of each objective and error its distance to the target
+    """
+    iter = 0
+    position = []
+    fitness = []
+    error = []
+
+class PolarCacheStats(MsgpackMixin):
+    """Counters of the server side cache of 2D results"""
+    hits = 0
+    misses = 0
+    size = 0
+    capacity = 0
+
+class XFoilPoolStats(MsgpackMixin):
+    """Counters of the polars analyzed with warm_start, and number of idle XFoil instances kept by the server"""
+    warm_starts = 0
+    cold_starts = 0
+    size = 0
+    capacity = 0
+
+class SpanStats(MsgpackMixin):
+    """Number, total and maximum duration in ms of the samples of a timing span"""
+    count = 0
+    total_ms = 0.0
+    max_ms = 0.0
+
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.count = get("count", 0)
+        obj.total_ms = get("total_ms", 0.0)
+        obj.max_ms = get("max_ms", 0.0)
+        return obj
+
+class MethodStats(MsgpackMixin):
+    """
+    Timings of a server binding:
+    call: time spent in the binding. queue: wait of each request to the gui thread. slot: gui work of each request.
+    serialize: encoding of the result, of total size bytes
+    """
+    method = ""
+    call = SpanStats()
+    queue = SpanStats()
+    slot = SpanStats()
+    serialize = SpanStats()
+    bytes = 0
+
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.method = get("method", "")
+        obj.call = SpanStats.from_msgpack(get("call", {}))
+        obj.queue = SpanStats.from_msgpack(get("queue", {}))
+        obj.slot = SpanStats.from_msgpack(get("slot", {}))
+        obj.serialize = SpanStats.from_msgpack(get("serialize", {}))
+        obj.bytes = get("bytes", 0)
+        return obj
 
 class OpPoint(MsgpackMixin):
     """A raw single point result"""
@@ -269,6 +491,61 @@ class OpPoint(MsgpackMixin):
     Re = 0.0
     mach = 0.0
 
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.alpha = get("alpha", "")
+        obj.polar_name = get("polar_name", "")
+        obj.foil_name = get("foil_name", "")
+        obj.Cl = get("Cl", 0.0)
+        obj.XCp = get("XCp", 0.0)
+        obj.Cd = get("Cd", 0.0)
+        obj.Cdp = get("Cdp", 0.0)
+        obj.Cm = get("Cm", 0.0)
+        obj.XTr1 = get("XTr1", 0.0)
+        obj.XTr2 = get("XTr2", 0.0)
+        obj.HMom = get("HMom", 0.0)
+        obj.Cpmn = get("Cpmn", 0.0)
+        obj.Re = get("Re", 0.0)
+        obj.mach = get("mach", 0.0)
+        return obj
+
+class enumOppField(enum.IntEnum):
+    """Distributions of an operating point. Boundary layer fields (XBL and after) come as <name>_top and <name>_bot"""
+    CPV = 0
+    CPI = 1
+    QV = 2
+    QI = 3
+    XBL = 4
+    DSTAR = 5
+    THETA = 6
+    UE = 7
+    HK = 8
+    CTAU = 9
+    RTHETA = 10
+    TAU = 11
+    DIS = 12
+
+class OpPointArrays:
+    """
+    Distributions of several operating points of a polar.
+    alpha is 1D. Every other attribute is an (n_opp, n_nodes) read-only float64 array, padded with nan
+    e.g. Cpv, Qi, dstar_top, Hk_bot
+    """
+    def __init__(self) -> None:
+        self.alpha = np.empty(0)
+
+    @classmethod
+    def from_bin(cls, encoded):
+        obj = cls()
+        n_opp = encoded["n_opp"]
+        widths = encoded.get("widths", {})
+        for k, v in encoded["columns"].items():
+            column = np.frombuffer(v, dtype='<f8')
+            obj.__dict__[k] = column if k == "alpha" else column.reshape(n_opp, widths.get(k, -1 if n_opp else 0))
+        return obj
+
 class PolarSpec(MsgpackMixin):
     polar_type = enumPolarType.FIXEDSPEEDPOLAR
     Re_type = 1
@@ -291,7 +568,22 @@ class PolarSpec(MsgpackMixin):
         self.xbot = xbot
         self.reynolds = reynolds
 
-class PolarResult(MsgpackMixin):
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.polar_type = get("polar_type", enumPolarType.FIXEDSPEEDPOLAR)
+        obj.Re_type = get("re_type", 1) # named re_type by the server
+        obj.ma_type = get("ma_type", 1)
+        obj.aoa = get("aoa", 0.0)
+        obj.mach = get("mach", 0.0)
+        obj.ncrit = get("ncrit", 9.0)
+        obj.xtop = get("xtop", 1.0)
+        obj.xbot = get("xbot", 1.0)
+        obj.reynolds = get("reynolds", 100000.0)
+        return obj
+
+class PolarResult(MsgpackMixin, ColumnsMixin):
     """ 
     A custom simplified data structure for the polar result.
     Filling this is slow so you might want to avoid it when running optimizations
@@ -311,6 +603,27 @@ class PolarResult(MsgpackMixin):
     RtCl = []
     Re = []
 
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        """The columns are taken from the message as they are. The ones which were not requested are empty tuples"""
+        obj = _new(cls)
+        get = encoded.get
+        obj.alpha = get("alpha", ())
+        obj.Cl = get("Cl", ())
+        obj.XCp = get("XCp", ())
+        obj.Cd = get("Cd", ())
+        obj.Cdp = get("Cdp", ())
+        obj.Cm = get("Cm", ())
+        obj.XTr1 = get("XTr1", ())
+        obj.XTr2 = get("XTr2", ())
+        obj.HMom = get("HMom", ())
+        obj.Cpmn = get("Cpmn", ())
+        obj.ClCd = get("ClCd", ())
+        obj.Cl32Cd = get("Cl32Cd", ())
+        obj.RtCl = get("RtCl", ())
+        obj.Re = get("Re", ())
+        return obj
+
 class Polar(MsgpackMixin):
     name = ""
     foil_name = ""
@@ -322,6 +635,16 @@ class Polar(MsgpackMixin):
         self.foil_name = foil_name
         self.spec = PolarSpec()
         self.result = PolarResult()
+
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.name = get("name", "")
+        obj.foil_name = get("foil_name", "")
+        obj.spec = PolarSpec.from_msgpack(get("spec", {}))
+        obj.result = PolarResult.from_msgpack(get("result", {}))
+        return obj
         
 class PolarManager:
     """
@@ -338,7 +661,7 @@ class PolarManager:
         """ Returns a dictionary of polars for the specified foil
         use sparingly. there might be a lot of data
         """
-        polar_list_raw = self._client.call("polarList", foil_name) 
+        polar_list_raw = self._client.call_cached("polarList", foil_name)
         return {item["name"]:Polar.from_msgpack(item) for item in polar_list_raw}
 
     def setCurPolar(self, polar_name:str, foil_name:str):
@@ -353,6 +676,22 @@ class OpPointManager:
         opp_raw = self._client.call("getOpPoint", alpha, polar_name, foil_name)
         return OpPoint.from_msgpack(opp_raw)
 
+    def getOpPoints(self, polar_name:str, foil_name:str, alphas = None, fields = [enumOppField.CPV]) -> OpPointArrays:
+        """
+        Returns the distributions of many stored operating points of a polar in a single call.
+
+        Args:
+            polar_name: (str)
+            foil_name: (str)
+            alphas: (list, optional) angles of attack to get. None returns every stored operating point of the polar. Missing angles are skipped
+            fields: (list, optional) enumOppField values to receive
+
+        Returns:
+            OpPointArrays, one row per operating point found
+        """
+        alphas = [] if alphas is None else [float(alpha) for alpha in alphas]
+        return OpPointArrays.from_bin(self._client.call("getOpPoints", polar_name, foil_name, alphas, list(fields)))
+
 # =========== Mainframe classes ============ #
 class enumApp(enum.IntEnum):
     NOAPP = 0
@@ -367,6 +706,35 @@ class State(MsgpackMixin):
     app = enumApp
     saved = False
     display = True
+    generation = 0
+
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.projectPath = get("projectPath", "")
+        obj.projectName = get("projectName", "")
+        obj.app = get("app", enumApp)
+        obj.saved = get("saved", False)
+        obj.display = get("display", True)
+        obj.generation = get("generation", 0)
+        return obj
+
+PROJECT_RECORDS = ("foils", "polars", "planes")
+
+class ProjectLoadOptions(MsgpackMixin):
+    """
+    The records of a .xfl project file which the server loads, see xflrClient.loadProject.
+    The polars and operating points are only loaded for the foils which are loaded.
+    """
+    include = list(PROJECT_RECORDS)
+    foils = [] # names of the foils to load, all of them if empty
+    opps = True # if False, the operating points stay in the file until they are first accessed
+
+    def __init__(self, include = PROJECT_RECORDS, foils = (), opps = True) -> None:
+        self.include = list(include)
+        self.foils = list(foils)
+        self.opps = opps
 
 class Afoil:
     """
@@ -406,16 +774,176 @@ class XDirect(MsgpackMixin):
         self.opp_mgr = OpPointManager(client)
         self.polar_mgr = PolarManager(client)
         self.foil_mgr = FoilManager(client)
+        self._cache = None  # client side mirror of the server cache
+        self._store = None  # PolarStore which receives every result
+        self._cur_polar = None  # last defined polar, to save analyze() results with their specification
 
     def define_analysis(self, polar:Polar):
         """Takes Polar as argument (and not polar.name) because we're creating a new Polar on the heap everytime"""
         self._client.call("defineAnalysis2D", polar.to_msgpack())
+        self._cur_polar = polar
 
-    def analyze(self, analysis_settings: AnalysisSettings2D, result_list = []):
-        """Analyses the current polar"""
+    def setStore(self, store):
+        """
+        Saves the results of analyze and analyze_batch to a PolarStore from now on. None stops saving.
+        analyze() results are saved with the specification of the last polar passed to define_analysis
+        """
+        self._store = store
+
+    def analyze(self, analysis_settings: AnalysisSettings2D, result_list = [], as_numpy = False):
+        """Analyses the current polar
+        as_numpy: receive the result columns as packed float64 and return them as numpy arrays. Much faster for long sequences
+        """
+        if self._cache is not None:
+            key = (self._client.call("polarCacheKey", analysis_settings), tuple(int(r) for r in result_list), as_numpy)
+            result = self._cache.get(key)
+            if result is None:
+                result = self._analyze(analysis_settings, result_list, as_numpy)
+                self._cache.put(key, result)
+        else:
+            result = self._analyze(analysis_settings, result_list, as_numpy)
+        if self._store is not None and self._cur_polar is not None:
+            self._store.add(self._cur_polar, result)
+        return result
+
+    def _analyze(self, analysis_settings: AnalysisSettings2D, result_list, as_numpy):
+        if as_numpy:
+            polar_result_raw = self._client.call("analyzeCurPolarBin", analysis_settings, result_list)
+            return PolarResult.from_bin(polar_result_raw)
         polar_result_raw = self._client.call("analyzeCurPolar", analysis_settings, result_list)
         return PolarResult.from_msgpack(polar_result_raw)
 
+    def setCacheSize(self, capacity:int, client_mirror = False):
+        """
+        Enables the server side cache of 2D results. Analyses of an identical foil geometry, polar specification and settings are then returned without running xfoil.
+        A cache hit only restores the polar data; no operating points are created.
+
+        Args:
+            capacity: (int) maximum number of cached polars. 0 disables the cache
+            client_mirror: (bool, optional) also keep the results in this object. A hit then costs a single small call
+        """
+        self._client.call("setPolarCacheSize", capacity)
+        self._cache = LRUCache(capacity) if client_mirror and capacity > 0 else None
+
+    def clearCache(self):
+        self._client.call("clearPolarCache")
+        if self._cache is not None:
+            self._cache.clear()
+
+    def getCacheStats(self) -> PolarCacheStats:
+        """Hit and miss counters of the server side cache"""
+        return PolarCacheStats.from_msgpack(self._client.call("getPolarCacheStats"))
+
+    def setXFoilPoolSize(self, capacity:int):
+        """Number of idle XFoil instances the server keeps for the analyses run with warm_start. Defaults to its number of cores, 0 frees them"""
+        self._client.call("setXFoilPoolSize", capacity)
+
+    def clearXFoilPool(self):
+        self._client.call("clearXFoilPool")
+
+    def getXFoilPoolStats(self) -> XFoilPoolStats:
+        """Number of polars which started from a converged boundary layer, and from scratch"""
+        return XFoilPoolStats.from_msgpack(self._client.call("getXFoilPoolStats"))
+
+    def analyze_batch(self, polars:list, analysis_settings: AnalysisSettings2D, result_list = [], n_threads = 0):
+        """
+        Defines and analyses many polars in a single call.
+        The server runs one xfoil task per polar on a thread pool and returns when all of them are done.
+        With analysis_settings.warm_start, the polars of each foil are sorted by Reynolds number and cut into n_threads chains instead.
+        Each polar of a chain starts from the boundary layer of the previous one, running its sequence from the end closest to where
+        the previous one stopped, and the first polar starts from an XFoil instance kept from earlier analyses of the same geometry.
+        This saves Newton iterations and restarts, but results near stall may differ slightly from cold started ones.
+
+        Args:
+            polars: (list) Polar objects to define. Each one needs a valid foil_name. Polar names should be unique
+            analysis_settings: (AnalysisSettings2D) sequence and settings shared by all polars
+            result_list: (list, optional) enumPolarResult values to receive for every polar
+            n_threads: (int, optional) size of the thread pool. 0 uses all the cores of the server
+
+        Returns:
+            list of PolarResult in the same order as polars. Results of polars with an invalid foil are empty
+        """
+        polar_results_raw = self._client.call("analyzeBatch2D", [polar.to_msgpack() for polar in polars], analysis_settings, result_list, n_threads)
+        results = [PolarResult.from_msgpack(polar_result_raw) for polar_result_raw in polar_results_raw]
+        if self._store is not None:
+            for polar, result in zip(polars, results):
+                self._store.add(polar, result)
+        return results
+
+    def optimize(self, foil, objectives:list, bounds:list, algorithm = "mopso", population = 31, n_threads = 0, settings: OptimSettings2D = None,
+                 poll_interval = 0.1):
+        """
+        Optimizes the foil on the server with the MOPSO or GA of the Optim2d dialog, and yields the front of each generation.
+        The variables are the amplitudes of Hicks-Henne bumps added to the upper surface, and each particle is analyzed with xfoil
+        at settings.alpha. The server evaluates the particles of each generation on a pool of n_threads.
+        Leaving the loop early (break, return, exception) cancels the optimization. Use makeOptimFoil to keep a particle of the last front.
+
+        Args:
+            foil: (Foil or str) the foil to optimize, which is left unchanged
+            objectives: (list) OptimObjective or (name, target, max_error) tuples. GA takes a single one
+            bounds: (list) one (min, max) pair of bump amplitudes per variable
+            algorithm: (str, optional) "mopso" or "ga"
+            population: (int, optional) number of particles
+            n_threads: (int, optional) size of the thread pool. 0 uses all the cores of the server
+            settings: (OptimSettings2D, optional) number of iterations and analysis conditions. algorithm, population and n_threads override its own
+            poll_interval: (float, optional) seconds between two requests while no new front is available
+
+        Yields:
+            OptimFront, starting with the one of the initial population
+        """
+        objectives = [obj if isinstance(obj, OptimObjective) else OptimObjective(*obj) for obj in objectives]
+        bounds = [(float(lo), float(hi)) for lo, hi in bounds]
+        if algorithm not in ("mopso", "ga"):
+            raise ValueError("unknown optimization algorithm %r" % algorithm)
+        if not objectives or not bounds:
+            raise ValueError("optimize needs at least one objective and one variable")
+        if algorithm == "ga" and len(objectives) > 1:
+            raise ValueError("the ga optimizer takes a single objective, use mopso to optimize %d objectives" % len(objectives))
+        for obj in objectives:
+            if obj.name not in OPTIM_OBJECTIVES:
+                raise ValueError("unknown objective %r, expected one of %s" % (obj.name, ", ".join(OPTIM_OBJECTIVES)))
+        if any(lo > hi for lo, hi in bounds):
+            raise ValueError("each bound must be a (min, max) pair")
+
+        settings = OptimSettings2D(**settings.to_msgpack()) if settings is not None else OptimSettings2D()
+        settings.algorithm = algorithm
+        settings.population = population
+        settings.n_threads = n_threads
+
+        foil_name = foil if isinstance(foil, str) else foil.name
+        if not self._client.call("startOptimize2D", foil_name, [obj.to_msgpack() for obj in objectives], bounds, settings):
+            return
+        n_read = 0
+        finished = False
+        try:
+            while not finished:
+                progress = self._client.call("getOptimProgress", n_read)
+                finished = progress['finished']
+                n_read += len(progress['fronts'])
+                for front_raw in progress['fronts']:
+                    yield OptimFront.from_msgpack(front_raw)
+                if not progress['fronts'] and not finished:
+                    time.sleep(poll_interval)
+        finally:
+            if not finished:
+                self._client.call("cancelOptimize")
+                while not self._client.call("getOptimProgress", n_read)['finished']:
+                    time.sleep(poll_interval)
+
+    def makeOptimFoil(self, index:int, name:str) -> Foil:
+        """Adds the foil of the particle at index in the last front of the optimization to the project, under name"""
+        foil_raw = self._client.call("makeOptimFoil", index, name)
+        return Foil.from_msgpack(foil_raw, self._client)
+
+    def analyze_async(self, analysis_settings: AnalysisSettings2D, result_list = []):
+        """Same as analyze but returns immediately with an RpcFuture of the PolarResult"""
+        return self._client.call_future("analyzeCurPolar", analysis_settings, result_list, decode=PolarResult.from_msgpack)
+
+    def analyze_batch_async(self, polars:list, analysis_settings: AnalysisSettings2D, result_list = [], n_threads = 0):
+        """Same as analyze_batch but returns immediately with an RpcFuture of the list of PolarResult"""
+        return self._client.call_future("analyzeBatch2D", [polar.to_msgpack() for polar in polars], analysis_settings, result_list, n_threads,
+                                        decode=lambda raw: [PolarResult.from_msgpack(polar_result_raw) for polar_result_raw in raw])
+
     def setDisplayState(self, dsp_state:XDirectDisplayState):
         self._client.call("setXDirectDisplay", dsp_state)
     
@@ -476,6 +1004,17 @@ class Wing(MsgpackMixin):
         else:
             self.sections = sections
 
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.type = get("type", enumWingType.MAINWING)
+        obj.sections = get("sections", None) or []
+        return obj
+
+# messages of the default wings of a plane
+_MAINWING, _SECONDWING, _ELEVATOR, _FIN = ({"type": wing_type} for wing_type in enumWingType)
+
 class Plane(MsgpackMixin):
     name = ""
     wing = Wing(enumWingType.MAINWING)
@@ -490,6 +1029,17 @@ class Plane(MsgpackMixin):
         self.elevator = Wing(enumWingType.ELEVATOR)
         self.fin = Wing(enumWingType.FIN)
 
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.name = get("name", "")
+        obj.wing = Wing.from_msgpack(get("wing", _MAINWING))
+        obj.wing2 = Wing.from_msgpack(get("wing2", _SECONDWING))
+        obj.elevator = Wing.from_msgpack(get("elevator", _ELEVATOR))
+        obj.fin = Wing.from_msgpack(get("fin", _FIN))
+        return obj
+
 class PlaneManager:
     """Manager for planes and 3D objects"""
 
@@ -590,7 +1140,7 @@ class WPolarSpec(MsgpackMixin):
         self.is_ground_effect = is_ground_effect
         self.height = height # m. Set if ground effect is tru
         
-class WPolarResult(MsgpackMixin):
+class WPolarResult(MsgpackMixin, ColumnsMixin):
     """ 
     A custom simplified data structure for the polar result.
     Filling this is slow so you might want to avoid it when running optimizations
@@ -629,6 +1179,78 @@ class WPolarResult(MsgpackMixin):
     XCpCl = [] # neutral point
     SM = [] # static margin
 
+    _SERVER_NAMES = {"FZ": "Fz", "FX": "Fx", "FY": "Fy"}
+
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        """The columns are taken from the message as they are. The ones which were not requested are empty tuples"""
+        obj = _new(cls)
+        get = encoded.get
+        obj.alpha = get("alpha", ())
+        obj.beta = get("beta", ())
+        obj.Q_inf = get("Q_inf", ())
+        obj.Cl = get("Cl", ())
+        obj.ClCd = get("ClCd", ())
+        obj.Cl32Cd = get("Cl32Cd", ())
+        obj.TCd = get("TCd", ())
+        obj.ICd = get("ICd", ())
+        obj.PCd = get("PCd", ())
+        obj.Cm = get("Cm", ())
+        obj.ICm = get("ICm", ())
+        obj.IYm = get("IYm", ())
+        obj.VCm = get("VCm", ())
+        obj.FZ = get("Fz", ())
+        obj.FX = get("Fx", ())
+        obj.FY = get("Fy", ())
+        obj.Rm = get("Rm", ())
+        obj.Pm = get("Pm", ())
+        obj.max_bending = get("max_bending", ())
+        obj.XCpCl = get("XCpCl", ())
+        obj.SM = get("SM", ())
+        return obj
+
+class enumPOppField(enum.IntEnum):
+    """Distributions of a plane operating point. CP, GAMMA and SIGMA are per panel, the others per span station of each wing"""
+    CP = 0
+    GAMMA = 1
+    SIGMA = 2
+    SPANPOS = 3
+    CHORD = 4
+    CL = 5      # local lift coefficient
+    AI = 6      # induced angle, degrees
+    ICD = 7
+    PCD = 8
+    RE = 9
+    CMAIRF = 10
+    XCP = 11    # centre of pressure, % of the local chord
+    BM = 12     # bending moment
+    F = 13      # strip force, (n, 3)
+    VD = 14     # downwash at the trailing edge, (n, 3)
+
+class PlaneOppArrays:
+    """
+    Distributions of one plane operating point, as read-only float64 numpy arrays.
+    The panel arrays (Cp, G, Sigma) are attributes. wings holds one dict of span station arrays per wing:
+    main wing, second wing, elevator, fin. The dict is empty if the plane has no such wing
+    """
+    _VECTORS = ("F", "Vd")
+
+    def __init__(self) -> None:
+        self.alpha = 0.0
+        self.beta = 0.0
+        self.ctrl = 0.0
+        self.QInf = 0.0
+        self.wings = []
+
+    @classmethod
+    def from_bin(cls, encoded):
+        obj = cls()
+        obj.alpha, obj.beta, obj.ctrl, obj.QInf = encoded["alpha"], encoded["beta"], encoded["ctrl"], encoded["QInf"]
+        obj.__dict__.update({k : np.frombuffer(v, dtype='<f8') for k, v in encoded["panels"].items()})
+        obj.wings = [{k : np.frombuffer(v, dtype='<f8').reshape(-1, 3) if k in cls._VECTORS else np.frombuffer(v, dtype='<f8') for k, v in wing.items()}
+                     for wing in encoded["wings"]]
+        return obj
+
 class WPolar(MsgpackMixin):
     name = ""
     plane_name = ""
@@ -662,12 +1284,53 @@ class AnalysisSettings3D(MsgpackMixin):
     is_sequence = False
     init_LLT = True
     store_opp = True
+    n_threads = 1 # threads of the VLM/panel solver, 0 for all the cores
 
-    def __init__(self, sequence = (0,0,0), is_sequence = False, init_LLT = True, store_opp = True) -> None:
+    def __init__(self, sequence = (0,0,0), is_sequence = False, init_LLT = True, store_opp = True, n_threads = 1) -> None:
         self.sequence = sequence
         self.is_sequence = is_sequence
         self.init_LLT = init_LLT
         self.store_opp = store_opp
+        self.n_threads = n_threads
+
+class PolarIndexEntry(MsgpackMixin):
+    """
+    A foil polar as the viscous 3D analyses see it. See Miarex.getPolarIndex
+    interpolated: True for the type 1 polars with points, which the Cl and alpha interpolations use.
+    i_zero_cl: the point closest to Cl=0. i_cl_low, i_cl_high: the range around it in which Cl strictly increases and is searched by bisection
+    """
+    foil_name = ""
+    polar_name = ""
+    reynolds = 0.0
+    alpha0 = 0.0
+    slope = 0.0
+    interpolated = False
+    cl_min = 0.0
+    cl_max = 0.0
+    alpha_min = 0.0
+    alpha_max = 0.0
+    i_zero_cl = -1
+    i_cl_low = -1
+    i_cl_high = -1
+
+    @classmethod
+    def from_msgpack(cls, encoded, client = None):
+        obj = _new(cls)
+        get = encoded.get
+        obj.foil_name = get("foil_name", "")
+        obj.polar_name = get("polar_name", "")
+        obj.reynolds = get("reynolds", 0.0)
+        obj.alpha0 = get("alpha0", 0.0)
+        obj.slope = get("slope", 0.0)
+        obj.interpolated = get("interpolated", False)
+        obj.cl_min = get("cl_min", 0.0)
+        obj.cl_max = get("cl_max", 0.0)
+        obj.alpha_min = get("alpha_min", 0.0)
+        obj.alpha_max = get("alpha_max", 0.0)
+        obj.i_zero_cl = get("i_zero_cl", -1)
+        obj.i_cl_low = get("i_cl_low", -1)
+        obj.i_cl_high = get("i_cl_high", -1)
+        return obj
 
 class Miarex:
     """
@@ -681,8 +1344,95 @@ class Miarex:
         """Takes Polar as argument (and not polar.name) because we're creating a new Polar on the heap everytime"""
         self._client.call("defineAnalysis3D", wpolar.to_msgpack())
 
-    def analyze(self, polar_name:str, plane_name:str, analysis_settings: AnalysisSettings3D, result_list = []):
-        """Analyses the current polar"""
+    def analyze(self, polar_name:str, plane_name:str, analysis_settings: AnalysisSettings3D, result_list = [], as_numpy = False):
+        """Analyses the current polar
+        as_numpy: receive the result columns as packed float64 and return them as numpy arrays. Much faster for long sequences
+        analysis_settings.n_threads spreads the VLM/panel solver of this analysis over several cores; the analyses run from the GUI keep one thread
+        The server runs one 3D analysis at a time: a call made while another one runs, e.g. from analyze_iter or another client, raises an rpc error
+        """
+        if as_numpy:
+            wpolar_result_raw = self._client.call("analyzeWPolarBin", polar_name, plane_name, analysis_settings, result_list)
+            return WPolarResult.from_bin(wpolar_result_raw)
         wpolar_result_raw = self._client.call("analyzeWPolar", polar_name, plane_name, analysis_settings, result_list)
         return WPolarResult.from_msgpack(wpolar_result_raw)
+
+    def analyze_async(self, polar_name:str, plane_name:str, analysis_settings: AnalysisSettings3D, result_list = []):
+        """Same as analyze but returns immediately with an RpcFuture of the WPolarResult"""
+        return self._client.call_future("analyzeWPolar", polar_name, plane_name, analysis_settings, result_list, decode=WPolarResult.from_msgpack)
+
+    def analyze_iter(self, polar_name:str, plane_name:str, analysis_settings: AnalysisSettings3D, result_list = [], poll_interval = 0.05):
+        """
+        Runs the analysis in the background and yields each operating point as soon as it is computed.
+        Leaving the loop early (break, return, exception) cancels the rest of the analysis.
+
+        Args:
+            result_list: (list of enumWPolarResult) columns to return
+            poll_interval: (float, optional) seconds between two requests while no new point is available
+
+        Yields:
+            dict of the requested columns for one operating point, e.g. {"alpha": 2.0, "Cl": 0.21}
+        """
+        if not self._client.call("startAnalyzeWPolar", polar_name, plane_name, analysis_settings):
+            return
+        n_read = 0
+        finished = False
+        try:
+            while not finished:
+                progress = self._client.call("getWPolarProgress", n_read, result_list)
+                finished = progress['finished']
+                columns = {k : v for k, v in progress['result'].items() if len(v)}
+                n_new = progress['n_points'] - n_read
+                n_read = progress['n_points']
+                for i in range(n_new):
+                    yield {k : v[i] for k, v in columns.items()}
+                if not n_new and not finished:
+                    time.sleep(poll_interval)
+        finally:
+            if not finished:
+                self._client.call("cancelWPolar")
+                while not self._client.call("getWPolarProgress", n_read, [])['finished']:
+                    time.sleep(poll_interval)
+
+    def getPolarIndex(self, plane_name:str):
+        """
+        The polars of the foils of the plane, sorted by Reynolds number, as the viscous LLT and panel analyses index them.
+        The analyses build this index once at their start, so adding or changing polars only affects the next run.
+
+        Returns:
+            list of PolarIndexEntry, grouped by foil
+        """
+        return [PolarIndexEntry.from_msgpack(entry) for entry in self._client.call("getPolarIndex", plane_name)]
+
+    def interpolatePolar(self, foil_name:str, re:float, cl:float, var = 2):
+        """
+        Value of a polar variable interpolated at (re, cl) on the polars of the foil, as the viscous 3D analyses do it.
+
+        Args:
+            var: (int) 0 alpha, 1 Cl, 2 Cd, 3 Cdp, 4 Cm, 5 XTr top, 6 XTr bottom, 7 HMom, 8 Cpmn, 9 Cl/Cd, 10 Cl^1.5/Cd, 11 XCp
+
+        Returns:
+            (value, out_of_range, error)
+        """
+        value, out_of_range, error = self._client.call("interpolatePolar", foil_name, re, cl, var)
+        return value, bool(out_of_range), bool(error)
+
+    def getPlaneOpps(self, polar_name:str, plane_name:str, x_values = None, fields = [enumPOppField.CP]):
+        """
+        Yields the panel and span station distributions of the stored operating points of a polar.
+        Each operating point is a separate call, so that large panel meshes are never sent in one message.
+
+        Args:
+            x_values: (list, optional) values of the polar variable: alpha for T1 and T2 polars, QInf for T4, beta for T5, ctrl for T7.
+                None yields every stored operating point. Missing values are skipped
+            fields: (list, optional) enumPOppField values to receive
+
+        Yields:
+            PlaneOppArrays
+        """
+        if x_values is None:
+            x_values = self._client.call("planeOppList", polar_name, plane_name)
+        for x in x_values:
+            popp_raw = self._client.call("getPlaneOppArrays", polar_name, plane_name, float(x), list(fields))
+            if popp_raw["found"]:
+                yield PlaneOppArrays.from_bin(popp_raw)
     
\ No newline at end of file
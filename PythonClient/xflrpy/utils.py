@@ -1,7 +1,320 @@
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import msgpack
+import msgpackrpc as rpc
+
 def loop_until(condition):
     def inner1(func):    
         def inner2(*args, **kwargs):
             while condition:
                 func(*args,**kwargs)
         return inner2
-    return inner1
\ No newline at end of file
+    return inner1    
+
+class LRUCache:
+    """Small least recently used mapping with a fixed number of entries"""
+    def __init__(self, capacity = 128) -> None:
+        self.capacity = capacity
+        self._data = OrderedDict()
+
+    def get(self, key, default = None):
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+# server bindings which do not modify the project or the settings, see xflServer::bindQuery
+QUERY_METHODS = frozenset(["ping", "generation", "getState", "foilExists", "getFoil", "foilList", "getFoilCoords", "getFoilCoordsBin",
+                           "getLineStyle", "exportFoil", "getPolarCacheStats", "getXFoilPoolStats", "polarCacheKey", "getPolar", "getXDirectDisplay", "polarList",
+                           "getOpPoint", "getOpPoints", "getPlane", "getPlaneData", "getWPolarProgress", "getOptimProgress", "planeOppList", "getPlaneOppArrays",
+                           "getPolarIndex", "interpolatePolar", "setStatsEnabled", "clearStats", "getStats", "deferredOppCount"])
+
+class MetadataCache:
+    """
+    Replies of metadata queries (state, foil and polar lists), kept while the generation of the server is unchanged.
+    The server increments its generation after each modification, made by any client or in the gui.
+    Modifications made through the owning client are seen at once, the others once the generation is checked again, at most max_age seconds later.
+    """
+    def __init__(self, max_age = 1.0) -> None:
+        self.max_age = max_age
+        self.generation = None
+        self._checked = float("-inf")   # time of the last generation check
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._checked = float("-inf")
+
+    def get(self, key, fetch_generation, fetch):
+        """Returns a copy of the entry stored under key, fetched again if the generation has changed"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked > self.max_age:
+                generation = fetch_generation()
+                self._checked = now
+                if generation != self.generation:
+                    self._entries.clear()
+                    self.generation = generation
+            if key not in self._entries:
+                self._entries[key] = fetch()
+            return copy.deepcopy(self._entries[key])
+
+class RpcFuture:
+    """
+    Result of a background rpc call. 
+    Use result() to block on it or await it from a coroutine.
+    The raw msgpack reply is passed through decode (if any) before being returned.
+    """
+    def __init__(self, future, decode = None) -> None:
+        self._future = future
+        self._decode = decode
+
+    def _decoded(self, raw):
+        return raw if self._decode is None else self._decode(raw)
+
+    def result(self, timeout = None):
+        return self._decoded(self._future.result(timeout))
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def add_done_callback(self, fn):
+        """fn is called with this RpcFuture once the reply has arrived"""
+        self._future.add_done_callback(lambda _: fn(self))
+
+    def __await__(self):
+        raw = yield from asyncio.wrap_future(self._future).__await__()
+        return self._decoded(raw)
+
+class BatchResult:
+    """
+    Placeholder returned by the calls recorded in a batch.
+    The reply is available with result() once the batch has been sent.
+    """
+    def __init__(self, method) -> None:
+        self.method = method
+        self._done = False
+        self._value = None
+
+    def _set(self, value):
+        self._value = value
+        self._done = True
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self):
+        if not self._done:
+            raise RuntimeError(f"The batch holding the call to {self.method} has not been sent, or an earlier call of the batch failed")
+        return self._value
+
+class Batch:
+    """Calls recorded by XflrRpcClient.batch(), sent to the server as a single multicall message"""
+    def __init__(self) -> None:
+        self.methods = []
+        self.args = []
+        self.results = []
+
+    def __len__(self):
+        return len(self.methods)
+
+    def call(self, method, *args) -> BatchResult:
+        self.methods.append(method)
+        self.args.append(list(args))
+        self.results.append(BatchResult(method))
+        return self.results[-1]
+
+class CallStats:
+    """
+    Wall time and payload size of the calls made by a client, per method. Disabled until enabled is set.
+    The payload sizes are those of the msgpack encoding of the arguments and of the reply, which are encoded a second time to be counted.
+    """
+    def __init__(self) -> None:
+        self.enabled = False
+        self._methods = {}  # method: [count, total_s, max_s, bytes_sent, bytes_received]
+        self._lock = threading.Lock()
+
+    def record(self, method, seconds, args, reply):
+        sent = len(msgpack.packb(list(args), default=lambda obj: obj.to_msgpack()))
+        received = len(msgpack.packb(reply))
+        with self._lock:
+            entry = self._methods.setdefault(method, [0, 0.0, 0.0, 0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            entry[3] += sent
+            entry[4] += received
+
+    def clear(self):
+        with self._lock:
+            self._methods.clear()
+
+    def summary(self) -> list:
+        """One dict per method, the most time consuming first"""
+        with self._lock:
+            rows = [{"method": method, "count": count, "total_s": total, "mean_s": total/count, "max_s": longest, "bytes_sent": sent, "bytes_received": received}
+                    for method, (count, total, longest, sent, received) in self._methods.items()]
+        return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+    def table(self) -> str:
+        lines = ["%-24s %8s %12s %12s %12s %12s %12s" % ("method", "calls", "total (ms)", "mean (ms)", "max (ms)", "sent (B)", "received (B)")]
+        for row in self.summary():
+            lines.append("%-24s %8d %12.3f %12.3f %12.3f %12d %12d" % (row["method"], row["count"], 1e3*row["total_s"], 1e3*row["mean_s"], 1e3*row["max_s"],
+                                                                    row["bytes_sent"], row["bytes_received"]))
+        return "\n".join(lines)
+
+    def to_prometheus(self, prefix = "xflrpy") -> str:
+        """The counters in the Prometheus text exposition format"""
+        metrics = (("calls_total", "counter", "count"), ("call_seconds_total", "counter", "total_s"), ("call_seconds_max", "gauge", "max_s"),
+                   ("sent_bytes_total", "counter", "bytes_sent"), ("received_bytes_total", "counter", "bytes_received"))
+        rows = self.summary()
+        lines = []
+        for name, kind, column in metrics:
+            lines.append("# TYPE %s_%s %s" % (prefix, name, kind))
+            lines += ['%s_%s{method="%s"} %r' % (prefix, name, row["method"], row[column]) for row in rows]
+        return "\n".join(lines) + "\n"
+
+class XflrRpcClient:
+    """
+    msgpack-rpc client which can also run calls in the background.
+    Each connection belongs to a thread of the client, which runs it on an event loop of its own,
+    so the event loop of the caller (e.g. the one of asyncio.run) is never used:
+    blocking calls are sent from a transport thread, background calls from worker threads.
+    With a single worker (default), background calls reach the server in the order they were made.
+    """
+    def __init__(self, address, n_workers = 1, cache_age = 1.0, **kwargs) -> None:
+        self.cache = None if cache_age is None else MetadataCache(cache_age)
+        self.stats = CallStats()
+        self._address = address
+        self._kwargs = kwargs
+        self._n_workers = n_workers
+        self._executor = None   # created on the first background call
+        self._local = threading.local()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._transport = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xflrpy-transport")
+        self._transport.submit(self._worker_client).result()
+
+    def _worker_client(self):
+        if not hasattr(self._local, "client"):
+            asyncio.set_event_loop(asyncio.new_event_loop())
+            self._local.client = rpc.Client(self._address, **self._kwargs)
+            with self._lock:
+                self._workers.append(self._local.client)
+        return self._local.client
+
+    def _worker_call(self, method, *args):
+        return self._rpc(self._worker_client(), method, *args)
+
+    def _rpc(self, client, method, *args):
+        """Sends the call on the connection of client, and records it if the stats are enabled"""
+        if not self.stats.enabled:
+            return rpc.Client.call(client, method, *args)
+        start = time.perf_counter()
+        reply = rpc.Client.call(client, method, *args)
+        self.stats.record(method, time.perf_counter() - start, args, reply)
+        return reply
+
+    def _blocking_call(self, method, *args):
+        """Sends the call from the transport thread and waits for the reply"""
+        return self._transport.submit(self._worker_call, method, *args).result()
+
+    def call(self, method, *args):
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            return batch.call(method, *args)
+        try:
+            return self._blocking_call(method, *args)
+        finally:
+            self._modified(method)
+
+    def call_cached(self, method, *args):
+        """
+        Same as call for the queries of metadata, but the reply comes from the cache while the generation of the server is unchanged.
+        """
+        if self.cache is None or getattr(self._local, "batch", None) is not None:
+            return self.call(method, *args)
+        return self.cache.get((method,) + tuple(args), lambda: self._blocking_call("generation"), lambda: self._blocking_call(method, *args))
+
+    def _modified(self, method):
+        if self.cache is not None and method not in QUERY_METHODS:
+            self.cache.invalidate()
+
+    @contextmanager
+    def batch(self):
+        """
+        Records the calls made in the with block by this thread and sends them as one multicall message on exit.
+        The server runs them in order and stops at the first failure, which is raised as an rpc.error.RPCError.
+        Inside the block, calls return a BatchResult instead of their reply, so only the methods which do not use the reply can be batched.
+
+        Yields:
+            Batch. Its results are the BatchResult of the recorded calls
+        """
+        if getattr(self._local, "batch", None) is not None:
+            raise RuntimeError("Batches cannot be nested")
+        batch = self._local.batch = Batch()
+        try:
+            yield batch
+        finally:
+            self._local.batch = None
+        if len(batch):
+            self._send(batch)
+
+    def _send(self, batch:Batch):
+        try:
+            reply = self._blocking_call("multicall", batch.methods, batch.args)
+        finally:
+            for method in batch.methods:
+                self._modified(method)
+        for raw, result in zip(reply["results"], batch.results):
+            result._set(msgpack.unpackb(raw, raw=False))
+        if reply["failed"] >= 0:
+            raise rpc.error.RPCError(f"Call {reply['failed']} of the batch ({batch.methods[reply['failed']]}) failed: {reply['error']}")
+
+    def call_future(self, method, *args, decode = None) -> RpcFuture:
+        """
+        Sends the call from a worker thread and returns immediately.
+
+        Args:
+            method: (str) name of the server binding
+            args: arguments of the binding
+            decode: (callable, optional) applied to the raw reply
+
+        Returns:
+            RpcFuture
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._n_workers, thread_name_prefix="xflrpy")
+        self._modified(method)
+        future = self._executor.submit(self._worker_call, method, *args)
+        future.add_done_callback(lambda _: self._modified(method))
+        return RpcFuture(future, decode)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._transport.shutdown(wait=True)
+        for client in self._workers:
+            client.close()
+        self._workers = []
@@ -185,7 +185,8 @@ int main(int argc, char *argv[])
     qInstallMessageHandler(&customLogHandler);
     XFLR5App app(argc, argv);
         
-    xflServer* server = new xflServer(8080);
+    xflServer* server = new xflServer(app.serverPort());
+    server->connectMainFrame(MainFrame::self());
     server->start();
 
     if(app.done())	return 0;
@@ -123,7 +123,6 @@
 #include <xflwidgets/mvc/objecttreedelegate.h>
 #include <xinverse/xinverse.h>
 
-#include <xflserver/xflserver.h> // needs implementation in  MainFrame::createDockWindows()
 
 #ifdef Q_OS_MAC
 #include <CoreFoundation/CoreFoundation.h>
@@ -847,7 +846,6 @@ void MainFrame::createDockWindows()
     XInverse::s_pMainFrame        = this;
     Miarex::s_pMainFrame          = this;
     gl3dXflView::s_pMainFrame     = this;
-    xflServer::s_pMainFrame    = this;
 
     m_pdwXDirect = new QDockWidget(tr("Direct foil analysis"), this);
     m_pdwXDirect->setAllowedAreas(Qt::LeftDockWidgetArea | Qt::RightDockWidgetArea);
@@ -2802,6 +2800,8 @@ void MainFrame::deleteProject(bool bClosing)
     // clear everything
     Objects3d::deleteObjects();
     Objects2d::deleteAllFoils();
+    xfl::clearDeferredOpps();
+    xfl::clearPartialProjectFile();
 
     m_pMiarex->m_pCurPlane  = nullptr;
     m_pMiarex->m_pCurPOpp   = nullptr;
@@ -3342,7 +3342,7 @@ MainFrame* MainFrame::self()
 }
 
 
-xfl::enumApp MainFrame::loadXFLR5File(QString pathname)
+xfl::enumApp MainFrame::loadXFLR5File(QString pathname, xfl::ProjectLoadOptions const &options)
 {
     QFile XFile(pathname);
     if (!XFile.open(QIODevice::ReadOnly))
@@ -3484,7 +3484,7 @@ xfl::enumApp MainFrame::loadXFLR5File(QString pathname)
 
         QDataStream ar(&XFile);
         QApplication::setOverrideCursor(Qt::WaitCursor);
-        if(!serializeProjectXFL(ar, false))
+        if(!serializeProjectXFL(ar, false, options))
         {
             QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
         }
@@ -3872,19 +3872,20 @@ void MainFrame::onSaveTimer()
 }
 
 
-void MainFrame::onSaveProject()
+bool MainFrame::onSaveProject()
 {
     if (!s_ProjectName.length())
     {
-        onSaveProjectAs();
-        return;
+        return onSaveProjectAs();
     }
-    if(saveProject(m_FileName))
+    bool bSaved = saveProject(m_FileName);
+    if(bSaved)
     {
         addRecentFile(m_FileName);
         statusBar()->showMessage(tr("The project ") + s_ProjectName + tr(" has been saved"));
     }
     m_pMiarex->updateView();
+    return bSaved;
 }
 
 
@@ -4247,6 +4248,17 @@ bool MainFrame::saveProject(QString PathName)
     }
 
 
+    if(xfl::isPartialProjectFile(PathName))
+    {
+        QMessageBox::warning(window(), tr("Warning"), tr("The project has been partially loaded from this file.")+"\n"+
+                                                      tr("Save it under another name to keep the records which have not been loaded."));
+        return false;
+    }
+
+    // read the operating points left in the project file before it is replaced
+    xfl::loadDeferredOpps();
+    xfl::loadDeferredPlaneOpps();
+
     QString backupFileName = QDir::tempPath() + QDir::separator() + s_ProjectName + ".bak";
 
     QFile::copy(PathName, backupFileName);
@@ -4269,11 +4281,15 @@ bool MainFrame::saveProject(QString PathName)
     {
         QString strong = tr("Error saving the project file");
         strong +="\n";
-        QFile::copy(backupFileName, PathName);
+        // put the previous file back in place of the incomplete one
+        fp.close();
+        fp.remove();
+        QFile::rename(backupFileName, PathName);
         strong +="The changes have not been saved";
         QMessageBox::critical(window(), tr("Error"), strong);
+        return false;
     }
-    else QFile::remove(backupFileName);
+    QFile::remove(backupFileName);
 
 
     m_FileName = PathName;
@@ -4428,7 +4444,7 @@ bool MainFrame::serializePlaneProject(QDataStream &ar)
     ar << foilList.count();
     for(int iFoil=0; iFoil<foilList.size(); iFoil++)
     {
-        serializeFoilXFL(foilList.at(iFoil), ar, bIsStoring);
+        xfl::serializeFoilXFL(foilList.at(iFoil), ar, bIsStoring);
     }
     // the foil polars
     // list the foil polars associated to this Plane's wings
@@ -4462,7 +4478,7 @@ bool MainFrame::serializePlaneProject(QDataStream &ar)
     ar << polarList.size();
     for (int ip=0; ip<polarList.size();ip++)
     {
-        serializePolarXFL(polarList.at(ip), ar, true);
+        xfl::serializePolarXFL(polarList.at(ip), ar, true);
     }
     ar << 0; //no need to save the operating points
 
@@ -4618,318 +4634,9 @@ void MainFrame::setMainFrameCentralWidget()
 }
 
 
-bool MainFrame::serializeProjectXFL(QDataStream &ar, bool bIsStoring)
+bool MainFrame::serializeProjectXFL(QDataStream &ar, bool bIsStoring, xfl::ProjectLoadOptions const &options)
 {
-    WPolar *pWPolar(nullptr);
-    PlaneOpp *pPOpp(nullptr);
-    Plane *pPlane(nullptr);
-    Polar *pPolar(nullptr);
-    OpPoint *pOpp(nullptr);
-
-    int i=0, n=0;
-    float f=0;
-    double dble=0;
-    bool boolean=false;
-
-    if (bIsStoring)
-    {
-        // storing code
-        int ArchiveFormat = 200002;
-        ar << ArchiveFormat;
-        // 200001 : First instance of new ".xfl" format
-
-        //Save unit data
-        ar << Units::lengthUnitIndex();
-        ar << Units::areaUnitIndex();
-        ar << Units::weightUnitIndex();
-        ar << Units::speedUnitIndex();
-        ar << Units::forceUnitIndex();
-        ar << Units::momentUnitIndex();
-
-        // format 200002
-        // saving WPolar full data including extra drag
-        WPolarDlg::s_WPolar.serializeWPlrXFL(ar, true);
-
-        // save the planes...
-        ar << Objects3d::s_oaPlane.size();
-        for (i=0; i<Objects3d::planeCount();i++)
-        {
-            pPlane = Objects3d::planeAt(i);
-            pPlane->serializePlaneXFL(ar, bIsStoring);
-        }
-
-        // save the WPolars
-        ar << Objects3d::polarCount();
-        for (i=0; i<Objects3d::polarCount();i++)
-        {
-            pWPolar = Objects3d::polarAt(i);
-            pWPolar->serializeWPlrXFL(ar, bIsStoring);
-        }
-
-        if(m_bSaveWOpps)
-        {
-            // not forgetting their POpps
-            ar << Objects3d::planeOppCount();
-            for (i=0; i<Objects3d::planeOppCount();i++)
-            {
-                pPOpp = Objects3d::planeOppAt(i);
-                pPOpp->serializePOppXFL(ar, bIsStoring);
-            }
-        }
-        else ar << 0;
-
-        // then the foils
-        ar << Objects2d::foilCount();
-        for(int i=0; i<Objects2d::foilCount(); i++)
-        {
-            Foil *pFoil = Objects2d::foilAt(i);
-            serializeFoilXFL(pFoil, ar, bIsStoring);
-        }
-
-        //the foil polars
-        ar << Objects2d::polarCount();
-        for (int i=0; i<Objects2d::polarCount();i++)
-        {
-            pPolar = Objects2d::polarAt(i);
-            serializePolarXFL(pPolar, ar, bIsStoring);
-        }
-
-        //the oppoints
-        if(m_bSaveOpps)
-        {
-            ar << Objects2d::oppCount();
-            for (int i=0; i<Objects2d::oppCount();i++)
-            {
-                pOpp = Objects2d::oppAt(i);
-                pOpp->serializeOppXFL(ar, bIsStoring);
-            }
-        }
-        else ar << 0;
-
-        // and the spline foil whilst we're at it
-        m_pAFoil->m_pSF->serializeXFL(ar, bIsStoring);
-
-        ar << Units::pressureUnitIndex();
-        ar << Units::inertiaUnitIndex();
-        //add provisions
-        // space allocation for the future storage of more data, without need to change the format
-        for (int i=2; i<20; i++) ar << 0;
-        dble=0;
-        for (int i=0; i<50; i++) ar << dble;
-    }
-    else
-    {
-        // LOADING CODE
-        int ArchiveFormat(0);
-        ar >> ArchiveFormat;
-        if(ArchiveFormat<200001 || ArchiveFormat>200002) return false;
-
-        //Load unit data
-        ar >> n; Units::setLengthUnitIndex(n);
-        ar >> n; Units::setAreaUnitIndex(n);
-        ar >> n; Units::setWeightUnitIndex(n);
-        ar >> n; Units::setSpeedUnitIndex(n);
-        ar >> n; Units::setForceUnitIndex(n);
-        ar >> n; Units::setMomentUnitIndex(n);
-
-        //pressure and inertia units are added later on in the provisions.
-
-        Units::setUnitConversionFactors();
-
-        if(ArchiveFormat==200001)
-        {
-            //Load the default Polar data. Not in the Settings, since this is Project dependant
-            ar >> n;
-            switch (n)
-            {
-                default:
-                case 1: WPolarDlg::s_WPolar.setPolarType(xfl::FIXEDSPEEDPOLAR);  break;
-                case 2: WPolarDlg::s_WPolar.setPolarType(xfl::FIXEDLIFTPOLAR);   break;
-                case 4: WPolarDlg::s_WPolar.setPolarType(xfl::FIXEDAOAPOLAR);    break;
-                case 5: WPolarDlg::s_WPolar.setPolarType(xfl::BETAPOLAR);        break;
-                case 7: WPolarDlg::s_WPolar.setPolarType(xfl::STABILITYPOLAR);   break;
-            }
-
-            ar >> n;
-            switch(n)
-            {
-                case 1: WPolarDlg::s_WPolar.setAnalysisMethod(xfl::LLTMETHOD);     break;
-                default:
-                case 2: WPolarDlg::s_WPolar.setAnalysisMethod(xfl::VLMMETHOD);     break;
-                case 3: WPolarDlg::s_WPolar.setAnalysisMethod(xfl::PANEL4METHOD);  break;
-            }
-
-            ar >> dble;    WPolarDlg::s_WPolar.setMass(dble);
-            ar >> WPolarDlg::s_WPolar.m_QInfSpec;
-            double x(0), y(0), z(0);
-            ar >> x >> y >> z;
-            WPolarDlg::s_WPolar.setCoG({x,y,z});
-
-            ar >> f; WPolarDlg::s_WPolar.setDensity(double(f));
-            ar >> f; WPolarDlg::s_WPolar.setViscosity(double(f));
-            ar >> WPolarDlg::s_WPolar.m_AlphaSpec;
-            ar >> WPolarDlg::s_WPolar.m_BetaSpec;
-
-            ar >> boolean;  WPolarDlg::s_WPolar.setTilted(boolean);
-            ar >> boolean;  WPolarDlg::s_WPolar.setWakeRollUp(boolean);
-        }
-        else if(ArchiveFormat==200002) WPolarDlg::s_WPolar.serializeWPlrXFL(ar, false);
-
-        // load the planes...
-        // assumes all object have been deleted and the array cleared.
-        ar >> n;
-        for(i=0; i<n; i++)
-        {
-            pPlane = new Plane();
-            if(pPlane->serializePlaneXFL(ar, bIsStoring)) Objects3d::appendPlane(pPlane);
-            else
-            {
-                delete pPlane;
-                QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
-                return false;
-            }
-        }
-
-        // load the WPolars
-        ar >> n;
-        for(i=0; i<n; i++)
-        {
-            pWPolar = new WPolar();
-            if(pWPolar->serializeWPlrXFL(ar, bIsStoring))
-            {
-                // clean up : the project may be carrying useless WPolars due to past programming errors
-                pPlane = Objects3d::getPlane(pWPolar->planeName());
-                if(pPlane)
-                {
-                    Objects3d::appendWPolar(pWPolar);
-                    if(pWPolar->referenceDim()==xfl::PLANFORMREFDIM)
-                    {
-                        pWPolar->setReferenceSpanLength(pPlane->planformSpan());
-                        double area  = pPlane->planformArea();
-                        if(pPlane->biPlane()) area += pPlane->wing2()->m_PlanformArea;
-                        pWPolar->setReferenceArea(area);
-                    }
-                    else if(pWPolar->referenceDim()==xfl::PROJECTEDREFDIM)
-                    {
-                        pWPolar->setReferenceSpanLength(pPlane->projectedSpan());
-                        double area = pPlane->projectedArea();
-                        if(pPlane->biPlane()) area += pPlane->wing2()->m_ProjectedArea;
-                        pWPolar->setReferenceArea(area);
-                    }
-                    pWPolar->setReferenceChordLength(pPlane->mac());
-                }
-                else
-                {
-                }
-            }
-            else
-            {
-                delete pWPolar;
-                QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
-                return false;
-            }
-        }
-
-        // the PlaneOpps
-        ar >> n;
-        for(i=0; i<n; i++)
-        {
-            pPOpp = new PlaneOpp();
-            if(pPOpp->serializePOppXFL(ar, bIsStoring))
-            {
-                //just append, since POpps have been sorted when first inserted
-                pPlane = Objects3d::getPlane(pPOpp->planeName());
-                pWPolar = Objects3d::getWPolar(pPlane, pPOpp->polarName());
-
-                // clean up : the project may be carrying useless PlaneOpps due to past programming errors
-                if(pPlane && pWPolar) Objects3d::insertPOpp(pPOpp);
-                else
-                {
-                }
-            }
-            else
-            {
-                delete pPOpp;
-                QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
-                return false;
-            }
-        }
-
-        // load the Foils
-        ar >> n;
-        for(i=0; i<n; i++)
-        {
-            Foil *pFoil = new Foil();
-            if(serializeFoilXFL(pFoil, ar, bIsStoring))
-            {
-                // delete any former foil with that name - necessary in the case of project insertion to avoid duplication
-                // there is a risk that old plane results are not consisent with the new foil, but difficult to avoid that
-                Foil *pOldFoil = Objects2d::foil(pFoil->name());
-                if(pOldFoil) Objects2d::deleteFoil(pOldFoil);
-                Objects2d::appendFoil(pFoil);
-            }
-            else
-            {
-                delete pFoil;
-                QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
-                return false;
-            }
-        }
-
-        // load the Polars
-        ar >> n;
-
-        for(i=0; i<n; i++)
-        {
-            pPolar = new Polar();
-            if(serializePolarXFL(pPolar, ar, bIsStoring)) Objects2d::appendPolar(pPolar);
-            else
-            {
-                delete pPolar;
-                QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
-                return false;
-            }
-        }
-
-        // OpPoints
-        ar >> n;
-        for(i=0; i<n; i++)
-        {
-            pOpp = new OpPoint();
-            if(pOpp->serializeOppXFL(ar, bIsStoring))  Objects2d::appendOpp(pOpp);
-            else
-            {
-                delete pOpp;
-                QMessageBox::warning(this,tr("Warning"), tr("Error reading the file")+"\n"+tr("Saved the valid part"));
-                return false;
-            }
-        }
-
-        // and the spline foil whilst we're at it
-        m_pAFoil->m_pSF->serializeXFL(ar, bIsStoring);
-
-        ar >> n; Units::setPressureUnitIndex(n);
-        ar >> n; Units::setInertiaUnitIndex(n);
-
-        // space allocation
-        int k=0;
-        double dble=0;
-        for (int i=2; i<20; i++) ar >> k;
-        for (int i=0; i<50; i++) ar >> dble;
-
-        // v6.49: recalculate the wing geometries after the foils have been loaded
-        // to determine the number of flaps
-        for(int ip=0; ip<Objects3d::planeCount(); ip++)
-        {
-            Plane *pPlane = Objects3d::planeAt(ip);
-            for(int iw=0; iw<MAXWINGS; iw++)
-            {
-                if(pPlane->wing(iw))
-                    pPlane->wing(iw)->computeGeometry();
-            }
-        }
-    }
-    return true;
+    return xfl::serializeProjectXFL(ar, bIsStoring, WPolarDlg::s_WPolar, m_pAFoil->m_pSF, m_bSaveOpps, m_bSaveWOpps, options);
 }
 
 
@@ -5969,208 +5676,6 @@ void MainFrame::showEvent(QShowEvent *)
 }
 
 
-/**
- * Loads or Saves the data of this foil to a binary file.
- * @param ar the QDataStream object from/to which the data should be serialized
- * @param bIsStoring true if saving the data, false if loading
- * @return true if the operation was successful, false otherwise
- */
-bool MainFrame::serializeFoilXFL(Foil *pFoil, QDataStream &ar, bool bIsStoring)
-{
-    qint8 b = 0x00;
-    int n(0);
-    QString strange;
-    int ArchiveFormat = 100007;
-    // 100006: first version of new xfl format
-    // 100007: foil new style
-    if(bIsStoring)
-    {
-        ar << ArchiveFormat;
-        ar << pFoil->name();
-        ar << pFoil->m_FoilDescription;
-
-/*        ar << pFoil->m_Stipple << pFoil->m_Width;
-        writeColor(ar, pFoil->red(), pFoil->green(), pFoil->blue(), pFoil->alphaChannel());
-        ar << pFoil->m_bIsVisible;
-        //        ar << m_bShowFoilPoints;
-        ar << qint8(pFoil->m_Symbol);
-        */
-        pFoil->theStyle().serializeXfl(ar, bIsStoring);
-
-        ar << pFoil->m_bCenterLine << pFoil->m_bLEFlap << pFoil->m_bTEFlap;
-        ar << pFoil->m_LEFlapAngle << pFoil->m_LEXHinge << pFoil->m_LEYHinge;
-        ar << pFoil->m_TEFlapAngle << pFoil->m_TEXHinge << pFoil->m_TEYHinge;
-        ar << pFoil->m_nb;
-        for (int j=0; j<pFoil->m_nb; j++)
-        {
-            ar << pFoil->m_xb[j] << pFoil->m_yb[j];
-        }
-        return true;
-    }
-    else
-    {
-        ar >> ArchiveFormat;
-
-        ar >> strange;
-        pFoil->setName(strange);
-
-        ar >> strange;
-        pFoil->setDescription(strange);
-
-        if(ArchiveFormat<100007)
-        {
-            ar >> n; pFoil->theStyle().setStipple(n);
-            ar >> pFoil->theStyle().m_Width;
-
-            int r=0,g=0,blue=0,a=0;
-            xfl::readColor(ar, r,g,blue,a);
-            pFoil->setColor(r,g,blue,a);
-            ar >> pFoil->theStyle().m_bIsVisible;
-            ar >> b; pFoil->theStyle().setPointStyle(int(b));
-        }
-        else
-            pFoil->theStyle().serializeXfl(ar, bIsStoring);
-
-        ar >> pFoil->m_bCenterLine >> pFoil->m_bLEFlap >> pFoil->m_bTEFlap;
-        ar >> pFoil->m_LEFlapAngle >> pFoil->m_LEXHinge >> pFoil->m_LEYHinge;
-        ar >> pFoil->m_TEFlapAngle >> pFoil->m_TEXHinge >> pFoil->m_TEYHinge;
-        ar >> pFoil->m_nb;
-
-        for (int j=0; j<pFoil->m_nb; j++)
-        {
-            ar >> pFoil->m_xb[j] >> pFoil->m_yb[j];
-        }
-
-        memcpy(pFoil->m_x, pFoil->m_xb, sizeof(pFoil->m_xb));
-        memcpy(pFoil->m_y, pFoil->m_yb, sizeof(pFoil->m_yb));
-        pFoil->m_n = pFoil->m_nb;
-
-        pFoil->initFoil();
-        pFoil->setFlap();
-
-        return true;
-    }
-}
-
-/**
- * Loads or saves the data of this polar to a binary file
- * @param ar the QDataStream object from/to which the data should be serialized
- * @param bIsStoring true if saving the data, false if loading
- * @return true if the operation was successful, false otherwise
- */
-bool MainFrame::serializePolarXFL(Polar *pPolar, QDataStream &ar, bool bIsStoring)
-{
-    double dble(0);
-    bool boolean(false);
-    int i(0), k(0), n(0);
-    // identifies the format of the file
-    // 100005: new style format
-    int ArchiveFormat=100005;
-
-    if(bIsStoring)
-    {
-        ar << ArchiveFormat; // first format for XFL file
-
-        ar << pPolar->m_FoilName;
-        ar << pPolar->name();
-
-/*        ar << pPolar->m_Style << pPolar->m_Width;
-        writeColor(ar, pPolar->m_red, pPolar->m_green, pPolar->m_blue, pPolar->m_alphaChannel);
-        ar << pPolar->m_bIsVisible << false;*/
-        pPolar->theStyle().serializeXfl(ar, bIsStoring);
-
-        if     (pPolar->m_PolarType==xfl::FIXEDSPEEDPOLAR)  ar<<1;
-        else if(pPolar->m_PolarType==xfl::FIXEDLIFTPOLAR)   ar<<2;
-        else if(pPolar->m_PolarType==xfl::RUBBERCHORDPOLAR) ar<<3;
-        else if(pPolar->m_PolarType==xfl::FIXEDAOAPOLAR)    ar<<4;
-        else                                                ar<<1;
-
-        ar << pPolar->m_MaType << pPolar->m_ReType;
-        ar << pPolar->m_Reynolds << pPolar->m_Mach;
-        ar << pPolar->m_ASpec;
-        ar << pPolar->m_XTop << pPolar->m_XBot;
-        ar << pPolar->m_NCrit;
-
-        ar << pPolar->m_Alpha.size();
-        for (i=0; i< pPolar->m_Alpha.size(); i++)
-        {
-            ar << float(pPolar->m_Alpha[i]) << float(pPolar->m_Cd[i]) ;
-            ar << float(pPolar->m_Cdp[i])   << float(pPolar->m_Cl[i]) << float(pPolar->m_Cm[i]);
-            ar << float(pPolar->m_XTr1[i])  << float(pPolar->m_XTr2[i]);
-            ar << float(pPolar->m_HMom[i])  << float(pPolar->m_Cpmn[i]);
-            ar << float(pPolar->m_Re[i]);
-            ar << float(pPolar->m_XCp[i]);
-        }
-
-//        ar << pPolar->m_theStyle.m_Symbol;
-
-        // space allocation for the future storage of more data, without need to change the format
-        for (int i=0; i<19; i++) ar << 0;
-        for (int i=0; i<50; i++) ar << 0.0;
-
-        return true;
-    }
-    else
-    {
-        //read variables
-        QString strange;
-        float Alpha(0), Cd(0), Cdp(0), Cl(0), Cm(0), XTr1(0), XTr2(0), HMom(0), Cpmn(0), Re(0), XCp(0);
-
-        ar >> ArchiveFormat;
-        if (ArchiveFormat <100000 || ArchiveFormat>110000) return false;
-
-        ar >> pPolar->m_FoilName;
-        ar >> strange; pPolar->setName(strange);
-
-        if(ArchiveFormat<100005)
-        {
-            ar >> n; pPolar->setStipple(n);
-            ar >> n; pPolar->setWidth(n);
-            int r,g,b,a;
-            xfl::readColor(ar, r,g,b,a);
-            pPolar->setColor(r,g,b,a);
-            ar >> pPolar->theStyle().m_bIsVisible >> boolean;
-        }
-        else
-        {
-            pPolar->theStyle().serializeXfl(ar, bIsStoring);
-        }
-
-        ar >> n;
-        if     (n==1) pPolar->m_PolarType=xfl::FIXEDSPEEDPOLAR;
-        else if(n==2) pPolar->m_PolarType=xfl::FIXEDLIFTPOLAR;
-        else if(n==3) pPolar->m_PolarType=xfl::RUBBERCHORDPOLAR;
-        else if(n==4) pPolar->m_PolarType=xfl::FIXEDAOAPOLAR;
-
-        ar >> pPolar->m_MaType >> pPolar->m_ReType;
-        ar >> pPolar->m_Reynolds >> pPolar->m_Mach;
-        ar >> pPolar->m_ASpec;
-        ar >> pPolar->m_XTop >> pPolar->m_XBot;
-        ar >> pPolar->m_NCrit;
-
-        ar >> n;
-
-        for (i=0; i< n; i++)
-        {
-            ar >> Alpha >> Cd >> Cdp >> Cl >> Cm >> XTr1 >> XTr2 >> HMom >> Cpmn >> Re >> XCp;
-            pPolar->addPoint(double(Alpha), double(Cd), double(Cdp), double(Cl), double(Cm),
-                             double(XTr1), double(XTr2), double(HMom), double(Cpmn), double(Re), double(XCp));
-        }
-
-        if(ArchiveFormat<100005)
-        {
-            ar >> n;
-            pPolar->theStyle().setPointStyle(n);
-        }
-
-        // space allocation
-        for (int i=0; i<19; i++) ar >> k;
-        for (int i=0; i<50; i++) ar >> dble;
-    }
-    return true;
-}
-
-
 /**
  * The user has requested of the graph data to a text file
  */
@@ -6397,7 +5902,11 @@ void MainFrame::setDefaultStaticFonts()
     LineBtn::setBackgroundColor(DisplayOptions::backgroundColor());
 }
 
-void MainFrame::onLoadFileHeadless(QStringList PathNames)
+/**
+ * Loads the files of the server.
+ * @param pOptions the records of a project file to read
+ */
+void MainFrame::onLoadFileHeadless(QStringList PathNames, xfl::ProjectLoadOptions *pOptions)
 {
     QString PathName;
     xfl::enumApp App  = xfl::NOAPP;
@@ -6411,7 +5920,7 @@ void MainFrame::onLoadFileHeadless(QStringList PathNames)
             PathName = PathNames.at(i);
             if (PathName.endsWith(".dat"))
             {
-                App = loadXFLR5File(PathName);
+                App = loadXFLR5File(PathName, *pOptions);
             } else {
                 warn_non_airfoil_multiload = true;
             }
@@ -6430,7 +5939,7 @@ void MainFrame::onLoadFileHeadless(QStringList PathNames)
         int pos = PathName.lastIndexOf("/");
         if(pos>0) xfl::setLastDirName(PathName.left(pos));
 
-        App = loadXFLR5File(PathName);
+        App = loadXFLR5File(PathName, *pOptions);
     }
 
     if(m_iApp==xfl::NOAPP)
@@ -6483,3 +5992,21 @@ void MainFrame::onNewProjectHeadless(){
     s_bSaved=false;
     updateView();
 }
+
+
+/**
+ * Rebuilds the object trees and redraws the active view.
+ * Used by the server when the display is switched back on, since objects may have been added without any view update.
+ */
+void MainFrame::onRefreshViewsHeadless(){
+    m_pXDirect->m_pFoilTreeView->fillModelView();
+    m_pXDirect->resetCurves();
+    m_pXDirect->setControls();
+
+    m_pMiarex->m_pPlaneTreeView->fillModelView();
+    Miarex::resetCurves();
+    gl3dMiarexView::s_bResetglOpp = true;
+    m_pMiarex->setControls();
+
+    updateView();
+}
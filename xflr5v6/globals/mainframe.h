@@ -44,6 +44,7 @@
 #include <xflcore/core_enums.h>
 #include <xflcore/gui_params.h>
 #include <xflgraph/graph.h>
+#include <xflobjects/objects_global.h>
 #include <xflwidgets/voidwidget.h>
 
 
@@ -99,7 +100,7 @@ class MainFrame : public QMainWindow
         QString &exportGraphFilter() {return m_GraphExportFilter;}
 
         void loadLastProject();
-        xfl::enumApp loadXFLR5File(QString PathName);
+        xfl::enumApp loadXFLR5File(QString PathName, xfl::ProjectLoadOptions const &options=xfl::ProjectLoadOptions());
         static MainFrame* self();
 
         /*___________________________________________Methods_______________________________*/
@@ -139,14 +140,15 @@ class MainFrame : public QMainWindow
         void onResetSettings();
         void onRestoreToolbars();
         void onSavePlaneAsProject();
-        void onSaveProject();
+        bool onSaveProject();
         void onSaveTimer();
         void onSaveViewToImageFile();
         void onSetNoApp();
 
         // Headless slots
         void onNewProjectHeadless();
-        void onLoadFileHeadless(QStringList fileNames);
+        void onLoadFileHeadless(QStringList fileNames, xfl::ProjectLoadOptions *pOptions);
+        void onRefreshViewsHeadless();
 
     private:
         void keyPressEvent(QKeyEvent *pEvent);
@@ -159,11 +161,9 @@ class MainFrame : public QMainWindow
         bool loadPolarFileV3(QDataStream &ar, bool bIsStoring, int ArchiveFormat=0);
         bool loadSettings();
         bool saveProject(QString PathName="");
-        bool serializeFoilXFL(Foil *pFoil, QDataStream &ar, bool bIsStoring);
         bool serializePlaneProject(QDataStream &ar);
-        bool serializePolarXFL(Polar *pPolar, QDataStream &ar, bool bIsStoring);
         bool serializeProjectWPA(QDataStream &ar, bool bIsStoring);
-        bool serializeProjectXFL(QDataStream &ar, bool bIsStoring);
+        bool serializeProjectXFL(QDataStream &ar, bool bIsStoring, xfl::ProjectLoadOptions const &options=xfl::ProjectLoadOptions());
         static QString const &projectName() {return s_ProjectName;}
         static bool hasOpenGL(){return s_bOpenGL;}
         void addRecentFile(const QString &PathName);
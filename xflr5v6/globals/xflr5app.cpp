@@ -49,6 +49,7 @@ XFLR5App::XFLR5App(int &argc, char** argv) : QApplication(argc, argv)
     setOrganizationDomain("cere-aero.tech");
 
     m_bDone = false;
+    m_ServerPort = 8080;
 
     QString StyleName;
     QString LanguagePath ="";
@@ -286,6 +287,13 @@ void XFLR5App::parseCmdLine(XFLR5App &xflapp,
     ScriptOption.setDescription("Runs the script file");
     parser.addOption(ScriptOption);
 
+    QCommandLineOption PortOption(QStringList() << "port");
+    PortOption.setValueName("port");
+    PortOption.setDefaultValue("8080");
+    PortOption.setDescription("Port of the rpc server used by the python client. "
+                              "Usage: xflr5 --port 8081 to run several instances side by side.");
+    parser.addOption(PortOption);
+
     QCommandLineOption TraceOption(QStringList() << "t" << "trace");
     TraceOption.setDescription("Runs the program in trace mode. The trace file is "+QDir::tempPath() + "/Trace.log");
     parser.addOption(TraceOption);
@@ -304,6 +312,14 @@ void XFLR5App::parseCmdLine(XFLR5App &xflapp,
         Trace("Processing option -s", true);
     }
 
+    if(parser.isSet(PortOption))
+    {
+        bool bOK=false;
+        int port = parser.value(PortOption).toInt(&bOK);
+        if(bOK) xflapp.m_ServerPort = port;
+        Trace("Processing option --port", xflapp.m_ServerPort);
+    }
+
     if(parser.isSet(TraceOption))
     {
         Trace("Processing option -t", true);
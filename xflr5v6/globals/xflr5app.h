@@ -33,6 +33,7 @@ class XFLR5App : public QApplication
     public:
         XFLR5App(int&, char**);
         bool done() const {return m_bDone;}
+        int serverPort() const {return m_ServerPort;}
 
     private:
         bool event(QEvent *pEvent) override;
@@ -40,6 +41,7 @@ class XFLR5App : public QApplication
         void parseCmdLine(XFLR5App &xflapp, QString &scriptfilename, bool &bScript, bool &bShowProgress, int &OGLVersion);
 
         bool m_bDone;
+        int m_ServerPort;   /**< the port of the rpc server */
 };
 
 
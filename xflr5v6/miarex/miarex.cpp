@@ -184,6 +184,7 @@ Miarex::Miarex(QWidget *parent) : QWidget(parent)
 
 
     m_LLTMaxIterations          = 100;
+    m_nPanelThreads             = 1;
     LLTAnalysis::s_CvPrec       =   0.01;
     LLTAnalysis::s_RelaxMax     =  20.0;
     LLTAnalysis::s_NLLTStations = 20;
@@ -2019,20 +2020,23 @@ void Miarex::on3DPrefs()
  * Checks the foils
  * Launches the analysis
  * Updates the active view
+ * @return true if an analysis has been launched
 */
-void Miarex::onAnalyze()
+bool Miarex::onAnalyze()
 {
     double V0(0), VMax(0), VDelta(0);
+    int nThreads = m_nPanelThreads;
+    m_nPanelThreads = 1;
 
     if(!m_pCurPlane)
     {
         QMessageBox::warning(s_pMainFrame, tr("Warning"), tr("Please define a plane object before running a calculation"));
-        return;
+        return false;
     }
     if(!m_pCurWPolar)
     {
         QMessageBox::warning(s_pMainFrame, tr("Warning"), tr("Please define an analysis/polar before running a calculation"));
-        return;
+        return false;
     }
 
     //prevent an automatic and lengthy redraw of the streamlines after the calculation
@@ -2086,14 +2090,14 @@ void Miarex::onAnalyze()
                     QString strong;
                     strong = pwing->m_Name + ": "+tr("Could not find the wing's foil ")+ pwing->rightFoilName(l) +tr("...\nAborting Calculation");
                     QMessageBox::warning(s_pMainFrame, tr("Warning"), strong);
-                    return;
+                    return false;
                 }
                 if (!Objects2d::foil(pwing->leftFoilName(l)))
                 {
                     QString strong;
                     strong = pwing->m_Name + ": "+tr("Could not find the wing's foil ")+ pwing->leftFoilName(l) +tr("...\nAborting Calculation");
                     QMessageBox::warning(s_pMainFrame, tr("Warning"), strong);
-                    return;
+                    return false;
                 }
             }
         }
@@ -2108,9 +2112,11 @@ void Miarex::onAnalyze()
     }
     else if(m_theTask.matSize()>0)
     {
-        panelAnalyze(V0, VMax, VDelta, m_bSequence);
+        panelAnalyze(V0, VMax, VDelta, m_bSequence, nThreads);
     }
+    else return false;
 
+    return true;
 }
 
 
@@ -2120,12 +2126,13 @@ void Miarex::onAnalyze()
  * @param VMax the final aoa
  * @param VDelta the increment
  * @param bSequence if true, the analysis will for a sequence of aoa from V0 to Vmax, if not only V0 shall be calculated
+ * @param nThreads the threads of the panel solver, 0 for all the cores
  */
-void Miarex::panelAnalyze(double V0, double VMax, double VDelta, bool bSequence)
+void Miarex::panelAnalyze(double V0, double VMax, double VDelta, bool bSequence, int nThreads)
 {
     if(!m_pCurPlane || !m_pCurWPolar) return;
 
-    m_theTask.initializeTask(m_pCurPlane, m_pCurWPolar, V0, VMax, VDelta, bSequence);
+    m_theTask.initializeTask(m_pCurPlane, m_pCurWPolar, V0, VMax, VDelta, bSequence, nThreads);
     m_theTask.stitchSurfaces();
     m_pPanelAnalysisDlg->setTask(&m_theTask);
     m_pPanelAnalysisDlg->initDialog();
@@ -2966,6 +2973,7 @@ void Miarex::onDeleteAllWPlrOpps()
 
     if(m_pCurPlane)
     {
+        xfl::discardDeferredPlaneOpps(m_pCurPlane->name(), m_pCurWPolar->polarName());
         for (int i = Objects3d::planeOppCount()-1; i>=0; i--)
         {
             PlaneOpp* pPOpp =  Objects3d::planeOppAt(i);
@@ -2997,6 +3005,7 @@ void Miarex::onDeleteAllWOpps()
 {
     emit projectModified();
 
+    xfl::discardDeferredPlaneOpps();
     for (int i = Objects3d::planeOppCount()-1; i>=0; i--)
     {
         PlaneOpp* pPOpp =  Objects3d::planeOppAt(i);
@@ -3120,6 +3129,7 @@ void Miarex::onDeletePlanePOpps()
 
     if(m_pCurPlane)
     {
+        xfl::discardDeferredPlaneOpps(m_pCurPlane->name());
         for (int i=Objects3d::planeOppCount()-1; i>=0; i--)
         {
             PlaneOpp *pPOpp = Objects3d::planeOppAt(i);
@@ -5285,6 +5295,7 @@ void Miarex::onRenameCurWPolar()
     }
 
     m_pCurWPolar->setPolarName(dlg.newName());
+    Objects3d::invalidateIndexes();
 
     //insert alphabetically
     bool bInserted = false;
@@ -5364,6 +5375,7 @@ void Miarex::onResetCurWPolar()
 
     if(m_pCurPlane)
     {
+        xfl::discardDeferredPlaneOpps(m_pCurPlane->name(), m_pCurWPolar->polarName());
         for(int i=Objects3d::planeOppCount()-1; i>=0; --i)
         {
             PlaneOpp *pPOpp =  Objects3d::planeOppAt(i);
@@ -8650,6 +8662,8 @@ void Miarex::onDefineWPolarHeadless(WPolar* pNewWPolar, Plane* plane)
 
 void Miarex::setAnalysisParamsHeadless(RpcLibAdapters::AnalysisSettings3D& analysis_settings)
 {
+    m_nPanelThreads = analysis_settings.n_threads;
+
     m_pchSequence->setChecked(analysis_settings.is_sequence);
 
     m_pdeAlphaMax->setEnabled(analysis_settings.is_sequence);
@@ -8753,3 +8767,105 @@ void Miarex::setAnalysisParamsHeadless(RpcLibAdapters::AnalysisSettings3D& analy
         m_plabParameterName->setFont(fontSymbol);*/
     }
 }
+
+
+/**
+ * Prepares the analysis of the current plane and polar without the analysis dialogs.
+ * Used by the server when the display is off: the task is then run in the server's thread.
+ * @return a pointer to the task ready to run, or nullptr if the analysis cannot be launched
+ */
+PlaneTask* Miarex::prepareTaskHeadless()
+{
+    double V0(0), VMax(0), VDelta(0);
+    int nThreads = m_nPanelThreads;
+    m_nPanelThreads = 1;
+
+    if(!m_pCurPlane || !m_pCurWPolar) return nullptr;
+
+    onReadAnalysisData();
+
+    if(m_pCurWPolar->polarType()==xfl::FIXEDAOAPOLAR)
+    {
+        V0     = m_QInfMin;
+        VMax   = m_QInfMax;
+        VDelta = m_QInfDelta;
+    }
+    else if(m_pCurWPolar->polarType()==xfl::STABILITYPOLAR)
+    {
+        V0     = m_ControlMin;
+        VMax   = m_ControlMax;
+        VDelta = m_ControlDelta;
+    }
+    else if(m_pCurWPolar->polarType()==xfl::BETAPOLAR)
+    {
+        V0     = m_BetaMin;
+        VMax   = m_BetaMax;
+        VDelta = m_BetaDelta;
+    }
+    else if(m_pCurWPolar->polarType() <xfl::FIXEDAOAPOLAR)
+    {
+        V0     = m_AlphaMin;
+        VMax   = m_AlphaMax;
+        VDelta = m_AlphaDelta;
+    }
+
+    for(int iw=0; iw<MAXWINGS; iw++)
+    {
+        if(pWing(iw))
+        {
+            Wing const*pwing = pWing(iw);
+            for (int l=0; l<pwing->NWingSection(); l++)
+            {
+                if (!Objects2d::foil(pwing->rightFoilName(l)) || !Objects2d::foil(pwing->leftFoilName(l)))
+                    return nullptr;
+            }
+        }
+    }
+
+    if(m_pCurWPolar->analysisMethod()==xfl::LLTMETHOD)
+    {
+        LLTAnalysis::s_bInitCalc = m_bInitLLTCalc;
+        LLTAnalysis::s_IterLim = m_LLTMaxIterations;
+        m_theTask.m_ptheLLTAnalysis->setCurvePointers(nullptr, nullptr); // no iteration graph to feed
+        m_theTask.initializeTask(m_pCurPlane, m_pCurWPolar, V0, VMax, VDelta, m_bSequence);
+    }
+    else if(m_theTask.matSize()>0)
+    {
+        m_theTask.initializeTask(m_pCurPlane, m_pCurWPolar, V0, VMax, VDelta, m_bSequence, nThreads);
+        m_theTask.stitchSurfaces();
+    }
+    else return nullptr;
+
+    // the dialogs of previous runs must not be notified
+    disconnect(&m_theTask, nullptr, nullptr, nullptr);
+    return &m_theTask;
+}
+
+
+/**
+ * Stores the operating points of a task run without the analysis dialogs, as the dialogs do on completion.
+ * The views are left untouched.
+ */
+void Miarex::onTaskFinishedHeadless()
+{
+    QVector<PlaneOpp*> &POppList = m_theTask.isLLTTask() ? m_theTask.m_ptheLLTAnalysis->m_PlaneOppList
+                                                         : m_theTask.m_pthePanelAnalysis->m_PlaneOppList;
+    if(PlaneOpp::s_bStoreOpps)
+    {
+        for(int iPOpp=0; iPOpp<POppList.size(); iPOpp++)
+        {
+            PlaneOpp *pPOpp = POppList.at(iPOpp);
+            if(DisplayOptions::isAlignedChildrenStyle()) pPOpp->setTheStyle(m_pCurWPolar->theStyle());
+            pPOpp->setVisible(true);
+
+            if(m_theTask.isLLTTask() || PlaneOpp::s_bKeepOutOpps || !pPOpp->isOut()) Objects3d::insertPOpp(pPOpp);
+            else delete pPOpp;
+        }
+    }
+    else
+    {
+        if(m_theTask.isLLTTask()) m_theTask.m_ptheLLTAnalysis->clearPOppList();
+        else                      m_theTask.m_pthePanelAnalysis->clearPOppList();
+    }
+    emit projectModified();
+}
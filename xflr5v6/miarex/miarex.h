@@ -231,11 +231,13 @@ class Miarex : public QWidget
         void onWPolarView();
 
     public slots:
-        void onAnalyze();
+        bool onAnalyze();
         // headless slots
         void onNewPlaneHeadless(Plane* pPlane); // perform updates on adding a new plane
         void onDefineWPolarHeadless(WPolar* wpolar, Plane* pPlane);
         void setAnalysisParamsHeadless(RpcLibAdapters::AnalysisSettings3D& analysis_settings);
+        PlaneTask* prepareTaskHeadless();
+        void onTaskFinishedHeadless();
 
 
     public:
@@ -272,7 +274,7 @@ class Miarex : public QWidget
         void drawColorGradient(QPainter &painter, QRect const & gradientRect);
         void paintCpLegendText(QPainter &painter);
         void paintPanelForceLegendText(QPainter &painter);
-        void panelAnalyze(double V0, double VMax, double VDelta, bool bSequence);
+        void panelAnalyze(double V0, double VMax, double VDelta, bool bSequence, int nThreads=1);
         void paintPlaneLegend(QPainter &painter, const Plane *pPlane, const WPolar *pWPolar, const QRect &drawRect, float devicePixelRatio);
         void paintPlaneOppLegend(QPainter &painter, QRect drawRect);
         QString POppTitle(PlaneOpp *pPOpp);
@@ -430,6 +432,7 @@ class Miarex : public QWidget
 
         int m_InducedDragPoint;     /**< 0 if downwash is at panel's centroid, 1 if averaged over panel length; used in CWing::VLMTrefftz */
         int m_LLTMaxIterations;     /**< the number of iterations for LLT */
+        int m_nPanelThreads;        /**< the threads of the panel solver for the next analysis; set by the server for its runs and reset to one when an analysis starts, so that the GUI analyses run on one thread */
         int m_posAnimateWOpp;       /**< the current animation aoa ind ex for WOpp animation */
         int m_posAnimateMode;       /**< the current animation aoa index for Mode animation */
         int m_WakeInterNodes;        /**< number of intermediate nodes between wake panels */
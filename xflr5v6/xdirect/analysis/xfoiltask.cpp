@@ -133,6 +133,42 @@ bool XFoilTask::initializeXFoilTask(Foil const*pFoil, Polar *pPolar, bool bVisco
     return true;
 }
 
+/**
+* Initializes the analysis of a new polar of the foil which this task has already analyzed.
+* The XFoil geometry is kept, and so is the boundary layer if the last point converged,
+* in which case it is the starting point of the first iterations of the new polar.
+* @param pFoil a pointer to the Foil, with the same coordinates as in the previous analysis
+* @param pPolar a pointer to the instance of the Polar object for which the calculation is run
+* @return true if the boundary layer of the previous analysis is reused
+*/
+bool XFoilTask::continueXFoilTask(Foil const*pFoil, Polar *pPolar, bool bViscous)
+{
+    bool bConverged = m_XFoilInstance.lvconv && m_XFoilInstance.isBLInitialized() && m_XFoilInstance.lvisc==bViscous;
+
+    s_bSkipOpp = s_bSkipPolar = false;
+
+    XFoil::setCancel(false);
+    m_bErrors = false;
+    m_pFoil = pFoil;
+    m_pPolar = pPolar;
+    m_bFromZero = false;
+    m_bIsFinished = false;
+    m_XFoilLog.clear();
+
+    if(!m_XFoilInstance.initXFoilAnalysis(m_pPolar->Reynolds(), m_pPolar->aoa(), m_pPolar->Mach(),
+                                          m_pPolar->NCrit(), m_pPolar->XtrTop(), m_pPolar->XtrBot(),
+                                          m_pPolar->ReType(), m_pPolar->MaType(),
+                                          bViscous, m_XFoilStream)) bConverged = false;
+
+    if(bConverged)
+    {
+        m_XFoilInstance.setBLInitialized(true);
+        m_XFoilInstance.lipan = true;
+    }
+    m_bInitBL = !bConverged;
+    return bConverged;
+}
+
 /** 
  * Sets the range of aoa or Cl parameters to analyze
  * @param bAlpha true if the input parameter is a range of aoa, false if a range of lift coefficients
@@ -62,6 +62,7 @@ class XFoilTask : public QRunnable
 
         bool initializeTask(FoilAnalysis &pFoilAnalysis, bool bViscous, bool bInitBL, bool bFromZero);
         bool initializeXFoilTask(const Foil *pFoil, Polar *pPolar, bool bViscous, bool bInitBL, bool bFromZero);
+        bool continueXFoilTask(const Foil *pFoil, Polar *pPolar, bool bViscous);
         bool iterate();
 
         void setSequence(bool bAlpha, double SpMin, double SpMax, double SpInc);
@@ -25,6 +25,7 @@
 #include <QRandomGenerator>
 
 #include "gatask.h"
+#include "mopsotask2d.h"
 
 #include <xflobjects/objects2d/foil.h>
 #include <xflcore/constants.h>
@@ -60,7 +61,7 @@ void GATask::setDimension(int n)
 
 void GATask::makeSwarm()
 {
-    m_Swarm.resize(s_PopSize);
+    m_Swarm.resize(m_PopSize);
     m_BestPosition.resize(m_HHn);
 
     if(s_bMultiThreaded)
@@ -69,7 +70,7 @@ void GATask::makeSwarm()
         for (int isw=0; isw<m_Swarm.size(); isw++)
         {
             Particle &particle = m_Swarm[isw];
-            futureSync.addFuture(QtConcurrent::run(this, &GATask::makeRandomParticle, &particle));
+            futureSync.addFuture(QtConcurrent::run(threadPool(), this, &GATask::makeRandomParticle, &particle));
         }
         futureSync.waitForFinished();
         outputMsg("   ...done");
@@ -83,7 +84,7 @@ void GATask::makeSwarm()
             outputMsg(QString::asprintf("   created particle %d", isw));
         }
     }
-    outputMsg(QString::asprintf("Made %d random particles\n", s_PopSize));
+    outputMsg(QString::asprintf("Made %d random particles\n", m_PopSize));
 }
 
 
@@ -122,6 +123,7 @@ void GATask::restoreDefaults()
 /** Posted when an iteration has ended */
 void GATask::postIterEvent(int iBest)
 {
+    if(!m_pParent) return;
     OptimEvent *pIterEvent = new OptimEvent(OPTIM_ITER_EVENT, m_Iter, iBest, m_Swarm.at(iBest));
     qApp->postEvent(m_pParent, pIterEvent);
 }
@@ -147,7 +149,7 @@ void GATask::onIteration()
     m_Iter++;
     postIterEvent(m_iBest);
 
-    if(m_Iter>=s_MaxIter || m_Error<m_Objective.m_MaxError)
+    if(m_Iter>=m_MaxIter || m_Error<m_Objective.m_MaxError)
     {
         outputMsg(QString::asprintf("The winner is particle %d\n", m_iBest));
         outputMsg(QString::asprintf("Residual error = %7.3g\n", m_Error));
@@ -157,7 +159,7 @@ void GATask::onIteration()
         postOptEndEvent(); // tell the GUI that the task is done
 
         // in case this task has been run in a worker thread, move it back to the main GUI thread so that it may be resumed
-        moveToThread(QApplication::instance()->thread());
+        moveToThread(QCoreApplication::instance()->thread());
     }
 }
 
@@ -305,7 +307,7 @@ void GATask::evaluatePopulation()
         for (int isw=0; isw<m_Swarm.size(); isw++)
         {
             Particle &particle = m_Swarm[isw];
-            futureSync.addFuture(QtConcurrent::run(this, &GATask::evaluateParticle, &particle));
+            futureSync.addFuture(QtConcurrent::run(threadPool(), this, &GATask::evaluateParticle, &particle));
         }
         futureSync.waitForFinished();
     }
@@ -336,17 +338,17 @@ void GATask::evaluatePopulation()
 // Note: QFutureSync requires that the parameters be passed by pointer and not by reference
 void GATask::evaluateParticle(Particle *pParticle) const
 {
-    double Cl = foilFunc(pParticle);
+    double value = foilFunc(pParticle);
 
-    while(Cl>LARGEVALUE/10.0)
+    while(value>LARGEVALUE/10.0)
     {
         // XFoil has failed to converge: make a new random particle
         makeRandomParticle(pParticle);
-        Cl = foilFunc(pParticle);
+        value = foilFunc(pParticle);
     }
 
-    pParticle->setFitness(0, Cl);
-    pParticle->setError(0, fabs(Cl-m_Objective.m_Target));
+    pParticle->setFitness(0, value);
+    pParticle->setError(0, fabs(value-m_Objective.m_Target));
 }
 
 
@@ -392,12 +394,12 @@ double GATask::foilFunc(Particle const*pParticle) const
     task->initializeXFoilTask(&tempfoil, m_pPolar, bViscous, bInitBL, false);
     task->run();
 
-    double Cl = LARGEVALUE;
-    if(xfoil.lvconv) Cl = xfoil.cl;
+    double value = LARGEVALUE;
+    if(xfoil.lvconv) value = MOPSOTask2d::objectiveValue(xfoil, m_Objective.m_Name);
 
     delete task;
 
-    return Cl;
+    return value;
 }
 
 /** Hicks-Henne bump function
@@ -437,7 +439,7 @@ void GATask::calcFitness(Particle *pParticle) const
 
     if(xfoil.lvconv)
     {
-        pParticle->setFitness(0, xfoil.cl);
+        pParticle->setFitness(0, MOPSOTask2d::objectiveValue(xfoil, m_Objective.m_Name));
     }
     else pParticle->setFitness(0, LARGEVALUE); // set and unlikely value
 
@@ -41,6 +41,8 @@ class GATask : public OptimTask
 {
     Q_OBJECT
 
+        friend class FoilOptim;
+
     public:
         GATask();
 
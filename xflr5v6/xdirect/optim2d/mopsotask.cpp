@@ -60,12 +60,10 @@ void MOPSOTask::restoreDefaults()
 
 void MOPSOTask::makeSwarm()
 {
-    QApplication::setOverrideCursor(Qt::WaitCursor);
-
     m_Iter = 0;
 
     outputMsg("Making swarm...\n");
-    m_Swarm.resize(s_PopSize);
+    m_Swarm.resize(m_PopSize);
 
     // no need to multithread, no fitness calculation
     for (int i=0; i<m_Swarm.size(); ++i)
@@ -80,7 +78,7 @@ void MOPSOTask::makeSwarm()
         for (int isw=0; isw<m_Swarm.size(); ++isw)
         {
            Particle &particle = m_Swarm[isw];
-           futureSync.addFuture(QtConcurrent::run(this, &MOPSOTask::calcFitness, &particle));
+           futureSync.addFuture(QtConcurrent::run(threadPool(), this, &MOPSOTask::calcFitness, &particle));
         }
         futureSync.waitForFinished();
     }
@@ -95,18 +93,16 @@ void MOPSOTask::makeSwarm()
             m_Swarm[i].setError(iobj, error(&m_Swarm.at(i), iobj));
 
     outputMsg(QString::asprintf("Made %d random particles\n", m_Swarm.size()));
-
-    QApplication::restoreOverrideCursor();
 }
 
 
 void MOPSOTask::onSwarm()
 {
-    if(m_Swarm.size()==0 || m_Swarm.size()!=s_PopSize)
+    if(m_Swarm.size()==0 || m_Swarm.size()!=m_PopSize)
     {
         outputMsg("Swarm has not been created\n");
         postPSOEvent(-1); // notifiy finished
-        moveToThread(QApplication::instance()->thread());
+        moveToThread(QCoreApplication::instance()->thread());
         return;
     }
 
@@ -129,7 +125,7 @@ void MOPSOTask::onIteration()
         for (int isw=0; isw<m_Swarm.size(); ++isw)
         {
            Particle &particle = m_Swarm[isw];
-           futureSync.addFuture(QtConcurrent::run(this, &MOPSOTask::moveParticle, &particle));
+           futureSync.addFuture(QtConcurrent::run(threadPool(), this, &MOPSOTask::moveParticle, &particle));
         }
         futureSync.waitForFinished();
     }
@@ -175,18 +171,18 @@ void MOPSOTask::onIteration()
 
     postIterEvent(iBest0);
 
-    if(m_Iter>=s_MaxIter || bIsConverged || m_Status==xfl::CANCELLED)
+    if(m_Iter>=m_MaxIter || bIsConverged || m_Status==xfl::CANCELLED)
     {
         if     (bIsConverged)             outputMsg("   ---Converged---\n");
         else if(m_Status==xfl::CANCELLED) outputMsg("The task has been cancelled\n");
-        else if(m_Iter>=s_MaxIter)        outputMsg("The maximum number of iterations has been reached\n");
+        else if(m_Iter>=m_MaxIter)        outputMsg("The maximum number of iterations has been reached\n");
 
         m_Status = xfl::FINISHED;
 
         postPSOEvent(iBest0); // tell the GUI that the task is done
 
         // this task may be resumed, so move it back to the main GUI thread
-        moveToThread(QApplication::instance()->thread());
+        moveToThread(QCoreApplication::instance()->thread());
     }
 }
 
@@ -247,6 +243,7 @@ void MOPSOTask::moveParticle(Particle *pParticle) const
 /** Posted when an iteration has ended */
 void MOPSOTask::postIterEvent(int iBest)
 {
+    if(!m_pParent) return;
     OptimEvent *pIterEvent = new OptimEvent(OPTIM_ITER_EVENT, m_Iter, iBest, m_Pareto.at(iBest));
     qApp->postEvent(m_pParent, pIterEvent);
 }
@@ -255,6 +252,7 @@ void MOPSOTask::postIterEvent(int iBest)
 /** Posted when the iteration loop has ended */
 void MOPSOTask::postPSOEvent(int iBest)
 {
+    if(!m_pParent) return;
     OptimEvent *pPSOEvent = new OptimEvent(OPTIM_END_EVENT, m_Iter, iBest, m_Pareto.at(iBest));
     qApp->postEvent(m_pParent, pPSOEvent);
 }
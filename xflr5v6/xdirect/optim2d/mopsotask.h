@@ -34,6 +34,7 @@ class MOPSOTask : public OptimTask
 
         friend class Optim2d;
         friend class Optim3d;
+        friend class FoilOptim;
 
     public:
         MOPSOTask();
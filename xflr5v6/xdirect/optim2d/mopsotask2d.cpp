@@ -83,25 +83,43 @@ void MOPSOTask2d::calcFitness(Particle *pParticle) const
     task->initializeXFoilTask(&tempfoil, m_pPolar, bViscous, bInitBL, false);
     task->run();
 
-    double Cl = LARGEVALUE;
-    double Cd = LARGEVALUE;
-    if(xfoil.lvconv)
+    for(int iobj=0; iobj<m_Objective.size(); iobj++)
     {
-        Cl = xfoil.cl;
-        Cd = xfoil.cd;
-    }
-    else
-    {
-        // just to keep a reasonable scale for the Pareto graph
-        Cl = 2.0;
-        Cd = 0.5;
-
+        QString const &name = m_Objective.at(iobj).m_Name;
+        if(xfoil.lvconv)
+            pParticle->setFitness(iobj, objectiveValue(xfoil, name));
+        else
+        {
+            // just to keep a reasonable scale for the Pareto graph
+            if     (name=="Cd")    pParticle->setFitness(iobj, 0.5);
+            else if(name=="Cm")    pParticle->setFitness(iobj, 1.0);
+            else if(name=="Cl/Cd") pParticle->setFitness(iobj, 0.0);
+            else                   pParticle->setFitness(iobj, 2.0);
+        }
     }
 
     delete task;
+}
+
 
-    pParticle->setFitness(0, Cl);
-    pParticle->setFitness(1, Cd);
+/** The names of the objectives which the fitness functions of the 2d tasks can evaluate */
+QStringList MOPSOTask2d::objectiveNames()
+{
+    return {"Cl", "Cd", "Cm", "Cl/Cd"};
+}
+
+
+/** The value of the objective for the last point analyzed by xfoil. Unknown names return Cl */
+double MOPSOTask2d::objectiveValue(XFoil const &xfoil, QString const &name)
+{
+    if(name=="Cd") return xfoil.cd;
+    if(name=="Cm") return xfoil.cm;
+    if(name=="Cl/Cd")
+    {
+        if(fabs(xfoil.cd)<PRECISION) return 0.0;
+        return xfoil.cl/xfoil.cd;
+    }
+    return xfoil.cl;
 }
 
 
@@ -24,6 +24,7 @@
 #include "mopsotask.h"
 
 class Foil;
+class XFoil;
 
 class MOPSOTask2d : public MOPSOTask
 {
@@ -38,6 +39,9 @@ class MOPSOTask2d : public MOPSOTask
 
         void makeFoil(Particle const &particle, Foil *pFoil) const;
 
+        static QStringList objectiveNames();
+        static double objectiveValue(XFoil const &xfoil, QString const &name);
+
     private:
         void calcFitness(Particle *pParticle) const override;
         double error(Particle const *pParticle, int iObjective) const override;
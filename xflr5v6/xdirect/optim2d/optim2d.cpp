@@ -827,6 +827,7 @@ void Optim2d::onOptimize()
         }
 
         m_pPSOTask->setAnalysisStatus(xfl::RUNNING);
+        m_pPSOTask->setMaxIter(OptimTask::s_MaxIter);
         m_pPSOTask->restartIterations();
         m_pPSOTask->clearPareto();  // current Pareto may be obsolete if target values have changed since swarm creation
         m_pPSOTask->makeParetoFront();
@@ -855,6 +856,7 @@ void Optim2d::onOptimize()
             return;
         }
         m_pGATask->setAnalysisStatus(xfl::RUNNING);
+        m_pGATask->setMaxIter(OptimTask::s_MaxIter);
         m_pGATask->restartIterations();
 
         disconnect(&m_Timer, nullptr, nullptr, nullptr);
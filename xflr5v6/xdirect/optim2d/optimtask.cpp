@@ -21,6 +21,7 @@
 
 #include <QApplication>
 #include <QDebug>
+#include <QThreadPool>
 
 #include "optimtask.h"
 
@@ -32,12 +33,24 @@ bool OptimTask::s_bMultiThreaded    = true;
 OptimTask::OptimTask()
 {
     m_Iter = 0;
+    m_PopSize = s_PopSize;
+    m_MaxIter = s_MaxIter;
+    m_pParent = nullptr;
+    m_pThreadPool = nullptr;
     m_Status = xfl::PENDING;
 }
 
 
+QThreadPool *OptimTask::threadPool() const
+{
+    if(m_pThreadPool) return m_pThreadPool;
+    return QThreadPool::globalInstance();
+}
+
+
 void OptimTask::outputMsg(QString const &msg) const
 {
+    if(!m_pParent) return;
     MessageEvent * pMsgEvent = new MessageEvent(msg);
     qApp->postEvent(m_pParent, pMsgEvent);
 }
@@ -67,6 +80,7 @@ void OptimTask::listPopulation() const
 /** Posted when the iteration loop has ended */
 void OptimTask::postOptEndEvent()
 {
+    if(!m_pParent) return;
     QEvent *pOptimEvent = new QEvent(OPTIM_END_EVENT);
     qApp->postEvent(m_pParent, pOptimEvent);
 }
@@ -36,6 +36,8 @@
 #include "particle.h"
 #include "optstructures.h"
 
+class QThreadPool;
+
 /**
  * @brief Abstract base class for optimization MOPSO and GA tasks.
  * Run the task using either a worker thread or a timer https://doc.qt.io/qt-5/thread-basics.html
@@ -45,10 +47,16 @@ class OptimTask : public QObject
 {
     Q_OBJECT
 
+        friend class FoilOptim;
+
     public:
         OptimTask();
 
         void setParent(QWidget *pParent) {m_pParent=pParent;}
+        void setThreadPool(QThreadPool *pPool) {m_pThreadPool=pPool;}
+
+        void setPopSize(int n) {m_PopSize=n;}
+        void setMaxIter(int n) {m_MaxIter=n;}
 
         virtual void setDimension(int n) {m_Variable.resize(n);}
         virtual void makeSwarm() = 0;
@@ -78,6 +86,7 @@ class OptimTask : public QObject
         static void setMultithreaded(bool b) {s_bMultiThreaded=b;}
 
     protected:
+        QThreadPool *threadPool() const;
         void checkBounds(Particle &particle) const;
         virtual void makeRandomParticle(Particle *pParticle) const = 0;
 
@@ -97,7 +106,10 @@ class OptimTask : public QObject
         QVector<Particle> m_Swarm; // the swarm
 
         int m_Iter;
-        QObject *m_pParent;
+        int m_PopSize;      /**< initialized with s_PopSize */
+        int m_MaxIter;      /**< initialized with s_MaxIter */
+        QObject *m_pParent; /**< receives the messages and the iteration events, may be null */
+        QThreadPool *m_pThreadPool; /**< evaluates the particles, the global pool if null */
         xfl::enumAnalysisStatus m_Status;
 
         // size = dim
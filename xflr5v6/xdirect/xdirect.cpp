@@ -1549,6 +1549,8 @@ void XDirect::onDeleteCurPolar()
     if (QMessageBox::Yes == QMessageBox::question(s_pMainFrame, tr("Question"), str,
                                                   QMessageBox::Yes|QMessageBox::No|QMessageBox::Cancel))
     {
+        xfl::discardDeferredOpps(Objects2d::curFoil()->name(), Objects2d::curPolar()->polarName());
+
         // start by removing all OpPoints
         for (l=m_poaOpp->size()-1; l>=0; l--)
         {
@@ -1589,6 +1591,8 @@ void XDirect::onDeletePolarOpps()
 {
     if(!Objects2d::curFoil() || !Objects2d::curPolar()) return;
 
+    xfl::discardDeferredOpps(Objects2d::curFoil()->name(), Objects2d::curPolar()->polarName());
+
     for(int i=m_poaOpp->size()-1; i>=0; i--)
     {
         OpPoint *pOpp = m_poaOpp->at(i);
@@ -1626,6 +1630,8 @@ void XDirect::onDeleteFoilOpps()
         }
     }
 
+    xfl::discardDeferredOpps(Objects2d::curFoil()->name());
+
     for(int i=m_poaOpp->size()-1; i>=0; i--)
     {
         OpPoint *pOpp = m_poaOpp->at(i);
@@ -1665,6 +1671,8 @@ void XDirect::onDeleteFoilPolars()
                                                   QMessageBox::Yes|QMessageBox::No|QMessageBox::Cancel))
 
     {
+        xfl::discardDeferredOpps(Objects2d::curFoil()->name());
+
         // start by removing all OpPoints
         for (int l=m_poaOpp->size()-1; l>=0; l--)
         {
@@ -3326,6 +3334,7 @@ void XDirect::onRenameCurPolar()
             return ;//cancelled
         }
     }
+    Objects2d::invalidateIndexes();
     m_pFoilTreeView->fillModelView();
     m_pFoilTreeView->selectPolar(Objects2d::curPolar());
     updateView();
@@ -3355,6 +3364,7 @@ void XDirect::onResetCurPolar()
 {
     if(!Objects2d::curPolar()) return;
     Objects2d::curPolar()->resetPolar();
+    xfl::discardDeferredOpps(Objects2d::curFoil()->name(), Objects2d::curPolar()->polarName());
 
     OpPoint*pOpp;
     for(int i=m_poaOpp->size()-1;i>=0;i--)
@@ -29,6 +29,7 @@
 #include <xflobjects/objects3d/planeopp.h>
 #include <xflobjects/objects3d/wpolar.h>
 #include <xflobjects/objects3d/wing.h>
+#include <xflobjects/objects2d/polarindex.h>
 #include <xflcore/matrix.h>
 
 int LLTAnalysis::s_IterLim = 100;
@@ -46,6 +47,7 @@ LLTAnalysis::LLTAnalysis()
     m_pX = m_pY = nullptr;
 
     m_poaPolar = nullptr;
+    m_pPolarIndex = nullptr;
     resetVariables();
 }
 
@@ -918,7 +920,10 @@ PlaneOpp* LLTAnalysis::createPlaneOpp(double QInf, double Alpha, bool bWingOut)
 
     //add the data to the polar object
     if(PlaneOpp::s_bKeepOutOpps || !pNewPOpp->m_bOut)
+    {
         m_pWPolar->addPlaneOpPoint(pNewPOpp);
+        emit planeOppAdded(pNewPOpp);
+    }
 
     return pNewPOpp;
 }
@@ -1356,6 +1361,8 @@ double LLTAnalysis::getZeroLiftAngle(const Foil *pFoil0, const Foil *pFoil1, dou
 */
 double LLTAnalysis::getPlrPointFromAlpha(Foil const*pFoil, double Re, double Alpha, int PlrVar, bool &bOutRe, bool &bError)
 {
+    if(m_pPolarIndex) return m_pPolarIndex->getPlrPointFromAlpha(pFoil, Re, Alpha, PlrVar, bOutRe, bError);
+
     double amin=0, amax=0;
     double Var1=0, Var2=0, u=0;
 
@@ -1603,6 +1610,17 @@ void LLTAnalysis::getLinearizedPolar(Foil *pFoil0, Foil *pFoil1, double Re, doub
     double Slope0=0, Slope1=0;
     double AlphaTemp1=0, AlphaTemp2=0, SlopeTemp1=0, SlopeTemp2=0;
 
+    if(m_pPolarIndex)
+    {
+        Alpha00 = Alpha01 = 0.0;
+        Slope0 = Slope1 = 2.0 * PI *PI/180.0;
+        m_pPolarIndex->getLinearizedCl(pFoil0, Re, Alpha00, Slope0);
+        m_pPolarIndex->getLinearizedCl(pFoil1, Re, Alpha01, Slope1);
+        Alpha0 = ((1-Tau) * Alpha00 + Tau * Alpha01);
+        Slope  = ((1-Tau) * Slope0  + Tau * Slope1);
+        return;
+    }
+
     //Find the two polars which enclose the Reynolds number
     int size = 0;
     Polar *pPolar=nullptr, *pPolar1=nullptr, *pPolar2=nullptr;
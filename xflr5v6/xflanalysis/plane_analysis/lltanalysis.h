@@ -53,8 +53,9 @@ class PlaneOpp;
 class PlaneTaskEvent;
 class Wing;
 class Polar;
+class PolarIndex;
 
-class LLTAnalysis : QObject
+class LLTAnalysis : public QObject
 {
     Q_OBJECT
 
@@ -63,6 +64,7 @@ class LLTAnalysis : QObject
     friend class MainFrame;
     friend class LLTAnalysisDlg;
     friend class XflScriptExec;
+    friend class HeadlessFrame;
 
 public:
     LLTAnalysis();
@@ -125,6 +127,7 @@ private:
 
 signals:
     void outputMsg(QString msg);
+    void planeOppAdded(PlaneOpp *pPOpp); /**< emitted in the analysis thread when an operating point has been added to the polar */
 
 public slots:
     void onCancel();
@@ -195,6 +198,7 @@ private:
 
     QVector<PlaneOpp*> m_PlaneOppList;
     QVector<Polar*> const *m_poaPolar;
+    PolarIndex const *m_pPolarIndex;            /**< if set, the interpolations use it instead of walking m_poaPolar */
 };
 
 #endif // LLTANALYSIS_H
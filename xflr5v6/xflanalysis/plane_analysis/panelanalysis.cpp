@@ -21,6 +21,8 @@
 *****************************************************************************/
 
 #include <QElapsedTimer>
+#include <QFutureSynchronizer>
+#include <QtConcurrent/QtConcurrentRun>
 #include <QTime>
 #include <QThread>
 #include <QCoreApplication>
@@ -50,6 +52,7 @@ PanelAnalysis::PanelAnalysis()
     m_nRHS = 0;
     s_MaxRHSSize = VLMMAXRHS;
     m_MaxMatSize = 0;
+    m_nThreads = 1;
 
 
     m_Progress = m_TotalTime = 0.0;
@@ -71,6 +74,7 @@ PanelAnalysis::PanelAnalysis()
 
     m_pWPolar = nullptr;
     m_pPlane  = nullptr;
+    m_pPolarIndex = nullptr;
     m_ppSurface = nullptr;
 
     m_pPanel         = nullptr;
@@ -708,10 +712,43 @@ bool PanelAnalysis::alphaLoop()
 
 
 
+/**
+* Sets the number of threads used by the analysis. PlaneTask sets it before each run.
+* @param nThreads the number of threads; 0 or less uses all the cores
+*/
+void PanelAnalysis::setThreadCount(int nThreads)
+{
+    m_nThreads = nThreads>0 ? nThreads : QThread::idealThreadCount();
+}
+
+
 /**
 * Builds the influence matrix, both for VLM or Panel calculations.
+* The rows are independent, so they are split in blocks between m_nThreads threads.
 */
 void PanelAnalysis::buildInfluenceMatrix()
+{
+    traceLog("      Creating the influence matrix...");
+    traceLog("\n");
+
+    if(m_nThreads>1 && m_MatSize>=m_nThreads)
+    {
+        int blockSize = (m_MatSize+m_nThreads-1)/m_nThreads;
+        QFutureSynchronizer<void> futureSync;
+        for(int iFirst=0; iFirst<m_MatSize; iFirst+=blockSize)
+            futureSync.addFuture(QtConcurrent::run(this, &PanelAnalysis::buildInfluenceRows, iFirst, qMin(iFirst+blockSize, m_MatSize)));
+        futureSync.waitForFinished();
+    }
+    else buildInfluenceRows(0, m_MatSize);
+
+    m_Progress += 10.0*double(m_MatSize)/400.;
+}
+
+
+/**
+* Builds the rows iFirst to iLast-1 of the influence matrix
+*/
+void PanelAnalysis::buildInfluenceRows(int iFirst, int iLast)
 {
     Vector3d C, CC, V;
     int m, mm, p, pp;
@@ -720,10 +757,8 @@ void PanelAnalysis::buildInfluenceMatrix()
     int Size = m_MatSize;
     //    if(m_b3DSymetric) Size = m_SymSize;
 
-    traceLog("      Creating the influence matrix...");
-    traceLog("\n");
-    m=0;
-    for(p=0; p<m_MatSize; p++)
+    m=iFirst;
+    for(p=iFirst; p<iLast; p++)
     {
         if(s_bCancel) return;
         //        if(!m_b3DSymetric || m_pPanel[p].m_bIsLeftPanel)
@@ -769,7 +804,6 @@ void PanelAnalysis::buildInfluenceMatrix()
         }
         m++;
         //        }
-        m_Progress += 10.0*double(Size)/400./double(Size);
     }
 }
 
@@ -1501,7 +1535,7 @@ void PanelAnalysis::computePlane(double Alpha, double QInf, int qrhs)
                 IDrag += m_WingIDrag[qrhs*MAXWINGS+iw];
 
                 //Get viscous interpolations
-                m_pWingList[iw]->panelComputeViscous(QInf, m_pWPolar, WingVDrag, m_pWPolar->bViscous(), OutString);
+                m_pWingList[iw]->panelComputeViscous(QInf, m_pWPolar, WingVDrag, m_pWPolar->bViscous(), OutString, m_pPolarIndex);
                 VDrag += WingVDrag;
 
                 traceLog(OutString);
@@ -1782,43 +1816,24 @@ void PanelAnalysis::computeOnBodyCp(double V0, double VDelta, int nval)
     //following VSAERO theory manual
     //the on-body tangential perturbation speed is the derivative of the doublet strength
 
-    double Alpha, *Mu, *Cp;
+    double *Mu, *Cp;
     Vector3d WindDirection, VInf, VLocal;
-    double Speed2, cosa, sina;
     //______________________________________________________________________________________
     traceLog("      Computing On-Body Speeds...\n");
 
     if(m_pWPolar->polarType() != xfl::FIXEDAOAPOLAR)
     {
-        for (int q=0; q<nval; q++)
+        // the operating points are independent
+        if(m_nThreads>1 && nval>1)
         {
-            //   Define wind axis
-            Alpha = V0 + double(q) * VDelta;
-            cosa = cos(Alpha*PI/180.0);
-            sina = sin(Alpha*PI/180.0);
-            WindDirection.set(cosa, 0.0, sina);
-            VInf = WindDirection * m_3DQInf[q];
-
-            Mu     = m_Mu    + q * m_MatSize;
-            //            Sigma  = m_Sigma + q * m_MatSize;
-            Cp     = m_Cp    + q * m_MatSize;
-
-            for (int p=0; p<m_MatSize; p++)
-            {
-                if(m_pPanel[p].m_Pos!=xfl::MIDSURFACE)
-                {
-                    m_pPanel[p].globalToLocal(VInf, VLocal);
-                    VLocal += m_uVl[p]*cosa*m_3DQInf[q] + m_wVl[p]*sina*m_3DQInf[q];
-                    Speed2 = VLocal.x*VLocal.x + VLocal.y*VLocal.y;
-                    Cp[p]  = 1.0-Speed2/m_3DQInf[q]/m_3DQInf[q];
-                }
-                else getVortexCp(p, Mu, Cp, WindDirection);
-
-                if(s_bCancel) return;
-            }
-            if(s_bCancel) return;
-            m_Progress += 1.0 *double(nval)/double(nval);
+            int blockSize = (nval+m_nThreads-1)/m_nThreads;
+            QFutureSynchronizer<void> futureSync;
+            for(int qFirst=0; qFirst<nval; qFirst+=blockSize)
+                futureSync.addFuture(QtConcurrent::run(this, &PanelAnalysis::computeOnBodyCpBlock, V0, VDelta, qFirst, qMin(qFirst+blockSize, nval)));
+            futureSync.waitForFinished();
         }
+        else computeOnBodyCpBlock(V0, VDelta, 0, nval);
+        m_Progress += double(nval);
     }
     else //FIXEDAOAPOLAR
     {
@@ -1855,6 +1870,46 @@ void PanelAnalysis::computeOnBodyCp(double V0, double VDelta, int nval)
 
 
 
+/**
+* Computes the on-body Cp for the operating points qFirst to qLast-1 of a sequence of aoa.
+* @param V0 the first aoa of the sequence
+* @param VDelta the aoa increment
+*/
+void PanelAnalysis::computeOnBodyCpBlock(double V0, double VDelta, int qFirst, int qLast)
+{
+    double Alpha, *Mu, *Cp;
+    Vector3d WindDirection, VInf, VLocal;
+    double Speed2, cosa, sina;
+
+    for (int q=qFirst; q<qLast; q++)
+    {
+        //   Define wind axis
+        Alpha = V0 + double(q) * VDelta;
+        cosa = cos(Alpha*PI/180.0);
+        sina = sin(Alpha*PI/180.0);
+        WindDirection.set(cosa, 0.0, sina);
+        VInf = WindDirection * m_3DQInf[q];
+
+        Mu     = m_Mu    + q * m_MatSize;
+        Cp     = m_Cp    + q * m_MatSize;
+
+        for (int p=0; p<m_MatSize; p++)
+        {
+            if(m_pPanel[p].m_Pos!=xfl::MIDSURFACE)
+            {
+                m_pPanel[p].globalToLocal(VInf, VLocal);
+                VLocal += m_uVl[p]*cosa*m_3DQInf[q] + m_wVl[p]*sina*m_3DQInf[q];
+                Speed2 = VLocal.x*VLocal.x + VLocal.y*VLocal.y;
+                Cp[p]  = 1.0-Speed2/m_3DQInf[q]/m_3DQInf[q];
+            }
+            else getVortexCp(p, Mu, Cp, WindDirection);
+
+            if(s_bCancel) return;
+        }
+    }
+}
+
+
 /**
 * Returns the influence at point C of the panel pPanel.
 * If the panel pPanel is located on a thin surface, then its the influence of a vortex.
@@ -2092,7 +2147,7 @@ bool PanelAnalysis::solveUnitRHS()
 
     traceLog("      Performing LU Matrix decomposition...\n");
 
-    if(!Crout_LU_Decomposition_with_Pivoting(m_aij, m_Index, Size, &s_bCancel, taskTime*double(m_MatSize)/400.0, m_Progress))
+    if(!Crout_LU_Decomposition_with_Pivoting(m_aij, m_Index, Size, &s_bCancel, taskTime*double(m_MatSize)/400.0, m_Progress, m_nThreads))
     {
         traceLog("      Singular Matrix.... Aborting calculation...\n");
         return false;
@@ -3044,7 +3099,7 @@ void PanelAnalysis::forces(double *Mu, double *Sigma, double alpha, Vector3d Vin
                 m_ppSurface->at(j)->getC4(k, PtC4, tau);
                 Re = m_ppSurface->at(j)->chord(tau) * QInfStrip /m_pWPolar->viscosity();
                 Cl = StripForce.dot(WindNormal)*m_pWPolar->density()/qdyn/StripArea;
-                PCd    = Wing::getInterpolatedVariable(2, m_ppSurface->at(j)->m_pFoilA, m_ppSurface->at(j)->m_pFoilB, Re, Cl, tau, bOutRe, bError);
+                PCd    = Wing::getInterpolatedVariable(2, m_ppSurface->at(j)->m_pFoilA, m_ppSurface->at(j)->m_pFoilB, Re, Cl, tau, bOutRe, bError, m_pPolarIndex);
                 PCd   *= StripArea * 1./2.*QInfStrip*QInfStrip;             // Newtons/rho
                 bOut = bOut || bOutRe || bError;
                 ViscousDrag += PCd ;                                         // Newtons/rho
@@ -4345,7 +4400,10 @@ PlaneOpp* PanelAnalysis::createPlaneOpp(double *Cp, double const *Gamma, double
 
     //add the data to the polar object
     if(PlaneOpp::s_bKeepOutOpps || !pPOpp->isOut())
+    {
         m_pWPolar->addPlaneOpPoint(pPOpp);
+        emit planeOppAdded(pPOpp);
+    }
 
     return pPOpp;
 }
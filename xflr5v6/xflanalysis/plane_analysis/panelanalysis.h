@@ -42,8 +42,9 @@ class PlaneTaskEvent;
 class Wing;
 class Polar;
 class Surface;
+class PolarIndex;
 
-class PanelAnalysis : QObject
+class PanelAnalysis : public QObject
 {
     Q_OBJECT
 
@@ -71,9 +72,11 @@ class PanelAnalysis : QObject
         bool getZeroMomentAngle();
 
         void buildInfluenceMatrix();
+        void buildInfluenceRows(int iFirst, int iLast);
 
         void computeAeroCoefs(double V0, double VDelta, int nrhs);
         void computeOnBodyCp(double V0, double VDelta, int nval);
+        void computeOnBodyCpBlock(double V0, double VDelta, int qFirst, int qLast);
         void computePlane(double Alpha, double QInf, int qrhs);
         void computeFarField(double QInf, double Alpha0, double AlphaDelta, int nval);
         void computeBalanceSpeeds(double Alpha, int q);
@@ -135,9 +138,12 @@ class PanelAnalysis : QObject
         static bool s_bCancel;      /**< true if the user has cancelled the analysis */
         static bool s_bWarning;     /**< true if one the OpPoints could not be properly interpolated */
         static void setMaxWakeIter(int nMaxWakeIter) {s_MaxWakeIter = nMaxWakeIter;}
+        void setThreadCount(int nThreads);
+        int threadCount() const {return m_nThreads;}
 
     signals:
         void outputMsg(QString msg) const;
+        void planeOppAdded(PlaneOpp *pPOpp) const; /**< emitted in the analysis thread when an operating point has been added to the polar */
 
     public slots:
         void onCancel();
@@ -150,6 +156,7 @@ class PanelAnalysis : QObject
         int m_MaxMatSize;    /**< the size currently allocated for the influence matrix >*/
 
         static int s_MaxWakeIter;                 /**< wake roll-up iteration limit */
+        int m_nThreads;                           /**< number of threads used for the influence matrix, its LU decomposition and the on-body Cp */
 
         double m_Progress;   /**< A measure of the progress of the analysis, used to provide feedback to the user */
         double m_TotalTime;     /**< the esimated total time of the analysis, used to set the progress bar. No specific unit. */
@@ -233,6 +240,7 @@ class PanelAnalysis : QObject
         // pointers to the object input data
         Plane *m_pPlane;            /**< a pointer to the plane object, or NULL if the calculation is performed on a wing */
         WPolar *m_pWPolar;          /**< a pointer to the current WPolar object */
+        PolarIndex const *m_pPolarIndex; /**< if set, the viscous interpolations use it instead of walking the polar array */
 
         //temp data
         int m_NSpanStations;
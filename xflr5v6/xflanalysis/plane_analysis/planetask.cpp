@@ -36,10 +36,13 @@ PlaneTask::PlaneTask()
 {
     m_pPlane = nullptr;
     m_pWPolar = nullptr;
+    m_pthePanelAnalysis = nullptr;
+    m_ptheLLTAnalysis = nullptr;
 
     m_vMin = m_vMax = m_vInc = 0.0;
     m_MaxPanelSize = 0;
     m_bSequence = true;
+    m_nThreads = 1;
     m_bIsFinished = false;
 
     m_WakeSize = 0;
@@ -54,7 +57,7 @@ PlaneTask::~PlaneTask()
 }
 
 
-void PlaneTask::initializeTask(Plane *pPlane, WPolar *pWPolar, double vMin, double vMax, double VInc, bool bSequence)
+void PlaneTask::initializeTask(Plane *pPlane, WPolar *pWPolar, double vMin, double vMax, double VInc, bool bSequence, int nThreads)
 {
     m_pPlane = pPlane;
     m_pWPolar = pWPolar;
@@ -63,6 +66,7 @@ void PlaneTask::initializeTask(Plane *pPlane, WPolar *pWPolar, double vMin, doub
     m_vMax = vMax;
     m_vInc = VInc;
     m_bSequence = bSequence;
+    m_nThreads = nThreads;
 }
 
 
@@ -75,6 +79,7 @@ void PlaneTask::initializeTask(PlaneAnalysis *pAnalysis)
     m_vMax = pAnalysis->vMax;
     m_vInc = pAnalysis->vInc;
     m_bSequence = true;
+    m_nThreads = 1;
 }
 
 
@@ -86,6 +91,14 @@ void PlaneTask::run()
         return;
     }
 
+    // the polars do not change during the analysis, so they are sorted once for all the span stations and iterations
+    if(m_pWPolar->bViscous() && Wing::s_poaPolar)
+    {
+        m_PolarIndex.build(*Wing::s_poaPolar);
+        if(m_ptheLLTAnalysis)   m_ptheLLTAnalysis->m_pPolarIndex   = &m_PolarIndex;
+        if(m_pthePanelAnalysis) m_pthePanelAnalysis->m_pPolarIndex = &m_PolarIndex;
+    }
+
     if(m_pWPolar->isLLTMethod())
     {
         LLTAnalyze();
@@ -95,6 +108,10 @@ void PlaneTask::run()
         PanelAnalyze();
     }
 
+    if(m_ptheLLTAnalysis)   m_ptheLLTAnalysis->m_pPolarIndex   = nullptr;
+    if(m_pthePanelAnalysis) m_pthePanelAnalysis->m_pPolarIndex = nullptr;
+    m_PolarIndex.clear();
+
     m_bIsFinished = true;
 
     emit taskFinished();
@@ -1624,6 +1641,7 @@ void PlaneTask::PanelAnalyze()
     m_bIsFinished   = false;
 
     m_pthePanelAnalysis->setRange(m_vMin, m_vMax, m_vInc, m_bSequence);
+    m_pthePanelAnalysis->setThreadCount(m_nThreads);
 
     m_pthePanelAnalysis->m_OpBeta = m_pWPolar->Beta();
 
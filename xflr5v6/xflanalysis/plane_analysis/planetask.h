@@ -28,6 +28,7 @@
 
 #include <xflanalysis/plane_analysis/lltanalysis.h>
 #include <xflanalysis/plane_analysis/panelanalysis.h>
+#include <xflobjects/objects2d/polarindex.h>
 
 class Plane;
 class WPolar;
@@ -62,7 +63,7 @@ class PlaneTask : public QObject
         PlaneTask();
         ~PlaneTask();
 
-        void initializeTask(Plane *pPlane, WPolar *pWPolar, double vMin, double vMax, double VInc, bool bSequence = true);
+        void initializeTask(Plane *pPlane, WPolar *pWPolar, double vMin, double vMax, double VInc, bool bSequence = true, int nThreads = 1);
         void initializeTask(PlaneAnalysis *pAnalysis);
 
         bool   allocatePanelArrays(int &memsize);
@@ -130,8 +131,11 @@ class PlaneTask : public QObject
 
         QVector<Surface *> m_SurfaceList;        /**< An array holding the pointers to the wings Surface objects */
 
+        PolarIndex m_PolarIndex;            /**< the foil polars, sorted at the start of each viscous analysis for the interpolations */
+
         double m_vMin, m_vMax, m_vInc;
         bool m_bSequence;
+        int m_nThreads;           /**< the threads of the panel solver for this task, 0 for all the cores */
         bool m_bIsFinished;       /**< true if the calculation is over */
         static bool s_bCancel;    /**< true if all analysis should be cancelled */
 
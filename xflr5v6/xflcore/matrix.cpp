@@ -20,10 +20,15 @@
 *****************************************************************************/
 
 
+#include <QFutureSynchronizer>
+#include <QtConcurrent/QtConcurrentRun>
+
 #include "matrix.h"
 #include <xflanalysis/analysis3d_params.h>
 #include <xflcore/constants.h>
 
+#define LUMINBLOCKROWS 32 /**< below this number of rows per thread, the LU update is not worth splitting */
+
 /** Transposes in place a 3x3 matrix */
 void transpose33(double *l)
 {
@@ -453,8 +458,11 @@ complex<double> det44(complex<double> const *aij)
      0  Success
     -1  Failure - The matrix A is singular.
 
+  If nThreads>1, the update of the remaining matrix is split in blocks of rows
+  which are processed in parallel. The result is identical.
+
 */
-bool Crout_LU_Decomposition_with_Pivoting(double *A, int pivot[], int n, bool *pbCancel, double TaskSize, double &Progress)
+bool Crout_LU_Decomposition_with_Pivoting(double *A, int pivot[], int n, bool *pbCancel, double TaskSize, double &Progress, int nThreads)
 {
     int i, j, k;
     double *p_k, *p_row, *p_col;
@@ -499,8 +507,19 @@ bool Crout_LU_Decomposition_with_Pivoting(double *A, int pivot[], int n, bool *p
         for (j = k+1; j < n; j++) *(p_k + j) /= *(p_k + k);
 
         // update remaining matrix
-        for (i = k+1, p_row = p_k + n; i < n; p_row += n, i++)
-            for (j = k+1; j < n; j++) *(p_row + j) -= *(p_row + k) * *(p_k + j);
+        if(nThreads>1 && n-k-1>=LUMINBLOCKROWS*nThreads)
+        {
+            int blockSize = (n-k-1+nThreads-1)/nThreads;
+            QFutureSynchronizer<void> futureSync;
+            for(int iFirst=k+1; iFirst<n; iFirst+=blockSize)
+                futureSync.addFuture(QtConcurrent::run(&eliminateRows, A, n, k, iFirst, qMin(iFirst+blockSize, n)));
+            futureSync.waitForFinished();
+        }
+        else
+        {
+            for (i = k+1, p_row = p_k + n; i < n; p_row += n, i++)
+                for (j = k+1; j < n; j++) *(p_row + j) -= *(p_row + k) * *(p_k + j);
+        }
 
         Progress += TaskSize/double(n);
         if(*pbCancel) return false;
@@ -509,6 +528,22 @@ bool Crout_LU_Decomposition_with_Pivoting(double *A, int pivot[], int n, bool *p
 }
 
 
+/**
+ * Subtracts the pivot row k from the rows iFirst to iLast-1, in the columns after k.
+ * Used by Crout_LU_Decomposition_with_Pivoting to process a block of rows.
+ */
+void eliminateRows(double *A, int n, int k, int iFirst, int iLast)
+{
+    double const *p_k = A + k*n;
+    for (int i=iFirst; i<iLast; i++)
+    {
+        double *p_row = A + i*n;
+        double l = p_row[k];
+        for (int j=k+1; j<n; j++) p_row[j] -= l * p_k[j];
+    }
+}
+
+
 /**
   int Crout_LU_with_Pivoting_Solve(double *LU, double B[], int pivot[],
                                                         double x[], int n)
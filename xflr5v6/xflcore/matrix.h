@@ -50,8 +50,9 @@ bool Invert44(const complex<double> *ain, complex<double> *aout);
 bool Gauss(double *A, int n, double *B, int m, bool *pbCancel);
 
 
-bool Crout_LU_Decomposition_with_Pivoting(double *A, int pivot[], int n, bool *pbCancel, double TaskSize, double &Progress);
+bool Crout_LU_Decomposition_with_Pivoting(double *A, int pivot[], int n, bool *pbCancel, double TaskSize, double &Progress, int nThreads=1);
 bool Crout_LU_with_Pivoting_Solve(const double *LU, double B[], int pivot[], double x[], int n, bool *pbCancel);
+void eliminateRows(double *A, int n, int k, int iFirst, int iLast);
 
 
 void TestEigen();
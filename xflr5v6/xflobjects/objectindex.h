@@ -0,0 +1,111 @@
+/****************************************************************************
+
+    ObjectIndex Class
+    Copyright (C) André Deperrois
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QMultiHash>
+#include <QMutex>
+#include <QMutexLocker>
+#include <QVector>
+
+
+/**
+ * @brief The ObjectIndex class maps the keys of the objects stored in one of the object arrays
+ * to their positions in the array, so that lookups by name do not need to walk the array.
+ *
+ * The arrays are still modified directly in many places, so the index is rebuilt lazily:
+ * - when the size or the storage of the array has changed since the last build,
+ * - when invalidate() has been called, which the Objects2d and Objects3d methods do after each insertion, deletion or renaming,
+ * - when a position found in the index no longer holds an object with the requested key.
+ * Positions are always checked against the live array, so a stale index may cost a rebuild but never returns a wrong object.
+ * Code which renames an object without changing the size of the array must call invalidate().
+ */
+template<class Key, class T>
+class ObjectIndex
+{
+    public:
+        ObjectIndex() : m_pData(nullptr), m_Size(-1) {}
+
+        void invalidate()
+        {
+            QMutexLocker locker(&m_Mutex);
+            m_Size = -1;
+        }
+
+        /**
+         * Returns the position of the first object of the array stored under key and for which isMatch returns true, or -1 if none.
+         * @param array the object array which is indexed
+         * @param key the key of the requested object
+         * @param keyOf the function which returns the key of an object of the array
+         * @param isMatch the function which tells if the object stored under key is the requested one, e.g. to apply a tolerance
+         */
+        template<class KeyOf, class Match>
+        int indexOf(QVector<T*> const &array, Key const &key, KeyOf keyOf, Match isMatch)
+        {
+            QMutexLocker locker(&m_Mutex);
+
+            if(m_Size!=array.size() || m_pData!=array.constData()) rebuild(array, keyOf);
+
+            bool bConsistent = true;
+            int pos = find(array, key, keyOf, isMatch, bConsistent);
+            if(!bConsistent)
+            {
+                rebuild(array, keyOf);
+                pos = find(array, key, keyOf, isMatch, bConsistent);
+            }
+            return pos;
+        }
+
+    private:
+        template<class KeyOf>
+        void rebuild(QVector<T*> const &array, KeyOf keyOf)
+        {
+            m_Hash.clear();
+            m_Hash.reserve(array.size());
+            for(int i=0; i<array.size(); i++) m_Hash.insert(keyOf(array.at(i)), i);
+            m_pData = array.constData();
+            m_Size = array.size();
+        }
+
+        template<class KeyOf, class Match>
+        int find(QVector<T*> const &array, Key const &key, KeyOf keyOf, Match isMatch, bool &bConsistent) const
+        {
+            int pos = -1;
+            for(typename QMultiHash<Key, int>::const_iterator it=m_Hash.constFind(key); it!=m_Hash.cend() && it.key()==key; ++it)
+            {
+                int i = it.value();
+                if(i>=array.size() || !(keyOf(array.at(i))==key))
+                {
+                    bConsistent = false;
+                    return -1;
+                }
+                if(isMatch(array.at(i)) && (pos<0 || i<pos)) pos = i;
+            }
+            return pos;
+        }
+
+    private:
+        QMultiHash<Key, int> m_Hash;
+        T* const *m_pData;   /**< the storage of the array when the index was built */
+        int m_Size;          /**< the size of the array when the index was built, or -1 if the index needs to be rebuilt */
+        QMutex m_Mutex;
+};
+
@@ -711,6 +711,141 @@ bool Foil::initFoil()
 }
 
 
+/**
+* Moves a few nodes of a foil without flaps, for which the base and current geometries are the same,
+* and updates the upper and lower surfaces, the mid camber line, the thickness and the camber.
+* Only the mid line points which lie in the span of the segments adjacent to the moved nodes are recalculated.
+* Falls back on initFoil() if the leading or trailing edge points move, if a move changes the leading edge node,
+* or if the max thickness or camber point lies in the recalculated span.
+*@param indices the indices of the nodes in the m_xb, m_yb arrays
+*@param positions the new positions of the nodes
+*@return true if the geometry was updated incrementally, false if initFoil() was called
+*/
+bool Foil::moveNodes(QVector<int> const &indices, QVector<Vector2d> const &positions)
+{
+    bool bFull = m_bTEFlap || m_bLEFlap || m_nb!=m_n || m_nb<4;
+
+    // the x-spans of the upper and lower surfaces which are affected by the moves
+    double upperMin = 1.e10, upperMax = -1.e10;
+    double lowerMin = 1.e10, lowerMax = -1.e10;
+
+    for(int i=0; i<indices.size() && i<positions.size(); i++)
+    {
+        int k = indices.at(i);
+        if(k<0 || k>=m_nb) continue;
+        if(k==0 || k==m_iBaseExt || k==m_nb-1) bFull = true;
+
+        double xmin = qMin(m_xb[k], positions.at(i).x);
+        double xmax = qMax(m_xb[k], positions.at(i).x);
+        if(k>0)
+        {
+            xmin = qMin(xmin, m_xb[k-1]);
+            xmax = qMax(xmax, m_xb[k-1]);
+        }
+        if(k<m_nb-1)
+        {
+            xmin = qMin(xmin, m_xb[k+1]);
+            xmax = qMax(xmax, m_xb[k+1]);
+        }
+        if(k<m_iBaseExt)
+        {
+            upperMin = qMin(upperMin, xmin);
+            upperMax = qMax(upperMax, xmax);
+        }
+        else
+        {
+            lowerMin = qMin(lowerMin, xmin);
+            lowerMax = qMax(lowerMax, xmax);
+        }
+
+        m_xb[k] = m_x[k] = positions.at(i).x;
+        m_yb[k] = m_y[k] = positions.at(i).y;
+    }
+
+    // the leading edge node is the first one after which x stops decreasing
+    for(int i=0; i<indices.size() && !bFull; i++)
+    {
+        int k = indices.at(i);
+        if(k<=0 || k>=m_nb-1) continue;
+        for(int j=k-1; j<=k; j++)
+        {
+            if(j<m_iBaseExt && m_xb[j+1]>=m_xb[j]) bFull = true;
+            if(j==m_iBaseExt && m_xb[j+1]<m_xb[j]) bFull = true;
+        }
+    }
+
+    if(bFull)
+    {
+        initFoil();
+        return false;
+    }
+
+    for(int i=0; i<indices.size(); i++)
+    {
+        int k = indices.at(i);
+        if(k<0 || k>=m_nb) continue;
+        if(k<m_iBaseExt)
+        {
+            m_BaseExtrados[m_iBaseExt-k].set(m_xb[k], m_yb[k]);
+            m_rpExtrados[m_iExt-k].set(m_x[k], m_y[k]);
+        }
+        else
+        {
+            m_BaseIntrados[k-m_iBaseExt].set(m_xb[k], m_yb[k]);
+            m_rpIntrados[k-m_iExt].set(m_x[k], m_y[k]);
+        }
+    }
+
+    double xt=0, yex=0, yin=0, nx=0, ny=0;
+    double step = (m_rpExtrados[m_iExt].x-m_rpExtrados[0].x)/double(MIDPOINTCOUNT-1);
+    double thickness=0.0, xThickness=0.0, camber=0.0, xCamber=0.0;
+
+    for (int l=0; l<MIDPOINTCOUNT; l++)
+    {
+        // the positions at which compMidLine() samples the surfaces
+        double xu = m_rpExtrados[0].x + double(l)*step*(m_rpExtrados[m_iExt].x-m_rpExtrados[0].x);
+        double xl = m_rpIntrados[0].x + double(l)*step*(m_rpIntrados[m_iInt].x-m_rpIntrados[0].x);
+        if((xu<upperMin || xu>upperMax) && (xl<lowerMin || xl>lowerMax)) continue;
+
+        xt = m_rpExtrados[0].x + l*step;
+        if(xt==m_fXThickness || xt==m_fXCamber)
+        {
+            // the previous max may have decreased, so all the points are needed
+            compMidLine(true);
+            memcpy(m_rpBaseMid, m_rpMid, sizeof(m_rpBaseMid));
+            return true;
+        }
+
+        getUpperY(double(l)*step, yex, nx, ny);
+        getLowerY(double(l)*step, yin, nx, ny);
+        m_rpMid[l].y = m_rpBaseMid[l].y = (yex+yin)/2.0;
+
+        if(fabs(yex-yin)>thickness)
+        {
+            thickness  = fabs(yex-yin);
+            xThickness = xt;
+        }
+        if(fabs(m_rpMid[l].y)>fabs(camber))
+        {
+            camber  = m_rpMid[l].y;
+            xCamber = xt;
+        }
+    }
+
+    if(thickness>m_fThickness)
+    {
+        m_fThickness  = thickness;
+        m_fXThickness = xThickness;
+    }
+    if(fabs(camber)>fabs(m_fCamber))
+    {
+        m_fCamber  = camber;
+        m_fXCamber = xCamber;
+    }
+    return true;
+}
+
+
 /**
 *ABCD are assumed to lie in the xy plane
 *@return true and intersection point M if AB and CD intersect inside, false and intersection point M if AB and CD intersect outside
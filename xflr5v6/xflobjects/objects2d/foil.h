@@ -32,6 +32,7 @@
 
 #include <QTextStream>
 #include <QColor>
+#include <QVector>
 
 #include <xflgeom/geom2d/vector2d.h>
 #include <xflobjects/xflobject.h>
@@ -78,6 +79,7 @@ class Foil : public XflObject
 
         bool exportFoil(QTextStream &out) const;
         bool initFoil();
+        bool moveNodes(QVector<int> const &indices, QVector<Vector2d> const &positions);
 
         void copyFoil(Foil const *pSrcFoil, bool bMetaData=true);
 
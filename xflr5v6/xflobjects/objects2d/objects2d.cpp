@@ -27,6 +27,8 @@
 #include <xflobjects/objects2d/oppoint.h>
 #include <xflcore/xflcore.h>
 #include <xflcore/displayoptions.h>
+#include <xflobjects/objectindex.h>
+#include <xflobjects/objects_global.h>
 
 
 int Objects2d::s_2dDarkFactor = 103;
@@ -41,6 +43,33 @@ Polar*    Objects2d::m_pCurPolar(nullptr);
 OpPoint * Objects2d::m_pCurOpp(nullptr);
 
 
+namespace
+{
+    typedef QPair<QString, QString> PolarKey; /**< (foil name, polar name) */
+    typedef QPair<PolarKey, qint64> OppKey;   /**< (foil name, polar name, aoa in 1/100th of a degree) */
+
+    ObjectIndex<QString,  Foil>    s_FoilIndex;
+    ObjectIndex<PolarKey, Polar>   s_PolarIndex;
+    ObjectIndex<OppKey,   OpPoint> s_OppIndex;
+
+    QString  foilKey(Foil const *pFoil)     {return pFoil->name();}
+    PolarKey polarKey(Polar const *pPolar)  {return PolarKey(pPolar->foilName(), pPolar->polarName());}
+    OppKey   oppKey(OpPoint const *pOpp)    {return OppKey(PolarKey(pOpp->foilName(), pOpp->polarName()), qRound64(pOpp->aoa()*100.0));}
+}
+
+
+/**
+ * Marks the foil, polar and operating point indexes as out of date.
+ * Must be called after renaming objects which are already stored in the arrays.
+ */
+void Objects2d::invalidateIndexes()
+{
+    s_FoilIndex.invalidate();
+    s_PolarIndex.invalidate();
+    s_OppIndex.invalidate();
+}
+
+
 void Objects2d::deleteAllFoils()
 {
     for(int io=0; io<s_oaOpp.size(); io++) delete s_oaOpp.at(io);
@@ -63,6 +92,8 @@ Foil * Objects2d::deleteFoil(Foil *pFoil)
 {
     if(!pFoil || !pFoil->name().length()) return nullptr;
 
+    xfl::discardDeferredOpps(pFoil->name());
+
     for (int j=s_oaOpp.size()-1; j>=0; j--)
     {
         OpPoint *pOpPoint = s_oaOpp[j];
@@ -125,18 +156,9 @@ Foil * Objects2d::deleteFoil(Foil *pFoil)
 Foil* Objects2d::foil(QString const &strFoilName)
 {
     if(!strFoilName.length()) return nullptr;
-    Foil* pFoil=nullptr;
-
-    for (int i=0; i<s_oaFoil.size(); i++)
-    {
-        pFoil = s_oaFoil.at(i);
-        if (pFoil->name() == strFoilName)
-        {
-            return pFoil;
-        }
-    }
 
-    return nullptr;
+    int i = s_FoilIndex.indexOf(s_oaFoil, strFoilName, foilKey, [](Foil const*){return true;});
+    return i>=0 ? s_oaFoil.at(i) : nullptr;
 }
 
 
@@ -266,6 +288,8 @@ Foil * Objects2d::deleteThisFoil(Foil *pFoil)
     Polar* pOldPolar=nullptr;
     OpPoint *pOpPoint=nullptr;
 
+    xfl::discardDeferredOpps(pFoil->name());
+
     //delete any OpPoints with this FoilName
     for (int jOpp=s_oaOpp.size()-1; jOpp>=0; jOpp--)
     {
@@ -351,6 +375,7 @@ void Objects2d::deletePolar(Polar *pPolar)
 
     if(!pPolar) return;
     if(pPolar == m_pCurPolar) m_pCurPolar = nullptr;
+    xfl::discardDeferredOpps(pPolar->foilName(), pPolar->polarName());
 
     for (int iPolar=0; iPolar<s_oaPolar.size(); iPolar++)
     {
@@ -370,6 +395,7 @@ void Objects2d::deletePolarAt(int index)
     if(index<0 || index>=s_oaPolar.size()) return;
     Polar *pPolar = s_oaPolar.at(index);
     if(pPolar == m_pCurPolar) m_pCurPolar = nullptr;
+    xfl::discardDeferredOpps(pPolar->foilName(), pPolar->polarName());
     s_oaPolar.removeAt(index);
     delete pPolar;
 }
@@ -439,6 +465,7 @@ void Objects2d::renameThisFoil(Foil *pFoil, QString const &newFoilName)
             pOpPoint->setFoilName(newFoilName);
         }
     }
+    invalidateIndexes();
 
 
     //remove the Foil from its current position in the array
@@ -474,35 +501,34 @@ void Objects2d::renameThisFoil(Foil *pFoil, QString const &newFoilName)
 OpPoint *Objects2d::getOpp(Foil *pFoil, Polar *pPolar, double Alpha)
 {
     OpPoint* pOpPoint = nullptr;
-    if(!pPolar) return nullptr;
+    if(!pFoil || !pPolar) return nullptr;
+
+    if(pPolar->polarType() != xfl::FIXEDAOAPOLAR)
+    {
+        //since alphas are calculated at 1/100th, the matching OpPoint is stored under the rounded aoa or one of its neighbours
+        qint64 key = qRound64(Alpha*100.0);
+        int iOpp = -1;
+        for(qint64 k=key-1; k<=key+1; k++)
+        {
+            int i = s_OppIndex.indexOf(s_oaOpp, OppKey(PolarKey(pFoil->name(), pPolar->polarName()), k), oppKey,
+                                       [Alpha](OpPoint const *pOpp){return qAbs(pOpp->aoa() - Alpha) <0.001;});
+            if(i>=0 && (iOpp<0 || i<iOpp)) iOpp = i;
+        }
+        return iOpp>=0 ? s_oaOpp.at(iOpp) : nullptr;
+    }
 
     for (int i=0; i<s_oaOpp.size(); i++)
     {
-        if(!pPolar) return nullptr;
         pOpPoint = s_oaOpp.at(i);
-        //since alphas are calculated at 1/100th
-        if (pOpPoint->foilName() == pFoil->name())
+        if (pOpPoint->foilName() == pFoil->name() && pOpPoint->polarName() == pPolar->polarName())
         {
-            if (pOpPoint->polarName() == pPolar->polarName())
+            if(qAbs(pOpPoint->Reynolds() - Alpha) <0.1)
             {
-                if(pPolar->polarType() != xfl::FIXEDAOAPOLAR)
-                {
-                    if(qAbs(pOpPoint->aoa() - Alpha) <0.001)
-                    {
-                        return pOpPoint;
-                    }
-                }
-                else
-                {
-                    if(qAbs(pOpPoint->Reynolds() - Alpha) <0.1)
-                    {
-                        return pOpPoint;
-                    }
-                }
+                return pOpPoint;
             }
         }
     }
-    return nullptr;// if no OpPoint has a matching alpha
+    return nullptr;// if no OpPoint has a matching Reynolds number
 }
 
 
@@ -648,17 +674,9 @@ void Objects2d::addPolar(Polar *pPolar)
 
 Polar *Objects2d::getPolar(const Foil *pFoil, QString const &PolarName)
 {
-    if (!PolarName.length()) return nullptr;
+    if (!pFoil || !PolarName.length()) return nullptr;
 
-    for (int i=0; i<s_oaPolar.size(); i++)
-    {
-        Polar *pPolar = s_oaPolar.at(i);
-        if (pPolar->foilName() == pFoil->name() &&  pPolar->polarName() == PolarName)
-        {
-            return pPolar;
-        }
-    }
-    return nullptr;
+    return getPolar(pFoil->name(), PolarName);
 }
 
 
@@ -669,15 +687,8 @@ Polar *Objects2d::getPolar(const QString &FoilName, const QString &PolarName)
         return nullptr;
     }
 
-    for (int i=0; i<s_oaPolar.size(); i++)
-    {
-        Polar *pPolar = s_oaPolar.at(i);
-        if (pPolar->foilName() == FoilName &&  pPolar->polarName() == PolarName)
-        {
-            return pPolar;
-        }
-    }
-    return nullptr;
+    int i = s_PolarIndex.indexOf(s_oaPolar, PolarKey(FoilName, PolarName), polarKey, [](Polar const*){return true;});
+    return i>=0 ? s_oaPolar.at(i) : nullptr;
 }
 
 
@@ -697,6 +708,8 @@ OpPoint*  Objects2d::oppAt(int index)
 
 void Objects2d::deleteFoilResults(Foil *pFoil, bool bDeletePolars)
 {
+    xfl::discardDeferredOpps(pFoil->name());
+
     for (int j=s_oaOpp.size()-1; j>=0; j--)
     {
         OpPoint *pOpPoint = s_oaOpp[j];
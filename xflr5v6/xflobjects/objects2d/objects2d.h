@@ -46,6 +46,7 @@ namespace Objects2d
     extern int s_2dDarkFactor;
 
     void      deleteObjects();
+    void      invalidateIndexes();
 
     void      deleteFoilResults(Foil *pFoil, bool bDeletePolars=false);
 
@@ -0,0 +1,424 @@
+/****************************************************************************
+
+    PolarIndex Class
+    Copyright (C) André Deperrois
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include "polarindex.h"
+
+#include <algorithm>
+#include <cmath>
+
+#include <xflobjects/objects2d/foil.h>
+#include <xflobjects/objects2d/polar.h>
+
+
+/** the end of the range from index 0 in which the values strictly increase */
+static int risingEnd(QVector<double> const &x, int i0=0)
+{
+    int i = i0;
+    while(i<x.size()-1 && x.at(i+1)>x.at(i)) i++;
+    return i;
+}
+
+
+/**
+ * Sorts the polars by foil and by Reynolds number and precomputes their limits and monotone ranges.
+ * Polars with the same Reynolds number keep their order in the array.
+ */
+void PolarIndex::build(QVector<Polar*> const &polars)
+{
+    clear();
+
+    for(int ip=0; ip<polars.size(); ip++)
+    {
+        Polar const *pPolar = polars.at(ip);
+        Entry entry;
+        entry.pPolar = pPolar;
+        entry.Re = pPolar->Reynolds();
+        pPolar->getLinearizedCl(entry.Alpha0, entry.Slope);
+        m_AllPolars[pPolar->foilName()].append(entry);
+
+        if(!pPolar->isFixedSpeedPolar() || pPolar->m_Cl.size()==0) continue;
+
+        QVector<double> const &Cl = pPolar->m_Cl;
+        pPolar->getClLimits(entry.ClMin, entry.ClMax);
+        pPolar->getAlphaLimits(entry.AlphaMin, entry.AlphaMax);
+
+        entry.iZeroCl = 0;
+        for(int i=1; i<Cl.size(); i++)
+        {
+            if(fabs(Cl.at(i))<fabs(Cl.at(entry.iZeroCl))) entry.iZeroCl = i;
+        }
+        entry.iClLow = entry.iZeroCl;
+        while(entry.iClLow>0 && Cl.at(entry.iClLow-1)<Cl.at(entry.iClLow)) entry.iClLow--;
+        entry.iClHigh = risingEnd(Cl, entry.iZeroCl);
+        entry.iClRise = risingEnd(Cl);
+        entry.iAlphaRise = risingEnd(pPolar->m_Alpha);
+
+        m_Type1Polars[pPolar->foilName()].append(entry);
+    }
+
+    auto byRe = [](Entry const &a, Entry const &b){return a.Re<b.Re;};
+    for(auto it=m_AllPolars.begin(); it!=m_AllPolars.end(); ++it)     std::stable_sort(it->begin(), it->end(), byRe);
+    for(auto it=m_Type1Polars.begin(); it!=m_Type1Polars.end(); ++it) std::stable_sort(it->begin(), it->end(), byRe);
+}
+
+
+void PolarIndex::clear()
+{
+    m_Type1Polars.clear();
+    m_AllPolars.clear();
+}
+
+
+QVector<PolarIndex::Entry> const &PolarIndex::type1Polars(QString const &foilName) const
+{
+    static QVector<Entry> const empty;
+    auto it = m_Type1Polars.constFind(foilName);
+    return it==m_Type1Polars.constEnd() ? empty : it.value();
+}
+
+
+QVector<PolarIndex::Entry> const &PolarIndex::allPolars(QString const &foilName) const
+{
+    static QVector<Entry> const empty;
+    auto it = m_AllPolars.constFind(foilName);
+    return it==m_AllPolars.constEnd() ? empty : it.value();
+}
+
+
+/**
+ * Returns the first index i such that x[i] <= v < x[i+1], or -1 if there is none.
+ * @param iRise the end of the range from index 0 in which x strictly increases
+ */
+int PolarIndex::firstInterval(QVector<double> const &x, int iRise, double v)
+{
+    if(iRise>0 && x.front()<=v && v<x.at(iRise))
+        return int(std::upper_bound(x.begin(), x.begin()+iRise+1, v)-x.begin())-1;
+
+    for(int i=iRise; i<x.size()-1; i++)
+    {
+        if(x.at(i)<=v && v<x.at(i+1)) return i;
+    }
+    return -1;
+}
+
+
+/**
+ * Returns the last index i such that x[i] <= v < x[i+1], or -1 if there is none.
+ * @param iRise the end of the range from index 0 in which x strictly increases
+ */
+int PolarIndex::lastInterval(QVector<double> const &x, int iRise, double v)
+{
+    if(iRise==x.size()-1) return firstInterval(x, iRise, v);
+
+    for(int i=x.size()-2; i>=0; i--)
+    {
+        if(x.at(i)<=v && v<x.at(i+1)) return i;
+    }
+    return -1;
+}
+
+
+/**
+ * Interpolates a variable of a polar at the lift coefficient Cl, searching the bracketing points from the point closest to Cl=0.
+ * @return the interpolated value, or 0 if no bracketing points are found
+ */
+double PolarIndex::valueFromZeroCl(Entry const &entry, int PlrVar, double Cl, bool &bOutRe)
+{
+    QVector<double> const &x = entry.pPolar->m_Cl;
+    QVector<double> const &X = entry.pPolar->getPlrVariable(PlrVar);
+
+    if(Cl<entry.ClMin)
+    {
+        bOutRe = true;
+        return X.front();
+    }
+    if(Cl>entry.ClMax)
+    {
+        bOutRe = true;
+        return X.back();
+    }
+
+    int pt = entry.iZeroCl;
+    if(Cl<x.at(pt))
+    {
+        // search downwards for x[i-1] < Cl <= x[i]
+        int i = -1;
+        if(entry.iClLow<pt && Cl>x.at(entry.iClLow))
+            i = int(std::lower_bound(x.begin()+entry.iClLow, x.begin()+pt+1, Cl)-x.begin());
+        else
+        {
+            for(int j=entry.iClLow; j>0; j--)
+            {
+                if(Cl<=x.at(j) && Cl>x.at(j-1))
+                {
+                    i = j;
+                    break;
+                }
+            }
+        }
+        if(i<0) return 0.0;
+        if(fabs(x.at(i)-x.at(i-1))<0.00001) return X.at(i);
+        double u = (Cl-x.at(i-1))/(x.at(i)-x.at(i-1));
+        return X.at(i-1) + u*(X.at(i)-X.at(i-1));
+    }
+    else
+    {
+        // search upwards for x[i] <= Cl < x[i+1]
+        int i = -1;
+        if(Cl<x.at(entry.iClHigh))
+            i = int(std::upper_bound(x.begin()+pt, x.begin()+entry.iClHigh+1, Cl)-x.begin())-1;
+        else
+        {
+            for(int j=entry.iClHigh; j<x.size()-1; j++)
+            {
+                if(x.at(j)<=Cl && Cl<x.at(j+1))
+                {
+                    i = j;
+                    break;
+                }
+            }
+        }
+        if(i<0) return 0.0;
+        if(fabs(x.at(i+1)-x.at(i))<0.00001) return X.at(i);
+        double u = (Cl-x.at(i))/(x.at(i+1)-x.at(i));
+        return X.at(i) + u*(X.at(i+1)-X.at(i));
+    }
+}
+
+
+/**
+ * Same as Wing::getPlrPointFromCl().
+ * Returns the value of an aero coefficient, interpolated on the polar mesh of the foil at the Reynolds number and the lift coefficient.
+ */
+double PolarIndex::getPlrPointFromCl(Foil const*pFoil, double Re, double Cl, int PlrVar, bool &bOutRe, bool &bError) const
+{
+    bOutRe = false;
+    bError = false;
+
+    if(!pFoil)
+    {
+        bOutRe = true;
+        bError = true;
+        return 0.000;
+    }
+
+    QVector<Entry> const &entries = type1Polars(pFoil->name());
+
+    //if Re is less than that of the first polar, use this one
+    if(entries.size() && Re<entries.front().Re)
+    {
+        bOutRe = true;
+        QVector<double> const &x = entries.front().pPolar->m_Cl;
+        QVector<double> const &X = entries.front().pPolar->getPlrVariable(PlrVar);
+        if(Cl<x.front()) return X.front();
+        if(Cl>x.back())  return X.back();
+        int i = firstInterval(x, entries.front().iClRise, Cl);
+        if(i>=0)
+        {
+            if(x.at(i+1)-x.at(i)<0.00001) return X.at(i);
+            double u = (Cl-x.at(i))/(x.at(i+1)-x.at(i));
+            return X.at(i) + u*(X.at(i+1)-X.at(i));
+        }
+    }
+
+    // the closest polars on each side of Re which include Cl in their range
+    int k = int(std::upper_bound(entries.begin(), entries.end(), Re, [](double re, Entry const &e){return re<e.Re;})-entries.begin());
+    Entry const *pEntry1 = nullptr;
+    Entry const *pEntry2 = nullptr;
+    for(int i=k-1; i>=0 && !pEntry1; i--)
+    {
+        if(entries.at(i).ClMin<=Cl && Cl<=entries.at(i).ClMax) pEntry1 = &entries.at(i);
+    }
+    for(int i=k; i<entries.size() && !pEntry2; i++)
+    {
+        if(entries.at(i).ClMin<=Cl && Cl<=entries.at(i).ClMax) pEntry2 = &entries.at(i);
+    }
+
+    if(!pEntry2)
+    {
+        //then Re is greater than that of any polar
+        // so use last polar and interpolate Cls on this polar
+        bOutRe = true;
+        if(!pEntry1)
+        {
+            bError = true;
+            return 0.000;
+        }
+        QVector<double> const &x = pEntry1->pPolar->m_Cl;
+        QVector<double> const &X = pEntry1->pPolar->getPlrVariable(PlrVar);
+        if(Cl<x.front()) return X.front();
+        if(Cl>x.back())  return X.back();
+        int i = firstInterval(x, pEntry1->iClRise, Cl);
+        if(i<0) return X.back(); //Out in Re, out in Cl...
+        if(x.at(i+1)-x.at(i)<0.00001) return X.at(i);
+        double u = (Cl-x.at(i))/(x.at(i+1)-x.at(i));
+        return X.at(i) + u*(X.at(i+1)-X.at(i));
+    }
+
+    if(!pEntry1)
+    {
+        bOutRe = true;
+        bError = true;
+        return 0.000;
+    }
+
+    // Re is between that of polars 1 and 2
+    double Var1 = valueFromZeroCl(*pEntry1, PlrVar, Cl, bOutRe);
+    double Var2 = valueFromZeroCl(*pEntry2, PlrVar, Cl, bOutRe);
+    double v = (Re-pEntry1->Re) / (pEntry2->Re-pEntry1->Re);
+    return Var1 + v*(Var2-Var1);
+}
+
+
+/**
+ * Same as LLTAnalysis::getPlrPointFromAlpha().
+ * Returns the value of an aero coefficient, interpolated on the polar mesh of the foil at the Reynolds number and the aoa.
+ */
+double PolarIndex::getPlrPointFromAlpha(Foil const*pFoil, double Re, double Alpha, int PlrVar, bool &bOutRe, bool &bError) const
+{
+    bOutRe = false;
+    bError = false;
+
+    if(!pFoil)
+    {
+        bOutRe = true;
+        bError = true;
+        return 0.000;
+    }
+
+    QVector<Entry> const &entries = type1Polars(pFoil->name());
+
+    //if Re is less than that of the first polar, use this one
+    if(entries.size() && Re<entries.front().Re)
+    {
+        bOutRe = true;
+        QVector<double> const &x = entries.front().pPolar->m_Alpha;
+        QVector<double> const &X = entries.front().pPolar->getPlrVariable(PlrVar);
+        if(Alpha<x.front())     return X.front();
+        else if(Alpha>x.back()) return X.back();
+        int i = firstInterval(x, entries.front().iAlphaRise, Alpha);
+        if(i>=0)
+        {
+            if(x.at(i+1)-x.at(i)<0.00001) return X.at(i);
+            double u = (Alpha-x.at(i))/(x.at(i+1)-x.at(i));
+            return X.at(i) + u*(X.at(i+1)-X.at(i));
+        }
+    }
+
+    // the closest polars on each side of Re which include Alpha in their range
+    int k = int(std::upper_bound(entries.begin(), entries.end(), Re, [](double re, Entry const &e){return re<e.Re;})-entries.begin());
+    Entry const *pEntry1 = nullptr;
+    Entry const *pEntry2 = nullptr;
+    for(int i=k-1; i>=0 && !pEntry1; i--)
+    {
+        if(entries.at(i).AlphaMin<=Alpha && Alpha<=entries.at(i).AlphaMax) pEntry1 = &entries.at(i);
+    }
+    for(int i=k; i<entries.size() && !pEntry2; i++)
+    {
+        if(entries.at(i).AlphaMin<=Alpha && Alpha<=entries.at(i).AlphaMax) pEntry2 = &entries.at(i);
+    }
+
+    if(!pEntry2)
+    {
+        //then Re is greater than that of any polar
+        // so use last polar and interpolate alphas on this polar
+        bOutRe = true;
+        if(!pEntry1)
+        {
+            bError = true;
+            return 0.000;
+        }
+        QVector<double> const &x = pEntry1->pPolar->m_Alpha;
+        QVector<double> const &X = pEntry1->pPolar->getPlrVariable(PlrVar);
+        if(Alpha<x.front()) return X.front();
+        if(Alpha>x.back())  return X.back();
+        int i = firstInterval(x, pEntry1->iAlphaRise, Alpha);
+        if(i<0) return X.back(); //Out in Re, out in alpha...
+        if(x.at(i+1)-x.at(i)<0.00001) return X.at(i);
+        double u = (Alpha-x.at(i))/(x.at(i+1)-x.at(i));
+        return X.at(i) + u*(X.at(i+1)-X.at(i));
+    }
+
+    if(!pEntry1)
+    {
+        bOutRe = true;
+        bError = true;
+        return 0.000;
+    }
+
+    // Re is between that of polars 1 and 2
+    double Var1=0, Var2=0;
+    QVector<double> const &x1 = pEntry1->pPolar->m_Alpha;
+    QVector<double> const &X1 = pEntry1->pPolar->getPlrVariable(PlrVar);
+    if(Alpha<x1.front())     Var1 = X1.front();
+    else if(Alpha>x1.back()) Var1 = X1.back();
+    else
+    {
+        int i = lastInterval(x1, pEntry1->iAlphaRise, Alpha);
+        if(i>=0)
+        {
+            if(x1.at(i+1)-x1.at(i)<0.00001) Var1 = X1.at(i);
+            else Var1 = X1.at(i) + (Alpha-x1.at(i))/(x1.at(i+1)-x1.at(i)) * (X1.at(i+1)-X1.at(i));
+        }
+    }
+
+    QVector<double> const &x2 = pEntry2->pPolar->m_Alpha;
+    QVector<double> const &X2 = pEntry2->pPolar->getPlrVariable(PlrVar);
+    if(Alpha<x2.front() || Alpha>x2.back())
+    {
+        bOutRe = true;
+        bError = true;
+        Var2 = Alpha<x2.front() ? X2.front() : X2.back();
+    }
+    else
+    {
+        int i = lastInterval(x2, pEntry2->iAlphaRise, Alpha);
+        if(i>=0)
+        {
+            if(x2.at(i+1)-x2.at(i)<0.00001) Var2 = X2.at(i);
+            else Var2 = X2.at(i) + (Alpha-x2.at(i))/(x2.at(i+1)-x2.at(i)) * (X2.at(i+1)-X2.at(i));
+        }
+    }
+
+    double v = (Re-pEntry1->Re) / (pEntry2->Re-pEntry1->Re);
+    return Var1 + v*(Var2-Var1);
+}
+
+
+/**
+ * Interpolates the linearized lift curve between the closest polars of the foil strictly below and above Re, whatever their type.
+ * @return false if Re is not enclosed by two polars, in which case Alpha0 and Slope are unchanged
+ */
+bool PolarIndex::getLinearizedCl(Foil const*pFoil, double Re, double &Alpha0, double &Slope) const
+{
+    if(!pFoil) return false;
+    QVector<Entry> const &entries = allPolars(pFoil->name());
+
+    int k1 = int(std::lower_bound(entries.begin(), entries.end(), Re, [](Entry const &e, double re){return e.Re<re;})-entries.begin())-1;
+    int k2 = int(std::upper_bound(entries.begin(), entries.end(), Re, [](double re, Entry const &e){return re<e.Re;})-entries.begin());
+    if(k1<0 || k2>=entries.size()) return false;
+
+    Entry const &e1 = entries.at(k1);
+    Entry const &e2 = entries.at(k2);
+    Alpha0 = e1.Alpha0 + (e2.Alpha0-e1.Alpha0) * (Re-e1.Re)/(e2.Re-e1.Re);
+    Slope  = e1.Slope  + (e2.Slope -e1.Slope)  * (Re-e1.Re)/(e2.Re-e1.Re);
+    return true;
+}
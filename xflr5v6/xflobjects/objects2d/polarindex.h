@@ -0,0 +1,80 @@
+/****************************************************************************
+
+    PolarIndex Class
+    Copyright (C) André Deperrois
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QHash>
+#include <QString>
+#include <QStringList>
+#include <QVector>
+
+class Foil;
+class Polar;
+
+/**
+ * @brief The PolarIndex class holds the 2D polars of each foil in the form used by the interpolations of the viscous 3D analyses,
+ * so that the interpolation of a span station does not need to walk the polar array.
+ *
+ * It is built from the polar array at the start of an analysis, and must be rebuilt if the polars are modified.
+ * For each foil, it holds:
+ * - the type 1 polars which have points, sorted by Reynolds number, with their Cl and alpha limits,
+ *   the point closest to Cl=0 and the ranges around it and from the first point in which Cl and alpha strictly increase,
+ *   in which the bracketing points are found by bisection,
+ * - all the polars, sorted by Reynolds number, with the coefficients of their linearized lift curve.
+ * The methods return the same values as Wing::getPlrPointFromCl(), LLTAnalysis::getPlrPointFromAlpha()
+ * and LLTAnalysis::getLinearizedPolar() when the polars are stored by increasing Reynolds number, as these methods assume.
+ */
+class PolarIndex
+{
+    public:
+        struct Entry
+        {
+            Polar const*pPolar=nullptr;
+            double Re=0.0;
+            double ClMin=0.0, ClMax=0.0;
+            double AlphaMin=0.0, AlphaMax=0.0;
+            int iZeroCl=0;                  /**< the first point with the lowest |Cl| */
+            int iClLow=0, iClHigh=0;        /**< the range around iZeroCl in which Cl strictly increases */
+            int iClRise=0;                  /**< the end of the range from the first point in which Cl strictly increases */
+            int iAlphaRise=0;               /**< the end of the range from the first point in which alpha strictly increases */
+            double Alpha0=0.0, Slope=0.0;   /**< the linearized lift curve, see Polar::getLinearizedCl() */
+        };
+
+        void build(QVector<Polar*> const &polars);
+        void clear();
+
+        bool isEmpty() const {return m_AllPolars.isEmpty();}
+        QStringList foilNames() const {return m_AllPolars.keys();}
+        QVector<Entry> const &type1Polars(QString const &foilName) const;
+        QVector<Entry> const &allPolars(QString const &foilName) const;
+
+        double getPlrPointFromCl(Foil const*pFoil, double Re, double Cl, int PlrVar, bool &bOutRe, bool &bError) const;
+        double getPlrPointFromAlpha(Foil const*pFoil, double Re, double Alpha, int PlrVar, bool &bOutRe, bool &bError) const;
+        bool getLinearizedCl(Foil const*pFoil, double Re, double &Alpha0, double &Slope) const;
+
+    private:
+        static int firstInterval(QVector<double> const &x, int iRise, double v);
+        static int lastInterval(QVector<double> const &x, int iRise, double v);
+        static double valueFromZeroCl(Entry const &entry, int PlrVar, double Cl, bool &bOutRe);
+
+        QHash<QString, QVector<Entry>> m_Type1Polars;
+        QHash<QString, QVector<Entry>> m_AllPolars;
+};
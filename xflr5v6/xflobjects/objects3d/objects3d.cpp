@@ -24,6 +24,8 @@
 #include <xflobjects/objects3d/surface.h>
 #include <xflobjects/objects3d/wpolar.h>
 #include <xflobjects/editors/renamedlg.h>
+#include <xflobjects/objectindex.h>
+#include <xflobjects/objects_global.h>
 
 
 QVector <Plane*>    Objects3d::s_oaPlane;
@@ -32,6 +34,45 @@ QVector <PlaneOpp*> Objects3d::s_oaPOpp;
 QVector <Body*>     Objects3d::s_oaBody;
 
 
+namespace
+{
+    typedef QPair<QString, QString> WPolarKey; /**< (plane name, polar name) */
+    typedef QPair<WPolarKey, qint64> POppKey;  /**< (plane name, polar name, operating variable in 1/100th) */
+
+    ObjectIndex<QString,   Plane>    s_PlaneIndex;
+    ObjectIndex<WPolarKey, WPolar>   s_WPolarIndex;
+    ObjectIndex<POppKey,   PlaneOpp> s_POppIndex;
+
+    /** Returns the variable of the PlaneOpp which is swept by its type of polar */
+    double pOppVariable(PlaneOpp const *pPOpp)
+    {
+        switch(pPOpp->polarType())
+        {
+            case xfl::FIXEDAOAPOLAR:  return pPOpp->QInf();
+            case xfl::BETAPOLAR:      return pPOpp->beta();
+            case xfl::STABILITYPOLAR: return pPOpp->ctrl();
+            default:                  return pPOpp->alpha();
+        }
+    }
+
+    QString   planeKey(Plane const *pPlane)     {return pPlane->name();}
+    WPolarKey wPolarKey(WPolar const *pWPolar)  {return WPolarKey(pWPolar->planeName(), pWPolar->polarName());}
+    POppKey   pOppKey(PlaneOpp const *pPOpp)    {return POppKey(WPolarKey(pPOpp->planeName(), pPOpp->polarName()), qRound64(pOppVariable(pPOpp)*100.0));}
+}
+
+
+/**
+ * Marks the plane, polar and operating point indexes as out of date.
+ * Must be called after renaming objects which are already stored in the arrays.
+ */
+void Objects3d::invalidateIndexes()
+{
+    s_PlaneIndex.invalidate();
+    s_WPolarIndex.invalidate();
+    s_POppIndex.invalidate();
+}
+
+
 
 /**
  * If the body is associated to a plane, duplicates the body and attaches it to the Plane
@@ -322,6 +363,8 @@ void Objects3d::deleteWPolar(WPolar *pWPolar)
     //remove and delete its children POpps from the array
     if(!pWPolar)return;
 
+    xfl::discardDeferredPlaneOpps(pWPolar->planeName(), pWPolar->polarName());
+
     for (int l=s_oaPOpp.size()-1;l>=0; l--)
     {
         PlaneOpp *pPOpp = s_oaPOpp.at(l);
@@ -356,6 +399,7 @@ void Objects3d::deletePlaneResults(Plane *pPlane, bool bDeletePolars)
     WPolar* pWPolar = nullptr;
     PlaneOpp * pPOpp = nullptr;
 
+    xfl::discardDeferredPlaneOpps(pPlane->name());
 
     //first remove all POpps associated to the plane
     for (int i=s_oaPOpp.size()-1; i>=0; i--)
@@ -427,20 +471,18 @@ Body * Objects3d::getBody(const QString &BodyName)
 PlaneOpp * Objects3d::getPlaneOpp(Plane const*pPlane, WPolar const*pWPolar, double x)
 {
     if(!pPlane || !pWPolar) return nullptr;
+    if(!pWPolar->isT12Polar() && !pWPolar->isT4Polar() && !pWPolar->isT5Polar() && !pWPolar->isT7Polar()) return nullptr;
 
-
-    for (int i=0; i<s_oaPOpp.size(); i++)
+    // the matching PlaneOpp is stored under the rounded value of x or one of its neighbours
+    qint64 key = qRound64(x*100.0);
+    int iPOpp = -1;
+    for(qint64 k=key-1; k<=key+1; k++)
     {
-        PlaneOpp*pPOpp = s_oaPOpp.at(i);
-        if ((pPOpp->planeName() == pPlane->name()) && (pPOpp->polarName() == pWPolar->polarName()))
-        {
-            if     (pWPolar->isT12Polar() && qAbs(pPOpp->alpha() - x)<0.005)   return pPOpp;
-            else if(pWPolar->isT4Polar()  && qAbs(pPOpp->QInf()  - x) <0.005)  return pPOpp;
-            else if(pWPolar->isT5Polar()  && qAbs(pPOpp->beta()  - x) <0.005)  return pPOpp;
-            else if(pWPolar->isT7Polar()  && qAbs(pPOpp->ctrl()  - x) <0.005)  return pPOpp;
-        }
+        int i = s_POppIndex.indexOf(s_oaPOpp, POppKey(WPolarKey(pPlane->name(), pWPolar->polarName()), k), pOppKey,
+                                    [x](PlaneOpp const *pPOpp){return qAbs(pOppVariable(pPOpp) - x)<0.005;});
+        if(i>=0 && (iPOpp<0 || i<iPOpp)) iPOpp = i;
     }
-    return nullptr;
+    return iPOpp>=0 ? s_oaPOpp.at(iPOpp) : nullptr;
 }
 
 
@@ -451,17 +493,10 @@ PlaneOpp * Objects3d::getPlaneOpp(Plane const*pPlane, WPolar const*pWPolar, doub
 */
 WPolar* Objects3d::getWPolar(Plane const*pPlane, const QString &WPolarName)
 {
-    WPolar *pWPolar = nullptr;
-
     if(!pPlane) return nullptr;
 
-    for (int i=0; i<s_oaWPolar.size(); i++)
-    {
-        pWPolar = s_oaWPolar.at(i);
-        if (pWPolar->planeName()==pPlane->name() && pWPolar->polarName()== WPolarName)
-            return pWPolar;
-    }
-    return nullptr;
+    int i = s_WPolarIndex.indexOf(s_oaWPolar, WPolarKey(pPlane->name(), WPolarName), wPolarKey, [](WPolar const*){return true;});
+    return i>=0 ? s_oaWPolar.at(i) : nullptr;
 }
 
 
@@ -473,13 +508,8 @@ WPolar* Objects3d::getWPolar(Plane const*pPlane, const QString &WPolarName)
 */
 Plane * Objects3d::getPlane(QString const &PlaneName)
 {
-    Plane* pPlane = nullptr;
-    for (int i=0; i<s_oaPlane.size(); i++)
-    {
-        pPlane = s_oaPlane.at(i);
-        if (pPlane->name() == PlaneName) return pPlane;
-    }
-    return nullptr;
+    int i = s_PlaneIndex.indexOf(s_oaPlane, PlaneName, planeKey, [](Plane const*){return true;});
+    return i>=0 ? s_oaPlane.at(i) : nullptr;
 }
 
 
@@ -621,6 +651,7 @@ Plane * Objects3d::setModPlane(Plane *pModPlane)
             return nullptr;//cancelled
         }
     }
+    invalidateIndexes();
     return pModPlane;
 }
 
@@ -815,6 +846,7 @@ void Objects3d::renamePlane(const QString &PlaneName)
                 pPOpp->setPlaneName(pPlane->name());
             }
         }
+        invalidateIndexes();
     }
 }
 
@@ -946,27 +978,13 @@ void Objects3d::setWPolarPOppStyle(WPolar const* pWPolar, bool bStipple, bool bW
 
 Plane * Objects3d::plane(QString const &PlaneName)
 {
-    Plane* pPlane = nullptr;
-    for (int i=0; i<planeCount(); i++)
-    {
-        pPlane = s_oaPlane.at(i);
-        if (pPlane->name() == PlaneName) return pPlane;
-    }
-    return nullptr;
+    return getPlane(PlaneName);
 }
 
 
 WPolar* Objects3d::wPolar(const Plane *pPlane, QString const &WPolarName)
 {
-    if(!pPlane) return nullptr;
-
-    for (int i=0; i<polarCount(); i++)
-    {
-        WPolar *pWPolar = s_oaWPolar.at(i);
-        if (pWPolar->planeName()==pPlane->name() && pWPolar->polarName()== WPolarName)
-            return pWPolar;
-    }
-    return nullptr;
+    return getWPolar(pPlane, WPolarName);
 }
 
 
@@ -49,6 +49,7 @@ namespace  Objects3d
     inline void removePolarAt(int i) {if(i<0 || i>=s_oaWPolar.size()) return; s_oaWPolar.removeAt(i);}
     inline void insertPolar(int i, WPolar*pWPolar) {s_oaWPolar.insert(i, pWPolar);}
     void      deleteObjects();
+    void      invalidateIndexes();
     void      deletePlane(Plane *pPlane);
     void      deletePlaneResults(Plane *pPlane, bool bDeletePolars=false);
     void      deleteWPolar(WPolar *pWPolar);
@@ -31,6 +31,7 @@
 #include <xflobjects/objects3d/pointmass.h>
 #include <xflobjects/objects_global.h>
 #include <xflobjects/objects2d/polar.h>
+#include <xflobjects/objects2d/polarindex.h>
 
 double Wing::s_MinPanelSize = 0.0001;
 QVector<Foil *> *Wing::s_poaFoil  = nullptr;
@@ -1748,7 +1749,7 @@ void Wing::panelComputeOnBody(double QInf, double Alpha, double *Cp, double cons
 *    - The viscous drag coefficient m_PCd[]
 *      - The top and bottom transition points m_XTrtop[] and m_XTrBot[]
 */
-void Wing::panelComputeViscous(double QInf, const WPolar *pWPolar, double &WingVDrag, bool bViscous, QString &OutString)
+void Wing::panelComputeViscous(double QInf, const WPolar *pWPolar, double &WingVDrag, bool bViscous, QString &OutString, PolarIndex const *pPolarIndex)
 {
     QString string, strong, strLength;
 
@@ -1787,15 +1788,15 @@ void Wing::panelComputeViscous(double QInf, const WPolar *pWPolar, double &WingV
             bPointOutCl = false;
             surf.getC4(k, PtC4, tau);
 
-            m_PCd[m]    = getInterpolatedVariable(2, surf.m_pFoilA, surf.m_pFoilB, m_Re[m], m_Cl[m], tau, bOutRe, bError);
+            m_PCd[m]    = getInterpolatedVariable(2, surf.m_pFoilA, surf.m_pFoilB, m_Re[m], m_Cl[m], tau, bOutRe, bError, pPolarIndex);
             bPointOutRe = bOutRe || bPointOutRe;
             if(bError) bPointOutCl = true;
 
-            m_XTrTop[m] = getInterpolatedVariable(5, surf.m_pFoilA, surf.m_pFoilB, m_Re[m], m_Cl[m], tau, bOutRe, bError);
+            m_XTrTop[m] = getInterpolatedVariable(5, surf.m_pFoilA, surf.m_pFoilB, m_Re[m], m_Cl[m], tau, bOutRe, bError, pPolarIndex);
             bPointOutRe = bOutRe || bPointOutRe;
             if(bError) bPointOutCl = true;
 
-            m_XTrBot[m] = getInterpolatedVariable(6, surf.m_pFoilA, surf.m_pFoilB, m_Re[m], m_Cl[m], tau, bOutRe, bError);
+            m_XTrBot[m] = getInterpolatedVariable(6, surf.m_pFoilA, surf.m_pFoilB, m_Re[m], m_Cl[m], tau, bOutRe, bError, pPolarIndex);
             bPointOutRe = bOutRe || bPointOutRe;
             if(bError) bPointOutCl = true;
 
@@ -3159,9 +3160,10 @@ Foil* Wing::foil(QString const &strFoilName)
 *@param Tau the relative position of the point between the two foils.
 *@param bOutRe true if Cl is outside the min or max Cl of the polar mesh.
 *@param bError if Re is outside the min or max Reynolds number of the polar mesh.
+*@param pPolarIndex if set, the sorted polars to interpolate instead of walking s_poaPolar.
 *@return the interpolated value.
 */
-double Wing::getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, double Re, double Cl, double Tau, bool &bOutRe, bool &bError)
+double Wing::getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, double Re, double Cl, double Tau, bool &bOutRe, bool &bError, PolarIndex const *pPolarIndex)
 {
     bool IsOutRe = false;
     bool IsError  = false;
@@ -3173,7 +3175,7 @@ double Wing::getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, doubl
         Cl = 0.0;
         Var0 = 0.0;
     }
-    else Var0 = getPlrPointFromCl(pFoil0, Re, Cl,nVar, IsOutRe, IsError);
+    else Var0 = getPlrPointFromCl(pFoil0, Re, Cl,nVar, IsOutRe, IsError, pPolarIndex);
     if(IsOutRe) bOutRe = true;
     if(IsError) bError = true;
 
@@ -3183,7 +3185,7 @@ double Wing::getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, doubl
         Cl = 0.0;
         Var1 = 0.0;
     }
-    else Var1 = getPlrPointFromCl(pFoil1, Re, Cl,nVar, IsOutRe, IsError);
+    else Var1 = getPlrPointFromCl(pFoil1, Re, Cl,nVar, IsOutRe, IsError, pPolarIndex);
     if(IsOutRe) bOutRe = true;
     if(IsError) bError = true;
 
@@ -3207,9 +3209,10 @@ double Wing::getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, doubl
 *@param PlrVar the index of the variable to interpolate.
 *@param bOutRe true if Cl is outside the min or max Cl of the polar mesh.
 *@param bError if Re is outside the min or max Reynolds number of the polar mesh.
+*@param pPolarIndex if set, the sorted polars to interpolate instead of walking s_poaPolar.
 *@return the interpolated value.
 */
-double Wing::getPlrPointFromCl(Foil *pFoil, double Re, double Cl, int PlrVar, bool &bOutRe, bool &bError)
+double Wing::getPlrPointFromCl(Foil *pFoil, double Re, double Cl, int PlrVar, bool &bOutRe, bool &bError, PolarIndex const *pPolarIndex)
 {
     /*    Var
     0 =    m_Alpha;
@@ -3221,6 +3224,8 @@ double Wing::getPlrPointFromCl(Foil *pFoil, double Re, double Cl, int PlrVar, bo
     7, 8 = m_HMom, m_Cpmn;
     9,10 = m_ClCd, m_Cl32Cd;
 */
+    if(pPolarIndex) return pPolarIndex->getPlrPointFromCl(pFoil, Re, Cl, PlrVar, bOutRe, bError);
+
     double Clmin=0, Clmax=0;
     Polar *pPolar;
     double Var1=0, Var2=0, u=0, dist=0;
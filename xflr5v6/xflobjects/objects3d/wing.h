@@ -58,6 +58,7 @@
 */
 
 class PointMass;
+class PolarIndex;
 class WPolar;
 class Panel;
 
@@ -110,7 +111,7 @@ class Wing
                                 const WPolar *pWPolar, const Vector3d &CoG, const Panel *pPanel);
 
 
-        void panelComputeViscous(double QInf, WPolar const*pWPolar, double &WingVDrag, bool bViscous, QString &OutString);
+        void panelComputeViscous(double QInf, WPolar const*pWPolar, double &WingVDrag, bool bViscous, QString &OutString, PolarIndex const *pPolarIndex=nullptr);
         void panelComputeBending(const Panel *pPanel, bool bThinSurface);
 
         bool isWingPanel(int nPanel, Panel const *pPanel);
@@ -271,8 +272,8 @@ class Wing
         int firstPanelIndex() const {return m_FirstPanelIndex;}
         int nPanels() const {return m_nPanels;}
 
-        static double getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, double Re, double Cl, double Tau, bool &bOutRe, bool &bError);
-        static double getPlrPointFromCl(Foil *pFoil, double Re, double Cl, int PlrVar, bool &bOutRe, bool &bError);
+        static double getInterpolatedVariable(int nVar, Foil *pFoil0, Foil *pFoil1, double Re, double Cl, double Tau, bool &bOutRe, bool &bError, PolarIndex const *pPolarIndex=nullptr);
+        static double getPlrPointFromCl(Foil *pFoil, double Re, double Cl, int PlrVar, bool &bOutRe, bool &bError, PolarIndex const *pPolarIndex=nullptr);
 
     //__________________________Variables_______________________
     private:
@@ -20,6 +20,9 @@
 *****************************************************************************/
 
 #include <QDir>
+#include <QDateTime>
+#include <QFileInfo>
+#include <atomic>
 
 #include <xflobjects/objects_global.h>
 #include <xflcore/constants.h>
@@ -30,6 +33,66 @@
 #include <xflobjects/objects3d/wpolar.h>
 #include <xflobjects/objects2d/objects2d.h>
 #include <xflobjects/objects3d/objects3d.h>
+#include <xflobjects/objects2d/oppoint.h>
+#include <xflobjects/objects3d/plane.h>
+#include <xflobjects/objects3d/planeopp.h>
+#include <gui_objects/splinefoil.h>
+
+
+namespace
+{
+    /** An operating point which serializeProjectXFL() has left in the project file */
+    struct DeferredOpp
+    {
+        QString objectName;     /**< the foil or the plane */
+        QString polarName;
+        void const *pPolar;     /**< the polar read with the project, to discard the points of a polar which has been deleted since */
+        qint64 pos;             /**< the position of the record in the file */
+    };
+
+    QString s_DeferredFileName;
+    QDateTime s_DeferredFileTime;
+    qint64 s_DeferredFileSize = 0;
+    QVector<DeferredOpp> s_DeferredOpps;
+    QVector<DeferredOpp> s_DeferredPOpps;
+    std::atomic<int> s_nDeferred(0);    /**< read by the server threads, the lists are only used in the main thread */
+    QString s_PartialFileName;          /**< the project file from which some records have not been read */
+
+    /** Removes and returns the records of the object and of its polar, or of all its polars if polarName is empty, or all the records if objectName is empty */
+    QVector<DeferredOpp> takeDeferred(QVector<DeferredOpp> &list, QString const &objectName, QString const &polarName)
+    {
+        QVector<DeferredOpp> taken;
+        if(objectName.isEmpty())
+        {
+            taken.swap(list);
+        }
+        else
+        {
+            for(int i=list.size()-1; i>=0; i--)
+            {
+                if(list.at(i).objectName==objectName && (polarName.isEmpty() || list.at(i).polarName==polarName))
+                {
+                    taken.prepend(list.at(i));
+                    list.removeAt(i);
+                }
+            }
+        }
+        s_nDeferred = s_DeferredOpps.size() + s_DeferredPOpps.size();
+        return taken;
+    }
+
+    /** Opens the file of the deferred records. Fails, and drops all the records, if the file has been modified since the project was read */
+    bool openDeferredFile(QFile &file)
+    {
+        QFileInfo fi(s_DeferredFileName);
+        if(!fi.exists() || fi.lastModified()!=s_DeferredFileTime || fi.size()!=s_DeferredFileSize || !file.open(QIODevice::ReadOnly))
+        {
+            xfl::clearDeferredOpps();
+            return false;
+        }
+        return true;
+    }
+}
 
 
 
@@ -1053,3 +1116,730 @@ bool xfl::serializePolar(Polar *pPolar, QDataStream &ar, bool bIsStoring)
     }
     return true;
 }
+
+
+/**
+ * Loads or Saves the data of this foil to a binary file.
+ * @param ar the QDataStream object from/to which the data should be serialized
+ * @param bIsStoring true if saving the data, false if loading
+ * @return true if the operation was successful, false otherwise
+ */
+bool xfl::serializeFoilXFL(Foil *pFoil, QDataStream &ar, bool bIsStoring)
+{
+    qint8 b = 0x00;
+    int n(0);
+    QString strange;
+    int ArchiveFormat = 100007;
+    // 100006: first version of new xfl format
+    // 100007: foil new style
+    if(bIsStoring)
+    {
+        ar << ArchiveFormat;
+        ar << pFoil->name();
+        ar << pFoil->m_FoilDescription;
+
+/*        ar << pFoil->m_Stipple << pFoil->m_Width;
+        writeColor(ar, pFoil->red(), pFoil->green(), pFoil->blue(), pFoil->alphaChannel());
+        ar << pFoil->m_bIsVisible;
+        //        ar << m_bShowFoilPoints;
+        ar << qint8(pFoil->m_Symbol);
+        */
+        pFoil->theStyle().serializeXfl(ar, bIsStoring);
+
+        ar << pFoil->m_bCenterLine << pFoil->m_bLEFlap << pFoil->m_bTEFlap;
+        ar << pFoil->m_LEFlapAngle << pFoil->m_LEXHinge << pFoil->m_LEYHinge;
+        ar << pFoil->m_TEFlapAngle << pFoil->m_TEXHinge << pFoil->m_TEYHinge;
+        ar << pFoil->m_nb;
+        for (int j=0; j<pFoil->m_nb; j++)
+        {
+            ar << pFoil->m_xb[j] << pFoil->m_yb[j];
+        }
+        return true;
+    }
+    else
+    {
+        ar >> ArchiveFormat;
+
+        ar >> strange;
+        pFoil->setName(strange);
+
+        ar >> strange;
+        pFoil->setDescription(strange);
+
+        if(ArchiveFormat<100007)
+        {
+            ar >> n; pFoil->theStyle().setStipple(n);
+            ar >> pFoil->theStyle().m_Width;
+
+            int r=0,g=0,blue=0,a=0;
+            xfl::readColor(ar, r,g,blue,a);
+            pFoil->setColor(r,g,blue,a);
+            ar >> pFoil->theStyle().m_bIsVisible;
+            ar >> b; pFoil->theStyle().setPointStyle(int(b));
+        }
+        else
+            pFoil->theStyle().serializeXfl(ar, bIsStoring);
+
+        ar >> pFoil->m_bCenterLine >> pFoil->m_bLEFlap >> pFoil->m_bTEFlap;
+        ar >> pFoil->m_LEFlapAngle >> pFoil->m_LEXHinge >> pFoil->m_LEYHinge;
+        ar >> pFoil->m_TEFlapAngle >> pFoil->m_TEXHinge >> pFoil->m_TEYHinge;
+        ar >> pFoil->m_nb;
+
+        for (int j=0; j<pFoil->m_nb; j++)
+        {
+            ar >> pFoil->m_xb[j] >> pFoil->m_yb[j];
+        }
+
+        memcpy(pFoil->m_x, pFoil->m_xb, sizeof(pFoil->m_xb));
+        memcpy(pFoil->m_y, pFoil->m_yb, sizeof(pFoil->m_yb));
+        pFoil->m_n = pFoil->m_nb;
+
+        pFoil->initFoil();
+        pFoil->setFlap();
+
+        return true;
+    }
+}
+
+/**
+ * Loads or saves the data of this polar to a binary file
+ * @param ar the QDataStream object from/to which the data should be serialized
+ * @param bIsStoring true if saving the data, false if loading
+ * @return true if the operation was successful, false otherwise
+ */
+bool xfl::serializePolarXFL(Polar *pPolar, QDataStream &ar, bool bIsStoring)
+{
+    double dble(0);
+    bool boolean(false);
+    int i(0), k(0), n(0);
+    // identifies the format of the file
+    // 100005: new style format
+    int ArchiveFormat=100005;
+
+    if(bIsStoring)
+    {
+        ar << ArchiveFormat; // first format for XFL file
+
+        ar << pPolar->m_FoilName;
+        ar << pPolar->name();
+
+/*        ar << pPolar->m_Style << pPolar->m_Width;
+        writeColor(ar, pPolar->m_red, pPolar->m_green, pPolar->m_blue, pPolar->m_alphaChannel);
+        ar << pPolar->m_bIsVisible << false;*/
+        pPolar->theStyle().serializeXfl(ar, bIsStoring);
+
+        if     (pPolar->m_PolarType==xfl::FIXEDSPEEDPOLAR)  ar<<1;
+        else if(pPolar->m_PolarType==xfl::FIXEDLIFTPOLAR)   ar<<2;
+        else if(pPolar->m_PolarType==xfl::RUBBERCHORDPOLAR) ar<<3;
+        else if(pPolar->m_PolarType==xfl::FIXEDAOAPOLAR)    ar<<4;
+        else                                                ar<<1;
+
+        ar << pPolar->m_MaType << pPolar->m_ReType;
+        ar << pPolar->m_Reynolds << pPolar->m_Mach;
+        ar << pPolar->m_ASpec;
+        ar << pPolar->m_XTop << pPolar->m_XBot;
+        ar << pPolar->m_NCrit;
+
+        ar << pPolar->m_Alpha.size();
+        for (i=0; i< pPolar->m_Alpha.size(); i++)
+        {
+            ar << float(pPolar->m_Alpha[i]) << float(pPolar->m_Cd[i]) ;
+            ar << float(pPolar->m_Cdp[i])   << float(pPolar->m_Cl[i]) << float(pPolar->m_Cm[i]);
+            ar << float(pPolar->m_XTr1[i])  << float(pPolar->m_XTr2[i]);
+            ar << float(pPolar->m_HMom[i])  << float(pPolar->m_Cpmn[i]);
+            ar << float(pPolar->m_Re[i]);
+            ar << float(pPolar->m_XCp[i]);
+        }
+
+//        ar << pPolar->m_theStyle.m_Symbol;
+
+        // space allocation for the future storage of more data, without need to change the format
+        for (int i=0; i<19; i++) ar << 0;
+        for (int i=0; i<50; i++) ar << 0.0;
+
+        return true;
+    }
+    else
+    {
+        //read variables
+        QString strange;
+        float Alpha(0), Cd(0), Cdp(0), Cl(0), Cm(0), XTr1(0), XTr2(0), HMom(0), Cpmn(0), Re(0), XCp(0);
+
+        ar >> ArchiveFormat;
+        if (ArchiveFormat <100000 || ArchiveFormat>110000) return false;
+
+        ar >> pPolar->m_FoilName;
+        ar >> strange; pPolar->setName(strange);
+
+        if(ArchiveFormat<100005)
+        {
+            ar >> n; pPolar->setStipple(n);
+            ar >> n; pPolar->setWidth(n);
+            int r,g,b,a;
+            xfl::readColor(ar, r,g,b,a);
+            pPolar->setColor(r,g,b,a);
+            ar >> pPolar->theStyle().m_bIsVisible >> boolean;
+        }
+        else
+        {
+            pPolar->theStyle().serializeXfl(ar, bIsStoring);
+        }
+
+        ar >> n;
+        if     (n==1) pPolar->m_PolarType=xfl::FIXEDSPEEDPOLAR;
+        else if(n==2) pPolar->m_PolarType=xfl::FIXEDLIFTPOLAR;
+        else if(n==3) pPolar->m_PolarType=xfl::RUBBERCHORDPOLAR;
+        else if(n==4) pPolar->m_PolarType=xfl::FIXEDAOAPOLAR;
+
+        ar >> pPolar->m_MaType >> pPolar->m_ReType;
+        ar >> pPolar->m_Reynolds >> pPolar->m_Mach;
+        ar >> pPolar->m_ASpec;
+        ar >> pPolar->m_XTop >> pPolar->m_XBot;
+        ar >> pPolar->m_NCrit;
+
+        ar >> n;
+
+        for (i=0; i< n; i++)
+        {
+            ar >> Alpha >> Cd >> Cdp >> Cl >> Cm >> XTr1 >> XTr2 >> HMom >> Cpmn >> Re >> XCp;
+            pPolar->addPoint(double(Alpha), double(Cd), double(Cdp), double(Cl), double(Cm),
+                             double(XTr1), double(XTr2), double(HMom), double(Cpmn), double(Re), double(XCp));
+        }
+
+        if(ArchiveFormat<100005)
+        {
+            ar >> n;
+            pPolar->theStyle().setPointStyle(n);
+        }
+
+        // space allocation
+        for (int i=0; i<19; i++) ar >> k;
+        for (int i=0; i<50; i++) ar >> dble;
+    }
+    return true;
+}
+
+
+/**
+ * Loads or saves the project to a binary stream in the .xfl format.
+ * On loading, the objects are appended to the arrays, which are assumed to have been cleared.
+ * @param ar the QDataStream object from/to which the data should be serialized
+ * @param bIsStoring true if saving the data, false if loading
+ * @param defaultWPolar the default 3D polar, which is stored with the project
+ * @param pSF the spline foil of the direct design, which is stored with the project
+ * @param bSaveOpps if false, the foil operating points are not saved
+ * @param bSaveWOpps if false, the plane operating points are not saved
+ * @param options the records to read; the others are read and dropped, since the records are not sized.
+ * The operating points are only deferred if the stream is a file.
+ * @return true if the operation was successful, false otherwise; the objects read before the error are kept
+ */
+bool xfl::serializeProjectXFL(QDataStream &ar, bool bIsStoring, WPolar &defaultWPolar, SplineFoil *pSF, bool bSaveOpps, bool bSaveWOpps,
+                              ProjectLoadOptions const &options)
+{
+    WPolar *pWPolar(nullptr);
+    PlaneOpp *pPOpp(nullptr);
+    Plane *pPlane(nullptr);
+    Polar *pPolar(nullptr);
+    OpPoint *pOpp(nullptr);
+
+    int i=0, n=0;
+    float f=0;
+    double dble=0;
+    bool boolean=false;
+
+    if (bIsStoring)
+    {
+        // storing code
+        int ArchiveFormat = 200002;
+        ar << ArchiveFormat;
+        // 200001 : First instance of new ".xfl" format
+
+        //Save unit data
+        ar << Units::lengthUnitIndex();
+        ar << Units::areaUnitIndex();
+        ar << Units::weightUnitIndex();
+        ar << Units::speedUnitIndex();
+        ar << Units::forceUnitIndex();
+        ar << Units::momentUnitIndex();
+
+        // format 200002
+        // saving WPolar full data including extra drag
+        defaultWPolar.serializeWPlrXFL(ar, true);
+
+        // save the planes...
+        ar << Objects3d::planeCount();
+        for (i=0; i<Objects3d::planeCount();i++)
+        {
+            pPlane = Objects3d::planeAt(i);
+            pPlane->serializePlaneXFL(ar, bIsStoring);
+        }
+
+        // save the WPolars
+        ar << Objects3d::polarCount();
+        for (i=0; i<Objects3d::polarCount();i++)
+        {
+            pWPolar = Objects3d::polarAt(i);
+            pWPolar->serializeWPlrXFL(ar, bIsStoring);
+        }
+
+        if(bSaveWOpps)
+        {
+            // not forgetting their POpps
+            ar << Objects3d::planeOppCount();
+            for (i=0; i<Objects3d::planeOppCount();i++)
+            {
+                pPOpp = Objects3d::planeOppAt(i);
+                pPOpp->serializePOppXFL(ar, bIsStoring);
+            }
+        }
+        else ar << 0;
+
+        // then the foils
+        ar << Objects2d::foilCount();
+        for(int i=0; i<Objects2d::foilCount(); i++)
+        {
+            Foil *pFoil = Objects2d::foilAt(i);
+            serializeFoilXFL(pFoil, ar, bIsStoring);
+        }
+
+        //the foil polars
+        ar << Objects2d::polarCount();
+        for (int i=0; i<Objects2d::polarCount();i++)
+        {
+            pPolar = Objects2d::polarAt(i);
+            serializePolarXFL(pPolar, ar, bIsStoring);
+        }
+
+        //the oppoints
+        if(bSaveOpps)
+        {
+            ar << Objects2d::oppCount();
+            for (int i=0; i<Objects2d::oppCount();i++)
+            {
+                pOpp = Objects2d::oppAt(i);
+                pOpp->serializeOppXFL(ar, bIsStoring);
+            }
+        }
+        else ar << 0;
+
+        // and the spline foil whilst we're at it
+        pSF->serializeXFL(ar, bIsStoring);
+
+        ar << Units::pressureUnitIndex();
+        ar << Units::inertiaUnitIndex();
+        //add provisions
+        // space allocation for the future storage of more data, without need to change the format
+        for (int i=2; i<20; i++) ar << 0;
+        dble=0;
+        for (int i=0; i<50; i++) ar << dble;
+    }
+    else
+    {
+        // LOADING CODE
+        int ArchiveFormat(0);
+        ar >> ArchiveFormat;
+        if(ArchiveFormat<200001 || ArchiveFormat>200002) return false;
+
+        auto isFoilRead = [&options](QString const &foilName)
+        {
+            return options.bFoils && (options.foilNames.isEmpty() || options.foilNames.contains(foilName));
+        };
+
+        QFile *pFile = qobject_cast<QFile*>(ar.device());
+        bool bDefer = !options.bOpps && pFile && !pFile->isSequential();
+        if(bDefer)
+        {
+            // only the records of one file are kept
+            loadDeferredOpps();
+            loadDeferredPlaneOpps();
+            QFileInfo fi(*pFile);
+            s_DeferredFileName = fi.absoluteFilePath();
+            s_DeferredFileTime = fi.lastModified();
+            s_DeferredFileSize = fi.size();
+        }
+        if(pFile && options.isPartial()) s_PartialFileName = QFileInfo(*pFile).absoluteFilePath();
+
+        //Load unit data
+        ar >> n; Units::setLengthUnitIndex(n);
+        ar >> n; Units::setAreaUnitIndex(n);
+        ar >> n; Units::setWeightUnitIndex(n);
+        ar >> n; Units::setSpeedUnitIndex(n);
+        ar >> n; Units::setForceUnitIndex(n);
+        ar >> n; Units::setMomentUnitIndex(n);
+
+        //pressure and inertia units are added later on in the provisions.
+
+        Units::setUnitConversionFactors();
+
+        if(ArchiveFormat==200001)
+        {
+            //Load the default Polar data. Not in the Settings, since this is Project dependant
+            ar >> n;
+            switch (n)
+            {
+                default:
+                case 1: defaultWPolar.setPolarType(xfl::FIXEDSPEEDPOLAR);  break;
+                case 2: defaultWPolar.setPolarType(xfl::FIXEDLIFTPOLAR);   break;
+                case 4: defaultWPolar.setPolarType(xfl::FIXEDAOAPOLAR);    break;
+                case 5: defaultWPolar.setPolarType(xfl::BETAPOLAR);        break;
+                case 7: defaultWPolar.setPolarType(xfl::STABILITYPOLAR);   break;
+            }
+
+            ar >> n;
+            switch(n)
+            {
+                case 1: defaultWPolar.setAnalysisMethod(xfl::LLTMETHOD);     break;
+                default:
+                case 2: defaultWPolar.setAnalysisMethod(xfl::VLMMETHOD);     break;
+                case 3: defaultWPolar.setAnalysisMethod(xfl::PANEL4METHOD);  break;
+            }
+
+            ar >> dble;    defaultWPolar.setMass(dble);
+            ar >> defaultWPolar.m_QInfSpec;
+            double x(0), y(0), z(0);
+            ar >> x >> y >> z;
+            defaultWPolar.setCoG({x,y,z});
+
+            ar >> f; defaultWPolar.setDensity(double(f));
+            ar >> f; defaultWPolar.setViscosity(double(f));
+            ar >> defaultWPolar.m_AlphaSpec;
+            ar >> defaultWPolar.m_BetaSpec;
+
+            ar >> boolean;  defaultWPolar.setTilted(boolean);
+            ar >> boolean;  defaultWPolar.setWakeRollUp(boolean);
+        }
+        else if(ArchiveFormat==200002) defaultWPolar.serializeWPlrXFL(ar, false);
+
+        // load the planes...
+        // assumes all object have been deleted and the array cleared.
+        ar >> n;
+        for(i=0; i<n; i++)
+        {
+            pPlane = new Plane();
+            if(pPlane->serializePlaneXFL(ar, bIsStoring))
+            {
+                if(options.bPlanes) Objects3d::appendPlane(pPlane);
+                else                delete pPlane;
+            }
+            else
+            {
+                delete pPlane;
+                return false;
+            }
+        }
+
+        // load the WPolars
+        ar >> n;
+        for(i=0; i<n; i++)
+        {
+            pWPolar = new WPolar();
+            if(pWPolar->serializeWPlrXFL(ar, bIsStoring))
+            {
+                // clean up : the project may be carrying useless WPolars due to past programming errors
+                pPlane = Objects3d::getPlane(pWPolar->planeName());
+                if(pPlane)
+                {
+                    Objects3d::appendWPolar(pWPolar);
+                    if(pWPolar->referenceDim()==xfl::PLANFORMREFDIM)
+                    {
+                        pWPolar->setReferenceSpanLength(pPlane->planformSpan());
+                        double area  = pPlane->planformArea();
+                        if(pPlane->biPlane()) area += pPlane->wing2()->m_PlanformArea;
+                        pWPolar->setReferenceArea(area);
+                    }
+                    else if(pWPolar->referenceDim()==xfl::PROJECTEDREFDIM)
+                    {
+                        pWPolar->setReferenceSpanLength(pPlane->projectedSpan());
+                        double area = pPlane->projectedArea();
+                        if(pPlane->biPlane()) area += pPlane->wing2()->m_ProjectedArea;
+                        pWPolar->setReferenceArea(area);
+                    }
+                    pWPolar->setReferenceChordLength(pPlane->mac());
+                }
+                else delete pWPolar;
+            }
+            else
+            {
+                delete pWPolar;
+                return false;
+            }
+        }
+
+        // the PlaneOpps
+        ar >> n;
+        for(i=0; i<n; i++)
+        {
+            qint64 pos = bDefer ? pFile->pos() : 0;
+            pPOpp = new PlaneOpp();
+            if(pPOpp->serializePOppXFL(ar, bIsStoring))
+            {
+                //just append, since POpps have been sorted when first inserted
+                pPlane = Objects3d::getPlane(pPOpp->planeName());
+                pWPolar = Objects3d::getWPolar(pPlane, pPOpp->polarName());
+
+                // clean up : the project may be carrying useless PlaneOpps due to past programming errors
+                if(pPlane && pWPolar && bDefer)
+                {
+                    s_DeferredPOpps.append({pPOpp->planeName(), pPOpp->polarName(), pWPolar, pos});
+                    delete pPOpp;
+                }
+                else if(pPlane && pWPolar) Objects3d::insertPOpp(pPOpp);
+                else delete pPOpp;
+            }
+            else
+            {
+                delete pPOpp;
+                return false;
+            }
+        }
+
+        // load the Foils
+        ar >> n;
+        for(i=0; i<n; i++)
+        {
+            Foil *pFoil = new Foil();
+            if(serializeFoilXFL(pFoil, ar, bIsStoring))
+            {
+                if(!isFoilRead(pFoil->name()))
+                {
+                    delete pFoil;
+                    continue;
+                }
+                // delete any former foil with that name - necessary in the case of project insertion to avoid duplication
+                // there is a risk that old plane results are not consisent with the new foil, but difficult to avoid that
+                Foil *pOldFoil = Objects2d::foil(pFoil->name());
+                if(pOldFoil) Objects2d::deleteFoil(pOldFoil);
+                Objects2d::appendFoil(pFoil);
+            }
+            else
+            {
+                delete pFoil;
+                return false;
+            }
+        }
+
+        // load the Polars
+        ar >> n;
+
+        for(i=0; i<n; i++)
+        {
+            pPolar = new Polar();
+            if(serializePolarXFL(pPolar, ar, bIsStoring))
+            {
+                if(options.bPolars && isFoilRead(pPolar->foilName())) Objects2d::appendPolar(pPolar);
+                else                                                  delete pPolar;
+            }
+            else
+            {
+                delete pPolar;
+                return false;
+            }
+        }
+
+        // OpPoints
+        ar >> n;
+        for(i=0; i<n; i++)
+        {
+            qint64 pos = bDefer ? pFile->pos() : 0;
+            pOpp = new OpPoint();
+            if(pOpp->serializeOppXFL(ar, bIsStoring))
+            {
+                if(!options.bPolars || !isFoilRead(pOpp->foilName()))
+                {
+                    delete pOpp;
+                }
+                else if(bDefer)
+                {
+                    pPolar = Objects2d::getPolar(pOpp->foilName(), pOpp->polarName());
+                    if(pPolar) s_DeferredOpps.append({pOpp->foilName(), pOpp->polarName(), pPolar, pos});
+                    delete pOpp;
+                }
+                else Objects2d::appendOpp(pOpp);
+            }
+            else
+            {
+                delete pOpp;
+                return false;
+            }
+        }
+
+        // and the spline foil whilst we're at it
+        pSF->serializeXFL(ar, bIsStoring);
+
+        ar >> n; Units::setPressureUnitIndex(n);
+        ar >> n; Units::setInertiaUnitIndex(n);
+
+        // space allocation
+        int k=0;
+        double dble=0;
+        for (int i=2; i<20; i++) ar >> k;
+        for (int i=0; i<50; i++) ar >> dble;
+
+        s_nDeferred = s_DeferredOpps.size() + s_DeferredPOpps.size();
+
+        // v6.49: recalculate the wing geometries after the foils have been loaded
+        // to determine the number of flaps
+        for(int ip=0; ip<Objects3d::planeCount(); ip++)
+        {
+            Plane *pPlane = Objects3d::planeAt(ip);
+            for(int iw=0; iw<MAXWINGS; iw++)
+            {
+                if(pPlane->wing(iw))
+                    pPlane->wing(iw)->computeGeometry();
+            }
+        }
+    }
+    return true;
+}
+
+
+/**
+ * Reads from the project file the foil operating points which serializeProjectXFL() has deferred,
+ * and inserts them in the project. Must be called in the thread which owns the objects.
+ * The points of a polar deleted since the project was loaded, and the points computed again since, are dropped.
+ * @param foilName the foil of the points to read; if empty, all the deferred points are read
+ * @param polarName the polar of the points to read; if empty, the points of all the polars of the foil are read
+ * @return the number of points inserted, or -1 if the file has changed since the project was loaded
+ */
+int xfl::loadDeferredOpps(QString const &foilName, QString const &polarName)
+{
+    if(s_DeferredOpps.isEmpty()) return 0;
+
+    QVector<DeferredOpp> records = takeDeferred(s_DeferredOpps, foilName, polarName);
+    if(records.isEmpty()) return 0;
+
+    QFile file(s_DeferredFileName);
+    if(!openDeferredFile(file)) return -1;
+
+    QDataStream ar(&file);
+    int nOpps = 0;
+    for(DeferredOpp const &record : records)
+    {
+        Foil *pFoil = Objects2d::foil(record.objectName);
+        Polar *pPolar = Objects2d::getPolar(record.objectName, record.polarName);
+        if(!pFoil || !pPolar || pPolar!=record.pPolar) continue;
+
+        OpPoint *pOpp = new OpPoint();
+        if(!file.seek(record.pos) || !pOpp->serializeOppXFL(ar, false) || ar.status()!=QDataStream::Ok)
+        {
+            delete pOpp;
+            ar.resetStatus();
+            continue;
+        }
+
+        double x = pPolar->polarType()==xfl::FIXEDAOAPOLAR ? pOpp->Reynolds() : pOpp->aoa();
+        if(Objects2d::getOpp(pFoil, pPolar, x)) delete pOpp;
+        else
+        {
+            Objects2d::insertOpPoint(pOpp);
+            nOpps++;
+        }
+    }
+    file.close();
+    return nOpps;
+}
+
+
+/**
+ * Reads from the project file the plane operating points which serializeProjectXFL() has deferred.
+ * Same as loadDeferredOpps(), for the planes.
+ */
+int xfl::loadDeferredPlaneOpps(QString const &planeName, QString const &polarName)
+{
+    if(s_DeferredPOpps.isEmpty()) return 0;
+
+    QVector<DeferredOpp> records = takeDeferred(s_DeferredPOpps, planeName, polarName);
+    if(records.isEmpty()) return 0;
+
+    QFile file(s_DeferredFileName);
+    if(!openDeferredFile(file)) return -1;
+
+    QDataStream ar(&file);
+    int nPOpps = 0;
+    for(DeferredOpp const &record : records)
+    {
+        Plane *pPlane = Objects3d::getPlane(record.objectName);
+        WPolar *pWPolar = Objects3d::getWPolar(pPlane, record.polarName);
+        if(!pPlane || !pWPolar || pWPolar!=record.pPolar) continue;
+
+        PlaneOpp *pPOpp = new PlaneOpp();
+        if(!file.seek(record.pos) || !pPOpp->serializePOppXFL(ar, false) || ar.status()!=QDataStream::Ok)
+        {
+            delete pPOpp;
+            ar.resetStatus();
+            continue;
+        }
+
+        double x = pPOpp->alpha();
+        switch(pPOpp->polarType())
+        {
+            case xfl::FIXEDAOAPOLAR:  x = pPOpp->QInf();  break;
+            case xfl::BETAPOLAR:      x = pPOpp->beta();  break;
+            case xfl::STABILITYPOLAR: x = pPOpp->ctrl();  break;
+            default: break;
+        }
+        if(Objects3d::getPlaneOpp(pPlane, pWPolar, x)) delete pPOpp;
+        else
+        {
+            Objects3d::insertPOpp(pPOpp);
+            nPOpps++;
+        }
+    }
+    file.close();
+    return nPOpps;
+}
+
+
+/** @return the number of foil and plane operating points which are still in the project file. May be called from any thread */
+int xfl::deferredOppCount()
+{
+    return s_nDeferred;
+}
+
+
+/** Drops the deferred operating points, e.g. when the project is deleted */
+void xfl::clearDeferredOpps()
+{
+    s_DeferredOpps.clear();
+    s_DeferredPOpps.clear();
+    s_DeferredFileName.clear();
+    s_nDeferred = 0;
+}
+
+
+/**
+ * Drops the deferred foil operating points of a polar whose operating points are deleted or reset, so that they are not read back later.
+ * Must be called in the thread which owns the objects.
+ * @param foilName the foil of the points; if empty, all the deferred points are dropped
+ * @param polarName the polar of the points; if empty, the points of all the polars of the foil are dropped
+ */
+void xfl::discardDeferredOpps(QString const &foilName, QString const &polarName)
+{
+    if(s_DeferredOpps.isEmpty()) return;
+    takeDeferred(s_DeferredOpps, foilName, polarName);
+}
+
+
+/** Same as discardDeferredOpps(), for the planes */
+void xfl::discardDeferredPlaneOpps(QString const &planeName, QString const &polarName)
+{
+    if(s_DeferredPOpps.isEmpty()) return;
+    takeDeferred(s_DeferredPOpps, planeName, polarName);
+}
+
+
+/**
+ * @return true if some records of pathName have not been read with the current project.
+ * Saving the project to this file would lose them.
+ */
+bool xfl::isPartialProjectFile(QString const &pathName)
+{
+    return !s_PartialFileName.isEmpty() && QFileInfo(pathName).absoluteFilePath()==s_PartialFileName;
+}
+
+
+/** Forgets the file of a partial load, e.g. when the project is deleted */
+void xfl::clearPartialProjectFile()
+{
+    s_PartialFileName.clear();
+}
@@ -29,14 +29,32 @@
 #include <QTextStream>
 #include <QPainter>
 #include <QFile>
+#include <QStringList>
 
 class Foil;
 class Polar;
 class WPolar;
 class Plane;
+class SplineFoil;
 
 namespace xfl
 {
+    /**
+     * The records of a .xfl project which serializeProjectXFL reads.
+     * The foil polars and operating points are only read for the foils which are read.
+     */
+    struct ProjectLoadOptions
+    {
+        bool bFoils = true;
+        bool bPolars = true;        /**< the foil polars and their operating points */
+        bool bPlanes = true;        /**< the planes, their polars and their operating points */
+        QStringList foilNames;      /**< if not empty, only the foils with these names are read */
+        bool bOpps = true;          /**< if false, the operating points are indexed and read from the file on first access, see loadDeferredOpps() */
+
+        /** @return true if some records are not read. The deferred operating points are read back before the project is saved, so they do not count */
+        bool isPartial() const {return !bFoils || !bPolars || !bPlanes || !foilNames.isEmpty();}
+    };
+
     QColor getObjectColor(int type);
 
     bool intersect(Vector3d const &LA, Vector3d const &LB, Vector3d const &TA, Vector3d const &TB, Vector3d const &Normal,
@@ -53,6 +71,20 @@ namespace xfl
     void setRandomFoilColor(Foil *pFoil, bool bLightTheme);
     bool serializeFoil(Foil*pFoil, QDataStream &ar, bool bIsStoring);
     bool serializePolar(Polar *pPolar, QDataStream &ar, bool bIsStoring);
+    bool serializeFoilXFL(Foil *pFoil, QDataStream &ar, bool bIsStoring);
+    bool serializePolarXFL(Polar *pPolar, QDataStream &ar, bool bIsStoring);
+    bool serializeProjectXFL(QDataStream &ar, bool bIsStoring, WPolar &defaultWPolar, SplineFoil *pSF, bool bSaveOpps=true, bool bSaveWOpps=true,
+                             ProjectLoadOptions const &options=ProjectLoadOptions());
+
+    int loadDeferredOpps(QString const &foilName=QString(), QString const &polarName=QString());
+    int loadDeferredPlaneOpps(QString const &planeName=QString(), QString const &polarName=QString());
+    int deferredOppCount();
+    void clearDeferredOpps();
+    void discardDeferredOpps(QString const &foilName=QString(), QString const &polarName=QString());
+    void discardDeferredPlaneOpps(QString const &planeName=QString(), QString const &polarName=QString());
+
+    bool isPartialProjectFile(QString const &pathName);
+    void clearPartialProjectFile();
 
 
 }
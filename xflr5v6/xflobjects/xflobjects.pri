@@ -17,11 +17,13 @@ HEADERS += \
     xflobjects/editors/wingdlg.h \
     xflobjects/editors/wingscaledlg.h \
     xflobjects/editors/wingseldlg.h \
+    xflobjects/objectindex.h \
     xflobjects/objects2d/blxfoil.h \
     xflobjects/objects2d/foil.h \
     xflobjects/objects2d/objects2d.h \
     xflobjects/objects2d/oppoint.h \
     xflobjects/objects2d/polar.h \
+    xflobjects/objects2d/polarindex.h \
     xflobjects/objects3d/body.h \
     xflobjects/objects3d/objects3d.h \
     xflobjects/objects3d/panel.h \
@@ -64,6 +66,7 @@ SOURCES += \
     xflobjects/objects2d/objects2d.cpp \
     xflobjects/objects2d/opppoint.cpp \
     xflobjects/objects2d/polar.cpp \
+    xflobjects/objects2d/polarindex.cpp \
     xflobjects/objects3d/body.cpp \
     xflobjects/objects3d/objects3d.cpp \
     xflobjects/objects3d/panel.cpp \
@@ -2,33 +2,107 @@
 
 #include <xflobjects/objects2d/foil.h>
 #include <xflobjects/objects2d/polar.h>
+#include <xflobjects/objects2d/polarindex.h>
+#include <xdirect/optim2d/particle.h>
 #include <xflobjects/objects3d/plane.h>
 #include <xflobjects/objects3d/wpolar.h>
+#include <xflobjects/objects3d/planeopp.h>
+#include <xflobjects/objects3d/wingopp.h>
 #include <xflobjects/objects2d/oppoint.h>
-#include <xdirect/xdirect.h>
+#include <xflobjects/objects_global.h>
+#include <xflcore/xflcore.h>
 #include <xflcore/linestyle.h>
 #include "rpc/msgpack.hpp"
-// class XDirect;
+#include "rpc/this_handler.h"
+#include "serverstats.h"
+class XDirect;
 #include <iostream>
+#include <map>
+#include <cstring>
+#include <limits>
+#include <algorithm>
+#include <stdexcept>
 
 namespace RpcLibAdapters
 {   
+    /** true in the thread of a multicall while it runs its calls */
+    inline bool &inMultiCall(){
+        static thread_local bool bInMultiCall = false;
+        return bInMultiCall;
+    }
+
+    /**
+     * Fails the current call with an rpc error and does not return.
+     * Inside a multicall, the error must only fail the nested call: it is thrown as an exception, which the dispatcher turns
+     * into the error response of that call, rather than set in this_handler, which would replace the reply of the whole multicall.
+     */
+    [[noreturn]] inline void respondError(std::string const &error){
+        if (inMultiCall()) throw std::runtime_error(error);
+        rpc::this_handler().respond_error(error);
+        throw std::runtime_error(error); // not reached, respond_error throws
+    }
+
+    /** msgpack sends a vector<char> as a bin blob. Doubles are copied with the native (little endian) byte order. */
+    typedef std::map<std::string, std::vector<char>> BinColumns;
+
+    inline std::vector<char> toBin(const std::vector<double>& v){
+        std::vector<char> out(v.size()*sizeof(double));
+        if (!v.empty()) std::memcpy(out.data(), v.data(), out.size());
+        return out;
+    }
+
+    inline void addBinColumn(BinColumns& columns, const std::string& key, const std::vector<double>& v){
+        if (!v.empty()) columns[key] = toBin(v);
+    }
+
     // public:
+        /** Results of the calls of a multicall, in order. Execution stops at the first call which fails */
+        struct MultiCallResult{
+            vector<vector<char>> results;   // msgpack encoded result of each call which was executed
+            int failed = -1;                // index of the call which failed, -1 if all succeeded
+            string error;
+
+            MSGPACK_DEFINE_MAP(results, failed, error);
+        };
+
         struct StateAdapter{
             std::string projectPath;
             std::string projectName;
             int app;
             bool saved;
             bool display;
-            MSGPACK_DEFINE_MAP(projectPath, projectName, app, saved, display);
+            int64_t generation;     // incremented after each modification, see xflServer::bind
+            MSGPACK_DEFINE_MAP(projectPath, projectName, app, saved, display, generation);
 
-            StateAdapter(QString _projectPath, QString _projectName, xfl::enumApp _app, bool _saved, bool _display=true){
+            StateAdapter() : app(xfl::NOAPP), saved(true), display(true), generation(0){}
+            StateAdapter(QString _projectPath, QString _projectName, xfl::enumApp _app, bool _saved, bool _display=true, int64_t _generation=0){
                 projectPath = _projectPath.toStdString();
                 projectName = _projectName.toStdString();
                 app = _app;
                 saved = _saved;
                 display=_display;
+                generation=_generation;
+
+            }
+        };
 
+        /** The records of a project file to load, see xfl::ProjectLoadOptions */
+        struct ProjectLoadOptions{
+            std::vector<std::string> include = {"foils", "polars", "planes"};
+            std::vector<std::string> foils;     // the names of the foils to load, all of them if empty
+            bool opps = true;                   // if false, the operating points are read from the file on first access
+
+            MSGPACK_DEFINE_MAP(include, foils, opps);
+
+            static xfl::ProjectLoadOptions from_msgpack(const ProjectLoadOptions in){
+                xfl::ProjectLoadOptions options;
+                auto isIncluded = [&in](std::string const &name){return std::find(in.include.begin(), in.include.end(), name)!=in.include.end();};
+                options.bFoils = isIncluded("foils");
+                options.bPolars = isIncluded("polars");
+                options.bPlanes = isIncluded("planes");
+                for (std::string const &name : in.foils) options.foilNames.append(QString::fromStdString(name));
+                options.bOpps = in.opps;
+                return options;
             }
         };
 
@@ -217,6 +291,26 @@ namespace RpcLibAdapters
                     }
                 }
             }
+
+            /** Returns the requested columns as float64 blobs, keyed like the msgpack map */
+            BinColumns toBin() const{
+                BinColumns columns;
+                addBinColumn(columns, "alpha", alpha);
+                addBinColumn(columns, "Cl", Cl);
+                addBinColumn(columns, "XCp", XCp);
+                addBinColumn(columns, "Cd", Cd);
+                addBinColumn(columns, "Cdp", Cdp);
+                addBinColumn(columns, "Cm", Cm);
+                addBinColumn(columns, "XTr1", XTr1);
+                addBinColumn(columns, "XTr2", XTr2);
+                addBinColumn(columns, "HMom", HMom);
+                addBinColumn(columns, "Cpmn", Cpmn);
+                addBinColumn(columns, "ClCd", ClCd);
+                addBinColumn(columns, "Cl32Cd", Cl32Cd);
+                addBinColumn(columns, "RtCl", RtCl);
+                addBinColumn(columns, "Re", Re);
+                return columns;
+            }
         };
 
         struct PolarAdapter{
@@ -278,38 +372,29 @@ namespace RpcLibAdapters
             bool store_opp;
             bool viscous;
             bool keep_open_on_error;
+            bool warm_start = false;    // start the polars of a foil from the boundary layer of its previous analyses, see XFoilPool
 
-            MSGPACK_DEFINE_MAP(sequence_type, sequence, is_sequence, init_BL, store_opp, viscous, keep_open_on_error);
+            MSGPACK_DEFINE_MAP(sequence_type, sequence, is_sequence, init_BL, store_opp, viscous, keep_open_on_error, warm_start);
 
         };
 
         struct XDirectDisplayState{
-            bool polar_view; // m_bPolarView
+            bool polar_view = true; // m_bPolarView
             // Polar View
-            xfl::enumGraphView graph_view; // m_iPlrView
-            int which_graph;
+            xfl::enumGraphView graph_view = xfl::ALLGRAPHS; // m_iPlrView
+            int which_graph = 0;
 
             //OpPoint View
-            bool active_opp_only;
-            bool show_bl;
-            bool show_pressure;
-            bool show_cpgraph; 
-            bool animated;
-            int ani_speed;
+            bool active_opp_only = true;
+            bool show_bl = false;
+            bool show_pressure = false;
+            bool show_cpgraph = true; 
+            bool animated = false;
+            int ani_speed = 500;
             
             MSGPACK_DEFINE_MAP(polar_view, graph_view, which_graph, active_opp_only, show_bl, show_pressure, show_cpgraph, animated, ani_speed);
             XDirectDisplayState(){}
-            XDirectDisplayState(const XDirect& out){
-                polar_view = out.bPolarView();
-                graph_view = out.iPlrView();
-                which_graph = out.iPlrGraph();
-                active_opp_only = out.bActiveOppOnly();
-                show_bl = out.bShowBL();
-                show_pressure = out.bShowPressure();
-                show_cpgraph = out.bCpGraph();
-                animated = out.bAnimate();
-                ani_speed = out.slAnimateSpeed();
-            }
+            XDirectDisplayState(const XDirect& out); // defined with the gui connections, see xflserver_gui.cpp
         };
 
         struct OpPointAdapter{
@@ -351,6 +436,96 @@ namespace RpcLibAdapters
 
         };
 
+        /** Distributions of several OpPoints stacked as (n_opp x n_nodes) float64 blobs. Shorter rows and missing results are padded with NaN */
+        struct OpPointArrays{
+            /** Surface distributions (CPV..QI) have one value per foil node. Boundary layer fields are sent as two columns, "<name>_top" and "<name>_bot" */
+            enum enumOppField{CPV, CPI, QV, QI, XBL, DSTAR, THETA, UE, HK, CTAU, RTHETA, TAU, DIS};
+
+            int n_opp = 0;
+            std::map<std::string, int> widths; // number of values per OpPoint of each column except "alpha", to shape the columns even if n_opp is 0
+            BinColumns columns; // "alpha" holds one value per OpPoint
+            MSGPACK_DEFINE_MAP(n_opp, widths, columns);
+
+            OpPointArrays(){}
+
+            OpPointArrays(const vector<OpPoint*>& opps, const vector<enumOppField>& field_list){
+                n_opp = int(opps.size());
+                vector<double> alpha;
+                for (OpPoint* pOpp : opps) alpha.push_back(pOpp->aoa());
+                columns["alpha"] = toBin(alpha);
+
+                for (enumOppField field : field_list){
+                    if (field<=QI){
+                        addColumn(opps, fieldName(field), field, 0);
+                    }
+                    else{
+                        addColumn(opps, fieldName(field)+"_top", field, 1);
+                        addColumn(opps, fieldName(field)+"_bot", field, 2);
+                    }
+                }
+            }
+
+            /** Sends an rpc error to the client if one of the requested fields is not an enumOppField */
+            static void checkFields(const vector<enumOppField>& field_list){
+                for (enumOppField field : field_list){
+                    if (field<CPV || field>DIS) respondError("invalid OpPoint field " + std::to_string(int(field)));
+                }
+            }
+
+            static std::string fieldName(enumOppField field){
+                static const char* names[] = {"Cpv", "Cpi", "Qv", "Qi", "xbl", "dstar", "theta", "ue", "Hk", "ctau", "Rtheta", "tau", "dis"};
+                if (field<CPV || field>DIS) return "";
+                return names[field];
+            }
+
+            void addColumn(const vector<OpPoint*>& opps, const std::string& key, enumOppField field, int side){
+                int width = 0;
+                for (OpPoint* pOpp : opps) width = std::max(width, size(*pOpp, field, side));
+                widths[key] = width;
+                columns[key] = stack(opps, field, side, width);
+            }
+
+            /** Number of values of the field; side is 0 for the surface distributions, 1 or 2 for the top or bottom boundary layer */
+            static int size(const OpPoint& opp, enumOppField field, int side){
+                if (side==0){
+                    if (!opp.bViscResults() && (field==CPV || field==QV)) return 0;
+                    return opp.m_n;
+                }
+                if (!opp.bBL()) return 0;
+                int nside = side==1 ? opp.blx.nside1 : opp.blx.nside2;
+                return std::max(nside-2, 0); // bl stations 2 to nside-1, as in the XDirect graphs
+            }
+
+            static double value(const OpPoint& opp, enumOppField field, int side, int i){
+                int ibl = i+2;
+                switch (field){
+                case CPV:    return opp.Cpv[i];
+                case CPI:    return opp.Cpi[i];
+                case QV:     return opp.Qv[i];
+                case QI:     return opp.Qi[i];
+                case XBL:    return opp.blx.xbl[ibl][side];
+                case DSTAR:  return opp.blx.dstr[ibl][side];
+                case THETA:  return opp.blx.thet[ibl][side];
+                case UE:     return opp.blx.uedg[ibl][side];
+                case HK:     return opp.blx.Hk[ibl][side];
+                case CTAU:   return opp.blx.ctau[ibl][side];
+                case RTHETA: return opp.blx.RTheta[ibl][side];
+                case TAU:    return opp.blx.tau[ibl][side];
+                case DIS:    return opp.blx.dis[ibl][side];
+                default:     return std::numeric_limits<double>::quiet_NaN();
+                }
+            }
+
+            static vector<char> stack(const vector<OpPoint*>& opps, enumOppField field, int side, int width){
+                vector<double> rows(opps.size()*width, std::numeric_limits<double>::quiet_NaN());
+                for (size_t j=0; j<opps.size(); j++){
+                    int n = size(*opps[j], field, side);
+                    for (int i=0; i<n; i++) rows[j*width+i] = value(*opps[j], field, side, i);
+                }
+                return toBin(rows);
+            }
+        };
+
         struct WingSectionAdapter{
             double y_position;
             double chord;
@@ -588,6 +763,151 @@ namespace RpcLibAdapters
                 }
         }
 
+            /** Returns the requested columns as float64 blobs, keyed like the msgpack map */
+            BinColumns toBin() const{
+                BinColumns columns;
+                addBinColumn(columns, "alpha", alpha);
+                addBinColumn(columns, "Cl", Cl);
+                addBinColumn(columns, "XCpCl", XCpCl);
+                addBinColumn(columns, "TCd", TCd);
+                addBinColumn(columns, "PCd", PCd);
+                addBinColumn(columns, "Cm", Cm);
+                addBinColumn(columns, "SM", SM);
+                addBinColumn(columns, "ICd", ICd);
+                addBinColumn(columns, "Fz", Fz);
+                addBinColumn(columns, "Fx", Fx);
+                addBinColumn(columns, "ClCd", ClCd);
+                addBinColumn(columns, "Cl32Cd", Cl32Cd);
+                addBinColumn(columns, "Q_inf", Q_inf);
+                addBinColumn(columns, "Fy", Fy);
+                return columns;
+            }
+
+            /** Appends the rows of another result with the same columns */
+            void append(const WPolarResult& other){
+                alpha.insert(alpha.end(), other.alpha.begin(), other.alpha.end());
+                Cl.insert(Cl.end(), other.Cl.begin(), other.Cl.end());
+                ClCd.insert(ClCd.end(), other.ClCd.begin(), other.ClCd.end());
+                TCd.insert(TCd.end(), other.TCd.begin(), other.TCd.end());
+                Cm.insert(Cm.end(), other.Cm.begin(), other.Cm.end());
+                Cl32Cd.insert(Cl32Cd.end(), other.Cl32Cd.begin(), other.Cl32Cd.end());
+                Fz.insert(Fz.end(), other.Fz.begin(), other.Fz.end());
+                Fx.insert(Fx.end(), other.Fx.begin(), other.Fx.end());
+                Fy.insert(Fy.end(), other.Fy.begin(), other.Fy.end());
+                Q_inf.insert(Q_inf.end(), other.Q_inf.begin(), other.Q_inf.end());
+                XCpCl.insert(XCpCl.end(), other.XCpCl.begin(), other.XCpCl.end());
+                SM.insert(SM.end(), other.SM.begin(), other.SM.end());
+                ICd.insert(ICd.end(), other.ICd.begin(), other.ICd.end());
+                PCd.insert(PCd.end(), other.PCd.begin(), other.PCd.end());
+            }
+
+        };
+
+        struct WPolarProgress{
+            WPolarResult result;    // the operating points computed since the requested index
+            int n_points;           // number of operating points computed so far
+            bool finished;
+
+            MSGPACK_DEFINE_MAP(result, n_points, finished);
+
+            WPolarProgress(){}
+        };
+
+        /** Panel and strip distributions of one PlaneOpp. One message per operating point keeps large panel meshes out of a single giant message */
+        struct PlaneOppArrays{
+            /** CP..SIGMA have one value per panel of the plane. The others have one value per span station of each wing; F and VD are (x,y,z) triplets */
+            enum enumPOppField{CP, GAMMA, SIGMA, SPANPOS, CHORD, CL, AI, ICD, PCD, RE, CMAIRF, XCP, BM, F, VD};
+
+            bool found = false;
+            double alpha = 0.0;
+            double beta = 0.0;
+            double ctrl = 0.0;
+            double QInf = 0.0;
+            BinColumns panels;
+            vector<BinColumns> wings; // main wing, second wing, elevator, fin. Empty if the plane has no such wing
+
+            MSGPACK_DEFINE_MAP(found, alpha, beta, ctrl, QInf, panels, wings);
+
+            PlaneOppArrays(){}
+
+            PlaneOppArrays(const PlaneOpp& out, const vector<enumPOppField>& field_list){
+                found = true;
+                alpha = out.alpha();
+                beta = out.beta();
+                ctrl = out.ctrl();
+                QInf = out.QInf();
+                wings.resize(MAXWINGS);
+                for (enumPOppField field : field_list){
+                    switch (field){
+                    case CP:
+                        panels["Cp"] = toBin(vector<double>(out.m_dCp, out.m_dCp+out.m_NPanels));
+                        break;
+                    case GAMMA:
+                        panels["G"] = toBin(vector<double>(out.m_dG, out.m_dG+out.m_NPanels));
+                        break;
+                    case SIGMA:
+                        panels["Sigma"] = toBin(vector<double>(out.m_dSigma, out.m_dSigma+out.m_NPanels));
+                        break;
+                    default:
+                        for (int iw=0; iw<MAXWINGS; iw++){
+                            if (out.m_pWOpp[iw]) wings[iw][fieldName(field)] = stripColumn(*out.m_pWOpp[iw], field);
+                        }
+                        break;
+                    }
+                }
+            }
+
+            /** The variable which is swept by the type of polar of the operating point */
+            static double variable(const PlaneOpp& out){
+                if (out.isT4Polar()) return out.QInf();
+                if (out.isT5Polar()) return out.beta();
+                if (out.isT7Polar()) return out.ctrl();
+                return out.alpha();
+            }
+
+            /** Sends an rpc error to the client if one of the requested fields is not an enumPOppField */
+            static void checkFields(const vector<enumPOppField>& field_list){
+                for (enumPOppField field : field_list){
+                    if (field<CP || field>VD) respondError("invalid PlaneOpp field " + std::to_string(int(field)));
+                }
+            }
+
+            static std::string fieldName(enumPOppField field){
+                static const char* names[] = {"Cp", "G", "Sigma", "SpanPos", "Chord", "Cl", "Ai", "ICd", "PCd", "Re", "CmAirf", "XCP", "BM", "F", "Vd"};
+                if (field<CP || field>VD) return "";
+                return names[field];
+            }
+
+            static vector<char> stripColumn(const WingOpp& wopp, enumPOppField field){
+                int n = wopp.m_NStation;
+                const double* pValues = nullptr;
+                switch (field){
+                case SPANPOS: pValues = wopp.m_SpanPos;        break;
+                case CHORD:   pValues = wopp.m_Chord;          break;
+                case CL:      pValues = wopp.m_Cl;             break;
+                case AI:      pValues = wopp.m_Ai;             break;
+                case ICD:     pValues = wopp.m_ICd;            break;
+                case PCD:     pValues = wopp.m_PCd;            break;
+                case RE:      pValues = wopp.m_Re;             break;
+                case CMAIRF:  pValues = wopp.m_CmAirf;         break;
+                case XCP:     pValues = wopp.m_XCPSpanRel;     break;
+                case BM:      pValues = wopp.m_BendingMoment;  break;
+                case F:
+                case VD:{
+                    const QVector<Vector3d>& vectors = field==F ? wopp.m_F : wopp.m_Vd;
+                    vector<double> xyz;
+                    for (int i=0; i<std::min(n, int(vectors.size())); i++){
+                        xyz.push_back(vectors.at(i).x);
+                        xyz.push_back(vectors.at(i).y);
+                        xyz.push_back(vectors.at(i).z);
+                    }
+                    return toBin(xyz);
+                }
+                default:
+                    return vector<char>();
+                }
+                return toBin(vector<double>(pValues, pValues+n));
+            }
         };
 
         struct WPolarAdapter{
@@ -636,13 +956,180 @@ namespace RpcLibAdapters
 
         };
 
+        struct PolarCacheStats{
+            int hits;
+            int misses;
+            int size;
+            int capacity;
+
+            MSGPACK_DEFINE_MAP(hits, misses, size, capacity);
+
+            PolarCacheStats(){}
+            PolarCacheStats(int _hits, int _misses, int _size, int _capacity){
+                hits = _hits;
+                misses = _misses;
+                size = _size;
+                capacity = _capacity;
+            }
+        };
+
+        struct XFoilPoolStats{
+            int warm_starts;    // polars which started from a converged boundary layer
+            int cold_starts;
+            int size;
+            int capacity;
+
+            MSGPACK_DEFINE_MAP(warm_starts, cold_starts, size, capacity);
+
+            XFoilPoolStats(){}
+            XFoilPoolStats(int _warm_starts, int _cold_starts, int _size, int _capacity){
+                warm_starts = _warm_starts;
+                cold_starts = _cold_starts;
+                size = _size;
+                capacity = _capacity;
+            }
+        };
+
+        struct PolarIndexEntry{
+            std::string foil_name;
+            std::string polar_name;
+            double reynolds = 0.0;
+            double alpha0 = 0.0;        // linearized lift curve, used by the LLT initialization
+            double slope = 0.0;
+            bool interpolated = false;  // true for the type 1 polars with points, which the Cl and alpha interpolations use
+            double cl_min = 0.0;
+            double cl_max = 0.0;
+            double alpha_min = 0.0;
+            double alpha_max = 0.0;
+            int i_zero_cl = -1;         // the point closest to Cl=0
+            int i_cl_low = -1;          // the range around it in which Cl strictly increases
+            int i_cl_high = -1;
+
+            MSGPACK_DEFINE_MAP(foil_name, polar_name, reynolds, alpha0, slope, interpolated, cl_min, cl_max, alpha_min, alpha_max, i_zero_cl, i_cl_low, i_cl_high);
+
+            PolarIndexEntry(){}
+            PolarIndexEntry(PolarIndex::Entry const& entry, PolarIndex::Entry const* pType1){
+                foil_name = entry.pPolar->foilName().toStdString();
+                polar_name = entry.pPolar->name().toStdString();
+                reynolds = entry.Re;
+                alpha0 = entry.Alpha0;
+                slope = entry.Slope;
+                if (pType1){
+                    interpolated = true;
+                    cl_min = pType1->ClMin;
+                    cl_max = pType1->ClMax;
+                    alpha_min = pType1->AlphaMin;
+                    alpha_max = pType1->AlphaMax;
+                    i_zero_cl = pType1->iZeroCl;
+                    i_cl_low = pType1->iClLow;
+                    i_cl_high = pType1->iClHigh;
+                }
+            }
+        };
+
+        struct OptimObjective{
+            std::string name;       // Cl, Cd, Cm or Cl/Cd
+            double target = 0.0;
+            double max_error = 0.0; // the optimization ends when every objective is within its max_error of its target
+
+            MSGPACK_DEFINE_MAP(name, target, max_error);
+        };
+
+        /** Settings of a foil optimization, see FoilOptim. The variables are the amplitudes of Hicks-Henne bumps on the upper surface */
+        struct OptimSettings2D{
+            std::string algorithm = "mopso";    // or "ga", which takes a single objective
+            int population = 31;
+            int max_iter = 100;
+            int n_threads = 0;                  // threads evaluating the particles, 0 for all the cores
+            double alpha = 0.0;                 // aoa of the analysis of each particle
+            double reynolds = 1.0e6;
+            double mach = 0.0;
+            double ncrit = 9.0;
+            double xtr_top = 1.0;
+            double xtr_bot = 1.0;
+            double hh_t2 = 1.0;                 // width parameter of the bumps
+
+            MSGPACK_DEFINE_MAP(algorithm, population, max_iter, n_threads, alpha, reynolds, mach, ncrit, xtr_top, xtr_bot, hh_t2);
+        };
+
+        /** The front of one generation: the Pareto archive for MOPSO, the best particle for GA. One row per particle */
+        struct OptimFront{
+            int iter = 0;
+            std::vector<std::vector<double>> position;
+            std::vector<std::vector<double>> fitness;   // the value of each objective
+            std::vector<std::vector<double>> error;     // the distance of each value to its target
+
+            MSGPACK_DEFINE_MAP(iter, position, fitness, error);
+
+            OptimFront(){}
+            OptimFront(int _iter, QVector<Particle> const& particles){
+                iter = _iter;
+                for (Particle const& particle: particles){
+                    position.push_back(std::vector<double>(particle.position().begin(), particle.position().end()));
+                    std::vector<double> f, e;
+                    for (int i=0; i<particle.nObjectives(); i++){
+                        f.push_back(particle.fitness(i));
+                        e.push_back(particle.error(i));
+                    }
+                    fitness.push_back(f);
+                    error.push_back(e);
+                }
+            }
+        };
+
+        struct OptimProgress{
+            std::vector<OptimFront> fronts;    // the fronts recorded since the requested index
+            int n_fronts = 0;                  // number of fronts recorded so far
+            bool finished = true;
+
+            MSGPACK_DEFINE_MAP(fronts, n_fronts, finished);
+        };
+
+        struct SpanStats{
+            int64_t count = 0;
+            double total_ms = 0.0;
+            double max_ms = 0.0;
+
+            MSGPACK_DEFINE_MAP(count, total_ms, max_ms);
+
+            SpanStats(){}
+            SpanStats(ServerStats::Span const &span){
+                count = span.count;
+                total_ms = span.total;
+                max_ms = span.max;
+            }
+        };
+
+        /** Timings of one binding, see ServerStats */
+        struct MethodStats{
+            std::string method;
+            SpanStats call;
+            SpanStats queue;
+            SpanStats slot;
+            SpanStats serialize;
+            int64_t bytes = 0;
+
+            MSGPACK_DEFINE_MAP(method, call, queue, slot, serialize, bytes);
+
+            MethodStats(){}
+            MethodStats(std::string const &_method, ServerStats::Method const &stats){
+                method = _method;
+                call = SpanStats(stats.call);
+                queue = SpanStats(stats.queue);
+                slot = SpanStats(stats.slot);
+                serialize = SpanStats(stats.serialize);
+                bytes = stats.bytes;
+            }
+        };
+
         struct AnalysisSettings3D{
             SequenceAdapter sequence;
             bool is_sequence;
             bool init_LLT;
             bool store_opp;
+            int n_threads = 1;  // threads of the panel solver, 0 for all the cores
 
-            MSGPACK_DEFINE_MAP(sequence, is_sequence, init_LLT, store_opp);
+            MSGPACK_DEFINE_MAP(sequence, is_sequence, init_LLT, store_opp, n_threads);
 
         };
 
@@ -655,4 +1142,6 @@ MSGPACK_ADD_ENUM(xfl::enumPolarType);
 MSGPACK_ADD_ENUM(xfl::enumAnalysisMethod);
 MSGPACK_ADD_ENUM(xfl::enumRefDimension);
 MSGPACK_ADD_ENUM(RpcLibAdapters::WPolarResult::enumWPolarResult);
-MSGPACK_ADD_ENUM(RpcLibAdapters::PolarResultAdapter::enumPolarResult);
\ No newline at end of file
+MSGPACK_ADD_ENUM(RpcLibAdapters::PolarResultAdapter::enumPolarResult);
+MSGPACK_ADD_ENUM(RpcLibAdapters::OpPointArrays::enumOppField);
+MSGPACK_ADD_ENUM(RpcLibAdapters::PlaneOppArrays::enumPOppField);
\ No newline at end of file
@@ -0,0 +1,260 @@
+/****************************************************************************
+
+    FoilOptim Class
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include "foiloptim.h"
+
+#include <QMutexLocker>
+#include <QThread>
+#include <QtConcurrent/QtConcurrentRun>
+#include <algorithm>
+#include <cmath>
+
+#include <xdirect/optim2d/gatask.h>
+#include <xdirect/optim2d/mopsotask2d.h>
+
+
+FoilOptim::FoilOptim() : m_pTask(nullptr), m_bPSO(true), m_bRunning(false), m_bCancel(false)
+{
+}
+
+
+FoilOptim::~FoilOptim()
+{
+    cancel();
+    wait();
+    delete m_pTask;
+}
+
+
+/** @return true if the request can be run: known algorithm and objective names, a single objective for the GA, one (min, max) pair per variable */
+bool FoilOptim::isValid(std::vector<RpcLibAdapters::OptimObjective> const &objectives, std::vector<std::vector<double>> const &bounds,
+                        RpcLibAdapters::OptimSettings2D const &settings)
+{
+    if(settings.algorithm!="mopso" && settings.algorithm!="ga") return false;
+    if(settings.population<2 || settings.max_iter<1) return false;
+    if(objectives.empty() || bounds.empty()) return false;
+    if(settings.algorithm=="ga" && objectives.size()>1) return false;
+
+    QStringList names = MOPSOTask2d::objectiveNames();
+    for(RpcLibAdapters::OptimObjective const &obj : objectives)
+    {
+        if(!names.contains(QString::fromStdString(obj.name))) return false;
+    }
+    for(std::vector<double> const &bound : bounds)
+    {
+        if(bound.size()!=2 || bound.at(0)>bound.at(1)) return false;
+    }
+    return true;
+}
+
+
+/**
+ * Launches the optimization of the foil and returns immediately.
+ * @return false if an optimization is already running, or if the request is not valid
+ */
+bool FoilOptim::start(Foil const*pFoil, std::vector<RpcLibAdapters::OptimObjective> const &objectives, std::vector<std::vector<double>> const &bounds,
+                      RpcLibAdapters::OptimSettings2D const &settings)
+{
+    if(!pFoil || m_bRunning || !isValid(objectives, bounds, settings)) return false;
+
+    wait(); // the loop of a cancelled run may still be ending
+
+    {
+        QMutexLocker locker(&m_Mutex);
+        delete m_pTask;
+        m_pTask = nullptr;
+        m_Fronts.clear();
+    }
+
+    m_Objectives = objectives;
+    m_Bounds = bounds;
+    m_Settings = settings;
+    m_bPSO = settings.algorithm=="mopso";
+
+    m_Foil.copyFoil(pFoil);
+
+    m_Polar.setReType(1);
+    m_Polar.setMaType(1);
+    m_Polar.setAoa(settings.alpha);
+    m_Polar.setReynolds(settings.reynolds);
+    m_Polar.setMach(settings.mach);
+    m_Polar.setNCrit(settings.ncrit);
+    m_Polar.setXtrTop(settings.xtr_top);
+    m_Polar.setXtrBot(settings.xtr_bot);
+
+    m_Pool.setMaxThreadCount(settings.n_threads>0 ? settings.n_threads : QThread::idealThreadCount());
+
+    m_bCancel = false;
+    m_bRunning = true;
+    m_Future = QtConcurrent::run([this](){run();});
+    return true;
+}
+
+
+void FoilOptim::wait()
+{
+    m_Future.waitForFinished();
+}
+
+
+/**
+ * The iteration loop. The task is created here rather than in start(),
+ * so that it belongs to the thread which runs its iterations.
+ */
+void FoilOptim::run()
+{
+    // the index of the leading edge node, as in Optim2d: the bumps are only added to the nodes before it
+    int iLE = -1;
+    for(int i=0; i<m_Foil.m_n-1; i++)
+    {
+        if(m_Foil.m_x[i]<m_Foil.m_x[i+1])
+        {
+            iLE = i;
+            break;
+        }
+    }
+
+    int nVar = int(m_Bounds.size());
+    double amp = 0.0;
+    QVector<OptVariable> variables;
+    for(int i=0; i<nVar; i++)
+    {
+        variables.append({QString::asprintf("HH%d", i), m_Bounds.at(i).at(0), m_Bounds.at(i).at(1)});
+        amp = std::max(amp, std::max(fabs(m_Bounds.at(i).at(0)), fabs(m_Bounds.at(i).at(1))));
+    }
+
+    OptimTask *pTask = nullptr;
+    if(m_bPSO)
+    {
+        MOPSOTask2d *pPSOTask2d = new MOPSOTask2d;
+        pPSOTask2d->setPolar(&m_Polar);
+        pPSOTask2d->setFoil(&m_Foil, iLE);
+        pPSOTask2d->setAlpha(m_Settings.alpha);
+        pPSOTask2d->setHHParams(nVar, m_Settings.hh_t2, amp);
+        pPSOTask2d->setNObjectives(int(m_Objectives.size()));
+        for(uint iobj=0; iobj<m_Objectives.size(); iobj++)
+        {
+            RpcLibAdapters::OptimObjective const &obj = m_Objectives.at(iobj);
+            pPSOTask2d->setObjective(int(iobj), {QString::fromStdString(obj.name), true, obj.target, obj.max_error});
+        }
+        pTask = pPSOTask2d;
+    }
+    else
+    {
+        RpcLibAdapters::OptimObjective const &obj = m_Objectives.front();
+        GATask *pGATask = new GATask;
+        pGATask->setPolar(&m_Polar);
+        pGATask->setFoil(&m_Foil, iLE);
+        pGATask->setAlpha(m_Settings.alpha);
+        pGATask->setHHParams(nVar, m_Settings.hh_t2, amp);
+        pGATask->setObjective({QString::fromStdString(obj.name), true, obj.target, obj.max_error});
+        pTask = pGATask;
+    }
+    pTask->setDimension(nVar);
+    pTask->setVariables(variables);
+    pTask->setPopSize(m_Settings.population);
+    pTask->setMaxIter(m_Settings.max_iter);
+    pTask->setThreadPool(&m_Pool);
+
+    {
+        QMutexLocker locker(&m_Mutex);
+        m_pTask = pTask;
+    }
+
+    pTask->makeSwarm();
+    if(m_bPSO)
+    {
+        MOPSOTask *pPSOTask = static_cast<MOPSOTask*>(pTask);
+        pPSOTask->clearPareto();
+        pPSOTask->makeParetoFront();
+    }
+    else
+    {
+        // unlike Optim2d, evaluate the first generation so that its selection is not a blind draw
+        static_cast<GATask*>(pTask)->evaluatePopulation();
+    }
+    pTask->restartIterations();
+    pTask->setAnalysisStatus(xfl::RUNNING);
+    storeFront();
+
+    while(pTask->isRunning() && !m_bCancel)
+    {
+        pTask->onIteration();
+        storeFront();
+    }
+    if(m_bCancel) pTask->cancelAnalyis();
+
+    m_bRunning = false;
+}
+
+
+/** Records the front of the iteration which has just ended. Called in the thread of the iterations */
+void FoilOptim::storeFront()
+{
+    Front front;
+    front.iter = m_pTask->m_Iter;
+    if(m_bPSO)
+    {
+        front.particles = static_cast<MOPSOTask*>(m_pTask)->m_Pareto;
+    }
+    else
+    {
+        GATask const *pGATask = static_cast<GATask*>(m_pTask);
+        if(pGATask->m_iBest>=0) front.particles.append(pGATask->bestParticle());
+    }
+
+    QMutexLocker locker(&m_Mutex);
+    m_Fronts.append(front);
+}
+
+
+int FoilOptim::frontCount()
+{
+    QMutexLocker locker(&m_Mutex);
+    return m_Fronts.size();
+}
+
+
+/** @return the fronts recorded since the one at index start */
+QVector<FoilOptim::Front> FoilOptim::fronts(int start)
+{
+    QMutexLocker locker(&m_Mutex);
+    start = std::max(start, 0);
+    if(start>=m_Fronts.size()) return QVector<Front>();
+    return m_Fronts.mid(start);
+}
+
+
+/**
+ * Makes the foil of a particle of the last recorded front.
+ * @return false if there is no such particle
+ */
+bool FoilOptim::makeFoil(int index, Foil *pFoil)
+{
+    QMutexLocker locker(&m_Mutex);
+    if(!m_pTask || m_Fronts.isEmpty()) return false;
+    QVector<Particle> const &particles = m_Fronts.last().particles;
+    if(index<0 || index>=particles.size()) return false;
+
+    if(m_bPSO) static_cast<MOPSOTask2d*>(m_pTask)->makeFoil(particles.at(index), pFoil);
+    else       static_cast<GATask*>(m_pTask)->makeFoil(&particles.at(index), pFoil);
+    return true;
+}
@@ -0,0 +1,91 @@
+/****************************************************************************
+
+    FoilOptim Class
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QFuture>
+#include <QMutex>
+#include <QThreadPool>
+#include <QVector>
+#include <atomic>
+
+#include <xdirect/optim2d/particle.h>
+#include <xflobjects/objects2d/foil.h>
+#include <xflobjects/objects2d/polar.h>
+
+#include "RpcLibAdapters.h"
+
+class OptimTask;
+
+/**
+ * @class FoilOptim
+ * Runs the MOPSO or GA optimization of the Optim2d dialog for the server, without the dialog.
+ * The variables are the amplitudes of Hicks-Henne bumps added to the upper surface of the foil,
+ * and the objectives are target values of the aerodynamic coefficients at a fixed aoa and Reynolds number.
+ * The optimization runs in the background; the particles of each generation are evaluated on a
+ * thread pool of their own, and the front of each generation is recorded so that the client can poll it.
+ * For MOPSO the front is the Pareto archive, for GA it is the best particle.
+ * All the methods may be called from the server thread while the optimization runs.
+ */
+class FoilOptim
+{
+    public:
+        struct Front{
+            int iter = 0;
+            QVector<Particle> particles;
+        };
+
+        FoilOptim();
+        ~FoilOptim();
+
+        static bool isValid(std::vector<RpcLibAdapters::OptimObjective> const &objectives, std::vector<std::vector<double>> const &bounds,
+                            RpcLibAdapters::OptimSettings2D const &settings);
+
+        bool start(Foil const*pFoil, std::vector<RpcLibAdapters::OptimObjective> const &objectives, std::vector<std::vector<double>> const &bounds,
+                   RpcLibAdapters::OptimSettings2D const &settings);
+        void cancel() {m_bCancel = true;}
+        void wait();
+        bool isRunning() const {return m_bRunning;}
+
+        int frontCount();
+        QVector<Front> fronts(int start);
+        bool makeFoil(int index, Foil *pFoil);
+
+    private:
+        void run();
+        void storeFront();
+
+        OptimTask *m_pTask;         /**< created by run(), in the thread of the iterations */
+        bool m_bPSO;
+        std::vector<RpcLibAdapters::OptimObjective> m_Objectives;
+        std::vector<std::vector<double>> m_Bounds;
+        RpcLibAdapters::OptimSettings2D m_Settings;
+        Foil m_Foil;                /**< a copy of the foil to optimize, which the project may delete while the task runs */
+        Polar m_Polar;
+        QThreadPool m_Pool;         /**< evaluates the particles of a generation */
+        QFuture<void> m_Future;     /**< the iteration loop */
+
+        QMutex m_Mutex;             /**< protects m_pTask and m_Fronts */
+        QVector<Front> m_Fronts;    /**< the front of each generation, starting with the initial population */
+
+        std::atomic<bool> m_bRunning;
+        std::atomic<bool> m_bCancel;
+};
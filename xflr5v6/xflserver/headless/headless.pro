@@ -0,0 +1,143 @@
+# -------------------------------------------------
+# The xflrpy server without the gui: a QCoreApplication which owns
+# the objects and the analyses, and serves the same methods as xflrpy.
+# QtWidgets is linked for the few dialogs and widgets which the object
+# classes reference, but no widget is ever created.
+# -------------------------------------------------
+
+lessThan(QT_MAJOR_VERSION, 5) {
+  error("Qt5.4 or greater is required for xflr5 v6")
+}
+
+DEFINES += QT_DEPRECATED_WARNINGS
+
+CONFIG += qt console
+CONFIG -= app_bundle
+QT += widgets network
+QT -= opengl
+
+TEMPLATE = app
+TARGET = xflrpy-server
+
+SRCDIR = $$PWD/../..
+
+INCLUDEPATH += $$SRCDIR
+INCLUDEPATH += $$SRCDIR/../XFoil-lib/
+INCLUDEPATH += $$SRCDIR/../rpclib/include
+DEPENDPATH += $$SRCDIR/../XFoil-lib/
+
+OBJECTS_DIR = ./objects
+MOC_DIR     = ./moc
+DESTDIR     = .
+
+win32 {
+    CONFIG -= debug_and_release debug_and_release_target
+}
+
+linux-g++{
+    isEmpty(PREFIX):PREFIX = /usr/local
+    target.path = $$PREFIX/bin
+    INSTALLS += target
+}
+
+LIBS += -L$$OUT_PWD/../../../XFoil-lib -lXFoil
+LIBS += -L$$SRCDIR/../rpclib/build -lrpc
+
+SOURCES += \
+    main.cpp \
+    headlessframe.cpp \
+    $$SRCDIR/xflserver/xflserver.cpp \
+    $$SRCDIR/xflserver/polarcache.cpp \
+    $$SRCDIR/xflserver/serverstats.cpp \
+    $$SRCDIR/xflserver/xfoilpool.cpp \
+    $$SRCDIR/xflserver/foiloptim.cpp \
+    $$SRCDIR/gui_objects/spline5.cpp \
+    $$SRCDIR/gui_objects/splinefoil.cpp \
+    $$SRCDIR/xdirect/analysis/xfoiltask.cpp \
+    $$SRCDIR/xdirect/optim2d/gatask.cpp \
+    $$SRCDIR/xdirect/optim2d/mopsotask.cpp \
+    $$SRCDIR/xdirect/optim2d/mopsotask2d.cpp \
+    $$SRCDIR/xdirect/optim2d/optimtask.cpp \
+    $$SRCDIR/xdirect/optim2d/particle.cpp \
+    $$SRCDIR/xflanalysis/analysis3d_globals.cpp \
+    $$SRCDIR/xflanalysis/plane_analysis/lltanalysis.cpp \
+    $$SRCDIR/xflanalysis/plane_analysis/panelanalysis.cpp \
+    $$SRCDIR/xflanalysis/plane_analysis/planetask.cpp \
+    $$SRCDIR/xflcore/displayoptions.cpp \
+    $$SRCDIR/xflcore/mathelem.cpp \
+    $$SRCDIR/xflcore/matrix.cpp \
+    $$SRCDIR/xflcore/units.cpp \
+    $$SRCDIR/xflcore/xflcore.cpp \
+    $$SRCDIR/xflgeom/geom2d/spline.cpp \
+    $$SRCDIR/xflgeom/geom2d/vector2d.cpp \
+    $$SRCDIR/xflgeom/geom3d/frame.cpp \
+    $$SRCDIR/xflgeom/geom3d/nurbssurface.cpp \
+    $$SRCDIR/xflgeom/geom3d/quaternion.cpp \
+    $$SRCDIR/xflgeom/geom3d/vector3d.cpp \
+    $$SRCDIR/xflobjects/editors/renamedlg.cpp \
+    $$SRCDIR/xflobjects/objects2d/blxfoil.cpp \
+    $$SRCDIR/xflobjects/objects2d/foil.cpp \
+    $$SRCDIR/xflobjects/objects2d/objects2d.cpp \
+    $$SRCDIR/xflobjects/objects2d/opppoint.cpp \
+    $$SRCDIR/xflobjects/objects2d/polar.cpp \
+    $$SRCDIR/xflobjects/objects2d/polarindex.cpp \
+    $$SRCDIR/xflobjects/objects3d/body.cpp \
+    $$SRCDIR/xflobjects/objects3d/objects3d.cpp \
+    $$SRCDIR/xflobjects/objects3d/panel.cpp \
+    $$SRCDIR/xflobjects/objects3d/plane.cpp \
+    $$SRCDIR/xflobjects/objects3d/planeopp.cpp \
+    $$SRCDIR/xflobjects/objects3d/surface.cpp \
+    $$SRCDIR/xflobjects/objects3d/wing.cpp \
+    $$SRCDIR/xflobjects/objects3d/wingopp.cpp \
+    $$SRCDIR/xflobjects/objects3d/wpolar.cpp \
+    $$SRCDIR/xflobjects/objects_global.cpp \
+
+HEADERS += \
+    headlessframe.h \
+    $$SRCDIR/xflserver/xflserver.h \
+    $$SRCDIR/xflserver/RpcLibAdapters.h \
+    $$SRCDIR/xflserver/polarcache.h \
+    $$SRCDIR/xflserver/serverstats.h \
+    $$SRCDIR/xflserver/xfoilpool.h \
+    $$SRCDIR/xflserver/foiloptim.h \
+    $$SRCDIR/xflserver/utils.h \
+    $$SRCDIR/gui_objects/spline5.h \
+    $$SRCDIR/gui_objects/splinefoil.h \
+    $$SRCDIR/xdirect/analysis/xfoiltask.h \
+    $$SRCDIR/xdirect/optim2d/gatask.h \
+    $$SRCDIR/xdirect/optim2d/mopsotask.h \
+    $$SRCDIR/xdirect/optim2d/mopsotask2d.h \
+    $$SRCDIR/xdirect/optim2d/optimtask.h \
+    $$SRCDIR/xdirect/optim2d/particle.h \
+    $$SRCDIR/xflanalysis/analysis3d_globals.h \
+    $$SRCDIR/xflanalysis/plane_analysis/lltanalysis.h \
+    $$SRCDIR/xflanalysis/plane_analysis/panelanalysis.h \
+    $$SRCDIR/xflanalysis/plane_analysis/planetask.h \
+    $$SRCDIR/xflcore/displayoptions.h \
+    $$SRCDIR/xflcore/mathelem.h \
+    $$SRCDIR/xflcore/matrix.h \
+    $$SRCDIR/xflcore/units.h \
+    $$SRCDIR/xflcore/xflcore.h \
+    $$SRCDIR/xflgeom/geom2d/spline.h \
+    $$SRCDIR/xflgeom/geom2d/vector2d.h \
+    $$SRCDIR/xflgeom/geom3d/frame.h \
+    $$SRCDIR/xflgeom/geom3d/nurbssurface.h \
+    $$SRCDIR/xflgeom/geom3d/quaternion.h \
+    $$SRCDIR/xflgeom/geom3d/vector3d.h \
+    $$SRCDIR/xflobjects/editors/renamedlg.h \
+    $$SRCDIR/xflobjects/objects2d/blxfoil.h \
+    $$SRCDIR/xflobjects/objects2d/foil.h \
+    $$SRCDIR/xflobjects/objects2d/objects2d.h \
+    $$SRCDIR/xflobjects/objects2d/oppoint.h \
+    $$SRCDIR/xflobjects/objects2d/polar.h \
+    $$SRCDIR/xflobjects/objects2d/polarindex.h \
+    $$SRCDIR/xflobjects/objects3d/body.h \
+    $$SRCDIR/xflobjects/objects3d/objects3d.h \
+    $$SRCDIR/xflobjects/objects3d/panel.h \
+    $$SRCDIR/xflobjects/objects3d/plane.h \
+    $$SRCDIR/xflobjects/objects3d/planeopp.h \
+    $$SRCDIR/xflobjects/objects3d/surface.h \
+    $$SRCDIR/xflobjects/objects3d/wing.h \
+    $$SRCDIR/xflobjects/objects3d/wingopp.h \
+    $$SRCDIR/xflobjects/objects3d/wpolar.h \
+    $$SRCDIR/xflobjects/objects_global.h \
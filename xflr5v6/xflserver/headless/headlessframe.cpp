@@ -0,0 +1,723 @@
+/****************************************************************************
+
+    HeadlessFrame Class
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include "headlessframe.h"
+
+#include <QCoreApplication>
+#include <QDataStream>
+#include <QDebug>
+#include <QDir>
+#include <QFile>
+#include <QTextStream>
+#include <cmath>
+
+#include <xfoil.h>
+#include <xflcore/displayoptions.h>
+#include <xflobjects/objects2d/foil.h>
+#include <xflobjects/objects2d/objects2d.h>
+#include <xflobjects/objects3d/objects3d.h>
+#include <xflobjects/objects3d/plane.h>
+#include <xflobjects/objects3d/planeopp.h>
+#include <xflobjects/objects_global.h>
+#include <xflserver/xflserver.h>
+
+
+HeadlessFrame::HeadlessFrame() : m_iApp(xfl::NOAPP), m_bSaved(true), m_pCurPlane(nullptr), m_pCurWPolar(nullptr),
+    m_bSequence(true), m_bInitLLTCalc(true), m_nThreads(1), m_vMin(0.0), m_vMax(1.0), m_vDelta(0.5)
+{
+    m_SF.m_bModified = false;
+    m_SF.initSplineFoil();
+
+    m_theLLTAnalysis.m_poaPolar = Objects2d::pOAPolar();
+    m_theTask.m_ptheLLTAnalysis = &m_theLLTAnalysis;
+    m_theTask.m_pthePanelAnalysis = &m_thePanelAnalysis;
+}
+
+
+HeadlessFrame::~HeadlessFrame()
+{
+    deleteProject();
+}
+
+
+void HeadlessFrame::deleteProject()
+{
+    //make sure the pointers are null before deleting the objects
+    Objects2d::setCurFoil(nullptr);
+    Objects2d::setCurPolar(nullptr);
+    Objects2d::setCurOpp(nullptr);
+    m_pCurPlane  = nullptr;
+    m_pCurWPolar = nullptr;
+    m_theTask.setWPolarObject(nullptr, nullptr);
+    m_theTask.setPlaneObject(nullptr);
+
+    Objects3d::deleteObjects();
+    Objects2d::deleteAllFoils();
+    xfl::clearDeferredOpps();
+    xfl::clearPartialProjectFile();
+}
+
+
+void HeadlessFrame::onNewProject()
+{
+    deleteProject();
+    setProjectName("");
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::setProjectName(QString const &pathName)
+{
+    m_FileName = pathName;
+    int pos = pathName.lastIndexOf("/");
+    if (pos>0) m_ProjectName = pathName.right(pathName.length()-pos-1);
+    else       m_ProjectName = pathName;
+
+    if(m_ProjectName.length()>4) m_ProjectName = m_ProjectName.left(m_ProjectName.length()-4);
+}
+
+
+void HeadlessFrame::onGetState(RpcLibAdapters::StateAdapter* state)
+{
+    *state = RpcLibAdapters::StateAdapter(m_FileName, m_ProjectName, m_iApp, m_bSaved);
+}
+
+
+/**
+ * Saves the project to its file. Without the file dialog of the gui, a project which has no file yet is not saved;
+ * the clients set its path first with setProjectPath.
+ * @return true if the project has been saved.
+ */
+bool HeadlessFrame::onSaveProject()
+{
+    if(!m_FileName.length())
+    {
+        qDebug()<<"The project has no file name, set its path before saving it";
+        return false;
+    }
+    return saveProject(m_FileName);
+}
+
+
+bool HeadlessFrame::saveProject(QString const &pathName)
+{
+    if(xfl::isPartialProjectFile(pathName))
+    {
+        qDebug()<<"The project has been partially loaded from this file, save it under another name to keep the records which have not been loaded"<<pathName;
+        return false;
+    }
+
+    // read the operating points left in the project file before it is replaced
+    xfl::loadDeferredOpps();
+    xfl::loadDeferredPlaneOpps();
+
+    QString backupFileName = QDir::tempPath() + QDir::separator() + m_ProjectName + ".bak";
+
+    QFile::copy(pathName, backupFileName);
+
+    QFile fp(pathName);
+    if(fp.exists())
+    {
+        // move the old file to the temp directory instead of overwriting it
+        fp.rename(backupFileName);
+    }
+
+    if (!fp.open(QIODevice::WriteOnly))
+    {
+        qDebug()<<"Could not open the file for writing"<<pathName;
+        return false;
+    }
+
+    QDataStream ar(&fp);
+    if(!xfl::serializeProjectXFL(ar, true, m_DefaultWPolar, &m_SF))
+    {
+        // put the previous file back in place of the incomplete one
+        fp.close();
+        fp.remove();
+        QFile::rename(backupFileName, pathName);
+        qDebug()<<"Error saving the project file, the changes have not been saved";
+        return false;
+    }
+    QFile::remove(backupFileName);
+
+    m_FileName = pathName;
+    fp.close();
+
+    m_bSaved = true;
+    return true;
+}
+
+
+/**
+ * Loads the files as MainFrame::onLoadFileHeadless does. Several files are only loaded if they are foil files.
+ * @param pOptions the records of a project file to read
+ */
+void HeadlessFrame::onLoadProject(QStringList pathNames, xfl::ProjectLoadOptions *pOptions)
+{
+    bool bLoaded = false;
+    if(pathNames.size()>1)
+    {
+        for(int i=0; i<pathNames.size(); i++)
+        {
+            if(pathNames.at(i).endsWith(".dat")) bLoaded = loadFile(pathNames.at(i), *pOptions) || bLoaded;
+            else qDebug()<<"Multiple file loading only available for airfoil files, ignored"<<pathNames.at(i);
+        }
+    }
+    else if(pathNames.size()==1 && pathNames.at(0).length())
+    {
+        QString pathName = pathNames.at(0);
+        pathName.replace(QDir::separator(), "/"); // Qt sometimes uses the windows \ separator
+        bLoaded = loadFile(pathName, *pOptions);
+    }
+
+    if(bLoaded && m_iApp==xfl::NOAPP)
+    {
+        if(Objects3d::planeCount()) m_iApp = xfl::MIAREX;
+        else                        m_iApp = xfl::XFOILANALYSIS;
+    }
+    if(bLoaded) setPlane(nullptr);
+}
+
+
+/**
+ * Reads a project or a foil file. The other file types of the gui are not supported.
+ * @return true if the file has been read
+ */
+bool HeadlessFrame::loadFile(QString pathName, xfl::ProjectLoadOptions const &options)
+{
+    QFile XFile(pathName);
+    if (!XFile.open(QIODevice::ReadOnly))
+    {
+        qDebug()<<"Could not open the file"<<pathName;
+        return false;
+    }
+
+    QString end = pathName.right(4).toLower();
+    if(end==".dat")
+    {
+        Foil *pFoil = xfl::readFoilFile(XFile);
+        XFile.close();
+        if(!pFoil) return false;
+
+        Objects2d::insertThisFoil(pFoil);
+        Objects2d::setCurFoil(pFoil);
+        Objects2d::setCurPolar(nullptr);
+        Objects2d::setCurOpp(nullptr);
+        m_bSaved = false;
+        return true;
+    }
+    else if(end==".xfl")
+    {
+        deleteProject();
+
+        QDataStream ar(&XFile);
+        if(!xfl::serializeProjectXFL(ar, false, m_DefaultWPolar, &m_SF, true, true, options))
+        {
+            qDebug()<<"Error reading the file, loaded the valid part"<<pathName;
+        }
+        XFile.close();
+
+        m_bSaved = true;
+        setProjectName(pathName);
+        return true;
+    }
+
+    XFile.close();
+    qDebug()<<"Only the .xfl project files and the .dat foil files can be loaded without the gui"<<pathName;
+    return false;
+}
+
+
+Foil* HeadlessFrame::addNewFoil(Foil *pFoil, QString const &newName)
+{
+    if(!pFoil) return nullptr;
+
+    pFoil->setName(newName);
+    Objects2d::insertThisFoil(pFoil);
+    m_bSaved = false;
+    return pFoil;
+}
+
+
+/**
+ * Applies the camber and thickness values of the foil to its geometry, as the FoilGeomDlg does.
+ * The foil is left unchanged if XFoil returns a corrupted geometry.
+ */
+void HeadlessFrame::onFoilGeom(Foil* pFoil, QString newName)
+{
+    if(!pFoil) return;
+
+    XFoil *pXFoil = new XFoil;
+    double nx[IBX], ny[IBX];
+    pXFoil->initialize();
+    pXFoil->initXFoilGeometry(pFoil->m_n, pFoil->m_x, pFoil->m_y, nx, ny);
+
+    pXFoil->hipnt(pFoil->xCamber(), pFoil->xThickness());   // xfoil hipnt is the most sensitive routine - better do it first
+    pXFoil->tcset(pFoil->camber(), pFoil->thickness());
+
+    bool bOk = pXFoil->nb==pFoil->m_n;
+    for(int j=0; bOk && j<pXFoil->nb; j++)
+    {
+        if(std::isnan(pXFoil->xb[j+1]) || std::isnan(pXFoil->yb[j+1])) bOk = false;
+    }
+
+    if(bOk)
+    {
+        for (int j=0; j<pXFoil->nb; j++)
+        {
+            pFoil->m_xb[j] = pXFoil->xb[j+1];
+            pFoil->m_yb[j] = pXFoil->yb[j+1];
+        }
+        pFoil->m_nb = pXFoil->nb;
+        pFoil->initFoil();
+        pFoil->setFlap();
+    }
+    else qDebug()<<"Could not modify the geometry of the foil"<<pFoil->name();
+    delete pXFoil;
+
+    addNewFoil(pFoil, newName);
+}
+
+
+/**
+ * Creates a 4 or 5 digit NACA foil with the panels of the NacaFoilDlg.
+ */
+void HeadlessFrame::onNacaFoil(int digits, QString name)
+{
+    int itype = 0;
+    if(digits<=25099) itype = 5;
+    if(digits<=9999 ) itype = 4;
+    if(itype==5)
+    {
+        int three = digits/100;
+        if(three!=210 && three !=220 && three !=230 && three !=240 && three !=250) itype = 0;
+    }
+    if(itype==0)
+    {
+        qDebug()<<"Illegal NACA Number"<<digits;
+        return;
+    }
+
+    XFoil *pXFoil = new XFoil;
+    pXFoil->lflap = false;
+    pXFoil->lbflap = false;
+    bool bGenerated = true;
+    if(itype==4) pXFoil->naca4(digits, 50);
+    else         bGenerated = pXFoil->naca5(digits, 100);
+
+    if(bGenerated)
+    {
+        Foil *pNewFoil = new Foil();
+        for (int j=0; j<pXFoil->nb; j++)
+        {
+            pNewFoil->m_xb[j] = pXFoil->xb[j+1];
+            pNewFoil->m_yb[j] = pXFoil->yb[j+1];
+            pNewFoil->m_x[j]  = pXFoil->xb[j+1];
+            pNewFoil->m_y[j]  = pXFoil->yb[j+1];
+        }
+        pNewFoil->m_nb = pXFoil->nb;
+        pNewFoil->m_n  = pXFoil->nb;
+        pNewFoil->initFoil();
+
+        xfl::setRandomFoilColor(pNewFoil, !DisplayOptions::isLightTheme());
+        pNewFoil->setLineStipple(Line::SOLID);
+        pNewFoil->setLineWidth(1);
+        pNewFoil->setPointStyle(Line::NOSYMBOL);
+
+        addNewFoil(pNewFoil, name);
+        Objects2d::setCurFoil(pNewFoil);
+    }
+    else qDebug()<<"Illegal NACA Number"<<digits;
+    delete pXFoil;
+}
+
+
+Foil* HeadlessFrame::onDuplicateFoil(Foil* pFoil, QString newName)
+{
+    if(!pFoil) return nullptr;
+    Foil *pNewFoil = new Foil;
+    pNewFoil->copyFoil(pFoil);
+    xfl::setRandomFoilColor(pNewFoil, !DisplayOptions::isLightTheme());
+    pNewFoil->initFoil();
+
+    addNewFoil(pNewFoil, newName);
+    Objects2d::setCurFoil(pNewFoil);
+    return pNewFoil;
+}
+
+
+void HeadlessFrame::onSelectFoil(Foil* pFoil)
+{
+    Objects2d::setCurFoil(pFoil);
+}
+
+
+void HeadlessFrame::onShowFoil(Foil* pFoil, bool bShow)
+{
+    if(!pFoil) return;
+    pFoil->setVisible(bShow);
+}
+
+
+void HeadlessFrame::onRenameFoil(Foil* pFoil, QString newName)
+{
+    if(!pFoil) return;
+    Objects2d::renameThisFoil(pFoil, newName);
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::onDeleteFoil(Foil* pFoil)
+{
+    if(!pFoil) return;
+    Foil *pNextFoil = Objects2d::deleteFoil(pFoil);
+    Objects2d::setCurFoil(pNextFoil);
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::onNormalizeFoil()
+{
+    if(!Objects2d::curFoil()) return;
+    Objects2d::curFoil()->normalizeGeometry();
+    Objects2d::curFoil()->initFoil();
+    m_bSaved = false;
+}
+
+
+/**
+ * Derotates the current foil. Unlike the gui, which asks for the name of a new foil, the foil is derotated in place.
+ */
+void HeadlessFrame::onDerotateFoil()
+{
+    if(!Objects2d::curFoil()) return;
+    Objects2d::curFoil()->deRotate();
+    Objects2d::curFoil()->initFoil();
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::onFoilStyle(Foil* pFoil, LineStyle ls)
+{
+    if(!pFoil) return;
+    pFoil->setTheStyle(ls);
+
+    if(DisplayOptions::isAlignedChildrenStyle())
+        Objects2d::setFoilChildrenStyle(pFoil);
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::onExportFoil(Foil* pFoil, QString fileName)
+{
+    if(!pFoil) return;
+    QFile XFile(fileName);
+
+    if (!XFile.open(QIODevice::WriteOnly | QIODevice::Text)) return;
+    QTextStream out(&XFile);
+
+    pFoil->exportFoil(out);
+    XFile.close();
+}
+
+
+/**
+ * Adds the plane to the project, replacing the plane with the same name if any, and makes it the current plane.
+ */
+void HeadlessFrame::onNewPlane(Plane* pPlane)
+{
+    if(!pPlane) return;
+    m_pCurWPolar = nullptr;
+    Objects3d::addPlane(pPlane);
+    setPlane(pPlane);
+    m_bSaved = false;
+}
+
+
+/**
+ * Completes the definition of the polar from its plane and adds it to the project, as Miarex::onDefineWPolarHeadless does.
+ * A polar of the plane with the same name is replaced.
+ */
+void HeadlessFrame::onDefineWPolar(WPolar* pWPolar, Plane* pPlane)
+{
+    if(!pPlane) return;
+
+    pWPolar->setPlaneName(pPlane->name());
+
+    if(pWPolar->referenceDim()==xfl::PLANFORMREFDIM)
+    {
+        pWPolar->setReferenceSpanLength(pPlane->planformSpan());
+        double area = pPlane->planformArea();
+        if(pPlane->biPlane()) area += pPlane->wing2()->m_PlanformArea;
+        pWPolar->setReferenceArea(area);
+    }
+    else if(pWPolar->referenceDim()==xfl::PROJECTEDREFDIM)
+    {
+        pWPolar->setReferenceSpanLength(pPlane->projectedSpan());
+        double area = pPlane->projectedArea();
+        if(pPlane->biPlane()) area += pPlane->wing2()->m_ProjectedArea;
+        pWPolar->setReferenceArea(area);
+    }
+    pWPolar->setReferenceChordLength(pPlane->mac());
+
+    pWPolar->setBoundaryCondition(xfl::DIRICHLET);
+
+    if (pWPolar->analysisMethod() == xfl::LLTMETHOD)
+    {
+        pWPolar->setViscous(true);
+        pWPolar->setThinSurfaces(true);
+        pWPolar->setWakeRollUp(false);
+        pWPolar->setTilted(false);
+    }
+    else if (pWPolar->analysisMethod() == xfl::VLMMETHOD)
+    {
+        pWPolar->setVLM1(true);
+        pWPolar->setThinSurfaces(true);
+        pWPolar->setAnalysisMethod(xfl::PANEL4METHOD);
+    }
+    else if (pWPolar->analysisMethod() == xfl::PANEL4METHOD)
+    {
+        pWPolar->setThinSurfaces(false);
+    }
+
+    QColor clr = xfl::getObjectColor(4);
+    pWPolar->setColor(clr);
+    if(DisplayOptions::isAlignedChildrenStyle()) pWPolar->setTheStyle(pPlane->theStyle());
+
+    // replaces the polar and its operating points without the rename dialog of Objects3d::insertNewWPolar
+    WPolar *pOldWPolar = Objects3d::getWPolar(pPlane, pWPolar->polarName());
+    if(pOldWPolar && pOldWPolar!=pWPolar)
+    {
+        if(m_pCurWPolar==pOldWPolar) m_pCurWPolar = nullptr;
+        Objects3d::deleteWPolar(pOldWPolar);
+    }
+    Objects3d::addWPolar(pWPolar);
+
+    setPlane(pPlane);
+    setWPolar(pWPolar);
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::setPlane(Plane* pPlane)
+{
+    if(!pPlane) pPlane = Objects3d::planeAt(0);
+    if(pPlane!=m_pCurPlane) m_pCurWPolar = nullptr;
+    m_pCurPlane = m_theTask.setPlaneObject(pPlane);
+}
+
+
+void HeadlessFrame::setWPolar(WPolar* pWPolar)
+{
+    if(!m_pCurPlane)
+    {
+        m_pCurWPolar = nullptr;
+        return;
+    }
+
+    if(pWPolar && pWPolar->planeName()!=m_pCurPlane->name()) pWPolar = nullptr;
+
+    if(!pWPolar)
+    {
+        //find the first polar for this plane
+        for (int i=0; i<Objects3d::polarCount(); i++)
+        {
+            if (Objects3d::polarAt(i)->planeName() == m_pCurPlane->name())
+            {
+                pWPolar = Objects3d::polarAt(i);
+                break;
+            }
+        }
+    }
+
+    m_pCurWPolar = m_theTask.setWPolarObject(m_pCurPlane, pWPolar);
+    if(!m_pCurWPolar) return;
+
+    //make sure the polar is up to date with the latest plane data
+    if(m_pCurWPolar->bAutoInertia())
+    {
+        m_pCurWPolar->setMass(m_pCurPlane->totalMass());
+        m_pCurWPolar->setCoG(m_pCurPlane->CoG());
+        m_pCurWPolar->setCoGIxx(m_pCurPlane->CoGIxx());
+        m_pCurWPolar->setCoGIyy(m_pCurPlane->CoGIyy());
+        m_pCurWPolar->setCoGIzz(m_pCurPlane->CoGIzz());
+        m_pCurWPolar->setCoGIxz(m_pCurPlane->CoGIxz());
+    }
+}
+
+
+/**
+ * Records the settings of the next 3D analysis. Unlike Miarex, which keeps the ranges of the fixed speed
+ * and stability polars in its own settings, the range of the client is used for all the polar types.
+ * The smallest increments are those of Miarex::onReadAnalysisData.
+ */
+void HeadlessFrame::onSetAnalysisSettings3D(RpcLibAdapters::AnalysisSettings3D &analysis_settings)
+{
+    m_nThreads = analysis_settings.n_threads;
+    PlaneOpp::s_bStoreOpps = analysis_settings.store_opp;
+
+    m_bSequence    = analysis_settings.is_sequence;
+    m_bInitLLTCalc = analysis_settings.init_LLT;
+    m_vMin   = analysis_settings.sequence.start;
+    m_vMax   = analysis_settings.sequence.end;
+    m_vDelta = std::abs(analysis_settings.sequence.delta);
+
+    double minDelta = 0.01;
+    if(m_pCurWPolar && m_pCurWPolar->polarType()==xfl::FIXEDAOAPOLAR)      minDelta = 0.1;
+    else if(m_pCurWPolar && m_pCurWPolar->polarType()==xfl::STABILITYPOLAR) minDelta = 0.001;
+    if(m_vDelta<minDelta) m_vDelta = minDelta;
+}
+
+
+/**
+ * Prepares the analysis of the current plane and polar, as Miarex::prepareTaskHeadless does.
+ * @return a pointer to the task ready to run, or nullptr if the analysis cannot be launched
+ */
+PlaneTask* HeadlessFrame::prepareTask()
+{
+    if(!m_pCurPlane || !m_pCurWPolar) return nullptr;
+
+    for(int iw=0; iw<MAXWINGS; iw++)
+    {
+        Wing const*pWing = m_pCurPlane->wingAt(iw);
+        if(!pWing) continue;
+        for (int l=0; l<pWing->NWingSection(); l++)
+        {
+            if (!Objects2d::foil(pWing->rightFoilName(l)) || !Objects2d::foil(pWing->leftFoilName(l)))
+                return nullptr;
+        }
+    }
+
+    m_theLLTAnalysis.m_bCancel = false; // left set by a cancelled run, unlike the flag of the panel analysis
+    if(m_pCurWPolar->analysisMethod()==xfl::LLTMETHOD)
+    {
+        LLTAnalysis::s_bInitCalc = m_bInitLLTCalc;
+        m_theLLTAnalysis.setCurvePointers(nullptr, nullptr); // no iteration graph to feed
+        m_theTask.initializeTask(m_pCurPlane, m_pCurWPolar, m_vMin, m_vMax, m_vDelta, m_bSequence);
+    }
+    else if(m_theTask.matSize()>0)
+    {
+        m_theTask.initializeTask(m_pCurPlane, m_pCurWPolar, m_vMin, m_vMax, m_vDelta, m_bSequence, m_nThreads);
+        m_theTask.stitchSurfaces();
+    }
+    else return nullptr;
+
+    return &m_theTask;
+}
+
+
+/**
+ * Stores the operating points of the task, as Miarex::onTaskFinishedHeadless does.
+ */
+void HeadlessFrame::onTaskFinished()
+{
+    QVector<PlaneOpp*> &POppList = m_theTask.isLLTTask() ? m_theLLTAnalysis.m_PlaneOppList : m_thePanelAnalysis.m_PlaneOppList;
+    if(PlaneOpp::s_bStoreOpps)
+    {
+        for(int iPOpp=0; iPOpp<POppList.size(); iPOpp++)
+        {
+            PlaneOpp *pPOpp = POppList.at(iPOpp);
+            if(DisplayOptions::isAlignedChildrenStyle()) pPOpp->setTheStyle(m_pCurWPolar->theStyle());
+            pPOpp->setVisible(true);
+
+            if(m_theTask.isLLTTask() || PlaneOpp::s_bKeepOutOpps || !pPOpp->isOut()) Objects3d::insertPOpp(pPOpp);
+            else delete pPOpp;
+        }
+        POppList.clear();
+    }
+    else
+    {
+        if(m_theTask.isLLTTask()) m_theLLTAnalysis.clearPOppList();
+        else                      m_thePanelAnalysis.clearPOppList();
+    }
+    m_bSaved = false;
+}
+
+
+void HeadlessFrame::onCancelTask()
+{
+    PanelAnalysis::s_bCancel = true;
+    m_theLLTAnalysis.onCancel();
+}
+
+
+/**
+ * Connects the signals of the server to the front end which replaces the gui. The display stays off,
+ * so the analyses run in the server's threads and the view updates are never requested.
+ */
+void xflServer::connectHeadless(HeadlessFrame *pFrame){
+    m_bHeadless = true;
+    m_bDisplay = false;
+
+    //========================= Mainframe slots =========================//
+    QObject::connect(this, &xflServer::onNewProject, pFrame, &HeadlessFrame::onNewProject, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSaveProject, pFrame, &HeadlessFrame::onSaveProject, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onLoadProject, pFrame, &HeadlessFrame::onLoadProject, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onXDirect, pFrame, [pFrame](){pFrame->m_iApp = xfl::XFOILANALYSIS;}, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onAFoil, pFrame, [pFrame](){pFrame->m_iApp = xfl::DIRECTDESIGN;}, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onMiarex, pFrame, [pFrame](){pFrame->m_iApp = xfl::MIAREX;}, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onXInverse, pFrame, [pFrame](){pFrame->m_iApp = xfl::INVERSEDESIGN;}, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onClose, QCoreApplication::instance(), &QCoreApplication::quit);
+    QObject::connect(this, &xflServer::onGetState, pFrame, &HeadlessFrame::onGetState, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetProjectPath, pFrame, &HeadlessFrame::setProjectName, Qt::BlockingQueuedConnection);
+
+    // ====================== AFoil slots =======================//
+    QObject::connect(this, &xflServer::onFoilGeom, pFrame, &HeadlessFrame::onFoilGeom, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onAFoilNacaFoils, pFrame, &HeadlessFrame::onNacaFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDuplicateFoil, pFrame, &HeadlessFrame::onDuplicateFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSelectFoil, pFrame, &HeadlessFrame::onSelectFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onShowFoil, pFrame, &HeadlessFrame::onShowFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onRenameFoil, pFrame, &HeadlessFrame::onRenameFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDeleteFoil, pFrame, &HeadlessFrame::onDeleteFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onNormalizeFoil, pFrame, &HeadlessFrame::onNormalizeFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDerotateFoil, pFrame, &HeadlessFrame::onDerotateFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onFoilStyle, pFrame, &HeadlessFrame::onFoilStyle, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onExportFoil, pFrame, &HeadlessFrame::onExportFoil, Qt::BlockingQueuedConnection);
+
+    // ===================== XDirect ====================== //
+    QObject::connect(this, &xflServer::onSetXDirectDisplay, pFrame, &HeadlessFrame::onSetXDirectDisplay, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onGetXDirectDisplay, pFrame, &HeadlessFrame::onGetXDirectDisplay, Qt::BlockingQueuedConnection);
+
+    // ===================== Miarex ====================== //
+    QObject::connect(this, &xflServer::onNewPlane, pFrame, &HeadlessFrame::onNewPlane, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDefineWPolar, pFrame, &HeadlessFrame::onDefineWPolar, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetWPolar, pFrame, &HeadlessFrame::setWPolar, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetPlane, pFrame, &HeadlessFrame::setPlane, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetAnalysisSettings3D, pFrame, &HeadlessFrame::onSetAnalysisSettings3D, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onPrepareWPolarTask, pFrame, &HeadlessFrame::prepareTask, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onWPolarTaskFinished, pFrame, &HeadlessFrame::onTaskFinished, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onCancelWPolar, pFrame, &HeadlessFrame::onCancelTask, Qt::DirectConnection);
+
+    // the operating points left in the project file by a partial load are inserted in the main thread, which owns the arrays
+    QObject::connect(this, &xflServer::onLoadDeferredOpps, pFrame, [&](QString foilName, QString polarName){
+        if(xfl::loadDeferredOpps(foilName, polarName)>0) m_Generation++;
+    }, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onLoadDeferredPlaneOpps, pFrame, [&](QString planeName, QString polarName){
+        if(xfl::loadDeferredPlaneOpps(planeName, polarName)>0) m_Generation++;
+    }, Qt::BlockingQueuedConnection);
+
+    // called in the analysis thread for each new operating point
+    QObject::connect(&pFrame->m_thePanelAnalysis, &PanelAnalysis::planeOppAdded, this, [&](PlaneOpp* pPOpp){addProgressRow(pPOpp);}, Qt::DirectConnection);
+    QObject::connect(&pFrame->m_theLLTAnalysis, &LLTAnalysis::planeOppAdded, this, [&](PlaneOpp* pPOpp){addProgressRow(pPOpp);}, Qt::DirectConnection);
+
+    // after all the other connections, so that the slots have returned when the stats are called
+    m_Stats.watch(this, false);
+}
@@ -0,0 +1,116 @@
+/****************************************************************************
+
+    HeadlessFrame Class
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QObject>
+#include <QString>
+#include <QStringList>
+
+#include <gui_objects/splinefoil.h>
+#include <xflanalysis/plane_analysis/lltanalysis.h>
+#include <xflanalysis/plane_analysis/panelanalysis.h>
+#include <xflanalysis/plane_analysis/planetask.h>
+#include <xflcore/core_enums.h>
+#include <xflcore/linestyle.h>
+#include <xflobjects/objects3d/wpolar.h>
+#include <xflobjects/objects_global.h>
+#include <xflserver/RpcLibAdapters.h>
+
+class Foil;
+class Plane;
+
+/**
+ * @class HeadlessFrame
+ * The front end of the server built without the gui, in place of MainFrame, AFoil, XDirect and Miarex.
+ * It owns the project state which these keep, and runs the slots which the server signals,
+ * doing to the objects of Objects2d and Objects3d what the headless slots of the gui do, without the widgets.
+ * Like the gui, it lives in the main thread, so that the project is only modified there.
+ */
+class HeadlessFrame : public QObject
+{
+    Q_OBJECT
+    friend class xflServer;
+
+    public:
+        HeadlessFrame();
+        ~HeadlessFrame();
+
+        // project
+        void onNewProject();
+        bool onSaveProject();
+        void onLoadProject(QStringList pathNames, xfl::ProjectLoadOptions *pOptions);
+        void onGetState(RpcLibAdapters::StateAdapter* state);
+        void setProjectName(QString const &pathName);
+
+        // foils
+        void onFoilGeom(Foil* pFoil, QString newName);
+        void onNacaFoil(int digits, QString name);
+        Foil* onDuplicateFoil(Foil* pFoil, QString newName);
+        void onSelectFoil(Foil* pFoil);
+        void onShowFoil(Foil* pFoil, bool bShow);
+        void onRenameFoil(Foil* pFoil, QString newName);
+        void onDeleteFoil(Foil* pFoil);
+        void onNormalizeFoil();
+        void onDerotateFoil();
+        void onFoilStyle(Foil* pFoil, LineStyle ls);
+        void onExportFoil(Foil* pFoil, QString fileName);
+
+        // the display state of XDirect is only kept for the clients which read it back
+        void onSetXDirectDisplay(RpcLibAdapters::XDirectDisplayState* dsp_state) {m_XDirectDisplay = *dsp_state;}
+        void onGetXDirectDisplay(RpcLibAdapters::XDirectDisplayState* dsp_state) {*dsp_state = m_XDirectDisplay;}
+
+        // planes
+        void onNewPlane(Plane* pPlane);
+        void onDefineWPolar(WPolar* pWPolar, Plane* pPlane);
+        void setPlane(Plane* pPlane);
+        void setWPolar(WPolar* pWPolar);
+        void onSetAnalysisSettings3D(RpcLibAdapters::AnalysisSettings3D& analysis_settings);
+        PlaneTask* prepareTask();
+        void onTaskFinished();
+        void onCancelTask();
+
+    private:
+        void deleteProject();
+        bool loadFile(QString pathName, xfl::ProjectLoadOptions const &options);
+        bool saveProject(QString const &pathName);
+        Foil* addNewFoil(Foil* pFoil, QString const &newName);
+
+        xfl::enumApp m_iApp;        /**< the app which the clients have selected, has no effect without the gui */
+        QString m_FileName;         /**< the absolute path to the file of the current project */
+        QString m_ProjectName;      /**< the file name without its extension */
+        bool m_bSaved;              /**< true if the project has not been modified since the last save operation */
+
+        SplineFoil m_SF;            /**< the spline foil of AFoil, which is stored in the project files */
+        WPolar m_DefaultWPolar;     /**< the default polar of the WPolarDlg, which is stored in the project files */
+        RpcLibAdapters::XDirectDisplayState m_XDirectDisplay;
+
+        LLTAnalysis m_theLLTAnalysis;
+        PanelAnalysis m_thePanelAnalysis;
+        PlaneTask m_theTask;
+        Plane *m_pCurPlane;
+        WPolar *m_pCurWPolar;
+
+        bool m_bSequence;
+        bool m_bInitLLTCalc;
+        int m_nThreads;                    /**< the threads of the panel solver, 0 for all the cores */
+        double m_vMin, m_vMax, m_vDelta;   /**< the range of the 3D analyses, in the unit of the polar variable */
+};
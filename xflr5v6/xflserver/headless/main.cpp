@@ -0,0 +1,58 @@
+/****************************************************************************
+
+    xflrpy-server
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include <QCoreApplication>
+#include <QCommandLineParser>
+
+#include <xflserver/xflserver.h>
+#include "headlessframe.h"
+
+/**
+ * The point of entry of the server without the gui.
+ * Serves the same methods as the application, with the display always off.
+ */
+int main(int argc, char *argv[])
+{
+    QCoreApplication app(argc, argv);
+    QCoreApplication::setApplicationName("xflrpy-server");
+
+    QCommandLineParser parser;
+    parser.setApplicationDescription("The xflrpy server, without the gui");
+    parser.addHelpOption();
+    QCommandLineOption PortOption(QStringList() << "port");
+    PortOption.setValueName("port");
+    PortOption.setDefaultValue("8080");
+    PortOption.setDescription("The port of the server.\n"
+                              "Usage: xflrpy-server --port 8081 to run several instances side by side.");
+    parser.addOption(PortOption);
+    parser.process(app);
+
+    bool bOK(false);
+    int port = parser.value(PortOption).toInt(&bOK);
+    if(!bOK) port = 8080;
+
+    HeadlessFrame frame;
+    xflServer* server = new xflServer(port);
+    server->connectHeadless(&frame);
+    server->start();
+
+    return app.exec();
+}
@@ -0,0 +1,98 @@
+/****************************************************************************
+
+    PolarCache Class
+    Copyright (C) 2021-2022 Nikhil Sethi 
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include "polarcache.h"
+#include "RpcLibAdapters.h"
+
+#include <QCryptographicHash>
+
+#include <xflobjects/objects2d/foil.h>
+#include <xflobjects/objects2d/polar.h>
+
+
+PolarCache::PolarCache(int capacity) : m_Cache(capacity)
+{
+    m_nHits = m_nMisses = 0;
+}
+
+
+/**
+ * Builds the cache key of an analysis
+ * @param pFoil the analyzed foil; its current coordinates are hashed
+ * @param pPolar the polar which holds the specification of the analysis
+ * @param settings the sequence and settings of the analysis
+ * @return the SHA-1 digest of the analysis inputs
+ */
+QByteArray PolarCache::key(Foil const*pFoil, Polar const*pPolar, RpcLibAdapters::AnalysisSettings2D const &settings)
+{
+    QCryptographicHash hash(QCryptographicHash::Sha1);
+
+    hash.addData(reinterpret_cast<const char*>(&pFoil->m_n), sizeof(int));
+    hash.addData(reinterpret_cast<const char*>(pFoil->m_x), pFoil->m_n*int(sizeof(double)));
+    hash.addData(reinterpret_cast<const char*>(pFoil->m_y), pFoil->m_n*int(sizeof(double)));
+
+    int ispec[]    = {int(pPolar->polarType()), pPolar->ReType(), pPolar->MaType()};
+    double dspec[] = {pPolar->aoa(), pPolar->Mach(), pPolar->NCrit(), pPolar->XtrTop(), pPolar->XtrBot(), pPolar->Reynolds()};
+    hash.addData(reinterpret_cast<const char*>(ispec), sizeof(ispec));
+    hash.addData(reinterpret_cast<const char*>(dspec), sizeof(dspec));
+
+    int iset[]    = {settings.sequence_type, settings.is_sequence, settings.init_BL, settings.viscous, settings.warm_start};
+    double dset[] = {settings.sequence.start, settings.sequence.end, settings.sequence.delta};
+    hash.addData(reinterpret_cast<const char*>(iset), sizeof(iset));
+    hash.addData(reinterpret_cast<const char*>(dset), sizeof(dset));
+
+    return hash.result();
+}
+
+
+/**
+ * Looks up an analysis and updates the hit and miss counters
+ * @return the cached polar, or nullptr if the analysis has not been cached
+ */
+Polar const* PolarCache::find(QByteArray const &key)
+{
+    if(!isEnabled()) return nullptr;
+
+    Polar const*pPolar = m_Cache.object(key);
+    if(pPolar) m_nHits++;
+    else       m_nMisses++;
+    return pPolar;
+}
+
+
+/**
+ * Stores a copy of the specification and results of the polar. The least recently used entry is evicted if the cache is full.
+ */
+void PolarCache::insert(QByteArray const &key, Polar const*pPolar)
+{
+    if(!isEnabled() || !pPolar) return;
+
+    Polar *pCopy = new Polar;
+    pCopy->copyPolar(pPolar);
+    m_Cache.insert(key, pCopy, 1);
+}
+
+
+void PolarCache::clear()
+{
+    m_Cache.clear();
+    m_nHits = m_nMisses = 0;
+}
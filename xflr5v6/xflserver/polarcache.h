@@ -0,0 +1,62 @@
+/****************************************************************************
+
+    PolarCache Class
+    Copyright (C) 2021-2022 Nikhil Sethi 
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QByteArray>
+#include <QCache>
+
+class Foil;
+class Polar;
+namespace RpcLibAdapters{
+    struct AnalysisSettings2D;
+}
+
+/**
+ * @class PolarCache
+ * An LRU cache of 2D analysis results.
+ * The key is a hash of the foil coordinates, the polar specification and the analysis settings,
+ * so that a foil with the same name but a modified geometry is never mistaken for a hit.
+ * A capacity of 0 disables the cache.
+ */
+class PolarCache
+{
+    public:
+        PolarCache(int capacity=0);
+
+        static QByteArray key(Foil const*pFoil, Polar const*pPolar, RpcLibAdapters::AnalysisSettings2D const &settings);
+
+        Polar const* find(QByteArray const &key);
+        void insert(QByteArray const &key, Polar const*pPolar);
+        void clear();
+
+        void setCapacity(int capacity) {m_Cache.setMaxCost(capacity);}
+        int capacity() const {return m_Cache.maxCost();}
+        int size()     const {return m_Cache.size();}
+        int hits()     const {return m_nHits;}
+        int misses()   const {return m_nMisses;}
+        bool isEnabled() const {return capacity()>0;}
+
+    private:
+        QCache<QByteArray, Polar> m_Cache;  /**< copies of the analyzed polars; each entry has a cost of 1 */
+        int m_nHits;
+        int m_nMisses;
+};
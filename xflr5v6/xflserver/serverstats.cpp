@@ -0,0 +1,165 @@
+/****************************************************************************
+
+    ServerStats Class
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include "serverstats.h"
+
+#include <QCoreApplication>
+#include <QEvent>
+#include <QMetaMethod>
+#include <QMutexLocker>
+#include <QThread>
+#include <chrono>
+
+
+void ServerStats::Span::add(double ms)
+{
+    count++;
+    total += ms;
+    if(ms>max) max = ms;
+}
+
+
+ServerStats::ServerStats() : m_bEnabled(false), m_pServerThread(nullptr), m_bHandled(true), m_CallStart(0), m_Emitted(-1), m_Delivered(-2)
+{
+}
+
+
+/** Time in ns of a monotonic clock shared by all threads */
+qint64 ServerStats::now()
+{
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+
+/**
+ * Connects every signal of the server to the time stamps of the gui round trips.
+ * Signal connections are invoked in the order in which they were made, and a blocking queued connection
+ * returns only once its slot has run. So this method is called twice:
+ * before any other connection is made, to stamp the emissions, and after all of them, to stamp the returns.
+ * The start of the processing in the gui thread is stamped by an event filter on the application.
+ * @param pServer the xflServer, which runs the bindings in its own thread
+ * @param bFirst true for the call made before the other connections
+ */
+void ServerStats::watch(QObject *pServer, bool bFirst)
+{
+    m_pServerThread = qobject_cast<QThread*>(pServer);
+
+    QMetaMethod slot = staticMetaObject.method(staticMetaObject.indexOfSlot(bFirst ? "onEmitted()" : "onReturned()"));
+    QMetaObject const *pMetaObject = pServer->metaObject();
+    for(int i=pMetaObject->methodOffset(); i<pMetaObject->methodCount(); i++)
+    {
+        QMetaMethod method = pMetaObject->method(i);
+        if(method.methodType()==QMetaMethod::Signal)
+            connect(pServer, method, this, slot, Qt::DirectConnection);
+    }
+
+    if(bFirst) QCoreApplication::instance()->installEventFilter(this);
+}
+
+
+void ServerStats::clear()
+{
+    QMutexLocker locker(&m_Mutex);
+    m_Methods.clear();
+}
+
+
+std::map<std::string, ServerStats::Method> ServerStats::methods()
+{
+    QMutexLocker locker(&m_Mutex);
+    return m_Methods;
+}
+
+
+void ServerStats::beginCall(std::string const &method)
+{
+    if(!m_bEnabled) return;
+    m_Current = method;
+    m_bHandled = false;
+    m_CallStart = now();
+}
+
+
+/** Records the call span. Called when the binding returns, before the serialization of its result */
+void ServerStats::handled()
+{
+    if(m_Current.empty() || m_bHandled) return;
+    m_bHandled = true;
+    double ms = double(now()-m_CallStart)/1.e6;
+    QMutexLocker locker(&m_Mutex);
+    m_Methods[m_Current].call.add(ms);
+}
+
+
+void ServerStats::serialized(double ms, size_t bytes)
+{
+    if(m_Current.empty()) return;
+    QMutexLocker locker(&m_Mutex);
+    Method &method = m_Methods[m_Current];
+    method.serialize.add(ms);
+    method.bytes += qint64(bytes);
+}
+
+
+void ServerStats::endCall()
+{
+    handled();
+    m_Current.clear();
+}
+
+
+bool ServerStats::isServerThread() const
+{
+    return m_pServerThread && QThread::currentThread()==m_pServerThread;
+}
+
+
+void ServerStats::onEmitted()
+{
+    if(m_Current.empty() || !isServerThread()) return;
+    m_Emitted = now();
+    m_Delivered = -1;
+}
+
+
+void ServerStats::onReturned()
+{
+    if(m_Current.empty() || !isServerThread()) return;
+    qint64 delivered = m_Delivered.exchange(-2);
+    if(delivered<m_Emitted) return; // not processed by the gui thread
+    qint64 returned = now();
+    QMutexLocker locker(&m_Mutex);
+    Method &method = m_Methods[m_Current];
+    method.queue.add(double(delivered-m_Emitted)/1.e6);
+    method.slot.add(double(returned-delivered)/1.e6);
+}
+
+
+/** Stamps the first queued call processed by the gui thread while a signal of the server is pending */
+bool ServerStats::eventFilter(QObject *pObject, QEvent *pEvent)
+{
+    if(pEvent->type()==QEvent::MetaCall && m_bEnabled)
+    {
+        qint64 pending = -1;
+        m_Delivered.compare_exchange_strong(pending, now());
+    }
+    return QObject::eventFilter(pObject, pEvent);
+}
@@ -0,0 +1,94 @@
+/****************************************************************************
+
+    ServerStats Class
+    Copyright (C) 2021-2022 Nikhil Sethi
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QMutex>
+#include <QObject>
+#include <atomic>
+#include <map>
+#include <string>
+
+class QThread;
+
+/**
+ * @class ServerStats
+ * Opt-in timing of the server bindings, per method:
+ * - call: time spent in the binding, from the reception of the unpacked arguments to the return of the result adapter
+ * - queue: time between the emission of a signal to the gui thread and the start of its processing there
+ * - slot: time spent in the gui slot, e.g. the xfoil iterations of an analysis
+ * - serialize: time taken to msgpack the result adapter, and its size
+ * queue and slot have one sample per signal emitted by the binding.
+ * All the methods except eventFilter are called from the server thread.
+ */
+class ServerStats : public QObject
+{
+    Q_OBJECT
+    public:
+        struct Span{
+            qint64 count = 0;
+            double total = 0.0;     // ms
+            double max = 0.0;       // ms
+            void add(double ms);
+        };
+
+        struct Method{
+            Span call, queue, slot, serialize;
+            qint64 bytes = 0;       // total size of the serialized results
+        };
+
+        ServerStats();
+
+        void watch(QObject *pServer, bool bFirst);
+
+        void setEnabled(bool bEnabled) {m_bEnabled = bEnabled;}
+        bool isEnabled() const {return m_bEnabled;}
+        void clear();
+        std::map<std::string, Method> methods();
+
+        void beginCall(std::string const &method);
+        void handled();
+        void serialized(double ms, size_t bytes);
+        void endCall();
+
+        static qint64 now();
+
+    protected:
+        bool eventFilter(QObject *pObject, QEvent *pEvent) override;
+
+    private slots:
+        void onEmitted();
+        void onReturned();
+
+    private:
+        bool isServerThread() const;
+
+        std::atomic<bool> m_bEnabled;
+        QMutex m_Mutex;                         /**< protects m_Methods, which getStats reads */
+        std::map<std::string, Method> m_Methods;
+
+        QThread *m_pServerThread;
+        std::string m_Current;                  /**< the method being called, empty outside of a call */
+        bool m_bHandled;
+        qint64 m_CallStart;
+        qint64 m_Emitted;                       /**< emission of the current signal, -1 if none is pending */
+        std::atomic<qint64> m_Delivered;        /**< start of its processing in the gui thread, -1 until then */
+};
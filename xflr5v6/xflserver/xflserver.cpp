@@ -20,63 +20,144 @@
 *****************************************************************************/
 
 #include "xflserver.h"
-#include <globals/mainframe.h>
-#include <design/afoil.h>
 #include "RpcLibAdapters.h" // redundant
-#include <xdirect/xdirect.h>
-#include <miarex/miarex.h>
 #include <xflobjects/objects2d/foil.h>
 #include "rpc/server.h"
 
 #include <xflobjects/objects2d/objects2d.h>
 #include <xflobjects/objects3d/objects3d.h>
 #include <iostream>
+#include <sstream>
+#include <algorithm>
 #include <QObject>
 #include <QString>
 #include <QVector>
-#include <QSignalSpy>
+#include <QThreadPool>
+#include <QMutexLocker>
+#include <QtConcurrent/QtConcurrentRun>
+
+#include <xdirect/analysis/xfoiltask.h>
+#include <xflanalysis/plane_analysis/planetask.h>
+#include <xflobjects/objects3d/planeopp.h>
+#include <xflobjects/objects3d/wpolar.h>
+#include <xflcore/displayoptions.h>
+#include <xflcore/xflcore.h>
+#include <xflcore/xflevents.h>
 
 #include "utils.h"
 
-MainFrame* xflServer::s_pMainFrame = nullptr;
-
 using namespace std;
 
-xflServer::xflServer(int port) : server(port)
+xflServer::xflServer(int port) : server(port), m_bHeadless(false), m_bDisplay(true), m_bViewDirty(false), m_bUpdatePending(false), m_bWPolarRunning(false), m_pProgressWPolar(nullptr), m_Generation(0)
 {
     cout << "Starting Xflr server at port: "<< port << endl;
 
-    //========================= Mainframe slots =========================//
-    QObject::connect(this, &xflServer::onNewProject, s_pMainFrame, &MainFrame::onNewProjectHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSaveProject, s_pMainFrame, &MainFrame::onSaveProject, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onLoadProject, s_pMainFrame, &MainFrame::onLoadFileHeadless,Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onXDirect, s_pMainFrame, &MainFrame::onXDirect, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onAFoil, s_pMainFrame, &MainFrame::onAFoil, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onMiarex, s_pMainFrame, &MainFrame::onMiarex, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onXInverse, s_pMainFrame, &MainFrame::onXInverse, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onClose, s_pMainFrame, &MainFrame::close);
-    QObject::connect(this, &xflServer::onUpdate, s_pMainFrame, &MainFrame::updateView, Qt::BlockingQueuedConnection);
-
-    server.bind("ping", []()->bool{
+    // before any other connection, see ServerStats::watch
+    m_Stats.watch(this, true);
+
+    m_XFoilPool.setCapacity(QThread::idealThreadCount());
+
+    bindQuery("ping", []()->bool{
         return true;
         });
-    server.bind("loadProject", [&](vector<string> files){
-        emit onLoadProject(QStringList::fromVector(QStrQVecFromStrVec(files)));
+
+    // lets the clients know if the metadata they have cached is still valid
+    bindQuery("generation", [&]()->int64_t{
+        return m_Generation;
+        });
+
+    // runs a sequence of calls in order in a single round trip. Not bound to m_Dispatcher, so multicalls cannot be nested
+    server.bind("multicall", [&](vector<string> methods, vector<RPCLIB_MSGPACK::object> args_list){
+        RpcLibAdapters::MultiCallResult multi;
+        // the bindings report their errors with exceptions, see RpcLibAdapters::respondError
+        struct MultiCallScope{
+            MultiCallScope(){RpcLibAdapters::inMultiCall() = true;}
+            ~MultiCallScope(){RpcLibAdapters::inMultiCall() = false;}
+        } scope;
+        for (size_t i=0; i<methods.size(); i++){
+            RPCLIB_MSGPACK::sbuffer request;
+            RPCLIB_MSGPACK::packer<RPCLIB_MSGPACK::sbuffer> pk(&request);
+            pk.pack_array(4);
+            pk.pack(0);                 // msgpack-rpc request
+            pk.pack(uint32_t(i));
+            pk.pack(methods[i]);
+            if (i<args_list.size()) pk.pack(args_list[i]);
+            else                    pk.pack_array(0);
+
+            try{
+                RPCLIB_MSGPACK::object_handle call = RPCLIB_MSGPACK::unpack(request.data(), request.size());
+                rpc::detail::response response = m_Dispatcher.dispatch(call.get(), true);
+                if (response.get_error()){
+                    std::ostringstream error;
+                    error << response.get_error()->get();
+                    multi.error = error.str();
+                }
+                else{
+                    RPCLIB_MSGPACK::sbuffer result;
+                    if (response.get_result()) RPCLIB_MSGPACK::pack(result, response.get_result()->get());
+                    else                       RPCLIB_MSGPACK::pack(result, RPCLIB_MSGPACK::type::nil_t());
+                    multi.results.emplace_back(result.data(), result.data()+result.size());
+                }
+            }
+            catch (std::exception& e){
+                multi.error = e.what();
+                // an error set in this_handler by a nested call would replace the reply of the multicall
+                rpc::this_handler().clear();
+                if (multi.error.empty()) multi.error = "call failed";
+            }
+            if (!multi.error.empty()){
+                multi.failed = int(i);
+                break;
+            }
+        }
+        return multi;
+    });
+    bind("loadProject", [&](vector<string> files){
+        xfl::ProjectLoadOptions options;
+        emit onLoadProject(QStringList::fromVector(QStrQVecFromStrVec(files)), &options);
+        });
+    bind("loadProjectPartial", [&](vector<string> files, RpcLibAdapters::ProjectLoadOptions load_options){
+        // reads only some of the records of a project file, and may leave the operating points in the file until they are accessed
+        xfl::ProjectLoadOptions options = RpcLibAdapters::ProjectLoadOptions::from_msgpack(load_options);
+        emit onLoadProject(QStringList::fromVector(QStrQVecFromStrVec(files)), &options);
         });
-    server.bind("newProject", [&](){
+    bindQuery("deferredOppCount", [&](){
+        return xfl::deferredOppCount();
+        });
+    bind("newProject", [&](){
         emit onNewProject();
         
         });
-    server.bind("saveProject", [&](){
-        emit onSaveProject();
+    bind("saveProject", [&](){
+        RpcLibAdapters::StateAdapter state;
+        emit onGetState(&state);
+        // the records skipped by a partial load would be lost if the source file was overwritten
+        if(xfl::isPartialProjectFile(QString::fromStdString(state.projectPath)))
+            RpcLibAdapters::respondError("the project was partially loaded from " + state.projectPath + ", set another project path before saving it");
+        if(state.projectPath.empty())
+            RpcLibAdapters::respondError("the project has no file name, set its path before saving it");
+        if(!emit onSaveProject())
+            RpcLibAdapters::respondError("the project could not be saved to " + state.projectPath);
         });    
-    server.bind("getState", [&]()->RpcLibAdapters::StateAdapter{
-        return RpcLibAdapters::StateAdapter(s_pMainFrame->m_FileName,s_pMainFrame->s_ProjectName,s_pMainFrame->m_iApp,s_pMainFrame->s_bSaved);
+    bindQuery("getState", [&]()->RpcLibAdapters::StateAdapter{
+        RpcLibAdapters::StateAdapter state;
+        emit onGetState(&state);
+        state.display = m_bDisplay;
+        state.generation = m_Generation;
+        return state;
+        });
+    bind("setDisplay", [&](bool flag){
+        // with the display off, analyses skip the dialogs and the views are only refreshed when it is switched back on
+        m_bDisplay = flag && !m_bHeadless;
+        if (m_bDisplay && m_bViewDirty){
+            emit onRefreshViews();
+            m_bViewDirty = false;
+        }
         });
-    server.bind("setProjectPath",[&](string projectPath){
-        s_pMainFrame->setProjectName(QString::fromStdString(projectPath));
+    bind("setProjectPath",[&](string projectPath){
+        emit onSetProjectPath(QString::fromStdString(projectPath));
         });
-    server.bind("setApp",[&](int app){
+    bind("setApp",[&](int app){
         if (app==xfl::enumApp::NOAPP){
             return;
         }
@@ -94,35 +175,22 @@ xflServer::xflServer(int port) : server(port)
         }
         });
     
-    server.bind("deleteFoil", [&](string name){
+    bind("deleteFoil", [&](string name){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         emit onDeleteFoil(pFoil);
         });
     
-    server.bind("exit",[&]{
+    bind("exit",[&]{
         stop();
         emit onClose();
         });
 
-    // ====================== AFoil slots =======================// 
-    QObject::connect(this, &xflServer::onFoilGeom, s_pMainFrame->m_pAFoil, &AFoil::onAFoilFoilGeomHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onAFoilNacaFoils, s_pMainFrame->m_pAFoil, &AFoil::onAFoilNacaFoilsHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onDuplicateFoil, s_pMainFrame->m_pAFoil, &AFoil::onDuplicateHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSelectFoil, s_pMainFrame->m_pAFoil, &AFoil::selectFoil, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onShowFoil, s_pMainFrame->m_pAFoil, &AFoil::onShowFoilHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onRenameFoil, s_pMainFrame->m_pAFoil, &AFoil::onRenameFoilHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onDeleteFoil, s_pMainFrame->m_pAFoil, &AFoil::onDeleteFoilHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onNormalizeFoil, s_pMainFrame->m_pAFoil, &AFoil::onAFoilNormalizeFoil, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onDerotateFoil, s_pMainFrame->m_pAFoil, &AFoil::onAFoilDerotateFoil, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onFoilStyle, s_pMainFrame->m_pAFoil, &AFoil::onFoilStyleHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onExportFoil, s_pMainFrame->m_pAFoil, &AFoil::onExportFoilHeadless, Qt::BlockingQueuedConnection);
-    // QObject::connect(this, &xflServer::onSetFoilCoords, s_pMainFrame->m_pAFoil, &AFoil::onSetFoilCoordsHeadless, Qt::BlockingQueuedConnection);
-    
-    server.bind("foilExists", [&](string name)->bool{
+    // ====================== AFoil =======================// 
+    bindQuery("foilExists", [&](string name)->bool{
         return Objects2d::foilExists(QString::fromStdString(name));
     });
 
-    server.bind("getFoil",[&](string name)->RpcLibAdapters::FoilAdapter{
+    bindQuery("getFoil",[&](string name)->RpcLibAdapters::FoilAdapter{
         Foil* pFoil;
         if (name =="") pFoil = Objects2d::curFoil();
         else pFoil = Objects2d::foil(QString::fromStdString(name));
@@ -137,11 +205,11 @@ xflServer::xflServer(int port) : server(port)
         }
     });
 
-    server.bind("foilList", [&]()->vector<RpcLibAdapters::FoilAdapter>{
+    bindQuery("foilList", [&]()->vector<RpcLibAdapters::FoilAdapter>{
         return FoilVecFromQFoilQVec(*Objects2d::pOAFoil());
     });
     
-    server.bind("getFoilCoords", [&](string name){
+    bindQuery("getFoilCoords", [&](string name){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         vector<RpcLibAdapters::Coord> v;
 
@@ -153,7 +221,7 @@ xflServer::xflServer(int port) : server(port)
         return v;
     });
 
-    server.bind("setFoilCoords", [&](string name, vector<RpcLibAdapters::Coord> v){
+    bind("setFoilCoords", [&](string name, vector<RpcLibAdapters::Coord> v){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         // double x[v.size()];
         // double y[v.size()];
@@ -165,10 +233,54 @@ xflServer::xflServer(int port) : server(port)
             pFoil->m_y[i] = v[i].y;
         }
         // emit onSetFoilCoords(pFoil);
-        emit onUpdate();
+        updateView();
+    });
+
+    bindQuery("getFoilCoordsBin", [&](string name){
+        // interleaved x,y float64 blob, read as an (n,2) array on the client
+        Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
+        if (!pFoil) RpcLibAdapters::respondError("unknown foil " + name);
+        vector<char> buf(2*pFoil->m_n*sizeof(double));
+        double* xy = reinterpret_cast<double*>(buf.data());
+        for (int i=0; i<pFoil->m_n; i++){
+            xy[2*i]   = pFoil->m_x[i];
+            xy[2*i+1] = pFoil->m_y[i];
+        }
+        return buf;
+    });
+
+    bind("setFoilCoordsBin", [&](string name, vector<char> buf){
+        Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
+        if (!pFoil) RpcLibAdapters::respondError("unknown foil " + name);
+        int n = std::min(int(buf.size()/(2*sizeof(double))), IBX);
+        const double* xy = reinterpret_cast<const double*>(buf.data());
+        for (int i=0; i<n; i++){
+            pFoil->m_xb[i] = pFoil->m_x[i] = xy[2*i];
+            pFoil->m_yb[i] = pFoil->m_y[i] = xy[2*i+1];
+        }
+        pFoil->m_nb = pFoil->m_n = n;
+        updateView();
+    });
+
+    // moves a few nodes of the foil, for the optimizers which perturb the geometry node by node
+    // returns false if the whole geometry had to be rebuilt, see Foil::moveNodes
+    bind("updateFoilCoordsBin", [&](string name, vector<int> indices, vector<char> buf)->bool{
+        Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
+        if (!pFoil) return false;
+        int n = std::min(int(indices.size()), int(buf.size()/(2*sizeof(double))));
+        const double* xy = reinterpret_cast<const double*>(buf.data());
+        QVector<int> nodes(n);
+        QVector<Vector2d> positions(n);
+        for (int i=0; i<n; i++){
+            nodes[i] = indices[i];
+            positions[i].set(xy[2*i], xy[2*i+1]);
+        }
+        bool bIncremental = pFoil->moveNodes(nodes, positions);
+        updateViewLater();
+        return bIncremental;
     });
 
-    server.bind("setGeom", [&](string name, double camber, double camber_x, double thickness, double thickness_x){
+    bind("setGeom", [&](string name, double camber, double camber_x, double thickness, double thickness_x){
         QString qname = QString::fromStdString(name);
         Foil* pFoil = Objects2d::foil(qname);
         
@@ -185,51 +297,51 @@ xflServer::xflServer(int port) : server(port)
         pFoil->normalizeGeometry();
     });
 
-    server.bind("renameFoil", [&](string name, string newName){
+    bind("renameFoil", [&](string name, string newName){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         emit onRenameFoil(pFoil, QString::fromStdString(newName));
     });
 
-    server.bind("createNACAFoil", [&](int digits, string name){
+    bind("createNACAFoil", [&](int digits, string name){
         emit onAFoilNacaFoils(digits, QString::fromStdString(name));
     });
 
-    server.bind("setCurFoil", [&](string name, bool select){
+    bind("setCurFoil", [&](string name, bool select){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         Objects2d::setCurFoil(pFoil);
         if (select) emit onSelectFoil(pFoil);
         
     });
 
-    server.bind("duplicateFoil", [&](string fromName, string toName)->RpcLibAdapters::FoilAdapter{
+    bind("duplicateFoil", [&](string fromName, string toName)->RpcLibAdapters::FoilAdapter{
         Foil* pFoil = Objects2d::foil(QString::fromStdString(fromName));
         Foil* newFoil = emit onDuplicateFoil(pFoil, QString::fromStdString(toName));
         return RpcLibAdapters::FoilAdapter(*newFoil);
     });
 
-    server.bind("showFoil", [&](string name, bool flag){
+    bind("showFoil", [&](string name, bool flag){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         emit onShowFoil(pFoil, flag);
     });
 
-    server.bind("normalizeFoil", [&](string name){
+    bind("normalizeFoil", [&](string name){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         emit onSelectFoil(pFoil);
         emit onNormalizeFoil(); // Operates on current foil
     });
 
-    server.bind("derotateFoil", [&](string name){
+    bind("derotateFoil", [&](string name){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         emit onSelectFoil(pFoil);
         emit onDerotateFoil(); // Operates on current foil
     });
 
-    server.bind("getLineStyle", [&](string name) -> RpcLibAdapters::LineStyleAdapter{
+    bindQuery("getLineStyle", [&](string name) -> RpcLibAdapters::LineStyleAdapter{
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         return RpcLibAdapters::LineStyleAdapter(pFoil->theStyle());
     });
 
-    server.bind("setLineStyle", [&](string name, RpcLibAdapters::LineStyleAdapter& lineStyle){
+    bind("setLineStyle", [&](string name, RpcLibAdapters::LineStyleAdapter& lineStyle){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(name));
         LineStyle ls = RpcLibAdapters::LineStyleAdapter::from_msgpack(lineStyle);
         
@@ -237,19 +349,13 @@ xflServer::xflServer(int port) : server(port)
 
     });
 
-    server.bind("exportFoil", [&](string foilName, string fileName){
+    bindQuery("exportFoil", [&](string foilName, string fileName){
         Foil* pFoil = Objects2d::foil(QString::fromStdString(foilName));        
         emit onExportFoil(pFoil, QString::fromStdString(fileName));
     });
 
     // ===================== XDirect ====================== //
-    QObject::connect(this, &xflServer::onAnalyzeCurPolar, s_pMainFrame->m_pXDirect, &XDirect::onAnalyze, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onDefinePolar, s_pMainFrame->m_pXDirect, &XDirect::onDefinePolarHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSetAnalysisSettings2D, s_pMainFrame->m_pXDirect, &XDirect::onSetAnalysisSettings2DHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSelectPolar, s_pMainFrame->m_pXDirect, &XDirect::onSelectPolarHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSetXDirectDisplay, s_pMainFrame->m_pXDirect, &XDirect::onSetDisplayHeadless, Qt::BlockingQueuedConnection);
-
-    server.bind("defineAnalysis2D", [&](RpcLibAdapters::PolarAdapter polar){
+    bind("defineAnalysis2D", [&](RpcLibAdapters::PolarAdapter polar){
         // creates a new polar on the heap everytime. use carefully
         Foil* pFoil = Objects2d::foil(QString::fromStdString(polar.foil_name));
         Polar* pPolar = RpcLibAdapters::PolarAdapter::from_msgpack(polar); 
@@ -257,40 +363,159 @@ xflServer::xflServer(int port) : server(port)
         Objects2d::setCurFoil(pFoil);   // need to set these for posterity
         
         Objects2d::setCurPolar(pPolar);
-        emit onDefinePolar(pPolar, pFoil);
+        definePolar(pPolar, pFoil);
     });
 
-    server.bind("analyzeCurPolar", [&](RpcLibAdapters::AnalysisSettings2D analysis_settings, vector<RpcLibAdapters::PolarResultAdapter::enumPolarResult> result_list){
-        emit onSetAnalysisSettings2D(&analysis_settings);
-        emit onAnalyzeCurPolar();
-        return RpcLibAdapters::PolarResultAdapter(*Objects2d::curPolar(), result_list);
+    bind("analyzeCurPolar", [&](RpcLibAdapters::AnalysisSettings2D analysis_settings, vector<RpcLibAdapters::PolarResultAdapter::enumPolarResult> result_list){
+        return RpcLibAdapters::PolarResultAdapter(*runCurPolar(analysis_settings), result_list);
     });
 
-    server.bind("setCurPolar", [&](string polar_name, string foil_name, bool select = false){
+    bind("analyzeCurPolarBin", [&](RpcLibAdapters::AnalysisSettings2D analysis_settings, vector<RpcLibAdapters::PolarResultAdapter::enumPolarResult> result_list){
+        // same as analyzeCurPolar but the columns are sent as float64 blobs
+        return RpcLibAdapters::PolarResultAdapter(*runCurPolar(analysis_settings), result_list).toBin();
+    });
+
+    bind("analyzeBatch2D", [&](vector<RpcLibAdapters::PolarAdapter> polars, RpcLibAdapters::AnalysisSettings2D analysis_settings, vector<RpcLibAdapters::PolarResultAdapter::enumPolarResult> result_list, int n_threads){
+        // one XFoilTask per polar, run on a thread pool like XflScriptExec::runFoilAnalyses()
+        vector<Polar*> batch;
+        for (auto const& polar: polars){
+            Foil* pFoil = Objects2d::foil(QString::fromStdString(polar.foil_name));
+            if (!pFoil) {
+                batch.push_back(nullptr);
+                continue;
+            }
+            Polar* pPolar = RpcLibAdapters::PolarAdapter::from_msgpack(polar);
+            definePolar(pPolar, pFoil);
+            batch.push_back(pPolar);
+        }
+
+        OpPoint::setStoreOpp(analysis_settings.store_opp);
+
+        QThreadPool pool;
+        pool.setMaxThreadCount(n_threads>0 ? n_threads : QThread::idealThreadCount());
+        XFoilTask::setCancelled(false);
+
+        QVector<QByteArray> keys(int(batch.size())); // empty key: not cached, either disabled or a hit
+        QVector<Polar*> warm; // polars which run in chains, see newXFoilChains()
+        for (uint i=0; i<batch.size(); i++){
+            Polar* pPolar = batch[i];
+            if (!pPolar) continue;
+            if (m_PolarCache.isEnabled()){
+                keys[i] = PolarCache::key(Objects2d::foil(pPolar->foilName()), pPolar, analysis_settings);
+                Polar const* pCached = m_PolarCache.find(keys[i]);
+                if (pCached){
+                    pPolar->copyPolar(pCached);
+                    keys[i].clear();
+                    continue;
+                }
+            }
+            if (analysis_settings.warm_start) warm.append(pPolar);
+            else pool.start(newXFoilTask(pPolar, analysis_settings));
+        }
+        for (XFoilChain* pChain: newXFoilChains(warm, analysis_settings, pool.maxThreadCount()))
+            pool.start(pChain);
+        pool.waitForDone();
+        updateView();
+
+        for (uint i=0; i<batch.size(); i++){
+            if (!keys[i].isEmpty()) m_PolarCache.insert(keys[i], batch[i]);
+        }
+
+        vector<RpcLibAdapters::PolarResultAdapter> results;
+        for (Polar* pPolar: batch){
+            if (pPolar) results.push_back(RpcLibAdapters::PolarResultAdapter(*pPolar, result_list));
+            else results.push_back(RpcLibAdapters::PolarResultAdapter());
+        }
+        return results;
+    });
+
+    bind("setPolarCacheSize", [&](int capacity){
+        // 0 disables the cache
+        m_PolarCache.setCapacity(capacity);
+    });
+
+    bind("clearPolarCache", [&](){
+        m_PolarCache.clear();
+    });
+
+    bind("setXFoilPoolSize", [&](int capacity){
+        // the number of idle XFoil instances kept for the analyses run with warm_start, 0 frees them
+        m_XFoilPool.setCapacity(capacity);
+    });
+
+    bind("clearXFoilPool", [&](){
+        m_XFoilPool.clear();
+    });
+
+    bindQuery("getXFoilPoolStats", [&](){
+        return RpcLibAdapters::XFoilPoolStats(m_XFoilPool.warmStarts(), m_XFoilPool.coldStarts(), m_XFoilPool.size(), m_XFoilPool.capacity());
+    });
+
+    bind("startOptimize2D", [&](string foil_name, vector<RpcLibAdapters::OptimObjective> objectives, vector<vector<double>> bounds, RpcLibAdapters::OptimSettings2D optim_settings)->bool{
+        // returns immediately, the front of each generation is polled with getOptimProgress
+        if (optim_settings.algorithm=="ga" && objectives.size()>1)
+            RpcLibAdapters::respondError("the ga optimizer takes a single objective, use mopso to optimize " + std::to_string(objectives.size()) + " objectives");
+        return m_FoilOptim.start(Objects2d::foil(QString::fromStdString(foil_name)), objectives, bounds, optim_settings);
+    });
+
+    bindQuery("getOptimProgress", [&](int start){
+        RpcLibAdapters::OptimProgress progress;
+        progress.finished = !m_FoilOptim.isRunning(); // read first so that no front recorded before the end is missed
+        for (FoilOptim::Front const& front: m_FoilOptim.fronts(start)){
+            progress.fronts.push_back(RpcLibAdapters::OptimFront(front.iter, front.particles));
+        }
+        progress.n_fronts = m_FoilOptim.frontCount();
+        return progress;
+    });
+
+    bind("cancelOptimize", [&](){
+        m_FoilOptim.cancel();
+    });
+
+    bind("makeOptimFoil", [&](int index, string name)->RpcLibAdapters::FoilAdapter{
+        // adds the foil of a particle of the last front to the project
+        Foil foil;
+        if (!m_FoilOptim.makeFoil(index, &foil)) return RpcLibAdapters::FoilAdapter();
+        Foil* newFoil = emit onDuplicateFoil(&foil, QString::fromStdString(name));
+        return RpcLibAdapters::FoilAdapter(*newFoil);
+    });
+
+    bindQuery("getPolarCacheStats", [&](){
+        return RpcLibAdapters::PolarCacheStats(m_PolarCache.hits(), m_PolarCache.misses(), m_PolarCache.size(), m_PolarCache.capacity());
+    });
+
+    bindQuery("polarCacheKey", [&](RpcLibAdapters::AnalysisSettings2D analysis_settings)->string{
+        // hex key of the current foil, polar and settings. Lets the client keep its own copy of the results
+        if (!Objects2d::curFoil() || !Objects2d::curPolar()) return "";
+        return PolarCache::key(Objects2d::curFoil(), Objects2d::curPolar(), analysis_settings).toHex().toStdString();
+    });
+
+    bind("setCurPolar", [&](string polar_name, string foil_name, bool select = false){
         Polar* pPolar = Objects2d::getPolar(QString::fromStdString(foil_name), QString::fromStdString(polar_name));
         Objects2d::setCurPolar(pPolar);
         if (select) emit onSelectPolar(pPolar);
     });
 
-    server.bind("getPolar", [&](string foil_name, string polar_name){
+    bindQuery("getPolar", [&](string foil_name, string polar_name){
         Polar* pPolar = Objects2d::getPolar(QString::fromStdString(foil_name), QString::fromStdString(polar_name));
         return RpcLibAdapters::PolarAdapter(*pPolar); //argument is a const reference
     });
 
-    server.bind("setXDirectDisplay", [&](RpcLibAdapters::XDirectDisplayState dsp_state){
+    bind("setXDirectDisplay", [&](RpcLibAdapters::XDirectDisplayState dsp_state){
         emit onSetXDirectDisplay(&dsp_state); // need to send pointers when dealing with custom rpc adapters
     });
 
-    server.bind("getXDirectDisplay", [&](){
-        const XDirect* xdirect_ref = s_pMainFrame->m_pXDirect;
-        return RpcLibAdapters::XDirectDisplayState(*xdirect_ref);
+    bindQuery("getXDirectDisplay", [&](){
+        RpcLibAdapters::XDirectDisplayState dsp_state;
+        emit onGetXDirectDisplay(&dsp_state);
+        return dsp_state;
     });
 
-    server.bind("polarList", [&](string foil_name){
+    bindQuery("polarList", [&](string foil_name){
         return  PolarVecFromQPolarQVec(*Objects2d::pOAPolar(), QString::fromStdString(foil_name));
     });
 
-    server.bind("getOpPoint", [&](double alpha, string polar_name, string foil_name){
+    bindQuery("getOpPoint", [&](double alpha, string polar_name, string foil_name){
         Foil* pFoil;  // preassigned here to create memory on stack. As it might point to null after below functions
         Polar* pPolar;
 
@@ -300,21 +525,41 @@ xflServer::xflServer(int port) : server(port)
         pPolar = Objects2d::getPolar(pFoil->name(), QString::fromStdString(polar_name));
         if (pPolar==nullptr) pPolar = Objects2d::curPolar();  
         
+        if (pFoil && pPolar && xfl::deferredOppCount()) emit onLoadDeferredOpps(pFoil->name(), pPolar->polarName());
+
         OpPoint* pOpPoint = Objects2d::getOpp(pFoil, pPolar, alpha);
         if (!pOpPoint) OpPoint* pOpPoint = Objects2d::curOpp();
         
         return  RpcLibAdapters::OpPointAdapter(*pOpPoint);
     });
 
+    bindQuery("getOpPoints", [&](string polar_name, string foil_name, vector<double> alphas, vector<RpcLibAdapters::OpPointArrays::enumOppField> field_list){
+        // all the stored OpPoints of the polar if alphas is empty, else the ones matching alphas; missing alphas are skipped
+        RpcLibAdapters::OpPointArrays::checkFields(field_list);
+        Foil* pFoil = Objects2d::foil(QString::fromStdString(foil_name));
+        Polar* pPolar = pFoil ? Objects2d::getPolar(pFoil, QString::fromStdString(polar_name)) : nullptr;
+
+        vector<OpPoint*> opps;
+        if (pPolar){
+            if (xfl::deferredOppCount()) emit onLoadDeferredOpps(pFoil->name(), pPolar->polarName());
+            if (alphas.empty()){
+                for (int i=0; i<Objects2d::oppCount(); i++){
+                    OpPoint* pOpp = Objects2d::oppAt(i);
+                    if (pOpp->foilName()==pFoil->name() && pOpp->polarName()==pPolar->polarName()) opps.push_back(pOpp);
+                }
+            }
+            else{
+                for (double alpha : alphas){
+                    OpPoint* pOpp = Objects2d::getOpp(pFoil, pPolar, alpha);
+                    if (pOpp) opps.push_back(pOpp);
+                }
+            }
+        }
+        return RpcLibAdapters::OpPointArrays(opps, field_list);
+    });
+
     // ===================== Miarex ====================== //
-    QObject::connect(this, &xflServer::onNewPlane, s_pMainFrame->m_pMiarex, &Miarex::onNewPlaneHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onDefineWPolar, s_pMainFrame->m_pMiarex, &Miarex::onDefineWPolarHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSetWPolar, s_pMainFrame->m_pMiarex, QOverload<WPolar*>::of(&Miarex::setWPolar), Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSetPlane, s_pMainFrame->m_pMiarex, QOverload<Plane*>::of(&Miarex::setPlane), Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onSetAnalysisSettings3D, s_pMainFrame->m_pMiarex, &Miarex::setAnalysisParamsHeadless, Qt::BlockingQueuedConnection);
-    QObject::connect(this, &xflServer::onAnalyzeCurWPolar, s_pMainFrame->m_pMiarex, &Miarex::onAnalyze, Qt::BlockingQueuedConnection);
-
-    server.bind("getPlane", [&](string name){
+    bindQuery("getPlane", [&](string name){
         Plane* pPlane = Objects3d::plane(QString::fromStdString(name));
             
         if (pPlane!=nullptr) {   // if the current foil is not the default splinefoil
@@ -327,7 +572,7 @@ xflServer::xflServer(int port) : server(port)
         }
     });
 
-    server.bind("addDefaultPlane", [&](string name){
+    bind("addDefaultPlane", [&](string name){
         Plane* pPlane = new Plane();
         pPlane->setName(QString::fromStdString(name));
         
@@ -336,40 +581,360 @@ xflServer::xflServer(int port) : server(port)
 
     });
 
-    server.bind("addPlane", [&](RpcLibAdapters::PlaneAdapter plane){
+    bind("addPlane", [&](RpcLibAdapters::PlaneAdapter plane){
         Plane* pPlane = RpcLibAdapters::PlaneAdapter::from_msgpack(plane);
         emit onNewPlane(pPlane);
         return RpcLibAdapters::PlaneAdapter(*Objects3d::addPlane(pPlane));
     });
 
-    server.bind("getPlaneData", [&](string name){
+    bindQuery("getPlaneData", [&](string name){
         return Objects3d::plane(QString::fromStdString(name))->planeData(false).toStdString();
     });
 
-    server.bind("defineAnalysis3D", [&](RpcLibAdapters::WPolarAdapter wpolar){
+    bindQuery("getPolarIndex", [&](string plane_name){
+        // the foil polars as the viscous 3D analyses of the plane see them, sorted by Reynolds number
+        vector<RpcLibAdapters::PolarIndexEntry> entries;
+        Plane* pPlane = Objects3d::plane(QString::fromStdString(plane_name));
+        if (!pPlane) return entries;
+
+        QStringList foilNames;
+        for (int iw=0; iw<MAXWINGS; iw++){
+            Wing const* pWing = pPlane->wingAt(iw);
+            if (!pWing) continue;
+            for (int is=0; is<pWing->NWingSection(); is++){
+                if (!foilNames.contains(pWing->rightFoilName(is))) foilNames.append(pWing->rightFoilName(is));
+                if (!foilNames.contains(pWing->leftFoilName(is)))  foilNames.append(pWing->leftFoilName(is));
+            }
+        }
+
+        PolarIndex index;
+        index.build(*Objects2d::pOAPolar());
+        for (QString const& foilName: foilNames){
+            QVector<PolarIndex::Entry> const& type1 = index.type1Polars(foilName);
+            for (PolarIndex::Entry const& entry: index.allPolars(foilName)){
+                PolarIndex::Entry const* pType1 = nullptr;
+                for (PolarIndex::Entry const& e: type1){
+                    if (e.pPolar==entry.pPolar) pType1 = &e;
+                }
+                entries.push_back(RpcLibAdapters::PolarIndexEntry(entry, pType1));
+            }
+        }
+        return entries;
+    });
+
+    bindQuery("interpolatePolar", [&](string foil_name, double re, double cl, int var)->vector<double>{
+        // the value of a polar variable at (Re, Cl) as the viscous 3D analyses interpolate it, and the out of range and error flags
+        Foil* pFoil = Objects2d::foil(QString::fromStdString(foil_name));
+        PolarIndex index;
+        index.build(*Objects2d::pOAPolar());
+        bool bOutRe=false, bError=false;
+        double value = index.getPlrPointFromCl(pFoil, re, cl, var, bOutRe, bError);
+        return {value, double(bOutRe), double(bError)};
+    });
+
+    bind("defineAnalysis3D", [&](RpcLibAdapters::WPolarAdapter wpolar){
         Plane* pPlane = Objects3d::plane(QString::fromStdString(wpolar.plane_name));
         WPolar* pWPolar = RpcLibAdapters::WPolarAdapter::from_msgpack(wpolar); 
         std::cout<<pWPolar<<std::endl;
         emit onDefineWPolar(pWPolar, pPlane);
     });
 
-    server.bind("analyzeWPolar", [&](string polar_name, string plane_name, RpcLibAdapters::AnalysisSettings3D analysis_settings, vector<RpcLibAdapters::WPolarResult::enumWPolarResult> result_list){
-        emit onSetAnalysisSettings3D(analysis_settings);
+    bind("analyzeWPolar", [&](string polar_name, string plane_name, RpcLibAdapters::AnalysisSettings3D analysis_settings, vector<RpcLibAdapters::WPolarResult::enumWPolarResult> result_list){
+        return RpcLibAdapters::WPolarResult(*runWPolar(polar_name, plane_name, analysis_settings), result_list);
+    });
+
+    bind("analyzeWPolarBin", [&](string polar_name, string plane_name, RpcLibAdapters::AnalysisSettings3D analysis_settings, vector<RpcLibAdapters::WPolarResult::enumWPolarResult> result_list){
+        // same as analyzeWPolar but the columns are sent as float64 blobs
+        return RpcLibAdapters::WPolarResult(*runWPolar(polar_name, plane_name, analysis_settings), result_list).toBin();
+    });
+
+    bind("startAnalyzeWPolar", [&](string polar_name, string plane_name, RpcLibAdapters::AnalysisSettings3D analysis_settings)->bool{
+        // returns immediately, the results are polled with getWPolarProgress
+        return startWPolar(polar_name, plane_name, analysis_settings);
+    });
 
+    bindQuery("getWPolarProgress", [&](int start, vector<RpcLibAdapters::WPolarResult::enumWPolarResult> result_list){
+        RpcLibAdapters::WPolarProgress progress;
+        bool bFinished = !m_bWPolarRunning; // read first so that no point added before the end is missed
+        QMutexLocker locker(&m_ProgressMutex);
+        for (int i=std::max(start, 0); i<m_ProgressRows.size(); i++){
+            progress.result.append(RpcLibAdapters::WPolarResult(*m_ProgressRows.at(i), result_list));
+        }
+        progress.n_points = m_ProgressRows.size();
+        progress.finished = bFinished;
+        return progress;
+    });
+
+    bind("cancelWPolar", [&](){
+        emit onCancelWPolar();
+    });
+
+    bindQuery("planeOppList", [&](string polar_name, string plane_name){
+        // values of the polar variable (alpha, QInf, beta or ctrl) of the stored operating points
+        QString planeName = QString::fromStdString(plane_name);
+        QString polarName = QString::fromStdString(polar_name);
+        if (xfl::deferredOppCount()) emit onLoadDeferredPlaneOpps(planeName, polarName);
+        vector<double> x;
+        for (int i=0; i<Objects3d::planeOppCount(); i++){
+            PlaneOpp* pPOpp = Objects3d::planeOppAt(i);
+            if (pPOpp->planeName()==planeName && pPOpp->polarName()==polarName) x.push_back(RpcLibAdapters::PlaneOppArrays::variable(*pPOpp));
+        }
+        return x;
+    });
+
+    bindQuery("getPlaneOppArrays", [&](string polar_name, string plane_name, double x, vector<RpcLibAdapters::PlaneOppArrays::enumPOppField> field_list){
+        RpcLibAdapters::PlaneOppArrays::checkFields(field_list);
         Plane* pPlane = Objects3d::plane(QString::fromStdString(plane_name));
-        WPolar* pPolar = Objects3d::getWPolar(pPlane, QString::fromStdString(polar_name));
-        emit onSetPlane(pPlane);
-        emit onSetWPolar(pPolar);
-        emit onAnalyzeCurWPolar();
-
-        // this spy is needed to make sure that the analysis is completed before results are returned.
-        QSignalSpy spy(s_pMainFrame->m_pMiarex->m_pPanelAnalysisDlg, &PanelAnalysisDlg::analysisFinished);
-        spy.wait(1000);
-        
-        return RpcLibAdapters::WPolarResult(*pPolar, result_list);
+        WPolar* pWPolar = Objects3d::wPolar(pPlane, QString::fromStdString(polar_name));
+        if (pPlane && pWPolar && xfl::deferredOppCount()) emit onLoadDeferredPlaneOpps(pPlane->name(), pWPolar->polarName());
+        PlaneOpp* pPOpp = Objects3d::getPlaneOpp(pPlane, pWPolar, x);
+        if (!pPOpp) return RpcLibAdapters::PlaneOppArrays();
+        return RpcLibAdapters::PlaneOppArrays(*pPOpp, field_list);
+    });
+
+    // ====================== Instrumentation =======================//
+    bindQuery("setStatsEnabled", [&](bool flag){
+        m_Stats.setEnabled(flag);
+    });
+
+    bindQuery("clearStats", [&](){
+        m_Stats.clear();
+    });
+
+    bindQuery("getStats", [&](){
+        vector<RpcLibAdapters::MethodStats> stats;
+        for (auto const &method : m_Stats.methods()) stats.emplace_back(method.first, method.second);
+        return stats;
+    });
+}
+
+/**
+ * Applies the analysis settings and analyzes the current polar
+ * @return the current polar, filled with the new results
+ */
+Polar* xflServer::runCurPolar(RpcLibAdapters::AnalysisSettings2D& analysis_settings){
+    Polar* pPolar = Objects2d::curPolar();
+    QByteArray key;
+    if (m_PolarCache.isEnabled() && Objects2d::curFoil() && pPolar){
+        key = PolarCache::key(Objects2d::curFoil(), pPolar, analysis_settings);
+        Polar const* pCached = m_PolarCache.find(key);
+        if (pCached){
+            pPolar->copyPolar(pCached);
+            return pPolar;
+        }
+    }
+
+    if (m_bDisplay){
+        emit onSetAnalysisSettings2D(&analysis_settings);
+        emit onAnalyzeCurPolar();
+    }
+    else if (Objects2d::curFoil() && pPolar){
+        // no dialog: the task runs in this thread
+        OpPoint::setStoreOpp(analysis_settings.store_opp);
+        XFoilTask::setCancelled(false);
+        if (analysis_settings.warm_start){
+            XFoilChain chain(&m_XFoilPool, this, analysis_settings);
+            chain.append(Objects2d::curFoil(), pPolar);
+            chain.run();
+        }
+        else {
+            XFoilTask* pXFoilTask = newXFoilTask(pPolar, analysis_settings);
+            pXFoilTask->run();
+            delete pXFoilTask;
+        }
+        m_bViewDirty = true;
+    }
+
+    if (!key.isEmpty()) m_PolarCache.insert(key, Objects2d::curPolar());
+    return Objects2d::curPolar();
+}
+
+/**
+ * Selects the plane and its polar, applies the analysis settings and runs the 3D analysis
+ * @return the analyzed polar, complete on return
+ */
+WPolar* xflServer::runWPolar(const string& polar_name, const string& plane_name, RpcLibAdapters::AnalysisSettings3D& analysis_settings){
+    if (startWPolar(polar_name, plane_name, analysis_settings)) m_WPolarDone.acquire();
+
+    Plane* pPlane = Objects3d::plane(QString::fromStdString(plane_name));
+    return Objects3d::getWPolar(pPlane, QString::fromStdString(polar_name));
+}
+
+/**
+ * Selects the plane and its polar, applies the analysis settings and launches the 3D analysis in the background.
+ * With the display on, the analysis dialogs run the task, otherwise it is run in a pooled thread.
+ * m_WPolarDone is released once the analysis has completed and its operating points are stored.
+ * Only one analysis runs at a time: the task and the progress rows are shared, so a call made during a run fails with an rpc error.
+ * @return true if an analysis has been launched
+ */
+bool xflServer::startWPolar(const string& polar_name, const string& plane_name, RpcLibAdapters::AnalysisSettings3D& analysis_settings){
+    if (m_bWPolarRunning.exchange(true))
+        RpcLibAdapters::respondError("a 3D analysis is already running, wait for it to finish or cancel it with cancelWPolar");
+
+    emit onSetAnalysisSettings3D(analysis_settings);
+
+    Plane* pPlane = Objects3d::plane(QString::fromStdString(plane_name));
+    WPolar* pPolar = Objects3d::getWPolar(pPlane, QString::fromStdString(polar_name));
+    emit onSetPlane(pPlane);
+    emit onSetWPolar(pPolar);
+
+    clearProgress();
+    m_pProgressWPolar = pPolar;
+    while (m_WPolarDone.tryAcquire()) {} // left over by runs nobody waited for
+
+    if (m_bDisplay){
+        if (!emit onAnalyzeCurWPolar()) m_bWPolarRunning = false;
+        return m_bWPolarRunning;
+    }
+
+    PlaneTask* pTask = emit onPrepareWPolarTask();
+    if (!pTask){
+        m_bWPolarRunning = false;
+        return false;
+    }
+    m_bViewDirty = true;
+    QtConcurrent::run([this, pTask](){
+        pTask->run();
+        emit onWPolarTaskFinished();
+        finishWPolar();
     });
+    return true;
+}
+
+/**
+ * Ends the 3D analysis launched by startWPolar. Runs launched from the GUI are ignored.
+ */
+void xflServer::finishWPolar(){
+    if (m_bWPolarRunning.exchange(false)) m_WPolarDone.release();
+}
 
+/**
+ * Records the operating point just added to the polar being analyzed. Called in the analysis thread.
+ * A single-point copy of the polar is kept, so the results can be read while the analysis goes on.
+ */
+void xflServer::addProgressRow(PlaneOpp* pPOpp){
+    if (!m_bWPolarRunning || !m_pProgressWPolar) return;
+    WPolar* pRow = new WPolar;
+    pRow->duplicateSpec(m_pProgressWPolar);
+    pRow->addPlaneOpPoint(pPOpp);
+
+    QMutexLocker locker(&m_ProgressMutex);
+    m_ProgressRows.append(pRow);
+}
+
+void xflServer::clearProgress(){
+    QMutexLocker locker(&m_ProgressMutex);
+    qDeleteAll(m_ProgressRows);
+    m_ProgressRows.clear();
+}
+
+/**
+ * Refreshes the views now if the display is on, otherwise when it is switched back on
+ */
+void xflServer::updateView(){
+    if (m_bDisplay) emit onUpdate();
+    else            m_bViewDirty = true;
+}
+
+/**
+ * Same as updateView(), but does not wait for the refresh.
+ * Requests made before the gui thread gets to the pending refresh are merged into it.
+ */
+void xflServer::updateViewLater(){
+    if (!m_bDisplay) m_bViewDirty = true;
+    else if (!m_bUpdatePending.exchange(true)) emit onUpdateLater();
+}
+
+/**
+ * Adds a new polar to the foil. With the display off, only the object arrays are updated.
+ */
+void xflServer::definePolar(Polar* pPolar, Foil* pFoil){
+    if (m_bDisplay){
+        emit onDefinePolar(pPolar, pFoil);
+        return;
+    }
+    if (!pFoil) return;
+    Objects2d::setCurFoil(pFoil);
+    pPolar->setFoilName(pFoil->name());
+    if (pPolar->name()=="") pPolar->setAutoPolarName();
+
+    if (DisplayOptions::isAlignedChildrenStyle()) pPolar->setTheStyle(pFoil->theStyle());
+    else {
+        QColor clr = xfl::randomColor(!DisplayOptions::isLightTheme());
+        pPolar->setColor(clr.red(), clr.green(), clr.blue(), clr.alpha());
+    }
+    pPolar->setVisible(true);
+
+    Objects2d::addPolar(pPolar);
+    Objects2d::setCurPolar(pPolar);
+    m_bViewDirty = true;
+}
+
+/**
+ * Creates the task which analyzes a polar over the range of the analysis settings.
+ * The task posts its operating points to this server, see customEvent().
+ */
+XFoilTask* xflServer::newXFoilTask(Polar* pPolar, RpcLibAdapters::AnalysisSettings2D const& analysis_settings){
+    bool bAlpha = analysis_settings.sequence_type != 1;
+    double vMin = analysis_settings.sequence.start;
+    double vMax = analysis_settings.is_sequence ? analysis_settings.sequence.end : vMin;
+    double vInc = analysis_settings.is_sequence ? analysis_settings.sequence.delta : 0.0;
+
+    XFoilTask *pXFoilTask = new XFoilTask(this);
+    pXFoilTask->initializeXFoilTask(Objects2d::foil(pPolar->foilName()), pPolar, analysis_settings.viscous, analysis_settings.init_BL, false);
+    if (pPolar->polarType()<xfl::FIXEDAOAPOLAR)
+        pXFoilTask->setSequence(bAlpha, vMin, vMax, vInc);
+    else if (pPolar->isFixedaoaPolar())
+        pXFoilTask->setReRange(vMin, vMax, vInc);
+    return pXFoilTask;
+}
+
+/**
+ * Groups the polars by foil geometry and sorts each group by Reynolds number, or by aoa for the type 4 polars,
+ * then cuts the groups into chains of neighbouring polars, about n_chains in all, which can run in parallel.
+ * Each polar of a chain starts from the boundary layer of the previous one, see XFoilChain.
+ */
+QVector<XFoilChain*> xflServer::newXFoilChains(QVector<Polar*> const& polars, RpcLibAdapters::AnalysisSettings2D const& analysis_settings, int n_chains){
+    QVector<QByteArray> keys;
+    QVector<QVector<Polar*>> groups;
+    for (Polar* pPolar: polars){
+        QByteArray key = XFoilPool::key(Objects2d::foil(pPolar->foilName()));
+        int iGroup = keys.indexOf(key);
+        if (iGroup<0){
+            iGroup = keys.size();
+            keys.append(key);
+            groups.append(QVector<Polar*>());
+        }
+        groups[iGroup].append(pPolar);
+    }
+
+    int length = std::max(1, (polars.size()+n_chains-1)/std::max(n_chains, 1));
+    QVector<XFoilChain*> chains;
+    for (QVector<Polar*>& group: groups){
+        std::stable_sort(group.begin(), group.end(), [](Polar const* a, Polar const* b){
+            if (a->isFixedaoaPolar()!=b->isFixedaoaPolar()) return b->isFixedaoaPolar();
+            if (a->isFixedaoaPolar()) return a->aoa()<b->aoa();
+            return a->Reynolds()<b->Reynolds();
+        });
+        for (int i=0; i<group.size(); i++){
+            if (i%length==0) chains.append(new XFoilChain(&m_XFoilPool, this, analysis_settings));
+            chains.last()->append(Objects2d::foil(group[i]->foilName()), group[i]);
+        }
+    }
+    return chains;
+}
 
+/**
+ * The XFoilTasks of a batch analysis post their operating points here.
+ * Polar data is filled on the fly by the tasks, only the OpPoints need to be handled in the main thread.
+ */
+void xflServer::customEvent(QEvent *pEvent){
+    if (pEvent->type() == XFOIL_END_OPP_EVENT){
+        XFoilOppEvent *pOppEvent = dynamic_cast<XFoilOppEvent*>(pEvent);
+        if (!pOppEvent->theOpPoint()) return; // unconverged point
+        if (OpPoint::bStoreOpp()) Objects2d::insertOpPoint(pOppEvent->theOpPoint());
+        else                      delete pOppEvent->theOpPoint();
+    }
 }
 
 void xflServer::run(){
@@ -383,5 +948,6 @@ void xflServer::stop(){
 
 xflServer::~xflServer(){
    stop();
+   clearProgress();
 }
 
@@ -22,24 +22,40 @@
 #pragma once
 
 #include "rpc/server.h"
+#include "rpc/dispatcher.h"
 #include <QThread>
 #include <QObject>
 #include <iostream>
 #include <QString>
+#include <QMutex>
+#include <QSemaphore>
+#include <QVector>
+#include <atomic>
+#include <functional>
+#include <tuple>
 #include <xflcore/linestyle.h>
+#include "polarcache.h"
+#include "xfoilpool.h"
+#include "foiloptim.h"
+#include "serverstats.h"
 // #include <xflserver/RpcLibAdapters.h>   // need implementation to use as reference
 
 class Foil; // only need pointer not actual implementation
 class AFoil;
 class Polar;
 class MainFrame; // need only pointer 
+class HeadlessFrame;
 class Plane;
 class WPolar;
+class PlaneOpp;
+class PlaneTask;
+class XFoilTask;
 namespace RpcLibAdapters{
 
     class AnalysisSettings2D;
     class AnalysisSettings3D;
     class XDirectDisplayState;
+    class StateAdapter;
 }
 
 class xflServer: public QThread
@@ -54,22 +70,131 @@ class xflServer: public QThread
         rpc::server server;
         void stop();
         // void foo();
-        static MainFrame* s_pMainFrame;   
+
+        /** Connects the signals to the gui, which runs the slots in its own thread. Defined in xflserver_gui.cpp */
+        void connectMainFrame(MainFrame *pMainFrame);
+        /** Connects the signals to the front end of the server built without the gui. Defined in headless/headlessframe.cpp */
+        void connectHeadless(HeadlessFrame *pFrame);
+
+    protected:
+        void customEvent(QEvent *pEvent) override; // receives the XFoilTask events of batch analyses
+
+    private:
+        /** Binds a method which may modify the project or the settings. The generation is incremented when each call returns */
+        template<typename F> void bind(std::string const &name, F func)
+        {
+            bindQuery(name, counted(func, static_cast<typename rpc::detail::func_traits<F>::args_type*>(nullptr)));
+        }
+
+        /** Binds func to the server, and to the dispatcher which runs the calls of a multicall. The generation is left unchanged */
+        template<typename F> void bindQuery(std::string const &name, F func)
+        {
+            auto timedFunc = timed(name, func, static_cast<typename rpc::detail::func_traits<F>::args_type*>(nullptr));
+            server.bind(name, timedFunc);
+            m_Dispatcher.bind(name, timedFunc);
+        }
+
+        /** Ends the timing of a call on destruction, so also when the call throws */
+        struct StatsCall{
+            ServerStats &stats;
+            ~StatsCall(){stats.endCall();}
+        };
+
+        /** Calls func and times the serialization of its result, which rpclib repeats when it sends the reply */
+        template<typename R, typename F, typename... Args> struct TimedInvoke{
+            static R invoke(ServerStats &stats, F const &func, Args&... args){
+                R result = func(args...);
+                stats.handled();
+                if(stats.isEnabled()){
+                    qint64 start = ServerStats::now();
+                    RPCLIB_MSGPACK::sbuffer buffer;
+                    RPCLIB_MSGPACK::pack(buffer, result);
+                    stats.serialized(double(ServerStats::now()-start)/1.e6, buffer.size());
+                }
+                return result;
+            }
+        };
+        template<typename F, typename... Args> struct TimedInvoke<void, F, Args...>{
+            static void invoke(ServerStats &, F const &func, Args&... args){
+                func(args...);
+            }
+        };
+
+        template<typename F, typename... Args>
+        std::function<typename rpc::detail::func_traits<F>::result_type(Args...)> timed(std::string const &name, F func, std::tuple<Args...>*)
+        {
+            typedef typename rpc::detail::func_traits<F>::result_type R;
+            return [this, name, func](Args... args)->R{
+                m_Stats.beginCall(name);
+                StatsCall call{m_Stats};
+                return TimedInvoke<R, F, Args...>::invoke(m_Stats, func, args...);
+            };
+        }
+
+        /** Increments the generation on destruction, so also when the call throws */
+        struct GenerationBump{
+            std::atomic<qint64> &generation;
+            ~GenerationBump(){generation++;}
+        };
+
+        template<typename F, typename... Args>
+        std::function<typename rpc::detail::func_traits<F>::result_type(Args...)> counted(F func, std::tuple<Args...>*)
+        {
+            typedef typename rpc::detail::func_traits<F>::result_type R;
+            return [this, func](Args... args)->R{
+                GenerationBump bump{m_Generation};
+                return func(args...);
+            };
+        }
+
+        rpc::detail::dispatcher m_Dispatcher;  /**< holds the same bindings as the server */
+        std::atomic<qint64> m_Generation;      /**< incremented after each modification of the project or of the settings, by a client or in the gui */
+        ServerStats m_Stats;                   /**< timings of the bindings, disabled until a client enables them */
+        PolarCache m_PolarCache;    /**< results of the 2D analyses, disabled until a size is set by the client */
+        XFoilPool m_XFoilPool;      /**< XFoil instances kept for the 2D analyses run with warm_start */
+        FoilOptim m_FoilOptim;      /**< the foil optimization launched by the client */
+        bool m_bHeadless;           /**< true if there is no gui, so the display stays off */
+        bool m_bDisplay;            /**< if false, analyses skip the dialogs and the view updates are deferred */
+        bool m_bViewDirty;          /**< true if objects changed while the display was off */
+        std::atomic<bool> m_bUpdatePending; /**< true while a refresh requested by updateViewLater() has not run yet */
+
+        std::atomic<bool> m_bWPolarRunning; /**< true while a 3D analysis launched by the server is running */
+        QSemaphore m_WPolarDone;            /**< released when that analysis has completed and its operating points are stored */
+        QMutex m_ProgressMutex;
+        WPolar* m_pProgressWPolar;          /**< the polar being analyzed */
+        QVector<WPolar*> m_ProgressRows;    /**< one single-point polar per operating point computed so far */
+
+        void addProgressRow(PlaneOpp* pPOpp);
+        void clearProgress();
+        void finishWPolar();
+        bool startWPolar(const std::string& polar_name, const std::string& plane_name, RpcLibAdapters::AnalysisSettings3D& analysis_settings);
+
+        void updateView();
+        void updateViewLater();
+        void definePolar(Polar* pPolar, Foil* pFoil);
+        QVector<XFoilChain*> newXFoilChains(QVector<Polar*> const& polars, RpcLibAdapters::AnalysisSettings2D const& analysis_settings, int n_chains);
+        XFoilTask* newXFoilTask(Polar* pPolar, RpcLibAdapters::AnalysisSettings2D const& analysis_settings);
+        Polar* runCurPolar(RpcLibAdapters::AnalysisSettings2D& analysis_settings);
+        WPolar* runWPolar(const std::string& polar_name, const std::string& plane_name, RpcLibAdapters::AnalysisSettings3D& analysis_settings);
     // private:
     signals:
 
         // Mainframe signals
         void onMiarexSig();
         void onNewProject();
-        void onSaveProject();
+        bool onSaveProject();
         void onCloseProject();
-        void onLoadProject(QStringList files);
+        void onLoadProject(QStringList files, xfl::ProjectLoadOptions* options);
         void onXDirect();
         void onAFoil();
         void onMiarex();
         void onXInverse();
         void onClose();
         void onUpdate();
+        void onUpdateLater();
+        void onRefreshViews();
+        void onGetState(RpcLibAdapters::StateAdapter* state);
+        void onSetProjectPath(QString path);
         
         // AFoil signals
         void onRenameFoil(Foil* foil, QString name);
@@ -93,12 +218,18 @@ class xflServer: public QThread
         void onSetXDirectDisplay(RpcLibAdapters::XDirectDisplayState* dsp_state);
         void onXDirectAnimate(bool flag);
         void onXDirectAnimateSpeed(int val);
+        void onGetXDirectDisplay(RpcLibAdapters::XDirectDisplayState* dsp_state);
+        void onLoadDeferredOpps(QString foilName, QString polarName);
 
         // Miarex signals
         void onNewPlane(Plane* plane);
         void onDefineWPolar(WPolar* polar, Plane* pPlane);
         void onSetAnalysisSettings3D(RpcLibAdapters::AnalysisSettings3D& analysis_settings);
-        void onAnalyzeCurWPolar();
+        bool onAnalyzeCurWPolar();
+        PlaneTask* onPrepareWPolarTask();
+        void onWPolarTaskFinished();
         void onSetWPolar(WPolar* pPolar);
         void onSetPlane(Plane* pPlane);
+        void onCancelWPolar();
+        void onLoadDeferredPlaneOpps(QString planeName, QString polarName);
 };
@@ -1,5 +1,14 @@
-SOURCES += xflserver/xflserver.cpp
+SOURCES += xflserver/xflserver.cpp \
+            xflserver/xflserver_gui.cpp \
+            xflserver/polarcache.cpp \
+            xflserver/serverstats.cpp \
+            xflserver/xfoilpool.cpp \
+            xflserver/foiloptim.cpp
 
 HEADERS += xflserver/xflserver.h \
             xflserver/RpcLibAdapters.h \
-            xflserver/utils.h
\ No newline at end of file
+            xflserver/polarcache.h \
+            xflserver/serverstats.h \
+            xflserver/xfoilpool.h \
+            xflserver/foiloptim.h \
+            xflserver/utils.h
@@ -0,0 +1,133 @@
+/****************************************************************************
+
+    xflServer Class
+    Copyright (C) 2021-2022 Nikhil Sethi 
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+// The connections of the server to the gui. Not part of the headless build, see headless/headless.pro
+
+#include "xflserver.h"
+#include "RpcLibAdapters.h"
+#include <globals/mainframe.h>
+#include <design/afoil.h>
+#include <xdirect/xdirect.h>
+#include <miarex/miarex.h>
+#include <miarex/analysis/lltanalysisdlg.h>
+#include <miarex/analysis/panelanalysisdlg.h>
+#include <xflanalysis/plane_analysis/lltanalysis.h>
+#include <xflanalysis/plane_analysis/panelanalysis.h>
+
+
+RpcLibAdapters::XDirectDisplayState::XDirectDisplayState(const XDirect& out){
+    polar_view = out.bPolarView();
+    graph_view = out.iPlrView();
+    which_graph = out.iPlrGraph();
+    active_opp_only = out.bActiveOppOnly();
+    show_bl = out.bShowBL();
+    show_pressure = out.bShowPressure();
+    show_cpgraph = out.bCpGraph();
+    animated = out.bAnimate();
+    ani_speed = out.slAnimateSpeed();
+}
+
+
+/**
+ * Connects the signals of the server to the slots of the gui, which run in the gui thread.
+ * The state reads and the cancellation are direct calls, made in the server thread.
+ */
+void xflServer::connectMainFrame(MainFrame *pMainFrame){
+    //========================= Mainframe slots =========================//
+    QObject::connect(this, &xflServer::onNewProject, pMainFrame, &MainFrame::onNewProjectHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSaveProject, pMainFrame, &MainFrame::onSaveProject, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onLoadProject, pMainFrame, &MainFrame::onLoadFileHeadless,Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onXDirect, pMainFrame, &MainFrame::onXDirect, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onAFoil, pMainFrame, &MainFrame::onAFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onMiarex, pMainFrame, &MainFrame::onMiarex, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onXInverse, pMainFrame, &MainFrame::onXInverse, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onClose, pMainFrame, &MainFrame::close);
+    QObject::connect(this, &xflServer::onUpdate, pMainFrame, &MainFrame::updateView, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onUpdateLater, pMainFrame, [this, pMainFrame](){
+        m_bUpdatePending = false;
+        pMainFrame->updateView();
+    }, Qt::QueuedConnection);
+    QObject::connect(this, &xflServer::onRefreshViews, pMainFrame, &MainFrame::onRefreshViewsHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onGetState, pMainFrame, [pMainFrame](RpcLibAdapters::StateAdapter* state){
+        *state = RpcLibAdapters::StateAdapter(pMainFrame->m_FileName, MainFrame::s_ProjectName, pMainFrame->m_iApp, MainFrame::s_bSaved);
+    }, Qt::DirectConnection);
+    QObject::connect(this, &xflServer::onSetProjectPath, pMainFrame, &MainFrame::setProjectName, Qt::BlockingQueuedConnection);
+
+    QObject::connect(pMainFrame->m_pAFoil, &AFoil::projectModified, [&](){m_Generation++;});
+    QObject::connect(pMainFrame->m_pXDirect, &XDirect::projectModified, [&](){m_Generation++;});
+    QObject::connect(pMainFrame->m_pMiarex, &Miarex::projectModified, [&](){m_Generation++;});
+
+    // ====================== AFoil slots =======================// 
+    QObject::connect(this, &xflServer::onFoilGeom, pMainFrame->m_pAFoil, &AFoil::onAFoilFoilGeomHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onAFoilNacaFoils, pMainFrame->m_pAFoil, &AFoil::onAFoilNacaFoilsHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDuplicateFoil, pMainFrame->m_pAFoil, &AFoil::onDuplicateHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSelectFoil, pMainFrame->m_pAFoil, &AFoil::selectFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onShowFoil, pMainFrame->m_pAFoil, &AFoil::onShowFoilHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onRenameFoil, pMainFrame->m_pAFoil, &AFoil::onRenameFoilHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDeleteFoil, pMainFrame->m_pAFoil, &AFoil::onDeleteFoilHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onNormalizeFoil, pMainFrame->m_pAFoil, &AFoil::onAFoilNormalizeFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDerotateFoil, pMainFrame->m_pAFoil, &AFoil::onAFoilDerotateFoil, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onFoilStyle, pMainFrame->m_pAFoil, &AFoil::onFoilStyleHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onExportFoil, pMainFrame->m_pAFoil, &AFoil::onExportFoilHeadless, Qt::BlockingQueuedConnection);
+    // QObject::connect(this, &xflServer::onSetFoilCoords, pMainFrame->m_pAFoil, &AFoil::onSetFoilCoordsHeadless, Qt::BlockingQueuedConnection);
+
+    // ===================== XDirect ====================== //
+    QObject::connect(this, &xflServer::onAnalyzeCurPolar, pMainFrame->m_pXDirect, &XDirect::onAnalyze, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDefinePolar, pMainFrame->m_pXDirect, &XDirect::onDefinePolarHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetAnalysisSettings2D, pMainFrame->m_pXDirect, &XDirect::onSetAnalysisSettings2DHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSelectPolar, pMainFrame->m_pXDirect, &XDirect::onSelectPolarHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetXDirectDisplay, pMainFrame->m_pXDirect, &XDirect::onSetDisplayHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onGetXDirectDisplay, pMainFrame->m_pXDirect, [pMainFrame](RpcLibAdapters::XDirectDisplayState* dsp_state){
+        *dsp_state = RpcLibAdapters::XDirectDisplayState(*pMainFrame->m_pXDirect);
+    }, Qt::DirectConnection);
+
+    // ===================== Miarex ====================== //
+    QObject::connect(this, &xflServer::onNewPlane, pMainFrame->m_pMiarex, &Miarex::onNewPlaneHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onDefineWPolar, pMainFrame->m_pMiarex, &Miarex::onDefineWPolarHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetWPolar, pMainFrame->m_pMiarex, QOverload<WPolar*>::of(&Miarex::setWPolar), Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetPlane, pMainFrame->m_pMiarex, QOverload<Plane*>::of(&Miarex::setPlane), Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onSetAnalysisSettings3D, pMainFrame->m_pMiarex, &Miarex::setAnalysisParamsHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onAnalyzeCurWPolar, pMainFrame->m_pMiarex, &Miarex::onAnalyze, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onPrepareWPolarTask, pMainFrame->m_pMiarex, &Miarex::prepareTaskHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onWPolarTaskFinished, pMainFrame->m_pMiarex, &Miarex::onTaskFinishedHeadless, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onCancelWPolar, pMainFrame->m_pMiarex, [pMainFrame](){
+        PanelAnalysis::s_bCancel = true;
+        pMainFrame->m_pMiarex->m_theLLTAnalysis.onCancel();
+    }, Qt::DirectConnection);
+
+    // the operating points left in the project file by a partial load are inserted in the gui thread, which owns the arrays
+    QObject::connect(this, &xflServer::onLoadDeferredOpps, pMainFrame, [&](QString foilName, QString polarName){
+        if(xfl::loadDeferredOpps(foilName, polarName)>0) m_Generation++;
+    }, Qt::BlockingQueuedConnection);
+    QObject::connect(this, &xflServer::onLoadDeferredPlaneOpps, pMainFrame, [&](QString planeName, QString polarName){
+        if(xfl::loadDeferredPlaneOpps(planeName, polarName)>0) m_Generation++;
+    }, Qt::BlockingQueuedConnection);
+
+    // the dialogs signal the end of an analysis once its operating points are stored
+    QObject::connect(pMainFrame->m_pMiarex->m_pPanelAnalysisDlg, &PanelAnalysisDlg::analysisFinished, this, [&](){finishWPolar();}, Qt::DirectConnection);
+    QObject::connect(pMainFrame->m_pMiarex->m_pLLTDlg, &LLTAnalysisDlg::lltAnalysisFinished, this, [&](){finishWPolar();}, Qt::DirectConnection);
+    // called in the analysis thread for each new operating point
+    QObject::connect(&pMainFrame->m_pMiarex->m_thePanelAnalysis, &PanelAnalysis::planeOppAdded, this, [&](PlaneOpp* pPOpp){addProgressRow(pPOpp);}, Qt::DirectConnection);
+    QObject::connect(&pMainFrame->m_pMiarex->m_theLLTAnalysis, &LLTAnalysis::planeOppAdded, this, [&](PlaneOpp* pPOpp){addProgressRow(pPOpp);}, Qt::DirectConnection);
+
+    // after all the other connections, so that the gui slots have returned when the stats are called
+    m_Stats.watch(this, false);
+}
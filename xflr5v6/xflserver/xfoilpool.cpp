@@ -0,0 +1,230 @@
+/****************************************************************************
+
+    XFoilPool and XFoilChain Classes
+    Copyright (C) 2021-2022 Nikhil Sethi 
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#include "xfoilpool.h"
+
+#include <QCryptographicHash>
+#include <QMutexLocker>
+#include <cmath>
+
+#include <xdirect/analysis/xfoiltask.h>
+#include <xflcore/constants.h>
+#include <xflobjects/objects2d/foil.h>
+#include <xflobjects/objects2d/polar.h>
+
+
+XFoilPool::XFoilPool(int capacity) : m_Capacity(capacity), m_nWarm(0), m_nCold(0)
+{
+}
+
+
+XFoilPool::~XFoilPool()
+{
+    clear();
+}
+
+
+/**
+ * @return the SHA-1 digest of the current coordinates of the foil
+ */
+QByteArray XFoilPool::key(Foil const*pFoil)
+{
+    QCryptographicHash hash(QCryptographicHash::Sha1);
+    hash.addData(reinterpret_cast<const char*>(&pFoil->m_n), sizeof(int));
+    hash.addData(reinterpret_cast<const char*>(pFoil->m_x), pFoil->m_n*int(sizeof(double)));
+    hash.addData(reinterpret_cast<const char*>(pFoil->m_y), pFoil->m_n*int(sizeof(double)));
+    return hash.result();
+}
+
+
+/**
+ * How far the last point of an XFoil instance is from the start of a polar.
+ * Instances which did not converge on their last point only save the geometry initialization, and come last.
+ */
+double XFoilPool::distance(XFoil const &xfoil, Polar const*pPolar)
+{
+    double d = xfoil.lvconv ? 0.0 : 1.e3;
+    if(pPolar->isFixedaoaPolar())
+        return d + qAbs(xfoil.alpha()*180.0/PI - pPolar->aoa());
+    if(xfoil.reinf1<=0.0 || pPolar->Reynolds()<=0.0)
+        return d + 1.e2;
+    return d + qAbs(log(xfoil.reinf1/pPolar->Reynolds()));
+}
+
+
+/**
+ * Removes from the pool the task of the foil which is the closest to the polar
+ * @return the task, or nullptr if the pool holds none for this foil
+ */
+XFoilTask* XFoilPool::take(QByteArray const &key, Polar const*pPolar)
+{
+    QMutexLocker locker(&m_Mutex);
+    int iBest = -1;
+    double best = 0.0;
+    for(int i=0; i<m_Tasks.size(); i++)
+    {
+        if(m_Tasks.at(i).first!=key) continue;
+        double d = distance(m_Tasks.at(i).second->m_XFoilInstance, pPolar);
+        if(iBest<0 || d<best)
+        {
+            iBest = i;
+            best = d;
+        }
+    }
+    if(iBest<0) return nullptr;
+    return m_Tasks.takeAt(iBest).second;
+}
+
+
+/**
+ * Stores an idle task. The least recently used task is deleted if the pool is full.
+ */
+void XFoilPool::give(QByteArray const &key, XFoilTask *pTask)
+{
+    if(!pTask) return;
+    QMutexLocker locker(&m_Mutex);
+    m_Tasks.append(qMakePair(key, pTask));
+    while(m_Tasks.size()>m_Capacity) delete m_Tasks.takeFirst().second;
+}
+
+
+void XFoilPool::count(bool bWarm)
+{
+    QMutexLocker locker(&m_Mutex);
+    if(bWarm) m_nWarm++;
+    else      m_nCold++;
+}
+
+
+void XFoilPool::setCapacity(int capacity)
+{
+    QMutexLocker locker(&m_Mutex);
+    m_Capacity = qMax(capacity, 0);
+    while(m_Tasks.size()>m_Capacity) delete m_Tasks.takeFirst().second;
+}
+
+
+int XFoilPool::size()
+{
+    QMutexLocker locker(&m_Mutex);
+    return m_Tasks.size();
+}
+
+
+void XFoilPool::clear()
+{
+    QMutexLocker locker(&m_Mutex);
+    for(int i=0; i<m_Tasks.size(); i++) delete m_Tasks.at(i).second;
+    m_Tasks.clear();
+    m_nWarm = m_nCold = 0;
+}
+
+
+
+XFoilChain::XFoilChain(XFoilPool *pPool, QObject *pParent, RpcLibAdapters::AnalysisSettings2D const &settings)
+{
+    setAutoDelete(true);
+    m_pPool = pPool;
+    m_pParent = pParent;
+    m_Settings = settings;
+}
+
+
+void XFoilChain::append(Foil const*pFoil, Polar *pPolar)
+{
+    m_Polars.append(qMakePair(pFoil, pPolar));
+}
+
+
+/**
+ * Maps the sequence of the analysis settings to the task, as xflServer::newXFoilTask() does.
+ * If the boundary layer is reused, the sequence is reversed when its last value is closer to the last converged point than its first value.
+ * @param bWarm true if the task starts from the boundary layer of its previous polar
+ */
+void XFoilChain::setSequence(XFoilTask *pTask, Polar const*pPolar, bool bWarm) const
+{
+    bool bAlpha = m_Settings.sequence_type != 1;
+    double vMin = m_Settings.sequence.start;
+    double vMax = m_Settings.is_sequence ? m_Settings.sequence.end : vMin;
+    double vInc = m_Settings.is_sequence ? m_Settings.sequence.delta : 0.0;
+
+    if(bWarm && qAbs(vInc)>0.0)
+    {
+        XFoil const &xfoil = pTask->m_XFoilInstance;
+        double seed = 0.0;
+        if(pPolar->isFixedaoaPolar()) seed = xfoil.reinf1;
+        else if(bAlpha)               seed = xfoil.alpha()*180.0/PI;
+        else                          seed = xfoil.cl;
+
+        // the last value of the sequence, counted as in XFoilTask::alphaSequence() and XFoilTask::ReSequence()
+        double inc = vMax>=vMin ? qAbs(vInc) : -qAbs(vInc);
+        int total = int(qAbs((vMax*1.0001-vMin)/inc));
+        double vLast = vMin + total*inc;
+        if(qAbs(seed-vLast)<qAbs(seed-vMin))
+        {
+            // half a step beyond the first value, so that the count of points is unchanged
+            vMax = vMin - 0.5*inc;
+            vMin = vLast;
+        }
+    }
+
+    if (pPolar->polarType()<xfl::FIXEDAOAPOLAR)
+        pTask->setSequence(bAlpha, vMin, vMax, vInc);
+    else if (pPolar->isFixedaoaPolar())
+        pTask->setReRange(vMin, vMax, vInc);
+}
+
+
+/**
+ * Runs the polars in the thread of the pool which started the chain
+ */
+void XFoilChain::run()
+{
+    if(m_Polars.isEmpty()) return;
+
+    QByteArray key = XFoilPool::key(m_Polars.first().first);
+    XFoilTask *pTask = m_pPool->take(key, m_Polars.first().second);
+
+    for(int i=0; i<m_Polars.size(); i++)
+    {
+        Foil const*pFoil = m_Polars.at(i).first;
+        Polar *pPolar    = m_Polars.at(i).second;
+        if(XFoilTask::s_bCancel) break;
+
+        bool bWarm = false;
+        if(pTask)
+        {
+            bWarm = pTask->continueXFoilTask(pFoil, pPolar, m_Settings.viscous);
+        }
+        else
+        {
+            pTask = new XFoilTask(m_pParent);
+            pTask->setAutoDelete(false);
+            pTask->initializeXFoilTask(pFoil, pPolar, m_Settings.viscous, m_Settings.init_BL, false);
+        }
+        m_pPool->count(bWarm);
+
+        setSequence(pTask, pPolar, bWarm);
+        pTask->run();
+    }
+
+    m_pPool->give(key, pTask);
+}
@@ -0,0 +1,101 @@
+/****************************************************************************
+
+    XFoilPool Class
+    Copyright (C) 2021-2022 Nikhil Sethi 
+
+    This program is free software; you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation; either version 2 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+*****************************************************************************/
+
+#pragma once
+
+#include <QByteArray>
+#include <QList>
+#include <QMutex>
+#include <QObject>
+#include <QPair>
+#include <QRunnable>
+#include <QVector>
+
+#include "RpcLibAdapters.h"
+
+class Foil;
+class Polar;
+class XFoil;
+class XFoilTask;
+
+/**
+ * @class XFoilPool
+ * Keeps the XFoilTasks of the last 2D analyses run with warm_start, with their XFoil instance,
+ * so that a new polar of the same foil starts from a converged boundary layer and from a loaded geometry.
+ * The tasks are keyed by a hash of the foil coordinates, and a new polar is given the task
+ * whose last point is the closest to it: by Reynolds number, or by aoa for the type 4 polars.
+ * A capacity of 0 disables the pool. Thread safe.
+ */
+class XFoilPool
+{
+    public:
+        XFoilPool(int capacity=0);
+        ~XFoilPool();
+
+        static QByteArray key(Foil const*pFoil);
+
+        XFoilTask *take(QByteArray const &key, Polar const*pPolar);
+        void give(QByteArray const &key, XFoilTask *pTask);
+        void count(bool bWarm);
+        void clear();
+
+        void setCapacity(int capacity);
+        int capacity() const {return m_Capacity;}
+        int size();
+        int warmStarts() const {return m_nWarm;}
+        int coldStarts() const {return m_nCold;}
+        bool isEnabled() const {return m_Capacity>0;}
+
+    private:
+        static double distance(XFoil const &xfoil, Polar const*pPolar);
+
+        QMutex m_Mutex;
+        QList<QPair<QByteArray, XFoilTask*>> m_Tasks;   /**< the idle tasks, least recently used first */
+        int m_Capacity;
+        int m_nWarm;        /**< the number of polars which started from a converged boundary layer */
+        int m_nCold;        /**< the number of polars which started from scratch */
+};
+
+
+/**
+ * @class XFoilChain
+ * Runs polars of the same foil one after the other with a single XFoilTask, each polar starting
+ * from the boundary layer of the previous one. The polars are best sorted by Reynolds number.
+ * The alpha, Cl or Re sequence of each polar starts from the end which is the closest to the last converged point.
+ * The task is taken from the pool at the start and given back at the end.
+ */
+class XFoilChain : public QRunnable
+{
+    public:
+        XFoilChain(XFoilPool *pPool, QObject *pParent, RpcLibAdapters::AnalysisSettings2D const &settings);
+
+        void append(Foil const*pFoil, Polar *pPolar);
+        int size() const {return m_Polars.size();}
+        void run() override;
+
+    private:
+        void setSequence(XFoilTask *pTask, Polar const*pPolar, bool bWarm) const;
+
+        XFoilPool *m_pPool;
+        QObject *m_pParent;
+        RpcLibAdapters::AnalysisSettings2D m_Settings;
+        QVector<QPair<Foil const*, Polar*>> m_Polars;
+};
@@ -5,6 +5,11 @@ TEMPLATE = subdirs
 SUBDIRS = \
     XFoil-lib \
     xflr5v6 \
+    headless \
+
+# the server without the gui, for the machines which have no display
+headless.subdir = xflr5v6/xflserver/headless
+headless.depends = XFoil-lib
 
 TRANSLATIONS = translations/xflr5 v6.ts \
     translations/xflr5 v6_fr.ts \